@@ -1,74 +1,46 @@
 import { NextResponse } from 'next/server';
 import { v4 as uuidv4 } from 'uuid';
 import { supabaseAdmin } from '@/lib/supabase/client';
-import { countryNames } from '@/lib/country-names';
-
-// Generate double round-robin fixtures (each team plays every other team twice)
-function generateRoundRobinFixtures(teams) {
-  const fixtures = [];
-  const numTeams = teams.length;
-
-  // If odd number of teams, add a bye
-  const hasBye = numTeams % 2 !== 0;
-  const effectiveTeams = hasBye ? [...teams, { id: 'bye', team_name: 'Bye' }] : teams;
-  const numRounds = effectiveTeams.length - 1;
-
-  // First half: Standard round-robin
-  for (let round = 0; round < numRounds; round++) {
-    const roundFixtures = [];
-
-    for (let i = 0; i < effectiveTeams.length / 2; i++) {
-      const home = effectiveTeams[i];
-      const away = effectiveTeams[effectiveTeams.length - 1 - i];
-
-      if (home.id !== 'bye' && away.id !== 'bye') {
-        roundFixtures.push({
-          home,
-          away,
-          round: round + 1
-        });
-      }
-    }
-
-    fixtures.push(roundFixtures);
-
-    // Rotate teams (keep first team fixed, rotate others)
-    const first = effectiveTeams.shift();
-    effectiveTeams.push(first);
-  }
-
-  // Second half: Reverse fixtures (away becomes home)
-  for (let round = 0; round < numRounds; round++) {
-    const roundFixtures = [];
-
-    for (let i = 0; i < effectiveTeams.length / 2; i++) {
-      const home = effectiveTeams[i];
-      const away = effectiveTeams[effectiveTeams.length - 1 - i];
-
-      if (home.id !== 'bye' && away.id !== 'bye') {
-        // Swap home and away for reverse fixtures
-        roundFixtures.push({
-          home: away,
-          away: home,
-          round: round + numRounds + 1
-        });
-      }
-    }
-
-    fixtures.push(roundFixtures);
-
-    // Rotate teams (keep first team fixed, rotate others)
-    const first = effectiveTeams.shift();
-    effectiveTeams.push(first);
-  }
-
-  return fixtures;
-}
-
-// Helper function to generate player with realistic skills
-function generatePlayer(age = null) {
+import { getTeams, invalidateTeams } from '@/lib/league/team-directory';
+import { applyCompletedMatches, getCurrentSeason, getLeagueTable, initializeStandings, rebuildStandings } from '@/lib/league/standings-store';
+import { getSeasonHistory, refreshSeasonSnapshot } from '@/lib/league/season-snapshots';
+import { etagMatches, strongETag } from '@/lib/http/etag';
+import { lastEventId, SSE_HEADERS } from '@/lib/http/sse';
+import { templateRoute, withMetrics } from '@/lib/metrics/route';
+import { sliceBalls } from '@/lib/simulation/ball-log';
+import { MATCH_COLUMNS } from '@/lib/simulation/match';
+import { createRandom } from '@/lib/simulation/random';
+import { PINNED_FIELDS, matchDetail, pinPlayerReplays } from '@/lib/simulation/replay';
+import { pauseLiveMatch, resumeLiveMatch, startLiveMatch, subscribeToMatch } from '@/lib/live/match-feed';
+import { claimMatches, getJob, jobForMatch, releaseMatches, submitSimulation } from '@/lib/jobs/simulation-queue';
+import { allocateNames, markTaken, releaseNames, releaseUnusedNames } from '@/lib/players/name-allocator';
+import { parseSearch, searchMarketplace } from '@/lib/marketplace/search';
+
+const DEFAULT_BALL_PAGE = 6;
+const SQUAD_SIZE = 20;
+
+// Paths each handler below serves, labelling its metrics; requests to any
+// other path are recorded as unmatched
+const ROUTES = {
+  GET: [
+    '', 'users', 'users/:id', 'players', 'players/:id', 'matches',
+    'matches/:id/start', 'matches/:id/pause', 'matches/:id/resume', 'matches/:id/stream',
+    'matches/:id/balls', 'matches/:id/scorecard', 'matches/:id',
+    'lineups', 'lineups/:id', 'marketplace', 'marketplace/buy/:id', 'leagues'
+  ],
+  POST: [
+    'auth/register', 'auth/login', 'players', 'lineups', 'marketplace',
+    'matches/simulate', 'matches/quick-sim', 'matches/:id/simulate', 'matches', 'match-orders'
+  ],
+  PUT: ['users/:id', 'players/:id', 'lineups/:id', 'matches/:id'],
+  DELETE: ['players/:id', 'matches/:id']
+};
+
+// Helper function to generate player with realistic skills; `random` is a
+// Math.random-compatible source, seeded to make a squad reproducible
+function generatePlayer(age = null, random = Math.random) {
   const ages = [21, 22, 23, 24, 25, 26, 27, 28, 29, 30];
-  const playerAge = age || ages[Math.floor(Math.random() * ages.length)];
+  const playerAge = age || ages[Math.floor(random() * ages.length)];
   
   // Skill levels mapping
   const skillLevels = [
@@ -85,7 +57,7 @@ function generatePlayer(age = null) {
     { name: 'Legendary', min: 96, max: 100 }
   ];
 
-  const generateSkill = () => Math.floor(Math.random() * 100) + 1;
+  const generateSkill = () => Math.floor(random() * 100) + 1;
   
   const batting = generateSkill();
   const bowling = generateSkill();
@@ -109,7 +81,7 @@ function generatePlayer(age = null) {
 
   return {
     id: uuidv4(),
-    name: `${firstNames[Math.floor(Math.random() * firstNames.length)]} ${lastNames[Math.floor(Math.random() * lastNames.length)]}`,
+    name: `${firstNames[Math.floor(random() * firstNames.length)]} ${lastNames[Math.floor(random() * lastNames.length)]}`,
     age: playerAge,
     batting,
     bowling,
@@ -119,548 +91,37 @@ function generatePlayer(age = null) {
     endurance,
     power,
     captaincy,
-    experience: Math.floor(Math.random() * 100),
-    form: formLevels[Math.floor(Math.random() * formLevels.length)],
-    fatigue: fatigueLevels[Math.floor(Math.random() * fatigueLevels.length)],
-    wage: Math.floor(Math.random() * 50000) + 10000,
+    experience: Math.floor(random() * 100),
+    form: formLevels[Math.floor(random() * formLevels.length)],
+    fatigue: fatigueLevels[Math.floor(random() * fatigueLevels.length)],
+    wage: Math.floor(random() * 50000) + 10000,
     rating: overall,
     nationality: 'England',
-    batting_style: battingStyles[Math.floor(Math.random() * battingStyles.length)],
-    bowler_type: bowlerTypes[Math.floor(Math.random() * bowlerTypes.length)],
+    batting_style: battingStyles[Math.floor(random() * battingStyles.length)],
+    bowler_type: bowlerTypes[Math.floor(random() * bowlerTypes.length)],
     talents: [],
     squad_type: 'senior',
-    market_value: Math.floor(overall * 1000) + Math.floor(Math.random() * 10000),
+    market_value: Math.floor(overall * 1000) + Math.floor(random() * 10000),
     is_for_sale: false,
     sale_price: 0
   };
 }
 
-// Enhanced T20 Match simulation functions
-function simulateInnings(battingTeam, bowlingTeam, target = null, matchConditions = {}, isSecondInnings = false) {
-  const maxOvers = 20;
-  const { weather = 'Sunny', pitchType = 'Normal' } = matchConditions;
-  
-  let runs = 0;
-  let wickets = 0;
-  let ballCount = 0;
-  let commentary = [];
-  let currentBatsman1 = 0;
-  let currentBatsman2 = 1;
-  let currentBowler = 0;
-  let bowlerOvers = {}; // Track overs bowled by each bowler
-  let partnerships = [];
-  let currentPartnership = { batsman1: battingTeam[0].name, batsman2: battingTeam[1].name, runs: 0, balls: 0 };
-  let fallOfWickets = [];
-  let bowlingFigures = {};
-  let lastBowler = -1;
-  
-  // Initialize batting scores
-  let batsmanScores = battingTeam.map(() => ({ 
-    runs: 0, balls: 0, fours: 0, sixes: 0, out: false, outType: null, bowler: null, strikeRate: 0 
-  }));
-  
-  // Weather and pitch effects
-  const getWeatherEffect = () => {
-    switch(weather) {
-      case 'Overcast': return { bowlingBonus: 5, battingPenalty: 3 };
-      case 'Rainy': return { bowlingBonus: 8, battingPenalty: 5 };
-      case 'Sunny': return { bowlingBonus: 0, battingPenalty: 0 };
-      default: return { bowlingBonus: 0, battingPenalty: 0 };
-    }
-  };
-  
-  const getPitchEffect = () => {
-    switch(pitchType) {
-      case 'Green': return { bowlingBonus: 6, battingPenalty: 4 };
-      case 'Dusty': return { bowlingBonus: 3, battingPenalty: 2, spinBonus: 5 };
-      case 'Flat': return { bowlingBonus: -3, battingPenalty: -3 };
-      default: return { bowlingBonus: 0, battingPenalty: 0 };
-    }
-  };
-  
-  const weatherEffect = getWeatherEffect();
-  const pitchEffect = getPitchEffect();
-  
-  for (let over = 0; over < maxOvers && wickets < 10; over++) {
-    const isPowerplay = over < 6;
-    const isDeathOvers = over >= 17;
-    
-    // Bowling restrictions - can't bowl more than 4 overs
-    let availableBowlers = bowlingTeam.filter((_, index) => (bowlerOvers[index] || 0) < 4);
-    if (availableBowlers.length === 0) availableBowlers = bowlingTeam; // Fallback
-    
-    // Select bowler (can't bowl consecutive overs)
-    let bowlerIndex;
-    do {
-      bowlerIndex = Math.floor(Math.random() * availableBowlers.length);
-      bowlerIndex = bowlingTeam.findIndex(b => b.id === availableBowlers[bowlerIndex].id);
-    } while (bowlerIndex === lastBowler && availableBowlers.length > 1);
-    
-    const bowler = bowlingTeam[bowlerIndex];
-    bowlerOvers[bowlerIndex] = (bowlerOvers[bowlerIndex] || 0) + 1;
-    lastBowler = bowlerIndex;
-    
-    // Initialize bowling figures
-    if (!bowlingFigures[bowler.id]) {
-      bowlingFigures[bowler.id] = { 
-        name: bowler.name, overs: 0, maidens: 0, runs: 0, wickets: 0, economy: 0 
-      };
-    }
-    
-    let overRuns = 0;
-    let overWickets = 0;
-    
-    for (let ball = 0; ball < 6 && wickets < 10; ball++) {
-      ballCount++;
-      currentPartnership.balls++;
-      
-      // Get current players
-      const batsman = battingTeam[currentBatsman1];
-      const nonStriker = battingTeam[currentBatsman2];
-      
-      // Calculate skills with form and fatigue effects
-      const formMultiplier = batsman.form === 'Excellent' ? 1.15 : 
-                           batsman.form === 'Good' ? 1.05 : 
-                           batsman.form === 'Poor' ? 0.9 : 
-                           batsman.form === 'Terrible' ? 0.8 : 1.0;
-      
-      const fatigueMultiplier = batsman.fatigue === 'Fresh' ? 1.0 : 
-                               batsman.fatigue === 'Slightly tired' ? 0.95 : 
-                               batsman.fatigue === 'Tired' ? 0.9 : 0.85;
-      
-      let batsmanSkill = (batsman.batting + batsman.technique + batsman.power) / 3;
-      batsmanSkill = batsmanSkill * formMultiplier * fatigueMultiplier;
-      
-      let bowlerSkill = (bowler.bowling + bowler.technique) / 2;
-      
-      // Apply conditions
-      bowlerSkill += weatherEffect.bowlingBonus + pitchEffect.bowlingBonus;
-      batsmanSkill -= weatherEffect.battingPenalty + pitchEffect.battingPenalty;
-      
-      // Spin bowling bonus on dusty pitch
-      if (pitchEffect.spinBonus && (bowler.bowler_type?.includes('spin') || bowler.bowler_type?.includes('Spin'))) {
-        bowlerSkill += pitchEffect.spinBonus;
-      }
-      
-      // Pressure factor for second innings
-      let pressureFactor = 1.0;
-      if (isSecondInnings && target) {
-        const requiredRate = ((target - runs) / ((maxOvers * 6 - ballCount) / 6));
-        const currentRate = runs > 0 ? (runs / (ballCount / 6)) : 0;
-        
-        if (requiredRate > currentRate + 2) {
-          pressureFactor = 1.2; // High pressure increases chances of risky shots
-        } else if (requiredRate < currentRate - 1) {
-          pressureFactor = 0.8; // Low pressure, play safely
-        }
-      }
-      
-      // Match situation adjustments
-      if (isPowerplay) {
-        batsmanSkill += 5; // Field restrictions favor batsmen
-      }
-      if (isDeathOvers) {
-        batsmanSkill += 3; // Batsmen more aggressive
-        bowlerSkill += 2; // Bowlers under pressure
-      }
-      
-      const outcomeRoll = Math.random() * 100;
-      let ballRuns = 0;
-      let isWicket = false;
-      let ballCommentary = '';
-      let extras = null;
-      let milestone = null;
-      
-      // Check for extras first (5% chance)
-      if (Math.random() < 0.05) {
-        const extraType = Math.random();
-        if (extraType < 0.6) {
-          ballRuns = 1;
-          extras = 'wide';
-          ballCommentary = `Wide ball! ${bowler.name} strays down the leg side`;
-          ball--; // Wide ball doesn't count as a legal delivery
-        } else if (extraType < 0.9) {
-          ballRuns = 1;
-          extras = 'no-ball';
-          ballCommentary = `No ball! ${bowler.name} oversteps the crease`;
-          ball--; // No ball doesn't count as a legal delivery
-        } else {
-          ballRuns = 1;
-          extras = 'bye';
-          ballCommentary = `Bye! The ball beats everyone`;
-        }
-      } else {
-        // Determine ball outcome
-        const wicketChance = (bowlerSkill - batsmanSkill) / 10 + (isDeathOvers ? 8 : 5);
-        
-        if (outcomeRoll < wicketChance && wicketChance > 0) {
-          // Wicket
-          isWicket = true;
-          overWickets++;
-          const wicketTypes = ['bowled', 'caught', 'lbw', 'caught behind', 'run out'];
-          const wicketType = wicketTypes[Math.floor(Math.random() * wicketTypes.length)];
-          
-          batsmanScores[currentBatsman1].out = true;
-          batsmanScores[currentBatsman1].outType = wicketType;
-          batsmanScores[currentBatsman1].bowler = bowler.name;
-          
-          fallOfWickets.push({
-            wicket: wickets + 1,
-            batsman: batsman.name,
-            runs: runs,
-            over: over + 1,
-            ball: ball + 1,
-            bowler: bowler.name,
-            type: wicketType
-          });
-          
-          // End current partnership
-          partnerships.push({...currentPartnership});
-          
-          wickets++;
-          ballCommentary = generateWicketCommentary(batsman, bowler, wicketType, runs, wickets);
-          
-          // Next batsman comes in
-          if (wickets < 10 && currentBatsman1 + wickets + 1 < battingTeam.length) {
-            currentBatsman1 = wickets + 1;
-            currentPartnership = {
-              batsman1: battingTeam[currentBatsman1].name,
-              batsman2: battingTeam[currentBatsman2].name,
-              runs: 0,
-              balls: 0
-            };
-          }
-        } else {
-          // Runs scored
-          const aggressionLevel = pressureFactor * (isPowerplay ? 1.2 : isDeathOvers ? 1.5 : 1.0);
-          const runChance = Math.random() * 100;
-          
-          if (runChance < (batsmanSkill / 10) * aggressionLevel) {
-            if (runChance < (batsmanSkill / 50) * aggressionLevel) {
-              ballRuns = 6;
-              batsmanScores[currentBatsman1].sixes++;
-              ballCommentary = generateBoundaryCommentary(batsman, bowler, 6, runs + 6, isPowerplay, isDeathOvers);
-            } else if (runChance < (batsmanSkill / 25) * aggressionLevel) {
-              ballRuns = 4;
-              batsmanScores[currentBatsman1].fours++;
-              ballCommentary = generateBoundaryCommentary(batsman, bowler, 4, runs + 4, isPowerplay, isDeathOvers);
-            } else {
-              ballRuns = Math.floor(Math.random() * 3) + 1;
-              ballCommentary = `${batsman.name} works it for ${ballRuns} run${ballRuns > 1 ? 's' : ''}`;
-            }
-          } else {
-            ballRuns = 0;
-            ballCommentary = generateDotBallCommentary(batsman, bowler, isPowerplay, isDeathOvers);
-          }
-          
-          if (!extras) {
-            batsmanScores[currentBatsman1].runs += ballRuns;
-            batsmanScores[currentBatsman1].balls++;
-            
-            // Check for milestones
-            if (batsmanScores[currentBatsman1].runs === 50) {
-              milestone = 'fifty';
-              ballCommentary += ` FIFTY for ${batsman.name}! What a knock!`;
-            } else if (batsmanScores[currentBatsman1].runs === 100) {
-              milestone = 'century';
-              ballCommentary += ` CENTURY! ${batsman.name} reaches three figures!`;
-            }
-          }
-          
-          runs += ballRuns;
-          overRuns += ballRuns;
-          currentPartnership.runs += ballRuns;
-          
-          // Change strike on odd runs
-          if (ballRuns % 2 === 1) {
-            [currentBatsman1, currentBatsman2] = [currentBatsman2, currentBatsman1];
-          }
-        }
-      }
-      
-      // Update bowling figures
-      bowlingFigures[bowler.id].runs += ballRuns;
-      if (isWicket) bowlingFigures[bowler.id].wickets++;
-      
-      // Calculate rates
-      const currentRunRate = ballCount > 0 ? (runs / (ballCount / 6)).toFixed(2) : '0.00';
-      let requiredRunRate = null;
-      if (isSecondInnings && target) {
-        const ballsLeft = (maxOvers * 6) - ballCount;
-        requiredRunRate = ballsLeft > 0 ? ((target - runs) / (ballsLeft / 6)).toFixed(2) : '0.00';
-      }
-      
-      commentary.push({
-        over: over + 1,
-        ball: ball + 1,
-        runs: ballRuns,
-        totalRuns: runs,
-        wickets: wickets,
-        batsman: batsman.name,
-        bowler: bowler.name,
-        commentary: ballCommentary,
-        isWicket: isWicket,
-        extras: extras,
-        milestone: milestone,
-        currentRunRate: parseFloat(currentRunRate),
-        requiredRunRate: requiredRunRate ? parseFloat(requiredRunRate) : null,
-        isPowerplay: isPowerplay,
-        isDeathOvers: isDeathOvers,
-        pressure: isSecondInnings && target ? (target - runs) : null,
-        ballsLeft: isSecondInnings && target ? (maxOvers * 6) - ballCount : null
-      });
-      
-      // Check if target achieved in second innings
-      if (isSecondInnings && runs > target) {
-        break;
-      }
-    }
-    
-    // Update bowling figures for the over
-    bowlingFigures[bowler.id].overs++;
-    if (overRuns === 0 && overWickets === 0) {
-      bowlingFigures[bowler.id].maidens++;
-    }
-    
-    // Change strike at end of over
-    [currentBatsman1, currentBatsman2] = [currentBatsman2, currentBatsman1];
-    
-    // Check if target achieved in second innings
-    if (isSecondInnings && runs > target) {
-      break;
-    }
-  }
-  
-  // Finalize current partnership
-  if (currentPartnership.balls > 0) {
-    partnerships.push(currentPartnership);
-  }
-  
-  // Calculate final bowling figures
-  Object.keys(bowlingFigures).forEach(bowlerId => {
-    const figure = bowlingFigures[bowlerId];
-    figure.economy = figure.overs > 0 ? (figure.runs / figure.overs).toFixed(2) : '0.00';
-  });
-  
-  // Calculate batting strike rates
-  batsmanScores.forEach((score, index) => {
-    score.strikeRate = score.balls > 0 ? ((score.runs / score.balls) * 100).toFixed(2) : '0.00';
-    score.name = battingTeam[index].name;
-  });
-  
-  return {
-    runs,
-    wickets,
-    overs: Math.floor(ballCount / 6) + (ballCount % 6 > 0 ? (ballCount % 6) / 10 : 0),
-    balls: ballCount,
-    commentary,
-    batsmanScores,
-    bowlingFigures: Object.values(bowlingFigures),
-    partnerships,
-    fallOfWickets,
-    runRate: ballCount > 0 ? (runs / (ballCount / 6)).toFixed(2) : '0.00'
-  };
-}
-
-// Helper function to calculate league standings
-function calculateLeagueStandings(allUsers, seasonMatches) {
-  // Initialize all teams from users with 0 stats
-  const teams = {};
-  allUsers.forEach(user => {
-    teams[user.id] = {
-      id: user.id,
-      name: user.team_name || 'Unknown Team',
-      played: 0,
-      won: 0,
-      lost: 0,
-      tied: 0,
-      points: 0,
-      netRunRate: 0,
-      runsFor: 0,
-      runsAgainst: 0,
-      oversFor: 0,
-      oversAgainst: 0,
-      highestScore: 0,
-      lowestScore: 999,
-      averageScore: 0,
-      winPercentage: 0,
-      form: []
-    };
-  });
-
-  // Calculate stats from season matches
-  seasonMatches.forEach(match => {
-    const homeTeam = teams[match.home_team_id];
-    const awayTeam = teams[match.away_team_id];
-
-    if (!homeTeam || !awayTeam) return; // Skip if team not found
-
-    // Update played matches
-    homeTeam.played++;
-    awayTeam.played++;
-
-    // Update runs and overs
-    homeTeam.runsFor += match.home_score;
-    homeTeam.runsAgainst += match.away_score;
-    homeTeam.oversFor += match.home_overs || 20;
-    homeTeam.oversAgainst += match.away_overs || 20;
-
-    awayTeam.runsFor += match.away_score;
-    awayTeam.runsAgainst += match.home_score;
-    awayTeam.oversFor += match.away_overs || 20;
-    awayTeam.oversAgainst += match.home_overs || 20;
-
-    // Update highest/lowest scores
-    homeTeam.highestScore = Math.max(homeTeam.highestScore, match.home_score);
-    homeTeam.lowestScore = Math.min(homeTeam.lowestScore, match.home_score);
-    awayTeam.highestScore = Math.max(awayTeam.highestScore, match.away_score);
-    awayTeam.lowestScore = Math.min(awayTeam.lowestScore, match.away_score);
-
-    // Update win/loss/tie records and form
-    if (match.result === match.home_team_id) {
-      homeTeam.won++;
-      homeTeam.points += 4;
-      awayTeam.lost++;
-      homeTeam.form.unshift('W');
-      awayTeam.form.unshift('L');
-    } else if (match.result === match.away_team_id) {
-      awayTeam.won++;
-      awayTeam.points += 4;
-      homeTeam.lost++;
-      awayTeam.form.unshift('W');
-      homeTeam.form.unshift('L');
-    } else {
-      homeTeam.tied++;
-      awayTeam.tied++;
-      homeTeam.points += 2;
-      awayTeam.points += 2;
-      homeTeam.form.unshift('T');
-      awayTeam.form.unshift('T');
-    }
-
-    // Keep only last 5 matches in form
-    if (homeTeam.form.length > 5) homeTeam.form = homeTeam.form.slice(0, 5);
-    if (awayTeam.form.length > 5) awayTeam.form = awayTeam.form.slice(0, 5);
-  });
-
-  // Calculate final statistics
-  const leagueTable = Object.values(teams).map(team => {
-    // Net Run Rate calculation
-    const runRateFor = team.oversFor > 0 ? team.runsFor / team.oversFor : 0;
-    const runRateAgainst = team.oversAgainst > 0 ? team.runsAgainst / team.oversAgainst : 0;
-    team.netRunRate = (runRateFor - runRateAgainst).toFixed(3);
-
-    // Other calculations
-    team.averageScore = team.played > 0 ? (team.runsFor / team.played).toFixed(1) : '0.0';
-    team.winPercentage = team.played > 0 ? ((team.won / team.played) * 100).toFixed(1) : '0.0';
-
-    // Handle lowest score for teams that haven't played
-    if (team.lowestScore === 999) team.lowestScore = 0;
-
-    return team;
-  });
-
-  // Sort by points (descending), then by net run rate (descending)
-  leagueTable.sort((a, b) => {
-    if (b.points !== a.points) return b.points - a.points;
-    return parseFloat(b.netRunRate) - parseFloat(a.netRunRate);
-  });
-
-  return leagueTable;
-}
-
-// Enhanced commentary generation functions
-function generateWicketCommentary(batsman, bowler, wicketType, runs, wicketNumber) {
-  const wicketComments = {
-    bowled: [
-      `BOWLED! ${bowler.name} crashes through the defenses of ${batsman.name}!`,
-      `Timber! ${batsman.name} is clean bowled by a beauty from ${bowler.name}!`,
-      `What a delivery! ${bowler.name} rattles the stumps and ${batsman.name} has to go!`
-    ],
-    caught: [
-      `CAUGHT! ${batsman.name} finds the fielder and ${bowler.name} gets his reward!`,
-      `Gone! ${batsman.name} tries to go big but holes out to the fielder!`,
-      `Excellent catch! ${batsman.name} is dismissed and ${bowler.name} is delighted!`
-    ],
-    lbw: [
-      `LBW! ${batsman.name} is trapped in front by ${bowler.name}!`,
-      `Plumb! ${batsman.name} is caught dead in front of the stumps!`,
-      `That looked stone dead! ${batsman.name} has to walk back!`
-    ],
-    'caught behind': [
-      `CAUGHT BEHIND! ${batsman.name} edges it to the keeper!`,
-      `Gone! The keeper takes a sharp catch behind the stumps!`,
-      `Thin edge! ${batsman.name} nicks it and the keeper does the rest!`
-    ],
-    'run out': [
-      `RUN OUT! Poor communication and ${batsman.name} has to go!`,
-      `Direct hit! ${batsman.name} is short of the crease!`,
-      `Brilliant fielding! ${batsman.name} is caught well short!`
-    ]
-  };
-  
-  const comments = wicketComments[wicketType] || [`OUT! ${batsman.name} is dismissed by ${bowler.name}`];
-  let comment = comments[Math.floor(Math.random() * comments.length)];
-  
-  if (wicketNumber <= 3) {
-    comment += ` Early breakthrough for the bowling side!`;
-  } else if (wicketNumber >= 8) {
-    comment += ` The tail is crumbling now!`;
-  }
-  
-  return comment;
-}
-
-function generateBoundaryCommentary(batsman, bowler, runs, totalRuns, isPowerplay, isDeathOvers) {
-  const sixComments = [
-    `SIX! ${batsman.name} sends it sailing over the ropes!`,
-    `Maximum! What a strike from ${batsman.name}!`,
-    `Gone all the way! ${batsman.name} absolutely crunches that one!`,
-    `Into the crowd! ${batsman.name} connects beautifully!`,
-    `Massive hit! ${batsman.name} clears the boundary with ease!`
-  ];
-  
-  const fourComments = [
-    `FOUR! ${batsman.name} finds the gap beautifully!`,
-    `Cracking shot! ${batsman.name} pierces the field!`,
-    `Exquisite timing! ${batsman.name} guides it to the fence!`,
-    `Brilliant stroke! ${batsman.name} finds the boundary!`,
-    `Perfect placement! ${batsman.name} beats the field!`
-  ];
-  
-  let comments = runs === 6 ? sixComments : fourComments;
-  let comment = comments[Math.floor(Math.random() * comments.length)];
-  
-  if (isPowerplay) {
-    comment += ` Making the most of the powerplay restrictions!`;
-  } else if (isDeathOvers) {
-    comment += ` Crucial runs in the death overs!`;
-  }
-  
-  return comment;
-}
-
-function generateDotBallCommentary(batsman, bowler, isPowerplay, isDeathOvers) {
-  const dotComments = [
-    `Dot ball. ${bowler.name} keeps it tight.`,
-    `Good length from ${bowler.name}, ${batsman.name} defends.`,
-    `${batsman.name} can't get it away, excellent bowling.`,
-    `${bowler.name} hits the right length, no runs.`,
-    `Solid defense from ${batsman.name}.`
-  ];
-  
-  let comment = dotComments[Math.floor(Math.random() * dotComments.length)];
-  
-  if (isDeathOvers) {
-    comment += ` Pressure building in the death overs!`;
-  } else if (isPowerplay) {
-    comment += ` Good tight bowling despite the field restrictions.`;
-  }
-  
-  return comment;
+// Pin the replays of a player's completed matches before their inputs change
+// or disappear; returns the player as it was (id, user_id, name)
+async function pinReplaysOf(playerId) {
+  const { data: player, error } = await supabaseAdmin
+    .from('players')
+    .select('id, user_id, name')
+    .eq('id', playerId)
+    .maybeSingle();
+
+  if (error) throw error;
+  if (player) await pinPlayerReplays([player]);
+  return player;
 }
 
-export async function GET(request, { params }) {
+export const GET = withMetrics(async function GET(request, { params }) {
   try {
     const { searchParams } = new URL(request.url);
     const path = params.path || [];
@@ -730,10 +191,11 @@ export async function GET(request, { params }) {
 
     if (path[0] === 'matches') {
       if (path[1] && path[2] === 'start') {
-        // Start live match simulation
+        // Start live match simulation; deliveries are released to
+        // /matches/:id/stream subscribers as the match progresses
         const { data: match, error } = await supabaseAdmin
           .from('matches')
-          .select('*')
+          .select(MATCH_COLUMNS)
           .eq('id', path[1])
           .single();
 
@@ -741,28 +203,28 @@ export async function GET(request, { params }) {
           return NextResponse.json({ error: 'Match not found' }, { status: 404 });
         }
 
-        // Update match status to in-progress
-        const { error: updateError } = await supabaseAdmin
-          .from('matches')
-          .update({
-            status: 'in-progress',
-            current_innings: 1,
-            current_over: 0,
-            current_ball: 0,
-            current_runs: 0,
-            current_wickets: 0,
-            live_commentary: [],
-            started_at: new Date().toISOString()
-          })
-          .eq('id', path[1]);
+        if (match.status !== 'scheduled') {
+          return NextResponse.json({ error: `Match already ${match.status}` }, { status: 400 });
+        }
 
-        if (updateError) throw updateError;
+        // A concurrent start or a queued simulation of the match holds its claim
+        if (claimMatches([match.id]).length === 0) {
+          return NextResponse.json({ error: 'Match is already being simulated' }, { status: 409 });
+        }
+
+        try {
+          await startLiveMatch(match);
+        } finally {
+          releaseMatches([match.id]);
+        }
 
         return NextResponse.json({ message: 'Match started successfully', matchId: path[1] });
       }
 
       if (path[1] && path[2] === 'pause') {
         // Pause live match
+        await pauseLiveMatch(path[1]);
+
         const { error } = await supabaseAdmin
           .from('matches')
           .update({
@@ -788,20 +250,139 @@ export async function GET(request, { params }) {
 
         if (error) throw error;
 
+        await resumeLiveMatch(path[1]);
+
         return NextResponse.json({ message: 'Match resumed successfully' });
       }
 
+      if (path[1] && path[2] === 'stream') {
+        // Server-sent events: deliveries, scoreboard deltas and state changes.
+        // Reconnecting clients resume after their Last-Event-ID.
+        const stream = await subscribeToMatch(path[1], lastEventId(request), request.signal);
+
+        if (!stream) {
+          return NextResponse.json({ error: 'Match not found' }, { status: 404 });
+        }
+
+        return new Response(stream, { headers: SSE_HEADERS });
+      }
+
+      if (path[1] && path[2] === 'balls') {
+        // Range of deliveries from the compact ball log (stored, or replayed
+        // from the match's seed), with commentary rendered for the returned
+        // balls only
+        const { data: row, error } = await supabaseAdmin
+          .from('matches')
+          .select('id, home_team_id, away_team_id, weather, pitch_type, status, current_innings, current_over, current_ball, ball_log, match_data')
+          .eq('id', path[1])
+          .single();
+
+        if (error || !row) {
+          return NextResponse.json({ error: 'Match not found' }, { status: 404 });
+        }
+
+        const replayed = await matchDetail(row, ['ball_log']);
+        if (replayed.error) {
+          return NextResponse.json({ error: replayed.error }, { status: 409 });
+        }
+
+        const match = { ...row, ball_log: replayed.detail.ball_log };
+        if (!match.ball_log?.length) {
+          return NextResponse.json({ error: 'No ball-by-ball log for this match' }, { status: 404 });
+        }
+
+        // A live match's log is stored when it starts; only the balls bowled
+        // up to its last recorded position are served
+        const live = match.status !== 'completed';
+        const liveInnings = Number(match.current_innings) || 1;
+        const playedInnings = live ? liveInnings : match.ball_log.length;
+        const innings = parseInt(searchParams.get('innings')) || playedInnings;
+        const log = innings <= playedInnings ? match.ball_log[innings - 1] : null;
+
+        if (!log) {
+          return NextResponse.json({ error: 'Innings not found' }, { status: 404 });
+        }
+
+        const intParam = (name) => parseInt(searchParams.get(name)) || null;
+        const range = {
+          from: intParam('from'),
+          to: intParam('to'),
+          fromOver: intParam('fromOver'),
+          toOver: intParam('toOver'),
+          last: intParam('last'),
+          until: live && innings === liveInnings ? (match.current_over || 0) * 6 + (match.current_ball || 0) : null,
+          commentary: searchParams.get('commentary') !== 'false'
+        };
+
+        if (!range.from && !range.to && !range.fromOver && !range.toOver && !range.last) {
+          range.last = DEFAULT_BALL_PAGE;
+        }
+
+        const { totalBalls, balls } = sliceBalls(log, range);
+
+        return NextResponse.json({
+          matchId: match.id,
+          status: match.status,
+          innings,
+          totalInnings: playedInnings,
+          target: log.target,
+          totalBalls,
+          balls
+        });
+      }
+
+      if (path[1] && path[2] === 'scorecard') {
+        // Both innings' scorecards, stored or replayed from the match's seed
+        const { data: match, error } = await supabaseAdmin
+          .from('matches')
+          .select('id, home_team_id, away_team_id, weather, pitch_type, status, match_data')
+          .eq('id', path[1])
+          .single();
+
+        if (error || !match) {
+          return NextResponse.json({ error: 'Match not found' }, { status: 404 });
+        }
+
+        const replayed = match.status === 'completed' ? await matchDetail(match, ['match_data']) : { detail: null };
+        if (replayed.error) {
+          return NextResponse.json({ error: replayed.error }, { status: 409 });
+        }
+
+        const scorecards = replayed.detail?.match_data;
+        if (!scorecards) {
+          return NextResponse.json({ error: 'No scorecard for this match' }, { status: 404 });
+        }
+
+        return NextResponse.json({
+          matchId: match.id,
+          firstInnings: scorecards.firstInnings,
+          secondInnings: scorecards.secondInnings,
+          replayed: !match.match_data?.firstInnings
+        });
+      }
+
       if (path[1]) {
-        // Get specific match
+        // Get specific match; the commentary and ball log columns are only
+        // returned on request (see /matches/:id/balls), replayed for matches
+        // that store a replay record instead
+        const include = searchParams.get('include') === 'commentary';
         const { data: match, error } = await supabaseAdmin
           .from('matches')
-          .select('*')
+          .select(include ? '*' : MATCH_COLUMNS)
           .eq('id', path[1])
           .single();
 
         if (error || !match) {
           return NextResponse.json({ error: 'Match not found' }, { status: 404 });
         }
+
+        if (include && match.status === 'completed') {
+          const replayed = await matchDetail(match);
+          if (replayed.detail) {
+            match.ball_log = replayed.detail.ball_log ?? match.ball_log;
+            match.match_data = replayed.detail.match_data ?? match.match_data;
+          }
+        }
         return NextResponse.json(match);
       } else {
         // Get all matches with enhanced filtering
@@ -811,7 +392,7 @@ export async function GET(request, { params }) {
 
         let query = supabaseAdmin
           .from('matches')
-          .select('*')
+          .select(MATCH_COLUMNS)
           .order('created_at', { ascending: false })
           .limit(limit);
 
@@ -827,25 +408,12 @@ export async function GET(request, { params }) {
 
         if (error) throw error;
 
-        // Populate team names
-        const populatedMatches = await Promise.all(matches.map(async (match) => {
-          const { data: homeTeam } = await supabaseAdmin
-            .from('users')
-            .select('team_name')
-            .eq('id', match.home_team_id)
-            .single();
-
-          const { data: awayTeam } = await supabaseAdmin
-            .from('users')
-            .select('team_name')
-            .eq('id', match.away_team_id)
-            .single();
-
-          return {
-            ...match,
-            home_team_name: homeTeam ? homeTeam.team_name : 'Unknown Team',
-            away_team_name: awayTeam ? awayTeam.team_name : 'Unknown Team'
-          };
+        // Populate team names from the team directory in one batched lookup
+        const teams = await getTeams(matches.flatMap(match => [match.home_team_id, match.away_team_id]));
+        const populatedMatches = matches.map(match => ({
+          ...match,
+          home_team_name: teams.get(match.home_team_id)?.team_name || 'Unknown Team',
+          away_team_name: teams.get(match.away_team_id)?.team_name || 'Unknown Team'
         }));
 
         return NextResponse.json(populatedMatches);
@@ -953,31 +521,23 @@ export async function GET(request, { params }) {
         return NextResponse.json({ message: 'Player purchased successfully' });
       }
 
-      // Get marketplace listings
-      const { data: players, error } = await supabaseAdmin
-        .from('players')
-        .select('*')
-        .eq('is_for_sale', true);
+      // Search marketplace listings, a page at a time
+      const { search, error } = parseSearch(searchParams);
+      if (error) {
+        return NextResponse.json({ error }, { status: 400 });
+      }
 
-      if (error) throw error;
-      return NextResponse.json(players || []);
+      return NextResponse.json(await searchMarketplace(search));
     }
 
     if (path[0] === 'leagues') {
       const requestedSeason = searchParams.get('season');
       const showHistory = searchParams.get('history') === 'true';
 
-      // Get all users (teams)
-      const { data: allUsers, error: usersError } = await supabaseAdmin
-        .from('users')
-        .select('*');
-
-      if (usersError) throw usersError;
-
       // Get league seasons to determine current season
       const { data: leagueSeasons, error: seasonsError } = await supabaseAdmin
         .from('league_seasons')
-        .select('*')
+        .select('season, status')
         .eq('league_id', 'default')
         .order('season', { ascending: false });
 
@@ -998,162 +558,31 @@ export async function GET(request, { params }) {
       // Use requested season or active season
       const currentSeason = requestedSeason || activeSeason;
 
-      // Get completed matches for the requested season
-      let matchesQuery = supabaseAdmin
-        .from('matches')
-        .select('*')
-        .eq('league', 'default')
-        .eq('status', 'completed');
-
-      if (showHistory && activeSeason) {
-        matchesQuery = matchesQuery.neq('season', activeSeason);
-      } else if (!showHistory && currentSeason) {
-        matchesQuery = matchesQuery.eq('season', currentSeason);
-      }
-
-      const { data: seasonMatches, error: matchesError } = await matchesQuery;
-      if (matchesError) throw matchesError;
-
-      // If showing history, group by season
+      // History is served from the frozen snapshots of completed seasons
       if (showHistory) {
-        const seasonsData = {};
+        const { history, etag } = await getSeasonHistory('default');
+        const historyETag = strongETag([etag, activeSeason]);
+        const headers = { ETag: historyETag, 'Cache-Control': 'public, no-cache' };
 
-        // Group matches by season
-        for (const match of seasonMatches) {
-          if (!seasonsData[match.season]) {
-            seasonsData[match.season] = [];
-          }
-          seasonsData[match.season].push(match);
+        if (etagMatches(request, historyETag)) {
+          return new NextResponse(null, { status: 304, headers });
         }
 
-        // Calculate standings for each season
-        const history = [];
-        for (const [season, matches] of Object.entries(seasonsData)) {
-          const seasonStandings = calculateLeagueStandings(allUsers, matches);
-          history.push({
-            season,
-            standings: seasonStandings,
-            totalMatches: matches.length,
-            completedMatches: matches.length
-          });
-        }
-
-        // Sort by season (most recent first)
-        history.sort((a, b) => b.season.localeCompare(a.season));
-
         return NextResponse.json({
           history,
           currentSeason: activeSeason
-        });
+        }, { headers });
       }
 
-      // Initialize all teams from users with 0 stats
-      const teams = {};
-      allUsers.forEach(user => {
-        teams[user.id] = {
-          id: user.id,
-          name: user.team_name || 'Unknown Team',
-          played: 0,
-          won: 0,
-          lost: 0,
-          tied: 0,
-          points: 0,
-          netRunRate: 0,
-          runsFor: 0,
-          runsAgainst: 0,
-          oversFor: 0,
-          oversAgainst: 0,
-          highestScore: 0,
-          lowestScore: 999,
-          averageScore: 0,
-          winPercentage: 0,
-          form: []
-        };
-      });
-
-      // Calculate stats from season matches
-      seasonMatches.forEach(match => {
-        const homeTeam = teams[match.home_team_id];
-        const awayTeam = teams[match.away_team_id];
-
-        if (!homeTeam || !awayTeam) return; // Skip if team not found
-
-        // Update played matches
-        homeTeam.played++;
-        awayTeam.played++;
-
-        // Update runs and overs
-        homeTeam.runsFor += match.home_score;
-        homeTeam.runsAgainst += match.away_score;
-        homeTeam.oversFor += match.home_overs || 20;
-        homeTeam.oversAgainst += match.away_overs || 20;
-
-        awayTeam.runsFor += match.away_score;
-        awayTeam.runsAgainst += match.home_score;
-        awayTeam.oversFor += match.away_overs || 20;
-        awayTeam.oversAgainst += match.home_overs || 20;
-
-        // Update highest/lowest scores
-        homeTeam.highestScore = Math.max(homeTeam.highestScore, match.home_score);
-        homeTeam.lowestScore = Math.min(homeTeam.lowestScore, match.home_score);
-        awayTeam.highestScore = Math.max(awayTeam.highestScore, match.away_score);
-        awayTeam.lowestScore = Math.min(awayTeam.lowestScore, match.away_score);
-
-        // Update win/loss/tie records and form
-        if (match.result === match.home_team_id) {
-          homeTeam.won++;
-          homeTeam.points += 4;
-          awayTeam.lost++;
-          homeTeam.form.unshift('W');
-          awayTeam.form.unshift('L');
-        } else if (match.result === match.away_team_id) {
-          awayTeam.won++;
-          awayTeam.points += 4;
-          homeTeam.lost++;
-          awayTeam.form.unshift('W');
-          homeTeam.form.unshift('L');
-        } else {
-          homeTeam.tied++;
-          awayTeam.tied++;
-          homeTeam.points += 2;
-          awayTeam.points += 2;
-          homeTeam.form.unshift('T');
-          awayTeam.form.unshift('T');
-        }
-
-        // Keep only last 5 matches in form
-        if (homeTeam.form.length > 5) homeTeam.form = homeTeam.form.slice(0, 5);
-        if (awayTeam.form.length > 5) awayTeam.form = awayTeam.form.slice(0, 5);
-      });
-
-      // Calculate final statistics
-      const leagueTable = Object.values(teams).map(team => {
-        // Net Run Rate calculation
-        const runRateFor = team.oversFor > 0 ? team.runsFor / team.oversFor : 0;
-        const runRateAgainst = team.oversAgainst > 0 ? team.runsAgainst / team.oversAgainst : 0;
-        team.netRunRate = (runRateFor - runRateAgainst).toFixed(3);
-
-        // Other calculations
-        team.averageScore = team.played > 0 ? (team.runsFor / team.played).toFixed(1) : '0.0';
-        team.winPercentage = team.played > 0 ? ((team.won / team.played) * 100).toFixed(1) : '0.0';
-
-        // Handle lowest score for teams that haven't played
-        if (team.lowestScore === 999) team.lowestScore = 0;
-
-        return team;
-      });
-
-      // Sort by points (descending), then by net run rate (descending)
-      leagueTable.sort((a, b) => {
-        if (b.points !== a.points) return b.points - a.points;
-        return parseFloat(b.netRunRate) - parseFloat(a.netRunRate);
-      });
+      // Current table comes from the maintained standings rows
+      const leagueTable = currentSeason ? await getLeagueTable('default', currentSeason) : [];
+      const completedMatches = leagueTable.reduce((sum, team) => sum + team.played, 0) / 2;
 
       return NextResponse.json({
         season: currentSeason,
         leagueTable,
-        totalMatches: seasonMatches.length,
-        completedMatches: seasonMatches.length
+        totalMatches: completedMatches,
+        completedMatches
       });
     }
 
@@ -1166,9 +595,9 @@ export async function GET(request, { params }) {
       { status: 500 }
     );
   }
-}
+}, templateRoute('/api', ROUTES.GET));
 
-export async function POST(request, { params }) {
+export const POST = withMetrics(async function POST(request, { params }) {
   try {
     const path = params.path || [];
 
@@ -1225,71 +654,36 @@ export async function POST(request, { params }) {
             .insert(user);
 
           if (insertError) throw insertError;
+          invalidateTeams([userId]);
 
-          // Generate starting squad for new user (20 players with globally unique names based on selected country)
-          const startingPlayers = [];
+          // The team is on the current default league table from the start
+          await initializeStandings('default', await getCurrentSeason('default'), [userId]);
 
-          // Get names for the selected country, fallback to England if not found
+          // Generate starting squad for new user (20 players with globally unique names based on selected country)
           const selectedCountry = body.country || 'England';
-          const countryData = countryNames[selectedCountry] || countryNames['England'];
-          const firstNames = countryData.firstNames;
-          const lastNames = countryData.lastNames;
-
-          // Generate unique names by checking database individually to avoid URI too large error
-          const usedNames = new Set();
-          let attempts = 0;
-          const maxAttempts = 1000; // Safety limit
-
-          while (startingPlayers.length < 20 && attempts < maxAttempts) {
-            attempts++;
-
-            // Generate a random name combination
-            const firstName = firstNames[Math.floor(Math.random() * firstNames.length)];
-            const lastName = lastNames[Math.floor(Math.random() * lastNames.length)];
-            const fullName = `${firstName} ${lastName}`;
-
-            // Skip if we already generated this name in this session
-            if (usedNames.has(fullName)) continue;
-
-            // Check if this name already exists in the database
-            const { data: existingPlayer, error: checkError } = await supabaseAdmin
-              .from('players')
-              .select('id')
-              .eq('name', fullName)
-              .single();
-
-            // If no error and no existing player found, this name is available
-            if (checkError && checkError.code === 'PGRST116') { // PGRST116 = no rows returned
-              // Name is available, create player
-              usedNames.add(fullName);
-              const player = generatePlayer();
-              player.name = fullName;
-              player.nationality = selectedCountry;
-              player.user_id = userId;
-              player.squad_type = 'senior';
-              startingPlayers.push(player);
-            } else if (checkError) {
-              // Some other error occurred, throw it
-              throw checkError;
-            }
-            // If existingPlayer exists, name is taken, continue to next attempt
-          }
+          const { names } = await allocateNames(selectedCountry, SQUAD_SIZE);
 
-          // If we still don't have 20 players after max attempts, fill with generic names
-          while (startingPlayers.length < 20) {
-            const player = generatePlayer();
-            player.name = `Player ${startingPlayers.length + 1}`;
+          // Skills are seeded from the team id, so a squad can be regenerated
+          const random = createRandom(`${userId}:squad`);
+
+          // Fill with generic names once the country's names run out
+          const startingPlayers = Array.from({ length: SQUAD_SIZE }, (_, i) => {
+            const player = generatePlayer(null, random);
+            player.name = names[i] || `Player ${i + 1}`;
             player.nationality = selectedCountry;
             player.user_id = userId;
             player.squad_type = 'senior';
-            startingPlayers.push(player);
-          }
+            return player;
+          });
 
           const { error: playersError } = await supabaseAdmin
             .from('players')
             .insert(startingPlayers);
 
-          if (playersError) throw playersError;
+          if (playersError) {
+            releaseNames(names);
+            throw playersError;
+          }
 
           // Create default lineup for new user
           const defaultLineupId = uuidv4();
@@ -1392,6 +786,7 @@ export async function POST(request, { params }) {
         .insert(player);
 
       if (error) throw error;
+      markTaken([player.name]);
       return NextResponse.json(player, { status: 201 });
     }
 
@@ -1424,9 +819,38 @@ export async function POST(request, { params }) {
     }
 
     if (path[0] === 'matches') {
-      if (path[1] && path[2] === 'simulate') {
-        // Simulate individual match - Note: Players table not implemented yet
-        return NextResponse.json({ error: 'Match simulation not implemented yet - requires players table' }, { status: 501 });
+      if (path[1] === 'simulate' || (path[1] && path[2] === 'simulate')) {
+        // Queue the ball-by-ball simulation of one match on the simulation
+        // workers; the job's status (and result once done) is served by
+        // /api/jobs/:id. Resubmitting a match returns its existing job.
+        const matchId = path[1] === 'simulate' ? (await request.json()).matchId : path[1];
+        const { data: match, error } = await supabaseAdmin
+          .from('matches')
+          .select('id, status')
+          .eq('id', matchId)
+          .maybeSingle();
+
+        if (error || !match) {
+          return NextResponse.json({ error: 'Match not found' }, { status: 404 });
+        }
+
+        // Only a scheduled match is simulated; a completed one answers with
+        // the job that completed it while that job is retained
+        const existing = jobForMatch(matchId);
+        if (match.status !== 'scheduled' && !(match.status === 'completed' && existing)) {
+          return NextResponse.json({ error: `Match already ${match.status}` }, { status: 409 });
+        }
+
+        const { job } = match.status === 'completed' ? { job: existing } : submitSimulation(matchId);
+        if (!job) {
+          return NextResponse.json({ error: 'Match is already being simulated' }, { status: 409 });
+        }
+
+        const status = getJob(job.id);
+        return NextResponse.json(status, {
+          status: status.status === 'done' ? 200 : 202,
+          headers: { Location: `/api/jobs/${job.id}` }
+        });
       }
 
       if (path[1] === 'quick-sim') {
@@ -1497,16 +921,42 @@ export async function POST(request, { params }) {
       { status: 500 }
     );
   }
-}
+}, templateRoute('/api', ROUTES.POST));
 
-export async function PUT(request, { params }) {
+export const PUT = withMetrics(async function PUT(request, { params }) {
   try {
     const path = params.path || [];
     const body = await request.json();
 
     console.log('PUT Request Path:', path, 'Body:', body);
 
+    if (path[0] === 'users' && path[1]) {
+      // Only team details are editable here; coins and credentials are not
+      const updates = {};
+      for (const field of ['team_name', 'country', 'nationality']) {
+        if (body[field] !== undefined) updates[field] = body[field];
+      }
+
+      const { data: updatedUser, error } = await supabaseAdmin
+        .from('users')
+        .update({ ...updates, updated_at: new Date().toISOString() })
+        .eq('id', path[1])
+        .select()
+        .single();
+
+      if (error || !updatedUser) {
+        return NextResponse.json({ error: 'User not found' }, { status: 404 });
+      }
+
+      invalidateTeams([path[1]]);
+      return NextResponse.json(updatedUser);
+    }
+
     if (path[0] === 'players' && path[1]) {
+      // A rename is one of the replayed attributes, so the previous name is
+      // read here whenever it can change
+      const previous = PINNED_FIELDS.some(field => body[field] !== undefined) ? await pinReplaysOf(path[1]) : null;
+
       const { error } = await supabaseAdmin
         .from('players')
         .update({ ...body, updated_at: new Date().toISOString() })
@@ -1524,6 +974,8 @@ export async function PUT(request, { params }) {
         return NextResponse.json({ error: 'Player not found' }, { status: 404 });
       }
 
+      markTaken([updatedPlayer.name]);
+      if (previous && previous.name !== updatedPlayer.name) await releaseUnusedNames([previous.name]);
       return NextResponse.json(updatedPlayer);
     }
 
@@ -1533,6 +985,14 @@ export async function PUT(request, { params }) {
     }
 
     if (path[0] === 'matches' && path[1]) {
+      const { data: previousMatch, error: previousError } = await supabaseAdmin
+        .from('matches')
+        .select('status, league, season')
+        .eq('id', path[1])
+        .maybeSingle();
+
+      if (previousError) throw previousError;
+
       const { error } = await supabaseAdmin
         .from('matches')
         .update({ ...body, updated_at: new Date().toISOString() })
@@ -1550,6 +1010,19 @@ export async function PUT(request, { params }) {
         return NextResponse.json({ error: 'Match not found' }, { status: 404 });
       }
 
+      // Keep the league standings in step: a newly completed match is applied
+      // as a delta, edits to an already completed match rebuild its season
+      if (previousMatch?.status === 'completed') {
+        await rebuildStandings(previousMatch.league, previousMatch.season);
+        await refreshSeasonSnapshot(previousMatch.league, previousMatch.season);
+        if (previousMatch.league !== updatedMatch.league || previousMatch.season !== updatedMatch.season) {
+          await rebuildStandings(updatedMatch.league, updatedMatch.season);
+          await refreshSeasonSnapshot(updatedMatch.league, updatedMatch.season);
+        }
+      } else if (updatedMatch.status === 'completed') {
+        await applyCompletedMatches([updatedMatch]);
+      }
+
       return NextResponse.json(updatedMatch);
     }
 
@@ -1562,33 +1035,44 @@ export async function PUT(request, { params }) {
       { status: 500 }
     );
   }
-}
+}, templateRoute('/api', ROUTES.PUT));
 
-export async function DELETE(request, { params }) {
+export const DELETE = withMetrics(async function DELETE(request, { params }) {
   try {
     const path = params.path || [];
 
     console.log('DELETE Request Path:', path);
 
     if (path[0] === 'players' && path[1]) {
+      const player = await pinReplaysOf(path[1]);
+
       const { error } = await supabaseAdmin
         .from('players')
         .delete()
         .eq('id', path[1]);
 
       if (error) throw error;
+      if (player) await releaseUnusedNames([player.name]);
 
       return NextResponse.json({ message: 'Player deleted successfully' });
     }
 
     if (path[0] === 'matches' && path[1]) {
-      const { error } = await supabaseAdmin
+      const { data: deletedMatches, error } = await supabaseAdmin
         .from('matches')
         .delete()
-        .eq('id', path[1]);
+        .eq('id', path[1])
+        .select('status, league, season');
 
       if (error) throw error;
 
+      // Removing a completed match takes its result out of the standings
+      const deletedMatch = deletedMatches?.[0];
+      if (deletedMatch?.status === 'completed') {
+        await rebuildStandings(deletedMatch.league, deletedMatch.season);
+        await refreshSeasonSnapshot(deletedMatch.league, deletedMatch.season);
+      }
+
       return NextResponse.json({ message: 'Match deleted successfully' });
     }
 
@@ -1601,4 +1085,4 @@ export async function DELETE(request, { params }) {
       { status: 500 }
     );
   }
-}
+}, templateRoute('/api', ROUTES.DELETE));
@@ -0,0 +1,41 @@
+import { NextResponse } from 'next/server';
+import { VIEWS, loadBootstrap } from '@/lib/dashboard/bootstrap';
+import { etagMatches, strongETag } from '@/lib/http/etag';
+import { withMetrics } from '@/lib/metrics/route';
+
+// Everything the dashboard (or, with view=squad, the squad page) shows on
+// load in one response. The body is private to the user and revalidated on
+// every load: a client sending back the ETag gets a bodiless 304 while
+// nothing it shows has changed.
+export const GET = withMetrics(async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const userId = searchParams.get('userId');
+    const view = searchParams.get('view') || 'dashboard';
+
+    if (!userId) {
+      return NextResponse.json({ error: 'User ID is required' }, { status: 400 });
+    }
+    if (!VIEWS.includes(view)) {
+      return NextResponse.json({ error: `view must be one of: ${VIEWS.join(', ')}` }, { status: 400 });
+    }
+
+    const bootstrap = await loadBootstrap(userId, view);
+    if (!bootstrap) {
+      return NextResponse.json({ error: 'User not found' }, { status: 404 });
+    }
+
+    const body = JSON.stringify(bootstrap);
+    const headers = { ETag: strongETag(body), 'Cache-Control': 'private, no-cache' };
+
+    if (etagMatches(request, headers.ETag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return new NextResponse(body, { headers: { ...headers, 'Content-Type': 'application/json' } });
+
+  } catch (error) {
+    console.error('Error loading bootstrap data:', error);
+    return NextResponse.json({ error: 'Failed to load dashboard data' }, { status: 500 });
+  }
+});
@@ -0,0 +1,12 @@
+import { renderPrometheus } from '@/lib/metrics/registry';
+
+// Per-route request metrics in the Prometheus text format. Not instrumented
+// itself, so scrapes do not show up in what they scrape.
+export async function GET() {
+  return new Response(renderPrometheus(), {
+    headers: {
+      'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+      'Cache-Control': 'no-store'
+    }
+  });
+}
@@ -1,7 +1,10 @@
 import { NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase/client';
+import { queueMetrics } from '@/lib/jobs/simulation-queue';
+import { requestSummary } from '@/lib/metrics/registry';
+import { withMetrics } from '@/lib/metrics/route';
 
-export async function GET() {
+export const GET = withMetrics(async function GET() {
   try {
     // Test Supabase connection
     const { data, error } = await supabase
@@ -12,11 +15,19 @@ export async function GET() {
       throw error;
     }
 
+    const queue = queueMetrics();
     const healthData = {
       status: 'healthy',
       timestamp: new Date().toISOString(),
       database: 'supabase',
-      connection: 'connected'
+      connection: 'connected',
+      simulationQueue: {
+        depth: queue.depth,
+        running: queue.running,
+        waitP95Ms: queue.waitMs.p95
+      },
+      // Per-route histograms are served by /api/health/metrics
+      requests: requestSummary()
     };
 
     return NextResponse.json(healthData, { status: 200 });
@@ -32,4 +43,4 @@ export async function GET() {
       { status: 503 }
     );
   }
-}
+});
@@ -0,0 +1,17 @@
+import { NextResponse } from 'next/server';
+import { getJob } from '@/lib/jobs/simulation-queue';
+import { withMetrics } from '@/lib/metrics/route';
+
+// Status of a simulation job: queued (with its queue position), running,
+// done (with the match summary) or failed (with the error)
+export const GET = withMetrics(async function GET(request, { params }) {
+  const job = getJob(params.id);
+
+  if (!job) {
+    return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+  }
+
+  return NextResponse.json(job, {
+    headers: { 'Cache-Control': 'no-store' }
+  });
+}, 'GET /api/jobs/:id');
@@ -0,0 +1,11 @@
+import { NextResponse } from 'next/server';
+import { queueMetrics } from '@/lib/jobs/simulation-queue';
+import { withMetrics } from '@/lib/metrics/route';
+
+// Simulation queue metrics: depth, jobs running, job counts and wait/run time
+// percentiles
+export const GET = withMetrics(async function GET() {
+  return NextResponse.json(queueMetrics(), {
+    headers: { 'Cache-Control': 'no-store' }
+  });
+});
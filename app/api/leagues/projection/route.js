@@ -0,0 +1,119 @@
+import { NextResponse } from 'next/server';
+import { supabaseAdmin } from '@/lib/supabase/client';
+import { calculateLeagueStandings } from '@/lib/league/standings';
+import { loadPlayingXIs } from '@/lib/simulation/squads';
+import { projectSeason } from '@/lib/simulation/projection';
+import { hashString } from '@/lib/simulation/random';
+import { withMetrics } from '@/lib/metrics/route';
+import { recordSimulation } from '@/lib/supabase/query-stats';
+
+const CACHE_TTL_MS = 5 * 60 * 1000;
+const MAX_CACHED_PROJECTIONS = 50;
+const MAX_CACHED_FIXTURES = 5000;
+
+// Projections keyed on the set of completed matches, and simulated fixture
+// outcomes keyed on the two playing XIs, shared across requests
+const projectionCache = new Map();
+const fixtureCache = new Map();
+
+function evictOldest(cache, maxSize) {
+  while (cache.size > maxSize) {
+    cache.delete(cache.keys().next().value);
+  }
+}
+
+export const GET = withMetrics(async function GET(request) {
+  try {
+    const startedAt = Date.now();
+    const { searchParams } = new URL(request.url);
+    const leagueId = searchParams.get('leagueId') || 'default';
+    const simulations = Math.min(Math.max(parseInt(searchParams.get('simulations')) || 2000, 100), 10000);
+    let season = searchParams.get('season');
+
+    if (!season) {
+      const { data: activeSeason, error: seasonError } = await supabaseAdmin
+        .from('league_seasons')
+        .select('season')
+        .eq('league_id', leagueId)
+        .eq('status', 'active')
+        .single();
+
+      if (seasonError && seasonError.code !== 'PGRST116') throw seasonError;
+
+      if (!activeSeason) {
+        return NextResponse.json(
+          { error: 'No active season found' },
+          { status: 404 }
+        );
+      }
+      season = activeSeason.season;
+    }
+
+    const seed = searchParams.has('seed')
+      ? parseInt(searchParams.get('seed')) >>> 0
+      : hashString(`${leagueId}:${season}`);
+
+    const { data: seasonMatches, error: matchesError } = await supabaseAdmin
+      .from('matches')
+      .select('id, home_team_id, away_team_id, status, home_score, away_score, home_overs, away_overs, result, round, match_number, weather, pitch_type')
+      .eq('league', leagueId)
+      .eq('season', season);
+
+    if (matchesError) throw matchesError;
+
+    const completedMatches = seasonMatches.filter(m => m.status === 'completed');
+    const remainingMatches = seasonMatches
+      .filter(m => m.status === 'scheduled')
+      .sort((a, b) => (a.round - b.round) || (a.match_number - b.match_number));
+
+    const completedKey = hashString(completedMatches.map(m => m.id).sort().join(','));
+    const cacheKey = `${leagueId}:${season}:${simulations}:${seed}:${completedKey}:${remainingMatches.length}`;
+    const cached = projectionCache.get(cacheKey);
+
+    if (cached && Date.now() - cached.createdAt < CACHE_TTL_MS) {
+      return NextResponse.json({ ...cached.projection, cached: true, elapsedMs: Date.now() - startedAt });
+    }
+
+    const { data: teams, error: teamsError } = await supabaseAdmin
+      .from('users')
+      .select('id, team_name');
+
+    if (teamsError) throw teamsError;
+
+    const standings = calculateLeagueStandings(teams, completedMatches);
+    const squads = await loadPlayingXIs(remainingMatches.flatMap(m => [m.home_team_id, m.away_team_id]));
+
+    const simulateStart = performance.now();
+    const projected = projectSeason({
+      standings,
+      fixtures: remainingMatches,
+      squads,
+      simulations,
+      seed,
+      fixtureCache
+    });
+    recordSimulation(performance.now() - simulateStart);
+
+    const projection = {
+      leagueId,
+      season,
+      completedMatches: completedMatches.length,
+      remainingMatches: remainingMatches.length,
+      ...projected,
+      generatedAt: new Date().toISOString()
+    };
+
+    projectionCache.set(cacheKey, { projection, createdAt: Date.now() });
+    evictOldest(projectionCache, MAX_CACHED_PROJECTIONS);
+    evictOldest(fixtureCache, MAX_CACHED_FIXTURES);
+
+    return NextResponse.json({ ...projection, cached: false, elapsedMs: Date.now() - startedAt });
+
+  } catch (error) {
+    console.error('Error projecting season:', error);
+    return NextResponse.json(
+      { error: 'Failed to project season' },
+      { status: 500 }
+    );
+  }
+});
@@ -1,10 +1,7 @@
-import { createClient } from '@supabase/supabase-js';
+import { supabaseAdmin as supabase } from '@/lib/supabase/client';
+import { withMetrics } from '@/lib/metrics/route';
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
-const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
-
-export async function GET(request, { params }) {
+export const GET = withMetrics(async function GET(request, { params }) {
   try {
     const { id } = params;
 
@@ -28,9 +25,9 @@ export async function GET(request, { params }) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+}, 'GET /api/lineups/:id');
 
-export async function PUT(request, { params }) {
+export const PUT = withMetrics(async function PUT(request, { params }) {
   try {
     const { id } = params;
     const body = await request.json();
@@ -90,9 +87,9 @@ export async function PUT(request, { params }) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+}, 'PUT /api/lineups/:id');
 
-export async function DELETE(request, { params }) {
+export const DELETE = withMetrics(async function DELETE(request, { params }) {
   try {
     const { id } = params;
 
@@ -132,4 +129,4 @@ export async function DELETE(request, { params }) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+}, 'DELETE /api/lineups/:id');
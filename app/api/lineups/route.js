@@ -1,11 +1,8 @@
-import { createClient } from '@supabase/supabase-js';
+import { supabaseAdmin as supabase } from '@/lib/supabase/client';
 import { randomUUID } from 'crypto';
+import { withMetrics } from '@/lib/metrics/route';
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
-const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
-
-export async function GET(request) {
+export const GET = withMetrics(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url);
     const userId = searchParams.get('userId');
@@ -30,9 +27,9 @@ export async function GET(request) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+});
 
-export async function POST(request) {
+export const POST = withMetrics(async function POST(request) {
   try {
     const body = await request.json();
     const { name, players, captain_id, wicketkeeper_id, first_bowler_id, second_bowler_id, is_main, user_id } = body;
@@ -82,4 +79,4 @@ export async function POST(request) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+});
@@ -1,10 +1,8 @@
-import { createClient } from '@supabase/supabase-js';
+import { supabaseAdmin as supabase } from '@/lib/supabase/client';
+import { parseSearch, searchMarketplace } from '@/lib/marketplace/search';
+import { withMetrics } from '@/lib/metrics/route';
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
-const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
-
-export async function POST(request) {
+export const POST = withMetrics(async function POST(request) {
   try {
     const body = await request.json();
     const { player_id, sale_price } = body;
@@ -49,24 +47,18 @@ export async function POST(request) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+});
 
-export async function GET(request) {
+export const GET = withMetrics(async function GET(request) {
   try {
-    const { data: players, error } = await supabase
-      .from('players')
-      .select('*')
-      .eq('is_for_sale', true)
-      .order('rating', { ascending: false });
-
-    if (error) {
-      console.error('Error fetching players for sale:', error);
-      return Response.json({ error: 'Failed to fetch players for sale' }, { status: 500 });
+    const { search, error: searchError } = parseSearch(new URL(request.url).searchParams);
+    if (searchError) {
+      return Response.json({ error: searchError }, { status: 400 });
     }
 
-    return Response.json(players);
+    return Response.json(await searchMarketplace(search));
   } catch (error) {
-    console.error('Error:', error);
-    return Response.json({ error: 'Internal server error' }, { status: 500 });
+    console.error('Error fetching players for sale:', error);
+    return Response.json({ error: 'Failed to fetch players for sale' }, { status: 500 });
   }
-}
+});
@@ -1,7 +1,9 @@
 import { NextResponse } from 'next/server';
 import { supabaseAdmin } from '@/lib/supabase/client';
+import { getTeams } from '@/lib/league/team-directory';
+import { withMetrics } from '@/lib/metrics/route';
 
-export async function GET(request) {
+export const GET = withMetrics(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url);
     const userId = searchParams.get('userId');
@@ -44,17 +46,9 @@ export async function GET(request) {
       // There's a match currently in progress
       const isUserInvolved = currentMatch.home_team_id === userId || currentMatch.away_team_id === userId;
 
-      const { data: homeTeam } = await supabaseAdmin
-        .from('users')
-        .select('team_name')
-        .eq('id', currentMatch.home_team_id)
-        .single();
-
-      const { data: awayTeam } = await supabaseAdmin
-        .from('users')
-        .select('team_name')
-        .eq('id', currentMatch.away_team_id)
-        .single();
+      const teams = await getTeams([currentMatch.home_team_id, currentMatch.away_team_id]);
+      const homeTeam = teams.get(currentMatch.home_team_id);
+      const awayTeam = teams.get(currentMatch.away_team_id);
 
       return NextResponse.json({
         status: 'match_in_progress',
@@ -83,17 +77,9 @@ export async function GET(request) {
     if (nextMatch && !nextMatchError) {
       const isUserInvolved = nextMatch.home_team_id === userId || nextMatch.away_team_id === userId;
 
-      const { data: homeTeam } = await supabaseAdmin
-        .from('users')
-        .select('team_name')
-        .eq('id', nextMatch.home_team_id)
-        .single();
-
-      const { data: awayTeam } = await supabaseAdmin
-        .from('users')
-        .select('team_name')
-        .eq('id', nextMatch.away_team_id)
-        .single();
+      const teams = await getTeams([nextMatch.home_team_id, nextMatch.away_team_id]);
+      const homeTeam = teams.get(nextMatch.home_team_id);
+      const awayTeam = teams.get(nextMatch.away_team_id);
 
       // Check if previous matches are completed in the current season
       const { count: previousMatches, error: countError } = await supabaseAdmin
@@ -155,4 +141,4 @@ export async function GET(request) {
       { status: 500 }
     );
   }
-}
+});
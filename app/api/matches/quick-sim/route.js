@@ -1,9 +1,26 @@
 import { NextResponse } from 'next/server';
 import { supabaseAdmin } from '@/lib/supabase/client';
-
-export async function POST(request) {
+import { getTeams } from '@/lib/league/team-directory';
+import { applyCompletedMatches } from '@/lib/league/standings-store';
+import { sortLeagueTable, toLeagueTableEntry } from '@/lib/league/standings';
+import { withMetrics } from '@/lib/metrics/route';
+import { recordSimulation } from '@/lib/supabase/query-stats';
+import { claimMatches, releaseMatches } from '@/lib/jobs/simulation-queue';
+import { fastForwardSeason } from '@/lib/league/fast-forward';
+
+const DEFAULT_BATCH_LIMIT = 5;
+const MAX_BATCH_LIMIT = 500;
+// Matches scored between yields to the event loop
+const SIMULATION_SLICE = 50;
+
+export const POST = withMetrics(async function POST(request) {
   try {
-    const { userId } = await request.json();
+    const body = await request.json();
+    if (body.mode === 'fast-forward') {
+      return await fastForward(request, body);
+    }
+
+    const { userId, limit } = body;
 
     if (!userId) {
       return NextResponse.json(
@@ -12,118 +29,196 @@ export async function POST(request) {
       );
     }
 
+    const batchLimit = Math.min(Math.max(parseInt(limit) || DEFAULT_BATCH_LIMIT, 1), MAX_BATCH_LIMIT);
+
     // Get all scheduled matches that are ready to be simulated
     const { data: scheduledMatches, error: matchesError } = await supabaseAdmin
       .from('matches')
       .select('*')
       .eq('status', 'scheduled')
       .order('scheduled_time', { ascending: true })
-      .limit(5); // Simulate up to 5 matches at once
+      .limit(batchLimit);
 
     if (matchesError) throw matchesError;
 
-    if (!scheduledMatches || scheduledMatches.length === 0) {
+    // Skip matches another request is simulating (a queued simulation job,
+    // a live start or an overlapping quick-sim)
+    const claimed = claimMatches((scheduledMatches || []).map(match => match.id));
+    if (claimed.length === 0) {
       return NextResponse.json(
         { error: 'No scheduled matches available for simulation' },
         { status: 400 }
       );
     }
 
-    const simulatedResults = [];
-    let simulatedCount = 0;
+    try {
+      return await simulateBatch(scheduledMatches.filter(match => claimed.includes(match.id)));
+    } finally {
+      releaseMatches(claimed);
+    }
+
+  } catch (error) {
+    console.error('Error in quick simulation:', error);
+    return NextResponse.json(
+      { error: 'Failed to perform quick simulation' },
+      { status: 500 }
+    );
+  }
+});
+
+// Fast-forward a season: { mode: 'fast-forward', leagueId, season, throughRound }
+// simulates every remaining match of the season (the active one by default),
+// or those up to `throughRound`. With `Accept: application/x-ndjson` progress
+// lines are streamed while it runs and the last line is the result.
+async function fastForward(request, { leagueId = 'default', season = null, throughRound = null }) {
+  let seasonQuery = supabaseAdmin
+    .from('league_seasons')
+    .select('id, league_id, season, status')
+    .eq('league_id', leagueId);
+
+  seasonQuery = season === null ? seasonQuery.eq('status', 'active') : seasonQuery.eq('season', String(season));
+
+  const { data: seasonRow, error } = await seasonQuery.maybeSingle();
+  if (error) throw error;
+
+  if (!seasonRow) {
+    return NextResponse.json(
+      { error: season === null ? 'No active season to fast-forward' : 'Season not found' },
+      { status: 404 }
+    );
+  }
+
+  if (seasonRow.status === 'completed') {
+    return NextResponse.json({ error: 'Season already completed' }, { status: 400 });
+  }
+
+  const options = { throughRound: throughRound === null ? null : parseInt(throughRound) };
+
+  if (!(request.headers.get('Accept') || '').includes('application/x-ndjson')) {
+    const result = await fastForwardSeason(seasonRow, options);
+    return NextResponse.json({
+      message: `Fast-forwarded ${result.simulated} matches`,
+      ...result
+    });
+  }
 
-    // Simulate each match
-    for (const match of scheduledMatches) {
+  const encoder = new TextEncoder();
+  const stream = new ReadableStream({
+    async start(controller) {
+      const send = (line) => controller.enqueue(encoder.encode(`${JSON.stringify(line)}\n`));
       try {
-        const result = await simulateMatch(match);
-        simulatedResults.push(result);
-        simulatedCount++;
+        const result = await fastForwardSeason(seasonRow, { ...options, onProgress: send });
+        send({ phase: 'result', ...result });
       } catch (error) {
-        console.error(`Error simulating match ${match.id}:`, error);
-        // Continue with other matches even if one fails
+        console.error('Error fast-forwarding season:', error);
+        send({ phase: 'error', error: 'Failed to fast-forward season' });
       }
+      controller.close();
     }
+  });
 
-    if (simulatedCount === 0) {
-      return NextResponse.json(
-        { error: 'Failed to simulate any matches' },
-        { status: 500 }
-      );
-    }
+  return new NextResponse(stream, {
+    headers: { 'Content-Type': 'application/x-ndjson; charset=utf-8', 'Cache-Control': 'no-store' }
+  });
+}
 
-    // Update league table if we have simulated matches
-    if (simulatedResults.length > 0) {
-      await updateLeagueTable();
+// Simulate a batch of claimed matches, store the results and update standings
+async function simulateBatch(scheduledMatches) {
+  // One query per table for every team in the batch
+  const teamIds = [...new Set(scheduledMatches.flatMap(m => [m.home_team_id, m.away_team_id]))];
+  const { teamsById, lineupPlayersByTeam } = await prefetchTeams(teamIds);
+
+  // Score the matches one after another (simulateMatch is synchronous), in
+  // slices with a turn of the event loop between them so a large batch does
+  // not hold up other requests for its whole run
+  const simulated = [];
+  let simulateMs = 0;
+  for (let start = 0; start < scheduledMatches.length; start += SIMULATION_SLICE) {
+    if (start > 0) await new Promise(resolve => setImmediate(resolve));
+    const sliceStart = performance.now();
+    for (const match of scheduledMatches.slice(start, start + SIMULATION_SLICE)) {
+      try {
+        simulated.push(simulateMatch(match, teamsById, lineupPlayersByTeam));
+      } catch (error) {
+        console.error(`Error simulating match ${match.id}:`, error);
+        // Continue with other matches even if one fails
+      }
     }
+    simulateMs += performance.now() - sliceStart;
+  }
 
-    return NextResponse.json({
-      message: `Successfully simulated ${simulatedCount} matches`,
-      simulated: simulatedCount,
-      results: simulatedResults
-    });
+  recordSimulation(simulateMs);
 
-  } catch (error) {
-    console.error('Error in quick simulation:', error);
+  if (simulated.length === 0) {
     return NextResponse.json(
-      { error: 'Failed to perform quick simulation' },
+      { error: 'Failed to simulate any matches' },
       { status: 500 }
     );
   }
+
+  // Write every result back in a single bulk upsert
+  const { error: upsertError } = await supabaseAdmin
+    .from('matches')
+    .upsert(simulated.map(outcome => outcome.row), { onConflict: 'id' });
+
+  if (upsertError) throw upsertError;
+
+  // Apply the batch to the league standings of the teams that just played
+  const standingsRows = await applyCompletedMatches(simulated.map(outcome => outcome.row));
+  const standings = sortLeagueTable(standingsRows.map(row => toLeagueTableEntry(row, teamsById.get(row.team_id)?.team_name)));
+
+  return NextResponse.json({
+    message: `Successfully simulated ${simulated.length} matches`,
+    simulated: simulated.length,
+    results: simulated.map(outcome => outcome.result),
+    standings
+  });
 }
 
-async function simulateMatch(match) {
-  // Get team information
-  const { data: homeTeam, error: homeTeamError } = await supabaseAdmin
-    .from('users')
-    .select('team_name, country')
-    .eq('id', match.home_team_id)
-    .single();
-
-  const { data: awayTeam, error: awayTeamError } = await supabaseAdmin
-    .from('users')
-    .select('team_name, country')
-    .eq('id', match.away_team_id)
-    .single();
-
-  if (homeTeamError || awayTeamError) {
-    throw new Error('Could not find team information');
+// Fetch teams (through the team directory), main lineups and lineup players
+// for all teams with one `in(...)` query per table
+async function prefetchTeams(teamIds) {
+  const [teamsById, lineupsResult, playersResult] = await Promise.all([
+    getTeams(teamIds),
+    supabaseAdmin
+      .from('lineups')
+      .select('user_id, players')
+      .in('user_id', teamIds)
+      .eq('is_main', true),
+    supabaseAdmin
+      .from('players')
+      .select('id, user_id, name, batting, bowling, power, technique')
+      .in('user_id', teamIds)
+  ]);
+
+  if (lineupsResult.error) throw lineupsResult.error;
+  if (playersResult.error) throw playersResult.error;
+
+  const lineupsByTeam = new Map();
+  for (const lineup of lineupsResult.data) {
+    if (!lineupsByTeam.has(lineup.user_id)) lineupsByTeam.set(lineup.user_id, lineup);
   }
 
-  // Get lineups for both teams
-  const { data: homeLineup, error: homeLineupError } = await supabaseAdmin
-    .from('lineups')
-    .select('*')
-    .eq('user_id', match.home_team_id)
-    .eq('is_main', true)
-    .single();
-
-  const { data: awayLineup, error: awayLineupError } = await supabaseAdmin
-    .from('lineups')
-    .select('*')
-    .eq('user_id', match.away_team_id)
-    .eq('is_main', true)
-    .single();
-
-  // Get players for home team
-  let homePlayers = [];
-  if (homeLineup) {
-    const { data: players, error: playersError } = await supabaseAdmin
-      .from('players')
-      .select('*')
-      .in('id', homeLineup.players || []);
-    homePlayers = players || [];
+  const playersById = new Map(playersResult.data.map(player => [player.id, player]));
+  const lineupPlayersByTeam = new Map();
+  for (const [teamId, lineup] of lineupsByTeam) {
+    lineupPlayersByTeam.set(teamId, (lineup.players || []).map(id => playersById.get(id)).filter(Boolean));
   }
 
-  // Get players for away team
-  let awayPlayers = [];
-  if (awayLineup) {
-    const { data: players, error: playersError } = await supabaseAdmin
-      .from('players')
-      .select('*')
-      .in('id', awayLineup.players || []);
-    awayPlayers = players || [];
+  return { teamsById, lineupPlayersByTeam };
+}
+
+function simulateMatch(match, teamsById, lineupPlayersByTeam) {
+  const homeTeam = teamsById.get(match.home_team_id);
+  const awayTeam = teamsById.get(match.away_team_id);
+
+  if (!homeTeam || !awayTeam) {
+    throw new Error('Could not find team information');
   }
 
+  const homePlayers = lineupPlayersByTeam.get(match.home_team_id) || [];
+  const awayPlayers = lineupPlayersByTeam.get(match.away_team_id) || [];
+
   // Generate scores based on team strength and player attributes
   const homeScore = generateTeamScore(homePlayers, 'home');
   const awayScore = generateTeamScore(awayPlayers, 'away');
@@ -148,198 +243,81 @@ async function simulateMatch(match) {
     winType = 'tie';
   }
 
-  // Update match in database
-  const { error: updateError } = await supabaseAdmin
-    .from('matches')
-    .update({
-      status: 'completed',
-      home_score: homeScore,
-      away_score: awayScore,
-      home_wickets: Math.floor(Math.random() * 10),
-      away_wickets: Math.floor(Math.random() * 10),
-      home_overs: 20,
-      away_overs: 20,
-      result: {
-        winner: winner,
-        homeScore: homeScore,
-        awayScore: awayScore,
-        result: result,
-        winMargin: winMargin,
-        winType: winType
-      },
-      win_margin: winMargin,
-      win_type: winType,
-      match_data: {
-        homeScore: homeScore,
-        awayScore: awayScore,
-        winner: winner,
-        result: result,
-        completedAt: new Date().toISOString()
-      }
-    })
-    .eq('id', match.id);
-
-  if (updateError) throw updateError;
-
-  return {
-    matchId: match.id,
-    homeTeam: {
-      id: match.home_team_id,
-      name: homeTeam.team_name,
-      country: homeTeam.country
-    },
-    awayTeam: {
-      id: match.away_team_id,
-      name: awayTeam.team_name,
-      country: awayTeam.country
+  // Full row for the bulk upsert
+  const row = {
+    ...match,
+    status: 'completed',
+    home_score: homeScore,
+    away_score: awayScore,
+    home_wickets: Math.floor(Math.random() * 10),
+    away_wickets: Math.floor(Math.random() * 10),
+    home_overs: 20,
+    away_overs: 20,
+    result: {
+      winner: winner,
+      homeScore: homeScore,
+      awayScore: awayScore,
+      result: result,
+      winMargin: winMargin,
+      winType: winType
     },
-    homeScore: homeScore,
-    awayScore: awayScore,
-    homeOvers: 20,
-    awayOvers: 20,
-    winner: winner,
-    winMargin: winMargin,
-    winType: winType,
-    target: null,
-    firstInnings: {
-      runs: homeScore,
-      wickets: Math.floor(Math.random() * 10),
-      overs: 20,
-      batsmanScores: generateBatsmanScores(homeScore, homePlayers),
-      bowlingFigures: generateBowlingFigures(homeScore, awayPlayers),
-      fallOfWickets: generateFallOfWickets(homeScore)
+    win_margin: winMargin,
+    win_type: winType,
+    match_data: {
+      homeScore: homeScore,
+      awayScore: awayScore,
+      winner: winner,
+      result: result,
+      completedAt: new Date().toISOString()
     },
-    secondInnings: {
-      runs: awayScore,
-      wickets: Math.floor(Math.random() * 10),
-      overs: 20,
-      batsmanScores: generateBatsmanScores(awayScore, awayPlayers),
-      bowlingFigures: generateBowlingFigures(awayScore, homePlayers),
-      fallOfWickets: generateFallOfWickets(awayScore)
-    },
-    matchConditions: {
-      weather: match.weather || 'Sunny',
-      pitchType: match.pitch_type || 'Normal'
-    },
-    commentary: generateCommentary(homeScore, awayScore, homeTeam.team_name, awayTeam.team_name)
+    updated_at: new Date().toISOString()
   };
-}
 
-async function updateLeagueTable() {
-  try {
-    // Get all completed matches
-    const { data: completedMatches, error: matchesError } = await supabaseAdmin
-      .from('matches')
-      .select('*')
-      .eq('status', 'completed')
-      .eq('league', 'default');
-
-    if (matchesError) throw matchesError;
-
-    // Get all teams
-    const { data: teams, error: teamsError } = await supabaseAdmin
-      .from('users')
-      .select('id, team_name');
-
-    if (teamsError) throw teamsError;
-
-    // Calculate league standings
-    const standings = {};
-
-    // Initialize standings for all teams
-    teams.forEach(team => {
-      standings[team.team_name] = {
-        id: team.id,
-        name: team.team_name,
-        played: 0,
-        won: 0,
-        lost: 0,
-        tied: 0,
-        points: 0,
-        netRunRate: 0,
-        totalRunsScored: 0,
-        totalRunsConceded: 0,
-        highestScore: 0,
-        lowestScore: 999,
-        averageScore: 0,
-        form: []
-      };
-    });
-
-    completedMatches.forEach(match => {
-      // Get team names from IDs
-      const homeTeam = teams.find(t => t.id === match.home_team_id);
-      const awayTeam = teams.find(t => t.id === match.away_team_id);
-
-      if (!homeTeam || !awayTeam) return; // Skip if team data is missing
-
-      const homeTeamName = homeTeam.team_name;
-      const awayTeamName = awayTeam.team_name;
-
-      // Update match statistics
-      standings[homeTeamName].played++;
-      standings[awayTeamName].played++;
-
-      standings[homeTeamName].totalRunsScored += match.home_score;
-      standings[homeTeamName].totalRunsConceded += match.away_score;
-      standings[awayTeamName].totalRunsScored += match.away_score;
-      standings[awayTeamName].totalRunsConceded += match.home_score;
-
-      // Update highest/lowest scores
-      standings[homeTeamName].highestScore = Math.max(standings[homeTeamName].highestScore, match.home_score);
-      standings[homeTeamName].lowestScore = Math.min(standings[homeTeamName].lowestScore, match.home_score);
-      standings[awayTeamName].highestScore = Math.max(standings[awayTeamName].highestScore, match.away_score);
-      standings[awayTeamName].lowestScore = Math.min(standings[awayTeamName].lowestScore, match.away_score);
-
-      // Determine winner and update form
-      if (match.home_score > match.away_score) {
-        standings[homeTeamName].won++;
-        standings[awayTeamName].lost++;
-        standings[homeTeamName].points += 2;
-        standings[homeTeamName].form.push('W');
-        standings[awayTeamName].form.push('L');
-      } else if (match.away_score > match.home_score) {
-        standings[awayTeamName].won++;
-        standings[homeTeamName].lost++;
-        standings[awayTeamName].points += 2;
-        standings[homeTeamName].form.push('L');
-        standings[awayTeamName].form.push('W');
-      } else {
-        standings[homeTeamName].tied++;
-        standings[awayTeamName].tied++;
-        standings[homeTeamName].points += 1;
-        standings[awayTeamName].points += 1;
-        standings[homeTeamName].form.push('T');
-        standings[awayTeamName].form.push('T');
-      }
-    });
-
-    // Calculate net run rates and averages
-    Object.values(standings).forEach(team => {
-      const runsScored = team.totalRunsScored;
-      const runsConceded = team.totalRunsConceded;
-      const ballsFaced = team.played * 120; // Assuming 20 overs = 120 balls
-      const ballsBowled = team.played * 120;
-
-      team.netRunRate = runsConceded > 0 ? ((runsScored / ballsFaced) - (runsConceded / ballsBowled)) * 6 : 0;
-      team.averageScore = team.played > 0 ? runsScored / team.played : 0;
-
-      // Keep only last 5 form results
-      team.form = team.form.slice(-5);
-    });
-
-    // Convert to array and sort by points, then net run rate
-    const leagueTable = Object.values(standings).sort((a, b) => {
-      if (b.points !== a.points) return b.points - a.points;
-      return b.netRunRate - a.netRunRate;
-    });
-
-    return leagueTable;
-
-  } catch (error) {
-    console.error('Error updating league table:', error);
-    throw error;
-  }
+  return {
+    row,
+    result: {
+      matchId: match.id,
+      homeTeam: {
+        id: match.home_team_id,
+        name: homeTeam.team_name,
+        country: homeTeam.country
+      },
+      awayTeam: {
+        id: match.away_team_id,
+        name: awayTeam.team_name,
+        country: awayTeam.country
+      },
+      homeScore: homeScore,
+      awayScore: awayScore,
+      homeOvers: 20,
+      awayOvers: 20,
+      winner: winner,
+      winMargin: winMargin,
+      winType: winType,
+      target: null,
+      firstInnings: {
+        runs: homeScore,
+        wickets: Math.floor(Math.random() * 10),
+        overs: 20,
+        batsmanScores: generateBatsmanScores(homeScore, homePlayers),
+        bowlingFigures: generateBowlingFigures(homeScore, awayPlayers),
+        fallOfWickets: generateFallOfWickets(homeScore)
+      },
+      secondInnings: {
+        runs: awayScore,
+        wickets: Math.floor(Math.random() * 10),
+        overs: 20,
+        batsmanScores: generateBatsmanScores(awayScore, awayPlayers),
+        bowlingFigures: generateBowlingFigures(awayScore, homePlayers),
+        fallOfWickets: generateFallOfWickets(awayScore)
+      },
+      matchConditions: {
+        weather: match.weather || 'Sunny',
+        pitchType: match.pitch_type || 'Normal'
+      },
+      commentary: generateCommentary(homeScore, awayScore, homeTeam.team_name, awayTeam.team_name)
+    }
+  };
 }
 
 // Helper functions to generate detailed match data
@@ -1,13 +1,27 @@
 import { NextResponse } from 'next/server';
 import { supabaseAdmin } from '@/lib/supabase/client';
+import { initializeStandings } from '@/lib/league/standings-store';
+import { freezeSeason } from '@/lib/league/season-snapshots';
+import { insertFixtures, seasonFixtures } from '@/lib/league/fixtures';
+import { withMetrics } from '@/lib/metrics/route';
 
-export async function POST(request) {
+export const POST = withMetrics(async function POST(request) {
   try {
-    const { leagueId = 'default' } = await request.json();
+    const { leagueId = 'default', season = null, divisions = false } = await request.json();
+
+    if (divisions) {
+      if (season === null) {
+        return NextResponse.json(
+          { error: 'A season is required to schedule divisions' },
+          { status: 400 }
+        );
+      }
+      return await scheduleDivisions(String(season));
+    }
 
     const { data: teams, error: teamsError } = await supabaseAdmin
       .from('users')
-      .select('*');
+      .select('id');
 
     if (teamsError) throw teamsError;
 
@@ -47,6 +61,9 @@ export async function POST(request) {
           .eq('id', activeSeason.id);
 
         if (updateError) throw updateError;
+
+        // The season is final now: freeze its history snapshot
+        await freezeSeason(leagueId, activeSeason.season);
       } else {
         return NextResponse.json(
           { error: 'Cannot start new season while current season has pending matches' },
@@ -84,142 +101,15 @@ export async function POST(request) {
 
     if (insertSeasonError) throw insertSeasonError;
 
-    // Check if there are any scheduled matches for this season
-    const { data: existingScheduledMatches, error: existingMatchesError } = await supabaseAdmin
-      .from('matches')
-      .select('*')
-      .eq('league', leagueId)
-      .eq('season', currentSeason)
-      .eq('status', 'scheduled');
-
-    if (existingMatchesError) throw existingMatchesError;
-
-    let matchesToCreate = [];
-
-    if (!existingScheduledMatches || existingScheduledMatches.length === 0) {
-      // No scheduled matches, create ALL rounds for the full season
-      const fixtures = generateRoundRobinFixtures(teams);
-
-      // Schedule ALL rounds at once for complete season visibility
-      let matchNumber = 1;
-
-      for (const round of fixtures) {
-        for (const fixture of round) {
-          const matchId = `match_${leagueId}_${currentSeason}_${matchNumber}`;
-          const match = {
-            id: matchId,
-            home_team_id: fixture.home.id,
-            away_team_id: fixture.away.id,
-            league: leagueId,
-            season: currentSeason,
-            match_type: 'T20',
-            scheduled_time: new Date(Date.now() + (matchNumber * 24 * 60 * 60 * 1000)), // Space matches 1 day apart
-            pitch_type: 'Normal',
-            weather: 'Sunny',
-            status: 'scheduled',
-            home_score: 0,
-            away_score: 0,
-            home_wickets: 0,
-            away_wickets: 0,
-            home_overs: 0,
-            away_overs: 0,
-            result: null,
-            win_margin: null,
-            win_type: null,
-            target: null,
-            commentary: [],
-            current_innings: null,
-            current_over: 0,
-            current_ball: 0,
-            current_runs: 0,
-            current_wickets: 0,
-            live_commentary: [],
-            match_data: null,
-            created_at: new Date(),
-            round: fixture.round,
-            match_number: matchNumber
-          };
-
-          matchesToCreate.push(match);
-          matchNumber++;
-        }
-      }
-    } else {
-      // Check if current round is complete, if so, schedule next round
-      const currentRound = Math.max(...existingScheduledMatches.map(m => m.round));
-
-      const { data: currentRoundMatches, error: currentRoundError } = await supabaseAdmin
-        .from('matches')
-        .select('*')
-        .eq('league', leagueId)
-        .eq('season', currentSeason)
-        .eq('round', currentRound);
-
-      if (currentRoundError) throw currentRoundError;
-
-      const completedMatches = currentRoundMatches ? currentRoundMatches.filter(m => m.status === 'completed').length : 0;
-      const totalCurrentRoundMatches = currentRoundMatches ? currentRoundMatches.length : 0;
-
-      if (completedMatches === totalCurrentRoundMatches) {
-        // Current round is complete, schedule next round
-        const fixtures = generateRoundRobinFixtures(teams);
-        const nextRoundIndex = currentRound; // fixtures is 0-indexed, round is 1-indexed
-
-        if (nextRoundIndex < fixtures.length) {
-          const nextRound = fixtures[nextRoundIndex];
-          let matchNumber = existingScheduledMatches.length + 1;
-
-          for (const fixture of nextRound) {
-            const matchId = `match_${leagueId}_${currentSeason}_${matchNumber}`;
-            const match = {
-              id: matchId,
-              home_team_id: fixture.home.id,
-              away_team_id: fixture.away.id,
-              league: leagueId,
-              season: currentSeason,
-              match_type: 'T20',
-              scheduled_time: new Date(Date.now() + (matchNumber * 24 * 60 * 60 * 1000)).toISOString(),
-              pitch_type: 'Normal',
-              weather: 'Sunny',
-              status: 'scheduled',
-              home_score: 0,
-              away_score: 0,
-              home_wickets: 0,
-              away_wickets: 0,
-              home_overs: 0,
-              away_overs: 0,
-              result: null,
-              win_margin: null,
-              win_type: null,
-              target: null,
-              commentary: [],
-              current_innings: null,
-              current_over: 0,
-              current_ball: 0,
-              current_runs: 0,
-              current_wickets: 0,
-              live_commentary: [],
-              match_data: null,
-              created_at: new Date().toISOString(),
-              round: fixture.round,
-              match_number: matchNumber
-            };
-
-            matchesToCreate.push(match);
-            matchNumber++;
-          }
-        }
-      }
-    }
+    // Every team starts the season on the table with an all-zero row
+    await initializeStandings(leagueId, currentSeason, newSeason.teams);
 
-    if (matchesToCreate.length > 0) {
-      // Insert new matches
-      const { error: insertMatchesError } = await supabaseAdmin
-        .from('matches')
-        .insert(matchesToCreate);
+    // Stream the whole season's fixtures into chunked bulk inserts
+    const fixtures = await insertFixtures(
+      seasonFixtures([{ id: leagueId, teamIds: newSeason.teams }], currentSeason)
+    );
 
-      if (insertMatchesError) throw insertMatchesError;
-    } else {
+    if (fixtures.inserted === 0) {
       return NextResponse.json(
         { error: 'No new matches to schedule at this time' },
         { status: 400 }
@@ -227,8 +117,10 @@ export async function POST(request) {
     }
 
     return NextResponse.json({
-      message: `Scheduled ${matchesToCreate.length} matches for ${teams.length} teams`,
-      totalMatches: matchesToCreate.length,
+      message: `Scheduled ${fixtures.inserted} matches for ${teams.length} teams`,
+      totalMatches: fixtures.inserted,
+      chunks: fixtures.chunks,
+      retries: fixtures.retries,
       season: currentSeason,
       teamsCount: teams.length
     });
@@ -240,66 +132,121 @@ export async function POST(request) {
       { status: 500 }
     );
   }
-}
+});
+
+// Players read per query when resolving team owners
+const OWNER_LOOKUP_CHUNK = 500;
+
+// Owning user of each `teams` row, as a Map of team id to user id: the owner
+// of the team's first listed player. Matches, squads, standings and the team
+// directory are all keyed by user ids, so fixtures are scheduled between
+// owners; teams without a listed player that exists have none.
+async function teamOwners(teams) {
+  const firstPlayers = new Map();
+  for (const team of teams) {
+    if (team.players?.length) firstPlayers.set(team.id, team.players[0]);
+  }
 
-// Generate double round-robin fixtures (each team plays every other team twice)
-function generateRoundRobinFixtures(teams) {
-  const fixtures = [];
-  const numTeams = teams.length;
-
-  // If odd number of teams, add a bye
-  const hasBye = numTeams % 2 !== 0;
-  const effectiveTeams = hasBye ? [...teams, { id: 'bye', team_name: 'Bye' }] : teams;
-  const numRounds = effectiveTeams.length - 1;
-
-  // First half: Standard round-robin
-  for (let round = 0; round < numRounds; round++) {
-    const roundFixtures = [];
-
-    for (let i = 0; i < effectiveTeams.length / 2; i++) {
-      const home = effectiveTeams[i];
-      const away = effectiveTeams[effectiveTeams.length - 1 - i];
-
-      if (home.id !== 'bye' && away.id !== 'bye') {
-        roundFixtures.push({
-          home,
-          away,
-          round: round + 1
-        });
-      }
+  const playerIds = [...new Set(firstPlayers.values())];
+  const ownerOfPlayer = new Map();
+  for (let offset = 0; offset < playerIds.length; offset += OWNER_LOOKUP_CHUNK) {
+    const { data, error } = await supabaseAdmin
+      .from('players')
+      .select('id, user_id')
+      .in('id', playerIds.slice(offset, offset + OWNER_LOOKUP_CHUNK));
+
+    if (error) throw error;
+    for (const player of data) {
+      if (player.user_id) ownerOfPlayer.set(player.id, player.user_id);
     }
+  }
 
-    fixtures.push(roundFixtures);
-
-    // Rotate teams (keep first team fixed, rotate others)
-    const first = effectiveTeams.shift();
-    effectiveTeams.push(first);
+  const owners = new Map();
+  for (const [teamId, playerId] of firstPlayers) {
+    if (ownerOfPlayer.has(playerId)) owners.set(teamId, ownerOfPlayer.get(playerId));
   }
+  return owners;
+}
 
-  // Second half: Reverse fixtures (away becomes home)
-  for (let round = 0; round < numRounds; round++) {
-    const roundFixtures = [];
-
-    for (let i = 0; i < effectiveTeams.length / 2; i++) {
-      const home = effectiveTeams[i];
-      const away = effectiveTeams[effectiveTeams.length - 1 - i];
-
-      if (home.id !== 'bye' && away.id !== 'bye') {
-        // Swap home and away for reverse fixtures
-        roundFixtures.push({
-          home: away,
-          away: home,
-          round: round + numRounds + 1
-        });
-      }
-    }
+// Schedule every division of a season: each `leagues` row of the season that
+// is active or upcoming is a division whose teams are the active `teams` rows
+// of that league, played by their owning users. Each division gets its own
+// league_seasons row, standings and double round-robin, keyed by the
+// division's id. Rerunning it only adds what is missing, so an interrupted
+// schedule can simply be retried.
+async function scheduleDivisions(season) {
+  const { data: leagues, error: leaguesError } = await supabaseAdmin
+    .from('leagues')
+    .select('id, name')
+    .eq('season', season)
+    .in('status', ['active', 'upcoming']);
+
+  if (leaguesError) throw leaguesError;
+
+  const { data: teams, error: teamsError } = leagues.length === 0
+    ? { data: [], error: null }
+    : await supabaseAdmin
+      .from('teams')
+      .select('id, league, players')
+      .in('league', leagues.map(league => league.id))
+      .eq('status', 'active');
+
+  if (teamsError) throw teamsError;
+
+  const owners = await teamOwners(teams);
+  const teamsByLeague = new Map(leagues.map(league => [league.id, { teamIds: new Set(), unowned: 0 }]));
+  for (const team of teams) {
+    const division = teamsByLeague.get(team.league);
+    if (!division) continue;
+    if (owners.has(team.id)) division.teamIds.add(owners.get(team.id));
+    else division.unowned++;
+  }
 
-    fixtures.push(roundFixtures);
+  const divisions = leagues
+    .map(league => ({
+      id: league.id,
+      name: league.name,
+      teamIds: [...teamsByLeague.get(league.id).teamIds].sort(),
+      unowned: teamsByLeague.get(league.id).unowned
+    }))
+    .filter(division => division.teamIds.length >= 2);
 
-    // Rotate teams (keep first team fixed, rotate others)
-    const first = effectiveTeams.shift();
-    effectiveTeams.push(first);
+  if (divisions.length === 0) {
+    return NextResponse.json(
+      { error: 'Need at least one division with 2 or more teams' },
+      { status: 400 }
+    );
   }
 
-  return fixtures;
+  const startedAt = new Date().toISOString();
+  const { error: seasonsError } = await supabaseAdmin
+    .from('league_seasons')
+    .upsert(divisions.map(division => ({
+      league_id: division.id,
+      season,
+      status: 'active',
+      teams: division.teamIds,
+      started_at: startedAt
+    })), { onConflict: 'league_id,season', ignoreDuplicates: true });
+
+  if (seasonsError) throw seasonsError;
+
+  await Promise.all(divisions.map(division => initializeStandings(division.id, season, division.teamIds)));
+
+  const fixtures = await insertFixtures(seasonFixtures(divisions, season));
+
+  return NextResponse.json({
+    message: `Scheduled ${fixtures.inserted} matches in ${divisions.length} divisions`,
+    totalMatches: fixtures.inserted,
+    existingMatches: fixtures.existing,
+    chunks: fixtures.chunks,
+    retries: fixtures.retries,
+    season,
+    divisions: divisions.map(division => ({
+      id: division.id,
+      name: division.name,
+      teamsCount: division.teamIds.length,
+      unownedTeams: division.unowned
+    }))
+  });
 }
@@ -1,10 +1,9 @@
-import { createClient } from '@supabase/supabase-js';
+import { supabaseAdmin as supabase } from '@/lib/supabase/client';
+import { markTaken, releaseUnusedNames } from '@/lib/players/name-allocator';
+import { PINNED_FIELDS, pinPlayerReplays } from '@/lib/simulation/replay';
+import { withMetrics } from '@/lib/metrics/route';
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
-const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
-
-export async function GET(request, { params }) {
+export const GET = withMetrics(async function GET(request, { params }) {
   try {
     const { id } = params;
 
@@ -28,9 +27,23 @@ export async function GET(request, { params }) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
+}, 'GET /api/players/:id');
+
+// Pin the replays of the player's completed matches before their inputs
+// change or disappear; returns the player as it was (id, user_id, name)
+async function pinReplaysOf(id) {
+  const { data: player, error } = await supabase
+    .from('players')
+    .select('id, user_id, name')
+    .eq('id', id)
+    .maybeSingle();
+
+  if (error) throw error;
+  if (player) await pinPlayerReplays([player]);
+  return player;
 }
 
-export async function PUT(request, { params }) {
+export const PUT = withMetrics(async function PUT(request, { params }) {
   try {
     const { id } = params;
     const body = await request.json();
@@ -60,6 +73,10 @@ export async function PUT(request, { params }) {
       sale_price
     } = body;
 
+    // A rename is one of the replayed attributes, so the previous name is
+    // read here whenever it can change
+    const previous = PINNED_FIELDS.some(field => body[field] !== undefined) ? await pinReplaysOf(id) : null;
+
     const { data: player, error } = await supabase
       .from('players')
       .update({
@@ -96,17 +113,21 @@ export async function PUT(request, { params }) {
       return Response.json({ error: 'Failed to update player' }, { status: 500 });
     }
 
+    markTaken([player.name]);
+    if (previous && previous.name !== player.name) await releaseUnusedNames([previous.name]);
     return Response.json(player);
   } catch (error) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+}, 'PUT /api/players/:id');
 
-export async function DELETE(request, { params }) {
+export const DELETE = withMetrics(async function DELETE(request, { params }) {
   try {
     const { id } = params;
 
+    const player = await pinReplaysOf(id);
+
     const { error } = await supabase
       .from('players')
       .delete()
@@ -117,9 +138,11 @@ export async function DELETE(request, { params }) {
       return Response.json({ error: 'Failed to delete player' }, { status: 500 });
     }
 
+    if (player) await releaseUnusedNames([player.name]);
+
     return Response.json({ message: 'Player deleted successfully' });
   } catch (error) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+}, 'DELETE /api/players/:id');
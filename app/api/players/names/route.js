@@ -0,0 +1,16 @@
+import { NextResponse } from 'next/server';
+import { nameCapacity } from '@/lib/players/name-allocator';
+import { withMetrics } from '@/lib/metrics/route';
+
+// Generated-name capacity per country: name combinations, how many are taken
+// and how many remain for new squads
+export const GET = withMetrics(async function GET() {
+  try {
+    return NextResponse.json(await nameCapacity(), {
+      headers: { 'Cache-Control': 'no-store' }
+    });
+  } catch (error) {
+    console.error('Error reading name capacity:', error);
+    return NextResponse.json({ error: 'Failed to read name capacity' }, { status: 500 });
+  }
+});
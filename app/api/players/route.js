@@ -1,10 +1,8 @@
-import { createClient } from '@supabase/supabase-js';
+import { supabaseAdmin as supabase } from '@/lib/supabase/client';
+import { markTaken } from '@/lib/players/name-allocator';
+import { withMetrics } from '@/lib/metrics/route';
 
-const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
-const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
-const supabase = createClient(supabaseUrl, supabaseKey);
-
-export async function GET(request) {
+export const GET = withMetrics(async function GET(request) {
   try {
     const { searchParams } = new URL(request.url);
     const userId = searchParams.get('userId');
@@ -17,7 +15,8 @@ export async function GET(request) {
       .from('players')
       .select('*')
       .eq('user_id', userId)
-      .order('rating', { ascending: false });
+      .order('rating', { ascending: false })
+      .order('id', { ascending: true });
 
     if (error) {
       console.error('Error fetching players:', error);
@@ -29,9 +28,9 @@ export async function GET(request) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+});
 
-export async function POST(request) {
+export const POST = withMetrics(async function POST(request) {
   try {
     const body = await request.json();
     const {
@@ -101,9 +100,10 @@ export async function POST(request) {
       return Response.json({ error: 'Failed to create player' }, { status: 500 });
     }
 
+    markTaken([player.name]);
     return Response.json(player);
   } catch (error) {
     console.error('Error:', error);
     return Response.json({ error: 'Internal server error' }, { status: 500 });
   }
-}
+});
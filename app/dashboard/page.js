@@ -26,6 +26,7 @@ import {
   Award,
   Zap
 } from 'lucide-react';
+import { waitForJob } from '@/lib/jobs/client';
 
 export default function DashboardPage() {
   const router = useRouter();
@@ -35,7 +36,6 @@ export default function DashboardPage() {
   const [recentMatches, setRecentMatches] = useState([]);
   const [leagueTable, setLeagueTable] = useState([]);
   const [lineups, setLineups] = useState([]);
-  const [marketplace, setMarketplace] = useState([]);
 
   const [loading, setLoading] = useState(true);
   const [quickSimLoading, setQuickSimLoading] = useState(false);
@@ -66,96 +66,18 @@ export default function DashboardPage() {
         ? 'http://localhost:3000'
         : '';
 
-      // Fetch players
-      try {
-        const playersResponse = await fetch(`${baseUrl}/api/players?userId=${savedUser.id}`);
-        if (playersResponse.ok) {
-          const playersData = await playersResponse.json();
-          setPlayers(Array.isArray(playersData) ? playersData : []);
-        } else {
-          setPlayers([]);
-        }
-      } catch (error) {
-        console.error('Error fetching players:', error);
-        setPlayers([]);
-      }
+      // Squad, fixtures, recent results and the league table in one request;
+      // the browser revalidates it with the ETag, so unchanged data is a 304
+      const response = await fetch(`${baseUrl}/api/bootstrap?userId=${savedUser.id}`);
+      if (!response.ok) throw new Error(`Bootstrap failed with ${response.status}`);
+      const data = await response.json();
 
-      // Fetch user's matches
-      try {
-        const matchesResponse = await fetch(`${baseUrl}/api/matches?userId=${savedUser.id}`);
-        if (matchesResponse.ok) {
-          const matchesData = await matchesResponse.json();
-          setMatches(Array.isArray(matchesData) ? matchesData : []);
-        } else {
-          setMatches([]);
-        }
-      } catch (error) {
-        console.error('Error fetching matches:', error);
-        setMatches([]);
-      }
-
-      // Fetch recent league matches for activity feed
-      try {
-        const recentMatchesResponse = await fetch(`${baseUrl}/api/matches`);
-        if (recentMatchesResponse.ok) {
-          const recentMatchesData = await recentMatchesResponse.json();
-          // Filter to get recent completed matches (not just user's matches)
-          const recentCompletedMatches = Array.isArray(recentMatchesData)
-            ? recentMatchesData
-                .filter(m => m && m.status === 'completed')
-                .sort((a, b) => new Date(b.completed_at || b.created_at) - new Date(a.completed_at || a.created_at))
-                .slice(0, 10) // Get last 10 completed matches
-            : [];
-          setRecentMatches(recentCompletedMatches);
-        } else {
-          setRecentMatches([]);
-        }
-      } catch (error) {
-        console.error('Error fetching recent matches:', error);
-        setRecentMatches([]);
-      }
-
-      // Fetch league table
-      try {
-        const leagueResponse = await fetch(`${baseUrl}/api/leagues`);
-        if (leagueResponse.ok) {
-          const leagueData = await leagueResponse.json();
-          setLeagueTable(leagueData || {});
-        } else {
-          setLeagueTable({});
-        }
-      } catch (error) {
-        console.error('Error fetching league table:', error);
-        setLeagueTable({});
-      }
-
-      // Fetch lineups
-      try {
-        const lineupsResponse = await fetch(`${baseUrl}/api/lineups?userId=${savedUser.id}`);
-        if (lineupsResponse.ok) {
-          const lineupsData = await lineupsResponse.json();
-          setLineups(Array.isArray(lineupsData) ? lineupsData : []);
-        } else {
-          setLineups([]);
-        }
-      } catch (error) {
-        console.error('Error fetching lineups:', error);
-        setLineups([]);
-      }
-
-      // Fetch marketplace
-      try {
-        const marketResponse = await fetch(`${baseUrl}/api/marketplace`);
-        if (marketResponse.ok) {
-          const marketData = await marketResponse.json();
-          setMarketplace(Array.isArray(marketData) ? marketData : []);
-        } else {
-          setMarketplace([]);
-        }
-      } catch (error) {
-        console.error('Error fetching marketplace:', error);
-        setMarketplace([]);
-      }
+      setUser(current => ({ ...current, ...data.user }));
+      setPlayers(data.players);
+      setMatches(data.matches);
+      setRecentMatches(data.recentMatches);
+      setLeagueTable(data.league);
+      setLineups(data.lineups);
 
     } catch (error) {
       console.error('Error fetching user data:', error);
@@ -222,8 +144,20 @@ export default function DashboardPage() {
   };
 
   const handleViewMatch = async (match) => {
+    // Completed matches store a replay record instead of their scorecards;
+    // the scorecard endpoint regenerates them
+    let scorecards = match.match_data?.firstInnings ? match.match_data : null;
+    if (!scorecards && match.status === 'completed') {
+      try {
+        const response = await fetch(`/api/matches/${match.id}/scorecard`);
+        if (response.ok) scorecards = await response.json();
+      } catch (error) {
+        console.error('Error loading scorecard:', error);
+      }
+    }
+
     // If match already has detailed data, use it
-    if (match.match_data && match.match_data.firstInnings) {
+    if (scorecards) {
       setMatchSummary({
         matchId: match.id,
         homeTeam: { id: match.home_team_id, name: match.home_team_name || 'Home Team' },
@@ -237,8 +171,8 @@ export default function DashboardPage() {
         winType: match.win_type,
         target: match.target,
         commentary: match.commentary || [],
-        firstInnings: match.match_data.firstInnings,
-        secondInnings: match.match_data.secondInnings,
+        firstInnings: scorecards.firstInnings,
+        secondInnings: scorecards.secondInnings,
         matchConditions: {
           weather: match.weather || 'Sunny',
           pitchType: match.pitch_type || 'Normal'
@@ -263,7 +197,8 @@ export default function DashboardPage() {
       });
 
       if (response.ok) {
-        const matchData = await response.json();
+        // The simulation runs as a background job; wait for its result
+        const matchData = await waitForJob(baseUrl, await response.json());
         setMatchSummary(matchData);
         setShowMatchSummary(true);
       }
@@ -8,6 +8,7 @@ import { Badge } from '@/components/ui/badge';
 import { Progress } from '@/components/ui/progress';
 import { useToast } from '@/hooks/use-toast';
 import { Toaster } from '@/components/ui/sonner';
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import Navigation from '@/components/Navigation';
 import {
   Users,
@@ -28,6 +29,8 @@ export default function MarketplacePage() {
   const router = useRouter();
   const [user, setUser] = useState(null);
   const [marketplace, setMarketplace] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [search, setSearch] = useState({ sort: 'rating', bowlerType: 'all' });
   const [loading, setLoading] = useState(true);
   const { toast } = useToast();
 
@@ -40,18 +43,27 @@ export default function MarketplacePage() {
     }
 
     setUser(JSON.parse(savedUser));
-    fetchMarketplace();
   }, [router]);
 
-  const fetchMarketplace = async () => {
+  useEffect(() => {
+    fetchMarketplace();
+  }, [search]);
+
+  // First page of the current search, or the page after `cursor`
+  const fetchMarketplace = async (cursor = null) => {
     try {
       const baseUrl = typeof window !== 'undefined' && window.location.hostname === 'localhost'
         ? 'http://localhost:3000'
         : '';
 
-      const response = await fetch(`${baseUrl}/api/marketplace`);
-      const marketData = await response.json();
-      setMarketplace(marketData);
+      const params = new URLSearchParams({ sort: search.sort });
+      if (search.bowlerType !== 'all') params.set('bowler_type', search.bowlerType);
+      if (cursor) params.set('cursor', cursor);
+
+      const response = await fetch(`${baseUrl}/api/marketplace?${params}`);
+      const { players, nextCursor: next } = await response.json();
+      setMarketplace(previous => cursor ? [...previous, ...players] : players);
+      setNextCursor(next);
     } catch (error) {
       console.error('Error fetching marketplace:', error);
       toast({
@@ -93,7 +105,7 @@ export default function MarketplacePage() {
         });
         // Update user coins
         setUser({...user, coins: user.coins - player.sale_price});
-        fetchMarketplace(); // Refresh marketplace
+        setMarketplace(marketplace.filter(listed => listed.id !== player.id));
       } else {
         toast({
           title: "Error",
@@ -202,6 +214,33 @@ export default function MarketplacePage() {
         <div className="flex items-center justify-between mb-6">
           <h2 className="text-2xl font-bold">Player Marketplace</h2>
           <div className="flex items-center space-x-2">
+            <Select value={search.sort} onValueChange={(value) => setSearch({...search, sort: value})}>
+              <SelectTrigger className="w-32">
+                <SelectValue placeholder="Sort by" />
+              </SelectTrigger>
+              <SelectContent>
+                <SelectItem value="rating">Best rated</SelectItem>
+                <SelectItem value="price">Cheapest</SelectItem>
+                <SelectItem value="value">Most valuable</SelectItem>
+              </SelectContent>
+            </Select>
+
+            <Select value={search.bowlerType} onValueChange={(value) => setSearch({...search, bowlerType: value})}>
+              <SelectTrigger className="w-32">
+                <SelectValue placeholder="Bowler Type" />
+              </SelectTrigger>
+              <SelectContent>
+                <SelectItem value="all">All Types</SelectItem>
+                <SelectItem value="Right-arm fast">Right-arm fast</SelectItem>
+                <SelectItem value="Left-arm fast">Left-arm fast</SelectItem>
+                <SelectItem value="Right-arm medium">Right-arm medium</SelectItem>
+                <SelectItem value="Left-arm medium">Left-arm medium</SelectItem>
+                <SelectItem value="Right-arm spin">Right-arm spin</SelectItem>
+                <SelectItem value="Left-arm spin">Left-arm spin</SelectItem>
+                <SelectItem value="Wicket-keeper">Wicket-keeper</SelectItem>
+              </SelectContent>
+            </Select>
+
             <Badge variant="outline" className="flex items-center space-x-1">
               <Coins className="w-4 h-4" />
               <span>{user.coins?.toLocaleString() || '0'} coins</span>
@@ -305,6 +344,14 @@ export default function MarketplacePage() {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={() => fetchMarketplace(nextCursor)}>
+              Load more
+            </Button>
+          </div>
+        )}
       </main>
 
       <Toaster />
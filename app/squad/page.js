@@ -92,15 +92,12 @@ export default function SquadPage() {
         ? 'http://localhost:3000'
         : '';
 
-      // Fetch players
-      const playersResponse = await fetch(`${baseUrl}/api/players?userId=${savedUser.id}`);
-      const playersData = await playersResponse.json();
-      setPlayers(playersData);
-
-      // Fetch lineups
-      const lineupsResponse = await fetch(`${baseUrl}/api/lineups?userId=${savedUser.id}`);
-      const lineupsData = await lineupsResponse.json();
-      setLineups(lineupsData);
+      // Players and lineups in one request, revalidated with its ETag
+      const response = await fetch(`${baseUrl}/api/bootstrap?userId=${savedUser.id}&view=squad`);
+      if (!response.ok) throw new Error(`Bootstrap failed with ${response.status}`);
+      const data = await response.json();
+      setPlayers(data.players);
+      setLineups(data.lineups);
     } catch (error) {
       console.error('Error fetching data:', error);
       toast({
@@ -142,10 +139,8 @@ export default function SquadPage() {
       const lineup = await response.json();
 
       if (response.ok) {
-        // Refresh the entire lineups list to get updated main lineup status
-        const refreshedLineupsResponse = await fetch(`${baseUrl}/api/lineups?userId=${user.id}`);
-        const refreshedLineups = await refreshedLineupsResponse.json();
-        setLineups(refreshedLineups);
+        // Refresh the squad to get the updated main lineup status
+        await fetchData();
 
         setIsCreatingLineup(false);
         setNewLineup({
@@ -206,10 +201,8 @@ export default function SquadPage() {
       const lineup = await response.json();
 
       if (response.ok) {
-        // Refresh the entire lineups list to get updated main lineup status
-        const refreshedLineupsResponse = await fetch(`${baseUrl}/api/lineups?userId=${user.id}`);
-        const refreshedLineups = await refreshedLineupsResponse.json();
-        setLineups(refreshedLineups);
+        // Refresh the squad to get the updated main lineup status
+        await fetchData();
 
         setIsEditingLineup(false);
         setEditingLineup(null);
@@ -268,7 +261,7 @@ export default function SquadPage() {
         setShowSellDialog(false);
         setSalePrice('');
         setPlayerToSell(null);
-        fetchPlayers(); // Refresh data
+        fetchData(); // Refresh data
       } else {
         toast({
           title: "Error",
@@ -285,28 +278,6 @@ export default function SquadPage() {
     }
   };
 
-  const fetchPlayers = async () => {
-    const savedUser = JSON.parse(localStorage.getItem('user'));
-    if (!savedUser) return;
-
-    try {
-      const baseUrl = typeof window !== 'undefined' && window.location.hostname === 'localhost'
-        ? 'http://localhost:3000'
-        : '';
-
-      const response = await fetch(`${baseUrl}/api/players?userId=${savedUser.id}`);
-      const playersData = await response.json();
-      setPlayers(playersData);
-    } catch (error) {
-      console.error('Error fetching players:', error);
-      toast({
-        title: "Error",
-        description: "Failed to fetch players",
-        variant: "destructive",
-      });
-    }
-  };
-
   const handlePlayerSelect = (playerId, isSelected) => {
     if (isSelected && newLineup.players.length < 11) {
       setNewLineup({...newLineup, players: [...newLineup.players, playerId]});
@@ -11,6 +11,7 @@ import {
   Eye,
   Clock
 } from 'lucide-react';
+import { waitForJob } from '@/lib/jobs/client';
 
 export default function MatchList({ userId, showTitle = true, title = "Recent Matches" }) {
   const [matches, setMatches] = useState([]);
@@ -88,7 +89,8 @@ export default function MatchList({ userId, showTitle = true, title = "Recent Ma
       });
 
       if (response.ok) {
-        const matchData = await response.json();
+        // The simulation runs as a background job; wait for its result
+        const matchData = await waitForJob(baseUrl, await response.json());
         setSelectedMatch(matchData);
         setShowMatchSummary(true);
       }
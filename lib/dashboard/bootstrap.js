@@ -0,0 +1,113 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { getTeams } from '../league/team-directory.js';
+import { getCurrentLeagueTable } from '../league/standings-store.js';
+
+// View models of the dashboard and squad pages, read in one go for
+// GET /api/bootstrap.
+//
+// Every read is issued at once, so a load costs the slowest chain (the
+// league table: season, standings, team names) rather than the sum of the
+// six requests the pages made before. Each read selects only the columns the
+// pages render; full rows stay behind /api/players, /api/lineups and
+// /api/matches.
+
+export const VIEWS = ['dashboard', 'squad'];
+
+// Squad list, lineup editor and the dashboard's squad strength
+export const SQUAD_PLAYER_COLUMNS = [
+  'id', 'name', 'age', 'form', 'rating', 'batting', 'bowling', 'keeping', 'captaincy',
+  'batting_style', 'bowler_type', 'market_value', 'is_for_sale'
+].join(', ');
+
+export const LINEUP_COLUMNS = [
+  'id', 'name', 'players', 'captain_id', 'wicketkeeper_id', 'first_bowler_id', 'second_bowler_id', 'is_main'
+].join(', ');
+
+// The team's own fixtures, counted by status on the dashboard
+export const TEAM_MATCH_COLUMNS = 'id, home_team_id, away_team_id, status, result';
+
+// Recent league results: the activity feed and what the match summary opens with
+export const RECENT_MATCH_COLUMNS = [
+  'id', 'home_team_id', 'away_team_id', 'status', 'home_score', 'away_score', 'home_overs',
+  'away_overs', 'result', 'win_margin', 'win_type', 'target', 'round', 'weather', 'pitch_type',
+  'created_at'
+].join(', ');
+
+export const TEAM_MATCH_LIMIT = 50;
+export const RECENT_MATCH_LIMIT = 10;
+export const LEAGUE_TABLE_ROWS = 8;
+
+async function rows(query) {
+  const { data, error } = await query;
+  if (error) throw error;
+  return data;
+}
+
+async function recentMatches() {
+  const matches = await rows(supabaseAdmin
+    .from('matches')
+    .select(RECENT_MATCH_COLUMNS)
+    .eq('status', 'completed')
+    .order('created_at', { ascending: false })
+    .limit(RECENT_MATCH_LIMIT));
+
+  const teams = await getTeams(matches.flatMap(match => [match.home_team_id, match.away_team_id]));
+  return matches.map(match => ({
+    ...match,
+    home_team_name: teams.get(match.home_team_id)?.team_name || 'Unknown Team',
+    away_team_name: teams.get(match.away_team_id)?.team_name || 'Unknown Team'
+  }));
+}
+
+async function leagueSummary() {
+  const { leagueTable, season, totalMatches } = await getCurrentLeagueTable('default');
+  return {
+    season,
+    totalMatches,
+    leagueTable: leagueTable.slice(0, LEAGUE_TABLE_ROWS).map(({ id, name, played, points }) => ({ id, name, played, points }))
+  };
+}
+
+// { user, players, lineups } for the squad view, plus { matches,
+// recentMatches, league } for the dashboard; null when the user does not exist
+export async function loadBootstrap(userId, view = 'dashboard') {
+  const reads = {
+    user: supabaseAdmin
+      .from('users')
+      .select('id, team_name, country, coins')
+      .eq('id', userId)
+      .maybeSingle()
+      .then(({ data, error }) => {
+        if (error) throw error;
+        return data;
+      }),
+    players: rows(supabaseAdmin
+      .from('players')
+      .select(SQUAD_PLAYER_COLUMNS)
+      .eq('user_id', userId)
+      // id breaks rating ties, so an unchanged squad keeps its order and ETag
+      .order('rating', { ascending: false })
+      .order('id', { ascending: true })),
+    lineups: rows(supabaseAdmin
+      .from('lineups')
+      .select(LINEUP_COLUMNS)
+      .eq('user_id', userId)
+      .order('created_at', { ascending: false }))
+  };
+
+  if (view === 'dashboard') {
+    reads.matches = rows(supabaseAdmin
+      .from('matches')
+      .select(TEAM_MATCH_COLUMNS)
+      .or(`home_team_id.eq.${userId},away_team_id.eq.${userId}`)
+      .order('created_at', { ascending: false })
+      .limit(TEAM_MATCH_LIMIT));
+    reads.recentMatches = recentMatches();
+    reads.league = leagueSummary();
+  }
+
+  const names = Object.keys(reads);
+  const values = await Promise.all(Object.values(reads));
+  const bootstrap = Object.fromEntries(names.map((name, index) => [name, values[index]]));
+  return bootstrap.user ? bootstrap : null;
+}
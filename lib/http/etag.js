@@ -0,0 +1,18 @@
+import { createHash } from 'node:crypto';
+
+// Strong validator for a JSON-serialisable value
+export function strongETag(value) {
+  const payload = typeof value === 'string' ? value : JSON.stringify(value);
+  return `"${createHash('sha1').update(payload).digest('base64url')}"`;
+}
+
+// Whether the request's If-None-Match already names `etag` (conditional GETs
+// compare opaque tags only, so W/ prefixes are ignored)
+export function etagMatches(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+
+  const opaque = etag.replace(/^W\//, '');
+  return header.split(',').some(tag => tag.trim().replace(/^W\//, '') === opaque);
+}
@@ -0,0 +1,32 @@
+// Server-sent events framing (text/event-stream)
+
+const encoder = new TextEncoder();
+
+export const SSE_HEADERS = {
+  'Content-Type': 'text/event-stream; charset=utf-8',
+  'Cache-Control': 'no-cache, no-transform',
+  Connection: 'keep-alive',
+  'X-Accel-Buffering': 'no'
+};
+
+// One event as bytes, ready to be enqueued on any number of streams. Events
+// without an `id` leave the client's Last-Event-ID unchanged.
+export function encodeEvent({ id = null, event = null, data }) {
+  let frame = '';
+  if (id !== null) frame += `id: ${id}\n`;
+  if (event) frame += `event: ${event}\n`;
+  frame += `data: ${JSON.stringify(data)}\n\n`;
+  return encoder.encode(frame);
+}
+
+export function encodeComment(text) {
+  return encoder.encode(`: ${text}\n\n`);
+}
+
+// Last-Event-ID sent by a reconnecting EventSource, or the `lastEventId`
+// query parameter for clients that cannot set headers; null when absent
+export function lastEventId(request) {
+  const value = request.headers.get('Last-Event-ID') ?? new URL(request.url).searchParams.get('lastEventId');
+  const id = Number.parseInt(value, 10);
+  return Number.isFinite(id) && id >= 0 ? id : null;
+}
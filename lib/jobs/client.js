@@ -0,0 +1,14 @@
+// Browser-side wait for a simulation job submitted to POST /api/matches/simulate:
+// polls /api/jobs/:id and resolves with the job's result once it is done
+export async function waitForJob(baseUrl, job, { intervalMs = 500 } = {}) {
+  let current = job;
+  while (current.status === 'queued' || current.status === 'running') {
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+    const response = await fetch(`${baseUrl}/api/jobs/${current.id}`, { cache: 'no-store' });
+    if (!response.ok) throw new Error(`Simulation job ${current.id} not found`);
+    current = await response.json();
+  }
+
+  if (current.status === 'failed') throw new Error(current.error);
+  return current.result;
+}
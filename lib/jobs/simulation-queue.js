@@ -0,0 +1,268 @@
+import os from 'node:os';
+import path from 'node:path';
+import { randomUUID } from 'node:crypto';
+import { supabaseAdmin } from '../supabase/client.js';
+import { applyCompletedMatches } from '../league/standings-store.js';
+import { getTeams } from '../league/team-directory.js';
+import { ballCount } from '../simulation/ball-log.js';
+import { MATCH_COLUMNS, simulateMatchBallByBall, storedMatchColumns } from '../simulation/match.js';
+import { loadPlayingXIs } from '../simulation/squads.js';
+import { recordSimulation } from '../supabase/query-stats.js';
+import { WorkerPool } from './worker-pool.js';
+
+// Background simulation jobs for POST /api/matches/:id/simulate.
+//
+// A submitted match becomes a job that waits in a FIFO queue and is simulated
+// on a worker thread (./simulation-worker.js), so a burst of simulations
+// never blocks the event loop serving every other request. There is at most
+// one job per match: submitting a match that is queued, running or recently
+// finished returns the job that already exists, so a double click cannot
+// simulate (and score) a fixture twice. Finished jobs are kept for
+// JOB_RETENTION_MS for their status endpoint.
+//
+// Other writers of match results (quick-sim, starting a live match) claim
+// their matches first and skip those already claimed; a running job holds the
+// claim of its match.
+//
+// The registry is per server process and lives on globalThis so route bundles
+// that each load their own copy of this module share it.
+const QUEUE_KEY = Symbol.for('cricket-pro.jobs.simulation');
+
+// Resolved from the project root, not import.meta.url: in a `next build`
+// bundle that points into .next/server, where the script is not emitted
+// (next.config.js traces it into the build instead)
+const WORKER_SCRIPT = path.join(process.cwd(), 'lib', 'jobs', 'simulation-worker.js');
+
+const JOB_RETENTION_MS = 10 * 60 * 1000;
+const MAX_RETAINED_JOBS = 1000;
+// Wait and run times kept for the percentiles of queueMetrics()
+const TIMING_SAMPLES = 500;
+
+const state = globalThis[QUEUE_KEY] ??= {
+  jobs: new Map(),
+  byMatch: new Map(),
+  claimed: new Set(),
+  queue: [],
+  running: 0,
+  pool: null,
+  counters: { submitted: 0, deduplicated: 0, completed: 0, failed: 0 },
+  waitMs: [],
+  runMs: []
+};
+
+// Worker threads used for simulations (SIMULATION_WORKERS); 0 simulates on
+// the main thread, one job at a time
+export function workerCount() {
+  const configured = Number.parseInt(process.env.SIMULATION_WORKERS, 10);
+  if (Number.isFinite(configured) && configured >= 0) return configured;
+  return Math.max(1, Math.min(4, os.availableParallelism() - 1));
+}
+
+function pool() {
+  state.pool ??= new WorkerPool(WORKER_SCRIPT, workerCount());
+  return state.pool;
+}
+
+// Ball-by-ball simulation of a match off the main thread (inline when
+// SIMULATION_WORKERS=0). The time it ran is reported to the caller's query
+// stats scope.
+export async function simulateOffThread(match, squads, teams) {
+  if (workerCount() === 0) {
+    await null;
+    const startedAt = performance.now();
+    const result = simulateMatchBallByBall(match, squads, teams);
+    recordSimulation(performance.now() - startedAt);
+    return result;
+  }
+  const { result, runMs } = await pool().run({ match, squads, teams });
+  recordSimulation(runMs);
+  return result;
+}
+
+// Claim matches for a writer of their results; returns the ids claimed, which
+// excludes matches claimed elsewhere or with a job that has not failed (a
+// finished job's match may have been read as scheduled before it completed)
+export function claimMatches(matchIds) {
+  const claimed = [];
+  for (const matchId of matchIds) {
+    const job = state.byMatch.get(matchId);
+    if (state.claimed.has(matchId) || (job && job.status !== 'failed')) continue;
+    state.claimed.add(matchId);
+    claimed.push(matchId);
+  }
+  return claimed;
+}
+
+export function releaseMatches(matchIds) {
+  for (const matchId of matchIds) state.claimed.delete(matchId);
+}
+
+function record(samples, value) {
+  samples.push(value);
+  if (samples.length > TIMING_SAMPLES) samples.shift();
+}
+
+function percentile(sorted, p) {
+  return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : null;
+}
+
+function timings(samples) {
+  const sorted = [...samples].sort((a, b) => a - b);
+  return { p50: percentile(sorted, 0.5), p95: percentile(sorted, 0.95), max: percentile(sorted, 1) };
+}
+
+// Drop finished jobs past their retention, oldest first
+function prune(now = Date.now()) {
+  let excess = state.jobs.size - MAX_RETAINED_JOBS;
+  for (const job of state.jobs.values()) {
+    if (job.status === 'queued' || job.status === 'running') continue;
+    if (excess <= 0 && now - job.finishedAt < JOB_RETENTION_MS) continue;
+    state.jobs.delete(job.id);
+    if (state.byMatch.get(job.matchId) === job) state.byMatch.delete(job.matchId);
+    excess--;
+  }
+}
+
+// Simulate a match and write its result and the standings it changes
+async function simulateMatchJob(matchId) {
+  const { data: match, error } = await supabaseAdmin
+    .from('matches')
+    .select(MATCH_COLUMNS)
+    .eq('id', matchId)
+    .maybeSingle();
+
+  if (error) throw error;
+  if (!match) throw new Error('Match not found');
+  if (match.status !== 'scheduled') throw new Error(`Match already ${match.status}`);
+
+  const teamIds = [match.home_team_id, match.away_team_id];
+  const [squads, teams] = await Promise.all([loadPlayingXIs(teamIds), getTeams(teamIds)]);
+  const simulated = await simulateOffThread(match, squads, teams);
+  // Scorecards and ball logs are replayed from match_data.replay on demand
+  const stored = storedMatchColumns(simulated);
+
+  // Written only if the match is still scheduled, so a match started or
+  // completed elsewhere meanwhile is not completed (and scored) twice
+  const { data: updated, error: updateError } = await supabaseAdmin
+    .from('matches')
+    .update(stored)
+    .eq('id', match.id)
+    .eq('status', 'scheduled')
+    .select('id');
+
+  if (updateError) throw updateError;
+  if (updated.length === 0) throw new Error('Match is no longer scheduled');
+
+  await applyCompletedMatches([{ ...match, ...stored }]);
+
+  const { ball_log: ballLog, ...summary } = simulated;
+  return {
+    ...match,
+    ...summary,
+    home_team_name: teams.get(match.home_team_id)?.team_name || 'Unknown Team',
+    away_team_name: teams.get(match.away_team_id)?.team_name || 'Unknown Team',
+    totalBalls: ballLog.map(ballCount)
+  };
+}
+
+async function run(job) {
+  state.running++;
+  state.claimed.add(job.matchId);
+  job.status = 'running';
+  job.startedAt = Date.now();
+  record(state.waitMs, job.startedAt - job.submittedAt);
+
+  try {
+    job.result = await simulateMatchJob(job.matchId);
+    job.status = 'done';
+    state.counters.completed++;
+  } catch (error) {
+    console.error(`Error simulating match ${job.matchId}:`, error);
+    job.error = error.message;
+    job.status = 'failed';
+    state.counters.failed++;
+  } finally {
+    job.finishedAt = Date.now();
+    record(state.runMs, job.finishedAt - job.startedAt);
+    state.claimed.delete(job.matchId);
+    state.running--;
+    drain();
+  }
+}
+
+// Start queued jobs while there are free workers
+function drain() {
+  const capacity = Math.max(workerCount(), 1);
+  while (state.running < capacity && state.queue.length > 0) {
+    run(state.queue.shift());
+  }
+}
+
+// Queue the simulation of a match. Returns { job, created }: the match's
+// existing job (queued, running or finished within the retention period)
+// when there is one, otherwise a new queued job; job is null while another
+// writer has claimed the match.
+export function submitSimulation(matchId) {
+  prune();
+  const existing = state.byMatch.get(matchId);
+  if (existing && existing.status !== 'failed') {
+    state.counters.deduplicated++;
+    return { job: existing, created: false };
+  }
+  if (state.claimed.has(matchId)) return { job: null, created: false };
+
+  const job = {
+    id: randomUUID(),
+    type: 'simulate-match',
+    matchId,
+    status: 'queued',
+    submittedAt: Date.now(),
+    startedAt: null,
+    finishedAt: null,
+    result: null,
+    error: null
+  };
+  state.jobs.set(job.id, job);
+  state.byMatch.set(matchId, job);
+  state.queue.push(job);
+  state.counters.submitted++;
+  drain();
+  return { job, created: true };
+}
+
+// Job of a match, if one is retained
+export function jobForMatch(matchId) {
+  return state.byMatch.get(matchId) || null;
+}
+
+// Status of a job as served by GET /api/jobs/:id; null when unknown or expired
+export function getJob(jobId) {
+  const job = state.jobs.get(jobId);
+  if (!job) return null;
+  const now = Date.now();
+  return {
+    id: job.id,
+    type: job.type,
+    matchId: job.matchId,
+    status: job.status,
+    position: job.status === 'queued' ? state.queue.indexOf(job) + 1 : null,
+    submittedAt: new Date(job.submittedAt).toISOString(),
+    waitMs: (job.startedAt ?? now) - job.submittedAt,
+    runMs: job.startedAt === null ? null : (job.finishedAt ?? now) - job.startedAt,
+    result: job.result,
+    error: job.error
+  };
+}
+
+// Queue depth, workers in use, job counts and wait/run time percentiles (ms)
+export function queueMetrics() {
+  return {
+    workers: workerCount(),
+    depth: state.queue.length,
+    running: state.running,
+    retained: state.jobs.size,
+    ...state.counters,
+    waitMs: timings(state.waitMs),
+    runMs: timings(state.runMs)
+  };
+}
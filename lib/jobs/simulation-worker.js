@@ -0,0 +1,13 @@
+import { parentPort } from 'node:worker_threads';
+import { simulateMatchBallByBall } from '../simulation/match.js';
+
+// Worker thread entry of the simulation pool (see simulation-queue.js):
+// simulates one match per message, off the event loop serving requests
+parentPort.on('message', ({ id, payload }) => {
+  try {
+    const { match, squads, teams } = payload;
+    parentPort.postMessage({ id, result: simulateMatchBallByBall(match, squads, teams) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
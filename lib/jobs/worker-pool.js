@@ -0,0 +1,93 @@
+import { Worker } from 'node:worker_threads';
+
+// Fixed-size pool of worker threads running one script (a path or file URL). Tasks wait in FIFO
+// order until a worker is free; a worker that exits while busy is replaced
+// and its task rejected. Idle workers are unref'd so they never keep the
+// process alive on their own.
+//
+// The worker script answers every { id, payload } message with
+// { id, result } or { id, error }. run() resolves with { result, runMs },
+// where runMs is the time from handing the task to a worker to its answer.
+export class WorkerPool {
+  constructor(scriptUrl, size) {
+    this.scriptUrl = scriptUrl;
+    this.size = size;
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.tasks = new Map();
+    this.nextId = 1;
+  }
+
+  get busy() {
+    return this.workers.length - this.idle.length;
+  }
+
+  get depth() {
+    return this.queue.length;
+  }
+
+  run(payload) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, payload, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  spawn() {
+    const worker = new Worker(this.scriptUrl);
+    worker.task = null;
+
+    worker.on('message', ({ id, result, error }) => {
+      const task = this.tasks.get(id);
+      this.tasks.delete(id);
+      worker.task = null;
+      worker.unref();
+      this.idle.push(worker);
+      if (error) task?.reject(new Error(error));
+      else task?.resolve({ result, runMs: performance.now() - task.dispatchedAt });
+      this.dispatch();
+    });
+
+    worker.on('error', (error) => {
+      if (worker.task) worker.task.reject(error);
+    });
+
+    worker.on('exit', () => {
+      this.workers = this.workers.filter(entry => entry !== worker);
+      this.idle = this.idle.filter(entry => entry !== worker);
+      if (worker.task) {
+        this.tasks.delete(worker.task.id);
+        worker.task.reject(new Error('Simulation worker exited'));
+      }
+      this.dispatch();
+    });
+
+    this.workers.push(worker);
+    return worker;
+  }
+
+  dispatch() {
+    while (this.queue.length > 0) {
+      let worker = this.idle.pop();
+      if (!worker) {
+        if (this.workers.length >= this.size) return;
+        worker = this.spawn();
+      }
+
+      const task = this.queue.shift();
+      task.dispatchedAt = performance.now();
+      worker.task = task;
+      worker.ref();
+      this.tasks.set(task.id, task);
+      worker.postMessage({ id: task.id, payload: task.payload });
+    }
+  }
+
+  async destroy() {
+    const workers = this.workers;
+    this.workers = [];
+    this.idle = [];
+    await Promise.all(workers.map(worker => worker.terminate()));
+  }
+}
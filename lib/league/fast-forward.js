@@ -0,0 +1,150 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { claimMatches, releaseMatches, simulateOffThread } from '../jobs/simulation-queue.js';
+import { MATCH_COLUMNS, storedMatchColumns } from '../simulation/match.js';
+import { loadPlayingXIs } from '../simulation/squads.js';
+import { freezeSeason } from './season-snapshots.js';
+import { applyCompletedMatches, getLeagueTable, rebuildStandings } from './standings-store.js';
+import { getTeams } from './team-directory.js';
+
+// Whole-season fast-forward: every remaining match of a season (or those up
+// to a round) simulated in round and match_number order in one pass.
+//
+// Squads and teams are read once for the whole season, matches are simulated
+// in chunks on the simulation workers and each chunk is written with one bulk
+// upsert while the next one simulates. Standings are applied once at the end,
+// and a season left without unfinished matches is marked completed and its
+// history snapshot frozen. The query count depends on the number of chunks,
+// not the number of matches.
+//
+// A run that fails after writing some chunks rebuilds the season's standings
+// from its completed matches, so the matches it did write are counted.
+
+const CHUNK_SIZE = 250;
+const UNFINISHED_STATUSES = ['scheduled', 'in-progress', 'paused'];
+
+async function writeChunk(rows) {
+  const { error } = await supabaseAdmin
+    .from('matches')
+    .upsert(rows, { onConflict: 'id' });
+
+  if (error) throw error;
+}
+
+// Simulate the remaining scheduled matches of a season (a league_seasons
+// row). `throughRound` stops after that round; `onProgress` is called with
+// { phase, simulated, total, round } after each chunk is written and as the
+// standings and season are finalised.
+export async function fastForwardSeason(season, { throughRound = null, onProgress = () => {} } = {}) {
+  const startedAt = performance.now();
+  const timings = { loadMs: 0, simulateMs: 0, writeMs: 0, standingsMs: 0 };
+  const league = season.league_id;
+
+  let query = supabaseAdmin
+    .from('matches')
+    .select(MATCH_COLUMNS)
+    .eq('league', league)
+    .eq('season', season.season)
+    .eq('status', 'scheduled');
+
+  if (throughRound !== null) query = query.lte('round', throughRound);
+
+  const { data: scheduled, error } = await query
+    .order('round', { ascending: true })
+    .order('match_number', { ascending: true });
+
+  if (error) throw error;
+
+  // Matches queued or being simulated by another request are left to it
+  const claimed = new Set(claimMatches(scheduled.map(match => match.id)));
+  const matches = scheduled.filter(match => claimed.has(match.id));
+  const completed = [];
+  let pendingWrite = Promise.resolve();
+  let applied = false;
+
+  try {
+    const teamIds = [...new Set(matches.flatMap(match => [match.home_team_id, match.away_team_id]))];
+    const [squads, teams] = await Promise.all([loadPlayingXIs(teamIds), getTeams(teamIds)]);
+    timings.loadMs = performance.now() - startedAt;
+
+    // One completion time for the whole run: the form window then follows
+    // round and match_number order (see completionOrder)
+    const completedAt = new Date().toISOString();
+
+    for (let offset = 0; offset < matches.length; offset += CHUNK_SIZE) {
+      const chunk = matches.slice(offset, offset + CHUNK_SIZE);
+      const simulateStart = performance.now();
+      const rows = await Promise.all(chunk.map(async (match) => {
+        const pair = new Map([
+          [match.home_team_id, squads.get(match.home_team_id)],
+          [match.away_team_id, squads.get(match.away_team_id)]
+        ]);
+        const simulated = await simulateOffThread(match, pair, teams);
+        return { ...match, ...storedMatchColumns(simulated), updated_at: completedAt };
+      }));
+      timings.simulateMs += performance.now() - simulateStart;
+
+      await pendingWrite;
+      const writeStart = performance.now();
+      pendingWrite = writeChunk(rows).then(() => {
+        timings.writeMs += performance.now() - writeStart;
+        completed.push(...rows.map(({ ball_log, match_data, ...columns }) => columns));
+        onProgress({ phase: 'simulate', simulated: completed.length, total: matches.length, round: rows[rows.length - 1].round });
+      });
+    }
+    await pendingWrite;
+
+    onProgress({ phase: 'standings', simulated: completed.length, total: matches.length, round: null });
+    const standingsStart = performance.now();
+    await applyCompletedMatches(completed);
+    applied = true;
+
+    const { count: unfinished, error: countError } = await supabaseAdmin
+      .from('matches')
+      .select('id', { count: 'exact', head: true })
+      .eq('league', league)
+      .eq('season', season.season)
+      .in('status', UNFINISHED_STATUSES);
+
+    if (countError) throw countError;
+
+    const seasonCompleted = unfinished === 0 && season.status !== 'completed';
+    if (seasonCompleted) {
+      const { error: seasonError } = await supabaseAdmin
+        .from('league_seasons')
+        .update({ status: 'completed', completed_at: new Date().toISOString() })
+        .eq('id', season.id);
+
+      if (seasonError) throw seasonError;
+      await freezeSeason(league, season.season);
+    }
+
+    const standings = await getLeagueTable(league, season.season);
+    timings.standingsMs = performance.now() - standingsStart;
+    onProgress({ phase: 'done', simulated: completed.length, total: matches.length, round: null });
+
+    return {
+      league,
+      season: season.season,
+      simulated: completed.length,
+      skipped: scheduled.length - matches.length,
+      rounds: completed.length > 0 ? [completed[0].round, completed[completed.length - 1].round] : null,
+      chunks: Math.ceil(completed.length / CHUNK_SIZE),
+      remaining: unfinished,
+      seasonCompleted,
+      standings,
+      timings: { ...timings, totalMs: performance.now() - startedAt }
+    };
+  } catch (error) {
+    // Chunks written before the failure are completed matches that never
+    // reached the standings
+    await pendingWrite.catch(() => {});
+    if (!applied && completed.length > 0) {
+      await rebuildStandings(league, season.season).catch(rebuildError => {
+        console.error(`Error rebuilding standings of ${league} season ${season.season}:`, rebuildError);
+      });
+    }
+    throw error;
+  } finally {
+    releaseMatches([...claimed]);
+  }
+}
@@ -0,0 +1,141 @@
+import { supabaseAdmin } from '../supabase/client.js';
+
+// Season fixtures, generated lazily and written in chunks.
+//
+// roundRobinRounds() yields a double round-robin one round at a time and
+// seasonFixtures() turns the rounds of every division into match rows, so a
+// season is never held in memory: insertFixtures() pulls a chunk of rows,
+// writes it and moves on. Match ids are derived from the division, season
+// and match number, and chunks are upserted ignoring duplicates, so a retried
+// chunk or a rerun schedule never duplicates a match; it only adds the ones
+// that are missing.
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const SLOT_MS = 60 * 1000;
+const DEFAULT_CHUNK_SIZE = 1000;
+const DEFAULT_RETRIES = 3;
+const RETRY_DELAY_MS = 200;
+
+// Rounds of a double round-robin between `teamCount` teams (circle method),
+// as { round, pairs: [[home, away], ...] } with team indexes. The first team
+// stays fixed while the others rotate; with an odd count one team per round
+// has a bye. The second half repeats the first with home and away swapped.
+export function* roundRobinRounds(teamCount) {
+  const slots = teamCount % 2 === 0 ? teamCount : teamCount + 1;
+  const roundsPerHalf = slots - 1;
+  const bye = teamCount;
+
+  for (let half = 0; half < 2; half++) {
+    for (let r = 0; r < roundsPerHalf; r++) {
+      const teamAt = (position) => position === 0 ? 0 : 1 + ((position - 1 + r) % roundsPerHalf);
+      const pairs = [];
+      for (let i = 0; i < slots / 2; i++) {
+        let home = teamAt(i);
+        let away = teamAt(slots - 1 - i);
+        if (home === bye || away === bye) continue;
+        // The fixed team alternates between home and away
+        if ((i === 0 && r % 2 === 1) !== (half === 1)) [home, away] = [away, home];
+        pairs.push([home, away]);
+      }
+      yield { round: half * roundsPerHalf + r + 1, pairs };
+    }
+  }
+}
+
+// Number of matches in a double round-robin of `teamCount` teams
+export function fixtureCount(teamCount) {
+  return teamCount * (teamCount - 1);
+}
+
+function matchId(league, season, matchNumber) {
+  return `match_${league}_${season}_${matchNumber}`;
+}
+
+// Match rows for every division ({ id, teamIds }) of a season, round by
+// round: round 1 of every division, then round 2, and so on. Rows carry only
+// the columns that differ from the schema defaults; a round is played on
+// one day, its matches a minute apart.
+export function* seasonFixtures(divisions, season, { startAt = Date.now() } = {}) {
+  const schedules = divisions.map(division => ({
+    division,
+    rounds: roundRobinRounds(division.teamIds.length),
+    matchNumber: 0
+  }));
+
+  for (let active = schedules; active.length > 0;) {
+    const next = [];
+    for (const schedule of active) {
+      const { value, done } = schedule.rounds.next();
+      if (done) continue;
+      next.push(schedule);
+
+      const { division } = schedule;
+      const day = startAt + value.round * DAY_MS;
+      for (let i = 0; i < value.pairs.length; i++) {
+        const [home, away] = value.pairs[i];
+        const matchNumber = ++schedule.matchNumber;
+        yield {
+          id: matchId(division.id, season, matchNumber),
+          home_team_id: division.teamIds[home],
+          away_team_id: division.teamIds[away],
+          league: division.id,
+          season,
+          match_type: 'T20',
+          scheduled_time: new Date(day + i * SLOT_MS).toISOString(),
+          pitch_type: 'Normal',
+          weather: 'Sunny',
+          status: 'scheduled',
+          result: null,
+          round: value.round,
+          match_number: matchNumber
+        };
+      }
+    }
+    active = next;
+  }
+}
+
+function isPermanent(error) {
+  // Constraint violations, bad columns and malformed requests fail the same way again
+  return /^(23|42|PGRST2)/.test(error?.code || '');
+}
+
+async function writeChunk(rows, retries) {
+  for (let attempt = 0; ; attempt++) {
+    const { data, error } = await supabaseAdmin
+      .from('matches')
+      .upsert(rows, { onConflict: 'id', ignoreDuplicates: true })
+      .select('id');
+
+    if (!error) return { inserted: data.length, attempts: attempt + 1 };
+    if (attempt >= retries || isPermanent(error)) throw error;
+    await new Promise(resolve => setTimeout(resolve, RETRY_DELAY_MS * 2 ** attempt));
+  }
+}
+
+// Write match rows from any iterable in chunks of `chunkSize`, retrying a
+// failed chunk up to `retries` times with backoff. Returns the rows written,
+// those that already existed, the number of chunks and of retried attempts.
+// `onChunk` receives the running totals after each chunk.
+export async function insertFixtures(rows, { chunkSize = DEFAULT_CHUNK_SIZE, retries = DEFAULT_RETRIES, onChunk = () => {} } = {}) {
+  const totals = { inserted: 0, existing: 0, chunks: 0, retries: 0 };
+  let chunk = [];
+
+  const flush = async () => {
+    const { inserted, attempts } = await writeChunk(chunk, retries);
+    totals.inserted += inserted;
+    totals.existing += chunk.length - inserted;
+    totals.chunks++;
+    totals.retries += attempts - 1;
+    chunk = [];
+    onChunk(totals);
+  };
+
+  for (const row of rows) {
+    chunk.push(row);
+    if (chunk.length >= chunkSize) await flush();
+  }
+  if (chunk.length > 0) await flush();
+
+  return totals;
+}
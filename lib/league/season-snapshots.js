@@ -0,0 +1,236 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { strongETag } from '../http/etag.js';
+import { replayMatches } from '../simulation/replay.js';
+import { matchWinner, standingsFromMatches } from './standings.js';
+import { toLeagueTable } from './standings-store.js';
+
+// Completed seasons never change, so their final standings, aggregates and
+// top performers are frozen into season_snapshots when the league_seasons row
+// becomes `completed`. History reads serve the stored snapshots (and their
+// precomputed ETags) instead of regrouping every past match.
+
+const TOP_PERFORMERS = 5;
+
+export function snapshotId(league, season) {
+  return `${league}:${season}`;
+}
+
+// Most recent season first; seasons are numeric strings ('10' after '9')
+function bySeasonDesc(a, b) {
+  return (Number(b.season) - Number(a.season)) || String(b.season).localeCompare(String(a.season));
+}
+
+function inningsOf(match) {
+  const data = match.match_data || {};
+  return [
+    { innings: data.firstInnings, battingTeamId: data.firstInnings?.battingTeamId || match.home_team_id, bowlingTeamId: data.firstInnings?.bowlingTeamId || match.away_team_id },
+    { innings: data.secondInnings, battingTeamId: data.secondInnings?.battingTeamId || match.away_team_id, bowlingTeamId: data.secondInnings?.bowlingTeamId || match.home_team_id }
+  ].filter(entry => entry.innings);
+}
+
+function topBy(entries, key) {
+  return [...entries]
+    .sort((a, b) => b[key] - a[key] || a.name.localeCompare(b.name))
+    .slice(0, TOP_PERFORMERS);
+}
+
+// Season aggregates and top performers from its completed matches. Player
+// figures come from the scorecards in match_data where a match has them.
+export function summarizeSeason(matches, teamNames) {
+  const teamName = (teamId) => teamNames.get(teamId) || 'Unknown Team';
+  const batting = new Map();
+  const bowling = new Map();
+  let totalRuns = 0;
+  let ties = 0;
+  let highestTeamScore = null;
+  let lowestTeamScore = null;
+  let biggestWin = null;
+
+  for (const match of matches) {
+    const homeScore = match.home_score || 0;
+    const awayScore = match.away_score || 0;
+    totalRuns += homeScore + awayScore;
+
+    for (const [teamId, score] of [[match.home_team_id, homeScore], [match.away_team_id, awayScore]]) {
+      if (!highestTeamScore || score > highestTeamScore.score) {
+        highestTeamScore = { matchId: match.id, teamId, teamName: teamName(teamId), score };
+      }
+      if (!lowestTeamScore || score < lowestTeamScore.score) {
+        lowestTeamScore = { matchId: match.id, teamId, teamName: teamName(teamId), score };
+      }
+    }
+
+    const winner = matchWinner(match);
+    if (winner === null) {
+      ties++;
+    } else {
+      const margin = Math.abs(homeScore - awayScore);
+      if (!biggestWin || margin > biggestWin.margin) {
+        biggestWin = { matchId: match.id, teamId: winner, teamName: teamName(winner), margin };
+      }
+    }
+
+    for (const { innings, battingTeamId, bowlingTeamId } of inningsOf(match)) {
+      for (const score of innings.batsmanScores || []) {
+        if (!score?.name) continue;
+        const key = `${battingTeamId}:${score.name}`;
+        const entry = batting.get(key) || { name: score.name, teamId: battingTeamId, teamName: teamName(battingTeamId), runs: 0, innings: 0, highScore: 0 };
+        entry.runs += score.runs || 0;
+        entry.innings++;
+        entry.highScore = Math.max(entry.highScore, score.runs || 0);
+        batting.set(key, entry);
+      }
+      for (const figure of innings.bowlingFigures || []) {
+        if (!figure?.name) continue;
+        const key = `${bowlingTeamId}:${figure.name}`;
+        const entry = bowling.get(key) || { name: figure.name, teamId: bowlingTeamId, teamName: teamName(bowlingTeamId), wickets: 0, runsConceded: 0 };
+        entry.wickets += figure.wickets || 0;
+        entry.runsConceded += figure.runs || 0;
+        bowling.set(key, entry);
+      }
+    }
+  }
+
+  return {
+    aggregates: {
+      totalMatches: matches.length,
+      totalRuns,
+      averageInningsScore: matches.length > 0 ? (totalRuns / (matches.length * 2)).toFixed(1) : '0.0',
+      ties,
+      highestTeamScore,
+      lowestTeamScore,
+      biggestWin
+    },
+    topPerformers: {
+      runScorers: topBy(batting.values(), 'runs'),
+      wicketTakers: topBy(bowling.values(), 'wickets')
+    }
+  };
+}
+
+// Compute and store the snapshot of a season from its completed matches
+export async function freezeSeason(league, season) {
+  const [seasonResult, matchesResult] = await Promise.all([
+    supabaseAdmin
+      .from('league_seasons')
+      .select('teams')
+      .eq('league_id', league)
+      .eq('season', season)
+      .maybeSingle(),
+    supabaseAdmin
+      .from('matches')
+      .select('id, home_team_id, away_team_id, home_score, away_score, home_overs, away_overs, result, round, match_number, updated_at, weather, pitch_type, match_data')
+      .eq('league', league)
+      .eq('season', season)
+      .eq('status', 'completed')
+  ]);
+
+  if (seasonResult.error) throw seasonResult.error;
+  if (matchesResult.error) throw matchesResult.error;
+
+  // Matches stored with a replay record instead of scorecards are replayed
+  // (one players query for the whole season)
+  const replayed = await replayMatches(matchesResult.data.filter(match => !match.match_data?.firstInnings));
+  const matches = matchesResult.data.map(match => {
+    const detail = replayed.get(match.id);
+    return detail ? { ...match, match_data: detail.match_data } : match;
+  });
+
+  const rows = standingsFromMatches(league, season, seasonResult.data?.teams || [], matches);
+  const standings = await toLeagueTable([...rows.values()]);
+  const { aggregates, topPerformers } = summarizeSeason(matches, new Map(standings.map(team => [team.id, team.name])));
+
+  const snapshot = {
+    id: snapshotId(league, season),
+    league_id: league,
+    season,
+    standings,
+    aggregates,
+    top_performers: topPerformers,
+    etag: strongETag({ league, season, standings, aggregates, topPerformers }),
+    created_at: new Date().toISOString()
+  };
+
+  const { error } = await supabaseAdmin
+    .from('season_snapshots')
+    .upsert(snapshot, { onConflict: 'id' });
+
+  if (error) throw error;
+  return snapshot;
+}
+
+// Re-freeze a season that already has a snapshot (after a completed match of
+// it was edited or removed)
+export async function refreshSeasonSnapshot(league, season) {
+  const { data: existing, error } = await supabaseAdmin
+    .from('season_snapshots')
+    .select('id')
+    .eq('id', snapshotId(league, season))
+    .maybeSingle();
+
+  if (error) throw error;
+  if (existing) await freezeSeason(league, season);
+}
+
+export function toHistoryEntry(snapshot) {
+  return {
+    season: snapshot.season,
+    totalMatches: snapshot.aggregates?.totalMatches || 0,
+    standings: snapshot.standings,
+    aggregates: snapshot.aggregates,
+    topPerformers: snapshot.top_performers
+  };
+}
+
+// History of every completed season, most recent first, with one ETag over
+// the snapshots it is made of. Two queries whatever the number of seasons;
+// seasons completed before snapshots existed are frozen on first read.
+export async function getSeasonHistory(league) {
+  const [seasonsResult, snapshotsResult] = await Promise.all([
+    supabaseAdmin
+      .from('league_seasons')
+      .select('season')
+      .eq('league_id', league)
+      .eq('status', 'completed'),
+    supabaseAdmin
+      .from('season_snapshots')
+      .select('*')
+      .eq('league_id', league)
+  ]);
+
+  if (seasonsResult.error) throw seasonsResult.error;
+  if (snapshotsResult.error) throw snapshotsResult.error;
+
+  const snapshots = new Map(snapshotsResult.data.map(snapshot => [snapshot.season, snapshot]));
+  for (const { season } of seasonsResult.data) {
+    if (!snapshots.has(season)) snapshots.set(season, await freezeSeason(league, season));
+  }
+
+  const completed = seasonsResult.data.map(({ season }) => snapshots.get(season)).sort(bySeasonDesc);
+  return {
+    history: completed.map(toHistoryEntry),
+    etag: strongETag(completed.map(snapshot => snapshot.etag))
+  };
+}
+
+// Snapshot of one completed season, or null if the season is not completed
+export async function getSeasonSnapshot(league, season) {
+  const { data: snapshot, error } = await supabaseAdmin
+    .from('season_snapshots')
+    .select('*')
+    .eq('id', snapshotId(league, season))
+    .maybeSingle();
+
+  if (error) throw error;
+  if (snapshot) return snapshot;
+
+  const { data: seasonRow, error: seasonError } = await supabaseAdmin
+    .from('league_seasons')
+    .select('status')
+    .eq('league_id', league)
+    .eq('season', season)
+    .maybeSingle();
+
+  if (seasonError) throw seasonError;
+  return seasonRow?.status === 'completed' ? freezeSeason(league, season) : null;
+}
@@ -0,0 +1,274 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { getTeams } from './team-directory.js';
+import {
+  applyMatchToStandings,
+  completionOrder,
+  emptyStandingsRow,
+  sortLeagueTable,
+  standingsFromMatches,
+  standingsRowId,
+  toLeagueTableEntry
+} from './standings.js';
+
+// Persistent league standings (league_standings table), one row per
+// (league, season, team) holding running totals. Rows are updated as a delta
+// when matches complete; rebuildStandings/checkStandings recompute a season
+// from its completed matches.
+//
+// A delta is a read-modify-write of the season's rows, so writes to a season
+// are serialized: each waits for the previous one on a promise chain per
+// (league, season). The chains are per server process and live on globalThis
+// so route bundles that each load their own copy of this module share them.
+const LOCKS_KEY = Symbol.for('cricket-pro.league.standings-locks');
+const locks = globalThis[LOCKS_KEY] ??= new Map();
+
+const EXACT_FIELDS = ['played', 'won', 'lost', 'tied', 'points', 'runs_for', 'runs_against', 'highest_score', 'lowest_score'];
+const OVERS_FIELDS = ['overs_for', 'overs_against'];
+
+function withTimestamp(rows) {
+  const updatedAt = new Date().toISOString();
+  return rows.map(row => ({ ...row, updated_at: updatedAt }));
+}
+
+// Run `write` once every earlier write to the given seasons has finished.
+// All keys are taken in one synchronous step, so writes spanning several
+// seasons cannot deadlock.
+async function withSeasonLock(seasons, write) {
+  const keys = [...new Set(seasons.map(({ league, season }) => `${league}:${season}`))];
+  const previous = keys.map(key => locks.get(key));
+  let release;
+  const held = new Promise(resolve => { release = resolve; });
+  for (const key of keys) locks.set(key, held);
+
+  await Promise.all(previous);
+  try {
+    return await write();
+  } finally {
+    release();
+    for (const key of keys) {
+      if (locks.get(key) === held) locks.delete(key);
+    }
+  }
+}
+
+// Zero rows for every team of a new season, leaving existing rows untouched
+export async function initializeStandings(league, season, teamIds) {
+  if (teamIds.length === 0) return;
+
+  const { error } = await supabaseAdmin
+    .from('league_standings')
+    .upsert(withTimestamp(teamIds.map(teamId => emptyStandingsRow(league, season, teamId))), {
+      onConflict: 'id',
+      ignoreDuplicates: true
+    });
+
+  if (error) throw error;
+}
+
+// Apply matches that just moved to `completed`: one read of the affected
+// rows and one bulk upsert, whatever the number of matches
+export async function applyCompletedMatches(matches) {
+  const ordered = [...matches].sort(completionOrder);
+  const ids = [...new Set(ordered.flatMap(match => [
+    standingsRowId(match.league, match.season, match.home_team_id),
+    standingsRowId(match.league, match.season, match.away_team_id)
+  ]))];
+
+  if (ids.length === 0) return [];
+
+  return withSeasonLock(ordered, () => writeCompletedMatches(ordered, ids));
+}
+
+async function writeCompletedMatches(ordered, ids) {
+  const { data: existing, error } = await supabaseAdmin
+    .from('league_standings')
+    .select('*')
+    .in('id', ids);
+
+  if (error) throw error;
+
+  const rows = new Map(existing.map(row => [row.id, row]));
+  for (const match of ordered) {
+    for (const teamId of [match.home_team_id, match.away_team_id]) {
+      const id = standingsRowId(match.league, match.season, teamId);
+      if (!rows.has(id)) rows.set(id, emptyStandingsRow(match.league, match.season, teamId));
+      applyMatchToStandings(rows.get(id), match);
+    }
+  }
+
+  const updated = withTimestamp([...rows.values()]);
+  const { error: upsertError } = await supabaseAdmin
+    .from('league_standings')
+    .upsert(updated, { onConflict: 'id' });
+
+  if (upsertError) throw upsertError;
+  return updated;
+}
+
+// League table entries for stored rows, named through the team directory
+export async function toLeagueTable(rows) {
+  const teams = await getTeams(rows.map(row => row.team_id));
+  return sortLeagueTable(rows.map(row => toLeagueTableEntry(row, teams.get(row.team_id)?.team_name)));
+}
+
+// Read a season's table: one indexed query on (league, season)
+export async function getLeagueTable(league, season) {
+  const { data: rows, error } = await supabaseAdmin
+    .from('league_standings')
+    .select('*')
+    .eq('league', league)
+    .eq('season', season);
+
+  if (error) throw error;
+  return toLeagueTable(rows);
+}
+
+// The league's active season, or '1' before any season has started
+export async function getCurrentSeason(league = 'default') {
+  const { data: activeSeason, error } = await supabaseAdmin
+    .from('league_seasons')
+    .select('season')
+    .eq('league_id', league)
+    .eq('status', 'active')
+    .maybeSingle();
+
+  if (error) throw error;
+  return activeSeason?.season || '1';
+}
+
+// Table of the league's active season (season '1' before any season has
+// started): { leagueTable, season, totalMatches }
+export async function getCurrentLeagueTable(league = 'default') {
+  const season = await getCurrentSeason(league);
+  const leagueTable = await getLeagueTable(league, season);
+
+  return {
+    leagueTable,
+    season,
+    totalMatches: leagueTable.reduce((sum, team) => sum + team.played, 0) / 2
+  };
+}
+
+// Expected rows for a season, recomputed from all of its completed matches.
+// Every registered team plays the default league, so its current season also
+// holds a row for teams registered since the season started.
+export async function recomputeStandings(league, season) {
+  const [seasonResult, matchesResult] = await Promise.all([
+    supabaseAdmin
+      .from('league_seasons')
+      .select('teams, status')
+      .eq('league_id', league)
+      .eq('season', season)
+      .maybeSingle(),
+    supabaseAdmin
+      .from('matches')
+      .select('id, league, season, home_team_id, away_team_id, home_score, away_score, home_overs, away_overs, result, round, match_number, updated_at')
+      .eq('league', league)
+      .eq('season', season)
+      .eq('status', 'completed')
+  ]);
+
+  if (seasonResult.error) throw seasonResult.error;
+  if (matchesResult.error) throw matchesResult.error;
+
+  const teamIds = [...(seasonResult.data?.teams || [])];
+  const isCurrent = seasonResult.data ? seasonResult.data.status === 'active' : season === '1';
+  if (league === 'default' && isCurrent) {
+    const { data: users, error } = await supabaseAdmin
+      .from('users')
+      .select('id');
+
+    if (error) throw error;
+    teamIds.push(...users.map(user => user.id));
+  }
+
+  return standingsFromMatches(league, season, teamIds, matchesResult.data);
+}
+
+// Replace a season's stored rows with a full recomputation
+export async function rebuildStandings(league, season) {
+  return withSeasonLock([{ league, season }], () => writeRebuiltStandings(league, season));
+}
+
+async function writeRebuiltStandings(league, season) {
+  const [expectedRows, storedResult] = await Promise.all([
+    recomputeStandings(league, season),
+    supabaseAdmin
+      .from('league_standings')
+      .select('id, team_id')
+      .eq('league', league)
+      .eq('season', season)
+  ]);
+
+  if (storedResult.error) throw storedResult.error;
+
+  const expected = [...expectedRows.values()];
+  if (expected.length > 0) {
+    const { error } = await supabaseAdmin
+      .from('league_standings')
+      .upsert(withTimestamp(expected), { onConflict: 'id' });
+
+    if (error) throw error;
+  }
+
+  // Drop rows of teams that no longer belong to the season
+  const stale = storedResult.data.filter(row => !expectedRows.has(row.team_id)).map(row => row.id);
+  if (stale.length > 0) {
+    const { error: deleteError } = await supabaseAdmin
+      .from('league_standings')
+      .delete()
+      .eq('league', league)
+      .eq('season', season)
+      .in('id', stale);
+
+    if (deleteError) throw deleteError;
+  }
+
+  return { league, season, teams: expected.length };
+}
+
+// Compare stored rows against a full recomputation
+export async function checkStandings(league, season) {
+  const [expectedRows, storedResult] = await Promise.all([
+    recomputeStandings(league, season),
+    supabaseAdmin
+      .from('league_standings')
+      .select('*')
+      .eq('league', league)
+      .eq('season', season)
+  ]);
+
+  if (storedResult.error) throw storedResult.error;
+
+  const stored = new Map(storedResult.data.map(row => [row.team_id, row]));
+  const mismatches = [];
+
+  for (const [teamId, expected] of expectedRows) {
+    const actual = stored.get(teamId);
+    if (!actual) {
+      mismatches.push({ teamId, field: 'row', stored: null, expected: 'present' });
+      continue;
+    }
+    for (const field of EXACT_FIELDS) {
+      if ((actual[field] ?? null) !== (expected[field] ?? null)) {
+        mismatches.push({ teamId, field, stored: actual[field], expected: expected[field] });
+      }
+    }
+    for (const field of OVERS_FIELDS) {
+      if (Math.abs((actual[field] || 0) - expected[field]) > 1e-6) {
+        mismatches.push({ teamId, field, stored: actual[field], expected: expected[field] });
+      }
+    }
+    if (JSON.stringify(actual.form || []) !== JSON.stringify(expected.form)) {
+      mismatches.push({ teamId, field: 'form', stored: actual.form, expected: expected.form });
+    }
+  }
+
+  for (const teamId of stored.keys()) {
+    if (!expectedRows.has(teamId)) {
+      mismatches.push({ teamId, field: 'row', stored: 'present', expected: null });
+    }
+  }
+
+  return { league, season, teams: expectedRows.size, consistent: mismatches.length === 0, mismatches };
+}
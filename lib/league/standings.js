@@ -0,0 +1,143 @@
+export const WIN_POINTS = 4;
+export const TIE_POINTS = 2;
+export const FORM_LENGTH = 5;
+
+// Winner of a completed match: the team id stored in `result` when there is
+// one, otherwise decided on the scores. Returns null for a tie.
+export function matchWinner(match) {
+  if (match.result === match.home_team_id || match.result === match.away_team_id) return match.result;
+  if (match.home_score > match.away_score) return match.home_team_id;
+  if (match.away_score > match.home_score) return match.away_team_id;
+  return null;
+}
+
+// Order in which completed matches enter the table (drives the form window)
+export function completionOrder(a, b) {
+  return String(a.updated_at || '').localeCompare(String(b.updated_at || ''))
+    || (a.round || 0) - (b.round || 0)
+    || (a.match_number || 0) - (b.match_number || 0)
+    || String(a.id).localeCompare(String(b.id));
+}
+
+export function standingsRowId(league, season, teamId) {
+  return `${league}:${season}:${teamId}`;
+}
+
+// Running totals of one team in one season, as stored in league_standings
+export function emptyStandingsRow(league, season, teamId) {
+  return {
+    id: standingsRowId(league, season, teamId),
+    league,
+    season,
+    team_id: teamId,
+    played: 0,
+    won: 0,
+    lost: 0,
+    tied: 0,
+    points: 0,
+    runs_for: 0,
+    runs_against: 0,
+    overs_for: 0,
+    overs_against: 0,
+    highest_score: null,
+    lowest_score: null,
+    form: []
+  };
+}
+
+// Add one completed match to a team's running totals
+export function applyMatchToStandings(row, match) {
+  const isHome = match.home_team_id === row.team_id;
+  const scored = (isHome ? match.home_score : match.away_score) || 0;
+  const conceded = (isHome ? match.away_score : match.home_score) || 0;
+  const winner = matchWinner(match);
+
+  row.played++;
+  row.runs_for += scored;
+  row.runs_against += conceded;
+  row.overs_for += (isHome ? match.home_overs : match.away_overs) || 20;
+  row.overs_against += (isHome ? match.away_overs : match.home_overs) || 20;
+  row.highest_score = Math.max(row.highest_score ?? 0, scored);
+  row.lowest_score = row.lowest_score === null ? scored : Math.min(row.lowest_score, scored);
+
+  let result;
+  if (winner === row.team_id) {
+    row.won++;
+    row.points += WIN_POINTS;
+    result = 'W';
+  } else if (winner === null) {
+    row.tied++;
+    row.points += TIE_POINTS;
+    result = 'T';
+  } else {
+    row.lost++;
+    result = 'L';
+  }
+
+  // Most recent result first
+  row.form = [result, ...(row.form || [])].slice(0, FORM_LENGTH);
+  return row;
+}
+
+// Full recomputation of a season's rows from its completed matches
+export function standingsFromMatches(league, season, teamIds, completedMatches) {
+  const rows = new Map();
+  const rowFor = (teamId) => {
+    if (!rows.has(teamId)) rows.set(teamId, emptyStandingsRow(league, season, teamId));
+    return rows.get(teamId);
+  };
+
+  teamIds.forEach(rowFor);
+  for (const match of [...completedMatches].sort(completionOrder)) {
+    applyMatchToStandings(rowFor(match.home_team_id), match);
+    applyMatchToStandings(rowFor(match.away_team_id), match);
+  }
+
+  return rows;
+}
+
+// League table entry (the shape the API returns) from a stored row
+export function toLeagueTableEntry(row, teamName) {
+  const runRateFor = row.overs_for > 0 ? row.runs_for / row.overs_for : 0;
+  const runRateAgainst = row.overs_against > 0 ? row.runs_against / row.overs_against : 0;
+
+  return {
+    id: row.team_id,
+    name: teamName || 'Unknown Team',
+    played: row.played,
+    won: row.won,
+    lost: row.lost,
+    tied: row.tied,
+    points: row.points,
+    netRunRate: (runRateFor - runRateAgainst).toFixed(3),
+    runsFor: row.runs_for,
+    runsAgainst: row.runs_against,
+    oversFor: row.overs_for,
+    oversAgainst: row.overs_against,
+    highestScore: row.highest_score ?? 0,
+    lowestScore: row.lowest_score ?? 0,
+    averageScore: row.played > 0 ? (row.runs_for / row.played).toFixed(1) : '0.0',
+    winPercentage: row.played > 0 ? ((row.won / row.played) * 100).toFixed(1) : '0.0',
+    form: row.form || []
+  };
+}
+
+// Sort by points (descending), then by net run rate (descending)
+export function sortLeagueTable(leagueTable) {
+  return leagueTable.sort((a, b) => {
+    if (b.points !== a.points) return b.points - a.points;
+    return parseFloat(b.netRunRate) - parseFloat(a.netRunRate);
+  });
+}
+
+// Helper function to calculate league standings from scratch
+export function calculateLeagueStandings(allUsers, seasonMatches) {
+  const teamIds = new Set(allUsers.map(user => user.id));
+  const names = new Map(allUsers.map(user => [user.id, user.team_name]));
+
+  // Skip matches involving teams that no longer exist
+  const matches = seasonMatches.filter(match => teamIds.has(match.home_team_id) && teamIds.has(match.away_team_id));
+  const rows = standingsFromMatches(null, null, [...teamIds], matches);
+
+  return sortLeagueTable([...rows.values()].map(row => toLeagueTableEntry(row, names.get(row.team_id))));
+}
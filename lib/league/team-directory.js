@@ -0,0 +1,56 @@
+import { supabaseAdmin } from '../supabase/client.js';
+
+const TEAM_CACHE_TTL_MS = 5 * 60 * 1000;
+
+// id -> { team, expiresAt }, kept on globalThis so every route bundle in the
+// process shares (and invalidates) the same directory
+const CACHE_KEY = Symbol.for('cricket-pro.team-directory');
+
+function getCache() {
+  return globalThis[CACHE_KEY] ??= new Map();
+}
+
+// Look up { id, team_name, country } for a set of team ids. Fresh entries are
+// served from memory; the rest are fetched with a single in() query.
+export async function getTeams(teamIds) {
+  const cache = getCache();
+  const now = Date.now();
+  const teams = new Map();
+  const missing = [];
+
+  for (const id of new Set(teamIds)) {
+    if (!id) continue;
+    const entry = cache.get(id);
+    if (entry && entry.expiresAt > now) {
+      teams.set(id, entry.team);
+    } else {
+      missing.push(id);
+    }
+  }
+
+  if (missing.length > 0) {
+    const { data, error } = await supabaseAdmin
+      .from('users')
+      .select('id, team_name, country')
+      .in('id', missing);
+
+    if (error) throw error;
+
+    for (const team of data) {
+      cache.set(team.id, { team, expiresAt: now + TEAM_CACHE_TTL_MS });
+      teams.set(team.id, team);
+    }
+  }
+
+  return teams;
+}
+
+// Drop cached entries for the given teams, or the whole directory
+export function invalidateTeams(teamIds = null) {
+  const cache = getCache();
+  if (!teamIds) {
+    cache.clear();
+    return;
+  }
+  for (const id of teamIds) cache.delete(id);
+}
@@ -0,0 +1,346 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { encodeComment, encodeEvent } from '../http/sse.js';
+import { simulateOffThread } from '../jobs/simulation-queue.js';
+import { applyCompletedMatches } from '../league/standings-store.js';
+import { getTeams } from '../league/team-directory.js';
+import { inningsTotals } from '../simulation/ball-log.js';
+import { matchResultColumns } from '../simulation/match.js';
+import { loadPlayingXIs } from '../simulation/squads.js';
+import { buildTimeline, releasedAt, scoreboardAt } from './timeline.js';
+
+// Live match feeds for GET /api/matches/:id/stream.
+//
+// A live match is simulated when it starts; its ball logs are stored and one
+// producer per match then releases the match timeline (./timeline.js) a
+// delivery at a time. Every event is encoded once and the same bytes are
+// enqueued on each subscriber's stream, so a subscriber costs a stream and
+// its queue. Progress is written to the current_* columns at the end of each
+// over, which is where a feed restored after a restart picks up from.
+//
+// Feeds are per server process; the registry lives on globalThis so route
+// bundles that each load their own copy of this module share it.
+const FEEDS_KEY = Symbol.for('cricket-pro.live.feeds');
+const feeds = globalThis[FEEDS_KEY] ??= new Map();
+
+const HEARTBEAT_MS = 15000;
+const IDLE_FEED_MS = 60000;
+// A subscriber this far behind is disconnected; its EventSource reconnects
+// with Last-Event-ID and catches up from the timeline
+const MAX_QUEUED_BYTES = 1024 * 1024;
+
+const FEED_COLUMNS = 'id, home_team_id, away_team_id, league, season, status, result, current_innings, current_over, current_ball, ball_log';
+
+export function ballIntervalMs() {
+  return Number(process.env.LIVE_BALL_INTERVAL_MS) || 2000;
+}
+
+class MatchFeed {
+  constructor(match) {
+    this.match = match;
+    this.status = match.status;
+    this.timeline = null;
+    this.released = 0;
+    this.completion = null;
+    this.subscribers = new Set();
+    this.timer = null;
+    this.heartbeat = null;
+    this.idle = null;
+    this.writes = Promise.resolve();
+  }
+
+  // `completion` holds the columns written when the last entry is released
+  load(ballLogs, completion) {
+    this.timeline = buildTimeline(this.match, ballLogs, completion.result);
+    this.completion = completion;
+    this.released = 0;
+  }
+
+  get finished() {
+    return this.status === 'completed' && (!this.timeline || this.released === this.timeline.length);
+  }
+
+  snapshot() {
+    return {
+      matchId: this.match.id,
+      status: this.status,
+      lastEventId: this.released,
+      ...scoreboardAt(this.timeline || [], this.released)
+    };
+  }
+
+  frame(entry) {
+    entry.bytes ??= encodeEvent(entry);
+    return entry.bytes;
+  }
+
+  // Stream of a new subscriber: a snapshot of the scoreboard, the timeline
+  // after `lastId` (when given) and then every event as it is released.
+  // Streams of a finished match end after the replay.
+  subscribe(lastId, signal = null) {
+    let subscriber = null;
+    const stream = new ReadableStream({
+      start: (controller) => {
+        controller.enqueue(encodeEvent({ event: 'snapshot', data: this.snapshot() }));
+        if (lastId !== null && this.timeline) {
+          for (let i = lastId; i < this.released; i++) controller.enqueue(this.frame(this.timeline[i]));
+        }
+        if (this.finished) {
+          controller.close();
+          return;
+        }
+        subscriber = controller;
+        this.subscribers.add(controller);
+        this.keepAlive();
+      },
+      cancel: () => this.unsubscribe(subscriber)
+    }, new ByteLengthQueuingStrategy({ highWaterMark: MAX_QUEUED_BYTES }));
+
+    signal?.addEventListener('abort', () => this.unsubscribe(subscriber), { once: true });
+    return stream;
+  }
+
+  unsubscribe(controller) {
+    if (!controller || !this.subscribers.delete(controller)) return;
+    try {
+      controller.close();
+    } catch {
+      // already closed or cancelled by the client
+    }
+    this.keepAlive();
+  }
+
+  broadcast(bytes) {
+    for (const controller of this.subscribers) {
+      try {
+        controller.enqueue(bytes);
+        if (controller.desiredSize < 0) this.unsubscribe(controller);
+      } catch {
+        this.subscribers.delete(controller);
+      }
+    }
+  }
+
+  // Heartbeats while anyone listens; an idle feed is dropped from the registry
+  keepAlive() {
+    if (this.subscribers.size > 0) {
+      clearTimeout(this.idle);
+      this.idle = null;
+      this.heartbeat ??= setInterval(() => this.broadcast(encodeComment('ping')), HEARTBEAT_MS);
+      this.heartbeat.unref?.();
+      return;
+    }
+    clearInterval(this.heartbeat);
+    this.heartbeat = null;
+    if (!this.timer && !this.idle) {
+      this.idle = setTimeout(() => {
+        if (feeds.get(this.match.id)?.feed === this) feeds.delete(this.match.id);
+      }, IDLE_FEED_MS);
+      this.idle.unref?.();
+    }
+  }
+
+  release() {
+    const entry = this.timeline[this.released++];
+    entry.releasedAt = Date.now();
+    this.broadcast(this.frame(entry));
+    return entry;
+  }
+
+  // One step of the producer: an innings state change, or a delivery together
+  // with its scoreboard delta
+  tick() {
+    const entry = this.release();
+    if (entry.event === 'ball') {
+      const score = this.release();
+      const next = this.timeline[this.released];
+      if (score.delivered % 6 === 0 || next?.event === 'state') this.persistProgress();
+    }
+    if (this.released === this.timeline.length) this.complete();
+  }
+
+  start() {
+    if (this.timer || !this.timeline) return;
+    this.status = 'in-progress';
+    clearTimeout(this.idle);
+    this.idle = null;
+    this.timer = setInterval(() => this.tick(), ballIntervalMs());
+    this.tick();
+  }
+
+  stop() {
+    clearInterval(this.timer);
+    this.timer = null;
+  }
+
+  pause() {
+    if (!this.timer) return;
+    this.stop();
+    this.status = 'paused';
+    this.broadcast(encodeEvent({ event: 'state', data: { status: 'paused' } }));
+    this.persistProgress();
+    this.keepAlive();
+  }
+
+  resume() {
+    if (this.status === 'completed' || this.timer) return;
+    this.broadcast(encodeEvent({ event: 'state', data: { status: 'in-progress' } }));
+    this.start();
+  }
+
+  // Writes are chained so progress updates land in order
+  write(task) {
+    this.writes = this.writes.then(task).catch(error => {
+      console.error(`Error writing live progress of match ${this.match.id}:`, error);
+    });
+    return this.writes;
+  }
+
+  persistProgress() {
+    const last = this.timeline[this.released - 1];
+    const board = scoreboardAt(this.timeline, this.released);
+    const delivered = last?.delivered || 0;
+    const progress = {
+      current_innings: String(last?.innings || 1),
+      current_over: Math.floor(delivered / 6),
+      current_ball: delivered % 6,
+      current_runs: board.runs,
+      current_wickets: board.wickets
+    };
+
+    return this.write(async () => {
+      const { error } = await supabaseAdmin.from('matches').update(progress).eq('id', this.match.id);
+      if (error) throw error;
+    });
+  }
+
+  complete() {
+    this.stop();
+    this.status = 'completed';
+    const columns = { ...this.completion, updated_at: new Date().toISOString() };
+    for (const controller of [...this.subscribers]) this.unsubscribe(controller);
+
+    return this.write(async () => {
+      const { error } = await supabaseAdmin.from('matches').update(columns).eq('id', this.match.id);
+      if (error) throw error;
+      await applyCompletedMatches([{ ...this.match, ...columns }]);
+    });
+  }
+}
+
+// Feed of a match that is not in the registry: restored from its stored ball
+// logs and live position, or waiting for the match to start. A feed restored
+// mid-match completes with the result derived from the logs (its scorecards
+// were only held by the process that started the match).
+async function loadFeed(matchId) {
+  const { data: match, error } = await supabaseAdmin
+    .from('matches')
+    .select(FEED_COLUMNS)
+    .eq('id', matchId)
+    .maybeSingle();
+
+  if (error) throw error;
+  if (!match) return null;
+
+  const { ball_log: ballLogs, ...columns } = match;
+  const feed = new MatchFeed(columns);
+  if (!Array.isArray(ballLogs) || ballLogs.length === 0) return feed;
+
+  if (match.status === 'completed') {
+    feed.load(ballLogs, { result: match.result });
+    feed.released = feed.timeline.length;
+    return feed;
+  }
+
+  const teams = await getTeams([match.home_team_id, match.away_team_id]);
+  const [first, second] = ballLogs.map(inningsTotals);
+  feed.load(ballLogs, matchResultColumns(match, first, second, teams));
+  feed.released = releasedAt(feed.timeline, Number(match.current_innings) || 1, (match.current_over || 0) * 6 + (match.current_ball || 0));
+  if (match.status === 'in-progress') feed.start();
+  return feed;
+}
+
+function register(matchId, pending) {
+  const slot = { pending, feed: null };
+  feeds.set(matchId, slot);
+  pending.then(
+    feed => {
+      slot.feed = feed;
+      if (!feed && feeds.get(matchId) === slot) feeds.delete(matchId);
+    },
+    () => {
+      if (feeds.get(matchId) === slot) feeds.delete(matchId);
+    }
+  );
+  return pending;
+}
+
+function getFeed(matchId) {
+  return feeds.get(matchId)?.pending ?? register(matchId, loadFeed(matchId));
+}
+
+// Stream of a match's live events, or null when the match does not exist.
+// `lastId` is the Last-Event-ID to resume after (0 replays the whole match).
+export async function subscribeToMatch(matchId, lastId = null, signal = null) {
+  const feed = await getFeed(matchId);
+  return feed ? feed.subscribe(lastId, signal) : null;
+}
+
+// Simulate a scheduled match, store its ball logs and start releasing it.
+// Subscribers already waiting on the match's feed receive it from the start.
+export async function startLiveMatch(match) {
+  const existing = await feeds.get(match.id)?.pending;
+  const feed = existing || new MatchFeed(match);
+  if (!existing) register(match.id, Promise.resolve(feed));
+
+  const teamIds = [match.home_team_id, match.away_team_id];
+  const [squads, teams] = await Promise.all([loadPlayingXIs(teamIds), getTeams(teamIds)]);
+  const { ball_log: ballLogs, ...completion } = await simulateOffThread(match, squads, teams);
+
+  const { error } = await supabaseAdmin
+    .from('matches')
+    .update({
+      status: 'in-progress',
+      current_innings: '1',
+      current_over: 0,
+      current_ball: 0,
+      current_runs: 0,
+      current_wickets: 0,
+      live_commentary: [],
+      ball_log: ballLogs,
+      started_at: new Date().toISOString()
+    })
+    .eq('id', match.id);
+
+  if (error) throw error;
+
+  feed.load(ballLogs, completion);
+  feed.start();
+  return feed;
+}
+
+export async function pauseLiveMatch(matchId) {
+  const feed = await feeds.get(matchId)?.pending;
+  if (feed) {
+    feed.pause();
+    await feed.writes;
+  }
+}
+
+// Resume releasing a paused match (restoring its feed if this process has none)
+export async function resumeLiveMatch(matchId) {
+  const feed = await getFeed(matchId);
+  feed?.resume();
+}
+
+// Subscribers, released events and release times of a match's feed
+export function liveFeedStats(matchId) {
+  const feed = feeds.get(matchId)?.feed;
+  if (!feed) return null;
+  return {
+    status: feed.status,
+    subscribers: feed.subscribers.size,
+    released: feed.released,
+    total: feed.timeline?.length || 0,
+    releasedAt: feed.timeline ? feed.timeline.slice(0, feed.released).map(entry => entry.releasedAt ?? null) : []
+  };
+}
@@ -0,0 +1,111 @@
+import { iterateBalls, withCommentary } from '../simulation/ball-log.js';
+
+// Event timeline of a match, derived from its ball logs alone so that a live
+// feed, a feed restored after a restart and the replay of a completed match
+// all number their events identically:
+//
+//   state (innings 1 starts), then per delivery a `ball` event and a `score`
+//   delta, state (innings 2 starts, with the target), ..., state (completed)
+//
+// Event ids are positions in this timeline (1-based), which is what
+// Last-Event-ID resumes from. Pause and resume are not part of it.
+
+const SCOREBOARD_FIELDS = ['runs', 'wickets', 'overs', 'runRate', 'requiredRunRate', 'ballsLeft'];
+
+function oversOf(balls) {
+  return `${Math.floor(balls / 6)}.${balls % 6}`;
+}
+
+function scoreboardOf(ball) {
+  return {
+    runs: ball.totalRuns,
+    wickets: ball.wickets,
+    overs: oversOf(ball.index),
+    runRate: ball.currentRunRate,
+    requiredRunRate: ball.requiredRunRate,
+    ballsLeft: ball.ballsLeft
+  };
+}
+
+// Fields of `next` that differ from `previous`
+function scoreboardDelta(previous, next) {
+  const delta = {};
+  for (const field of SCOREBOARD_FIELDS) {
+    if (!previous || previous[field] !== next[field]) delta[field] = next[field];
+  }
+  return delta;
+}
+
+// Timeline entries { id, event, data, innings, delivered }, where `delivered`
+// is the number of balls of `innings` bowled once the entry is released (the
+// completion entry comes after the last innings).
+// `result` is the result column written when the match completes.
+export function buildTimeline(match, ballLogs, result) {
+  const entries = [];
+  const push = (event, data, innings, delivered) => {
+    entries.push({ id: entries.length + 1, event, data, innings, delivered });
+  };
+  const sides = [
+    { battingTeamId: match.home_team_id, bowlingTeamId: match.away_team_id },
+    { battingTeamId: match.away_team_id, bowlingTeamId: match.home_team_id }
+  ];
+  const totals = [];
+
+  ballLogs.forEach((log, i) => {
+    const innings = i + 1;
+    push('state', {
+      status: 'in-progress',
+      innings,
+      ...sides[i],
+      target: innings === 2 ? (totals[0]?.runs ?? 0) + 1 : null
+    }, innings, 0);
+
+    let scoreboard = null;
+    for (const ball of iterateBalls(log)) {
+      const next = scoreboardOf(ball);
+      push('ball', { innings, ...withCommentary(log, ball) }, innings, ball.index);
+      push('score', { innings, ...scoreboardDelta(scoreboard, next) }, innings, ball.index);
+      scoreboard = next;
+    }
+    totals.push(scoreboard || { runs: 0, wickets: 0, overs: '0.0' });
+  });
+
+  const [home, away] = totals;
+  push('state', {
+    status: 'completed',
+    homeScore: home?.runs ?? 0,
+    homeWickets: home?.wickets ?? 0,
+    awayScore: away?.runs ?? 0,
+    awayWickets: away?.wickets ?? 0,
+    result
+  }, ballLogs.length + 1, 0);
+
+  return entries;
+}
+
+// Number of timeline entries released at a persisted live position:
+// `delivered` balls of `innings` bowled (0 when the innings has just begun)
+export function releasedAt(timeline, innings, delivered) {
+  let released = 0;
+  for (const entry of timeline) {
+    if (entry.innings > innings || (entry.innings === innings && entry.delivered > delivered)) break;
+    released++;
+  }
+  return released;
+}
+
+// Scoreboard of the match after the first `released` entries, sent to every
+// subscriber when it connects
+export function scoreboardAt(timeline, released) {
+  const board = { innings: null, target: null, runs: 0, wickets: 0, overs: '0.0', runRate: 0, requiredRunRate: null, ballsLeft: null };
+  for (let i = 0; i < released; i++) {
+    const { event, data } = timeline[i];
+    if (event === 'state' && data.status === 'in-progress') {
+      Object.assign(board, { innings: data.innings, target: data.target, runs: 0, wickets: 0, overs: '0.0', runRate: 0, requiredRunRate: null, ballsLeft: null });
+    } else if (event === 'score') {
+      const { innings, ...delta } = data;
+      Object.assign(board, delta);
+    }
+  }
+  return board;
+}
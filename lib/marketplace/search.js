@@ -0,0 +1,154 @@
+import { supabaseAdmin } from '../supabase/client.js';
+
+// Marketplace search: players for sale filtered on skills, age, price,
+// bowler type and nationality, sorted by rating, price or value and paged
+// with a keyset cursor.
+//
+// A page is read with `limit + 1` rows after the cursor, never with an
+// offset, so every page costs the same however deep it is. Each sort pairs
+// its column with the player id, which makes the order total and lets the
+// partial (sort column, id) indexes on listed players in schema.sql serve it
+// in either direction. The sort columns are nullable; a null sorts as in
+// Postgres and those indexes, above every value: last going up, first going
+// down.
+
+export const SORTS = {
+  rating: { column: 'rating', ascending: false },
+  price: { column: 'sale_price', ascending: true },
+  value: { column: 'market_value', ascending: false }
+};
+
+// Columns with _min / _max range filters
+export const RANGE_FILTERS = [
+  'batting', 'bowling', 'keeping', 'technique', 'fielding', 'endurance', 'power', 'captaincy',
+  'rating', 'age', 'sale_price', 'market_value'
+];
+
+// Columns matched against one value or a comma-separated list
+export const LIST_FILTERS = ['bowler_type', 'nationality', 'batting_style'];
+
+// What a marketplace card shows, unless `fields` asks for other columns
+export const CARD_COLUMNS = [
+  'id', 'user_id', 'name', 'age', 'nationality', 'batting_style', 'bowler_type',
+  'batting', 'bowling', 'keeping', 'captaincy', 'rating', 'market_value', 'sale_price'
+];
+
+const SELECTABLE_COLUMNS = new Set([
+  ...CARD_COLUMNS, 'technique', 'fielding', 'endurance', 'power', 'experience', 'form', 'fatigue',
+  'wage', 'talents', 'squad_type', 'is_for_sale', 'created_at', 'updated_at'
+]);
+
+export const DEFAULT_PAGE_SIZE = 24;
+export const MAX_PAGE_SIZE = 100;
+
+export function encodeCursor(value, id) {
+  return Buffer.from(JSON.stringify([value, id])).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+  try {
+    const decoded = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (Array.isArray(decoded) && decoded.length === 2 && (decoded[0] === null || Number.isFinite(decoded[0]))
+      && typeof decoded[1] === 'string' && /^[\w-]+$/.test(decoded[1])) {
+      return decoded;
+    }
+  } catch {
+    // fall through to the invalid cursor error
+  }
+  return null;
+}
+
+function parseInteger(searchParams, name) {
+  const raw = searchParams.get(name);
+  if (raw === null || raw === '') return { value: null };
+  const value = Number(raw);
+  return Number.isInteger(value) ? { value } : { error: `${name} must be an integer` };
+}
+
+// Validate the query string of a search. Returns { search } or { error }.
+export function parseSearch(searchParams) {
+  const sortName = searchParams.get('sort') || 'rating';
+  const sort = SORTS[sortName];
+  if (!sort) return { error: `sort must be one of ${Object.keys(SORTS).join(', ')}` };
+
+  const order = searchParams.get('order');
+  if (order && order !== 'asc' && order !== 'desc') return { error: 'order must be asc or desc' };
+  const ascending = order ? order === 'asc' : sort.ascending;
+
+  const limit = parseInteger(searchParams, 'limit');
+  if (limit.error) return limit;
+  const pageSize = Math.min(Math.max(limit.value ?? DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+
+  const ranges = [];
+  for (const column of RANGE_FILTERS) {
+    for (const bound of ['min', 'max']) {
+      const parsed = parseInteger(searchParams, `${column}_${bound}`);
+      if (parsed.error) return parsed;
+      if (parsed.value !== null) ranges.push({ column, op: bound === 'min' ? 'gte' : 'lte', value: parsed.value });
+    }
+  }
+
+  const lists = [];
+  for (const column of LIST_FILTERS) {
+    const raw = searchParams.get(column);
+    if (raw) lists.push({ column, values: raw.split(',').map(value => value.trim()).filter(Boolean) });
+  }
+
+  let columns = CARD_COLUMNS;
+  const fields = searchParams.get('fields');
+  if (fields) {
+    const requested = fields.split(',').map(field => field.trim()).filter(Boolean);
+    const unknown = requested.filter(field => !SELECTABLE_COLUMNS.has(field));
+    if (unknown.length > 0) return { error: `Unknown fields: ${unknown.join(', ')}` };
+    // The cursor is built from the id and the sort column
+    columns = [...new Set(['id', sort.column, ...requested])];
+  }
+
+  let after = null;
+  const cursor = searchParams.get('cursor');
+  if (cursor) {
+    after = decodeCursor(cursor);
+    if (!after) return { error: 'Invalid cursor' };
+  }
+
+  return { search: { sort: sortName, column: sort.column, ascending, pageSize, ranges, lists, columns, after } };
+}
+
+// One page of listed players for a parsed search: { players, nextCursor },
+// where nextCursor is null on the last page
+export async function searchMarketplace({ column, ascending, pageSize, ranges, lists, columns, after }) {
+  let query = supabaseAdmin
+    .from('players')
+    .select(columns.join(', '))
+    .eq('is_for_sale', true);
+
+  for (const { column: filterColumn, op, value } of ranges) query = query[op](filterColumn, value);
+  for (const { column: filterColumn, values } of lists) {
+    query = values.length === 1 ? query.eq(filterColumn, values[0]) : query.in(filterColumn, values);
+  }
+
+  // Rows strictly after the cursor in (column, id) order, nulls highest
+  if (after) {
+    const [value, id] = after;
+    const op = ascending ? 'gt' : 'lt';
+    const sameValue = value === null ? `${column}.is.null` : `${column}.eq.${value}`;
+    const beyond = value === null
+      ? (ascending ? [] : [`${column}.not.is.null`])
+      : [`${column}.${op}.${value}`, ...(ascending ? [`${column}.is.null`] : [])];
+    query = query.or([...beyond, `and(${sameValue},id.${op}.${id})`].join(','));
+  }
+
+  const { data, error } = await query
+    .order(column, { ascending })
+    .order('id', { ascending })
+    .limit(pageSize + 1);
+
+  if (error) throw error;
+
+  const players = data.slice(0, pageSize);
+  const last = players[players.length - 1];
+  return {
+    players,
+    nextCursor: data.length > pageSize ? encodeCursor(last[column], last.id) : null
+  };
+}
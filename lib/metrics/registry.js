@@ -0,0 +1,176 @@
+// Per-route request metrics, rendered in the Prometheus text format.
+//
+// Every instrumented request (see ./route.js) adds its latency and query
+// count to a histogram of its route, and its rows, database time and
+// simulation time to counters. Requests slower than SLOW_REQUEST_MS are
+// also logged with the queries they made. The registry lives on globalThis
+// so every route bundle in the process records into (and serves) the same
+// one.
+const REGISTRY_KEY = Symbol.for('cricket-pro.metrics');
+
+// Upper bounds of the latency (seconds) and queries-per-request buckets
+export const LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+export const QUERY_BUCKETS = [0, 1, 2, 5, 10, 20, 50, 100, 200, 500];
+
+function getRegistry() {
+  return globalThis[REGISTRY_KEY] ??= { routes: new Map(), startedAt: Date.now() };
+}
+
+function histogram(buckets) {
+  return { buckets: new Array(buckets.length).fill(0), count: 0, sum: 0 };
+}
+
+function observe(target, bounds, value) {
+  target.count++;
+  target.sum += value;
+  for (let i = 0; i < bounds.length; i++) {
+    if (value <= bounds[i]) target.buckets[i]++;
+  }
+}
+
+function routeMetrics(route) {
+  const { routes } = getRegistry();
+  let metrics = routes.get(route);
+  if (!metrics) {
+    metrics = {
+      statuses: new Map(),
+      latency: histogram(LATENCY_BUCKETS),
+      queries: histogram(QUERY_BUCKETS),
+      maxQueries: 0,
+      rows: 0,
+      dbSeconds: 0,
+      simulationSeconds: 0,
+      slow: 0
+    };
+    routes.set(route, metrics);
+  }
+  return metrics;
+}
+
+export function slowRequestThresholdMs() {
+  const threshold = Number(process.env.SLOW_REQUEST_MS);
+  return threshold > 0 ? threshold : null;
+}
+
+// Queries of a slow request grouped by table and operation, most expensive first
+function queryBreakdown(log) {
+  const groups = new Map();
+  for (const { table, operation, rows, ms } of log) {
+    const key = `${operation} ${table}`;
+    const group = groups.get(key) ?? { table, operation, count: 0, rows: 0, ms: 0 };
+    group.count++;
+    group.rows += rows;
+    group.ms += ms;
+    groups.set(key, group);
+  }
+  return [...groups.values()]
+    .sort((a, b) => b.ms - a.ms)
+    .map(group => ({ ...group, ms: Math.round(group.ms * 10) / 10 }));
+}
+
+// Record one request: { route, status, durationMs, queries, rows, dbMs,
+// simulationMs, log }
+export function observeRequest({ route, status, durationMs, queries, rows, dbMs, simulationMs, log }) {
+  const metrics = routeMetrics(route);
+  metrics.statuses.set(status, (metrics.statuses.get(status) || 0) + 1);
+  observe(metrics.latency, LATENCY_BUCKETS, durationMs / 1000);
+  observe(metrics.queries, QUERY_BUCKETS, queries);
+  metrics.maxQueries = Math.max(metrics.maxQueries, queries);
+  metrics.rows += rows;
+  metrics.dbSeconds += dbMs / 1000;
+  metrics.simulationSeconds += simulationMs / 1000;
+
+  const threshold = slowRequestThresholdMs();
+  if (threshold === null || durationMs < threshold) return;
+
+  metrics.slow++;
+  const entry = {
+    route,
+    status,
+    ms: Math.round(durationMs),
+    queries,
+    rows,
+    dbMs: Math.round(dbMs),
+    simulationMs: Math.round(simulationMs),
+    at: new Date().toISOString(),
+    breakdown: queryBreakdown(log)
+  };
+  console.warn(`Slow request: ${JSON.stringify(entry)}`);
+}
+
+// Requests, slow requests and routes seen since the process started
+export function requestSummary() {
+  const { routes } = getRegistry();
+  let requests = 0;
+  let slow = 0;
+  for (const metrics of routes.values()) {
+    requests += metrics.latency.count;
+    slow += metrics.slow;
+  }
+  return { requests, slow, routes: routes.size, slowThresholdMs: slowRequestThresholdMs() };
+}
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function labels(values) {
+  return `{${Object.entries(values).map(([name, value]) => `${name}="${escapeLabel(value)}"`).join(',')}}`;
+}
+
+function renderHistogram(lines, name, route, bounds, { buckets, count, sum }) {
+  bounds.forEach((bound, i) => lines.push(`${name}_bucket${labels({ route, le: bound })} ${buckets[i]}`));
+  lines.push(`${name}_bucket${labels({ route, le: '+Inf' })} ${count}`);
+  lines.push(`${name}_sum${labels({ route })} ${sum}`);
+  lines.push(`${name}_count${labels({ route })} ${count}`);
+}
+
+// Every metric in the Prometheus text exposition format (version 0.0.4)
+export function renderPrometheus() {
+  const { routes, startedAt } = getRegistry();
+  const sorted = [...routes.entries()].sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0));
+  const lines = [];
+  const family = (name, type, help, emit) => {
+    lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`);
+    for (const [route, metrics] of sorted) emit(route, metrics);
+  };
+
+  family('cricket_http_requests_total', 'counter', 'Requests handled, by route and status.', (route, metrics) => {
+    for (const [status, count] of [...metrics.statuses].sort(([a], [b]) => a - b)) {
+      lines.push(`cricket_http_requests_total${labels({ route, status })} ${count}`);
+    }
+  });
+  family('cricket_http_request_duration_seconds', 'histogram', 'Request latency.', (route, metrics) => {
+    renderHistogram(lines, 'cricket_http_request_duration_seconds', route, LATENCY_BUCKETS, metrics.latency);
+  });
+  family('cricket_http_request_queries', 'histogram', 'Supabase queries per request.', (route, metrics) => {
+    renderHistogram(lines, 'cricket_http_request_queries', route, QUERY_BUCKETS, metrics.queries);
+  });
+  family('cricket_http_request_queries_max', 'gauge', 'Most Supabase queries made by one request.', (route, metrics) => {
+    lines.push(`cricket_http_request_queries_max${labels({ route })} ${metrics.maxQueries}`);
+  });
+  family('cricket_db_rows_total', 'counter', 'Rows returned by Supabase queries.', (route, metrics) => {
+    lines.push(`cricket_db_rows_total${labels({ route })} ${metrics.rows}`);
+  });
+  family('cricket_db_seconds_total', 'counter', 'Time spent waiting on Supabase queries.', (route, metrics) => {
+    lines.push(`cricket_db_seconds_total${labels({ route })} ${metrics.dbSeconds}`);
+  });
+  family('cricket_simulation_seconds_total', 'counter', 'Time spent simulating matches, on or off the request thread.', (route, metrics) => {
+    lines.push(`cricket_simulation_seconds_total${labels({ route })} ${metrics.simulationSeconds}`);
+  });
+  family('cricket_slow_requests_total', 'counter', 'Requests slower than SLOW_REQUEST_MS.', (route, metrics) => {
+    lines.push(`cricket_slow_requests_total${labels({ route })} ${metrics.slow}`);
+  });
+
+  lines.push(
+    '# HELP cricket_process_start_time_seconds Start time of the process since the Unix epoch.',
+    '# TYPE cricket_process_start_time_seconds gauge',
+    `cricket_process_start_time_seconds ${startedAt / 1000}`
+  );
+  return `${lines.join('\n')}\n`;
+}
+
+// Forget every recorded metric (tests and benchmarks)
+export function resetMetrics() {
+  getRegistry().routes.clear();
+}
@@ -0,0 +1,58 @@
+import { currentQueryStats, trackQueries } from '../supabase/query-stats.js';
+import { observeRequest } from './registry.js';
+
+// Route handler instrumentation: wraps a handler so each request is timed,
+// its queries counted (also sent back as X-Query-Count) and the totals
+// recorded in ./registry.js under the route's template.
+
+// A request a route handler served but no template describes
+export const UNMATCHED_ROUTE = 'unmatched';
+
+// "GET /api/health" for a request to /api/health: the label of a route file
+// without dynamic segments, whose path is its template
+export function routeLabel(request) {
+  return `${request.method} ${new URL(request.url).pathname}`;
+}
+
+// Label function for a catch-all handler mounted at `base` that serves
+// `templates` ("matches/:id/balls", where ":id" stands for any one segment,
+// earlier templates winning): a request is labelled with the template its
+// path matches and anything else with UNMATCHED_ROUTE, so probes of unknown
+// paths cannot add labels
+export function templateRoute(base, templates) {
+  const parsed = templates.map(template => ({ template, segments: template ? template.split('/') : [] }));
+  return (request, { params } = {}) => {
+    const path = params?.path || [];
+    const matched = parsed.find(({ segments }) => segments.length === path.length &&
+      segments.every((segment, i) => segment === ':id' || segment === path[i]));
+    return matched ? `${request.method} ${[base, matched.template].filter(Boolean).join('/')}` : UNMATCHED_ROUTE;
+  };
+}
+
+// Wrap a route handler; `route` is its label ("GET /api/jobs/:id"), or a
+// function of the handler's arguments returning one, and must be given for
+// routes with dynamic segments (otherwise the request path is the label)
+function labelOf(route, request, rest) {
+  if (typeof route === 'function') return route(request, ...rest);
+  return route || routeLabel(request);
+}
+
+export function withMetrics(handler, route = null) {
+  return async (request, ...rest) => {
+    const startedAt = performance.now();
+    let scope = null;
+    let status = 500;
+    try {
+      const { result: response, queries } = await trackQueries(async () => {
+        scope = currentQueryStats();
+        const result = await handler(request, ...rest);
+        status = result?.status ?? 200;
+        return result;
+      });
+      response?.headers?.set('X-Query-Count', String(queries));
+      return response;
+    } finally {
+      observeRequest({ ...scope, route: labelOf(route, request, rest), status, durationMs: performance.now() - startedAt });
+    }
+  };
+}
@@ -0,0 +1,274 @@
+import { createHash } from 'node:crypto';
+import fs from 'node:fs';
+import { MIGRATION_TABLES } from './tables.js';
+
+// Streaming, resumable copy of Mongo collections into Supabase tables.
+//
+// Each table is read with one cursor in _id order and written as upserts of
+// at most `batchSize` rows and `maxBatchBytes` of JSON, so memory holds one
+// batch per running table whatever the collection size. Up to `workers`
+// tables run at once; a table starts only when every table it depends on
+// (MIGRATION_TABLES dependsOn) has finished.
+//
+// After every committed batch the table's last _id, row count and checksum
+// go to the checkpoint file, and a run with the same checkpoint resumes each
+// table after that _id. Upserts are idempotent, so a batch written just
+// before a crash but not yet checkpointed is simply written again.
+//
+// The checksum of a table is the sum (mod 2^64) of the SHA-1 prefixes of its
+// rows in canonical JSON: independent of batching and of where a run was
+// resumed, so a dry run, a clean run and a resumed run all report the same
+// value for the same data.
+
+export const CHECKPOINT_VERSION = 1;
+
+export const DEFAULT_OPTIONS = {
+  batchSize: 500,
+  maxBatchBytes: 4 * 1024 * 1024,
+  workers: 2
+};
+
+const CHECKSUM_MASK = (1n << 64n) - 1n;
+
+// Checkpoints store _ids as JSON; ObjectIds need a codec from the driver
+export const JSON_IDS = { encode: id => id, decode: value => value };
+
+// JSON with object keys sorted, so equal rows always hash equally
+export function canonicalJson(value) {
+  if (value !== null && typeof value?.toJSON === 'function') value = value.toJSON();
+  if (Array.isArray(value)) {
+    return `[${value.map(item => (item === undefined ? 'null' : canonicalJson(item))).join(',')}]`;
+  }
+  if (value !== null && typeof value === 'object') {
+    const fields = Object.keys(value)
+      .sort()
+      .filter(key => value[key] !== undefined)
+      .map(key => `${JSON.stringify(key)}:${canonicalJson(value[key])}`);
+    return `{${fields.join(',')}}`;
+  }
+  return JSON.stringify(value) ?? 'null';
+}
+
+function rowHash(json) {
+  return BigInt(`0x${createHash('sha1').update(json).digest('hex').slice(0, 16)}`);
+}
+
+function addChecksum(checksum, sum) {
+  return ((BigInt(`0x${checksum}`) + sum) & CHECKSUM_MASK).toString(16).padStart(16, '0');
+}
+
+function emptyState() {
+  return { lastId: null, rows: 0, batches: 0, bytes: 0, checksum: '0'.repeat(16), done: false };
+}
+
+export function loadCheckpoint(path) {
+  if (!path || !fs.existsSync(path)) return { version: CHECKPOINT_VERSION, tables: {} };
+  const checkpoint = JSON.parse(fs.readFileSync(path, 'utf8'));
+  if (checkpoint.version !== CHECKPOINT_VERSION) {
+    throw new Error(`Checkpoint ${path} has version ${checkpoint.version}, expected ${CHECKPOINT_VERSION}; rerun with --restart`);
+  }
+  return checkpoint;
+}
+
+// Written to a temporary file and renamed, so a kill never leaves half a file
+function saveCheckpoint(path, checkpoint) {
+  const temporary = `${path}.tmp`;
+  fs.writeFileSync(temporary, JSON.stringify(checkpoint, null, 2));
+  fs.renameSync(temporary, path);
+}
+
+// Tables to run, checked for unknown names and dependency cycles. Dependencies
+// outside the selection are taken as already migrated.
+function selectTables(tables, only) {
+  const selected = only ? tables.filter(spec => only.includes(spec.table)) : tables;
+  if (only) {
+    const unknown = only.filter(name => !tables.some(spec => spec.table === name));
+    if (unknown.length > 0) throw new Error(`Unknown tables: ${unknown.join(', ')}`);
+  }
+
+  const names = new Set(selected.map(spec => spec.table));
+  const visiting = new Set();
+  const visited = new Set();
+  const visit = spec => {
+    if (visited.has(spec.table)) return;
+    if (visiting.has(spec.table)) throw new Error(`Dependency cycle through ${spec.table}`);
+    visiting.add(spec.table);
+    for (const dependency of spec.dependsOn) {
+      if (names.has(dependency)) visit(selected.find(other => other.table === dependency));
+    }
+    visiting.delete(spec.table);
+    visited.add(spec.table);
+  };
+  selected.forEach(visit);
+
+  return { selected, names };
+}
+
+// Peak heap and RSS, sampled while the migration runs
+function memoryMonitor() {
+  const peak = { heapBytes: 0, rssBytes: 0 };
+  const sample = () => {
+    const { heapUsed, rss } = process.memoryUsage();
+    peak.heapBytes = Math.max(peak.heapBytes, heapUsed);
+    peak.rssBytes = Math.max(peak.rssBytes, rss);
+  };
+  sample();
+  const timer = setInterval(sample, 25);
+  timer.unref?.();
+  return {
+    sample,
+    stop() {
+      clearInterval(timer);
+      sample();
+      return {
+        peakHeapBytes: peak.heapBytes,
+        peakRssBytes: Math.max(peak.rssBytes, process.resourceUsage().maxRSS * 1024)
+      };
+    }
+  };
+}
+
+// Migrate `tables` from a Mongo database handle (`source.collection(name)`)
+// into a Supabase client (`target`). Options: dryRun (read, map and
+// checksum only; nothing is written, the checkpoint included), batchSize,
+// maxBatchBytes, workers, only (table names), checkpointPath, restart
+// (ignore and replace the checkpoint), idCodec, signal (stop after the
+// current batches, keeping the checkpoint) and onBatch(table, state).
+//
+// Returns a report with per-table status, rows, batches, bytes, checksum
+// and rows/sec, the totals and the peak memory; `error` is set when a table
+// failed, in which case the checkpoint still holds every committed batch.
+export async function migrate(source, target, options = {}) {
+  const {
+    tables = MIGRATION_TABLES,
+    only = null,
+    dryRun = false,
+    batchSize = DEFAULT_OPTIONS.batchSize,
+    maxBatchBytes = DEFAULT_OPTIONS.maxBatchBytes,
+    workers = DEFAULT_OPTIONS.workers,
+    checkpointPath = null,
+    restart = false,
+    idCodec = JSON_IDS,
+    signal = null,
+    onBatch = null
+  } = options;
+
+  const { selected, names } = selectTables(tables, only);
+  const useCheckpoint = Boolean(checkpointPath) && !dryRun;
+  if (useCheckpoint && restart && fs.existsSync(checkpointPath)) fs.unlinkSync(checkpointPath);
+  const checkpoint = useCheckpoint ? loadCheckpoint(checkpointPath) : { version: CHECKPOINT_VERSION, tables: {} };
+
+  const memory = memoryMonitor();
+  const startedAt = performance.now();
+  const report = { dryRun, tables: {}, rows: 0, elapsedMs: 0, rowsPerSec: 0, aborted: false, error: null };
+  for (const spec of selected) {
+    const state = checkpoint.tables[spec.table];
+    report.tables[spec.table] = {
+      status: state?.done ? 'skipped' : 'pending',
+      rows: state?.rows ?? 0,
+      migrated: 0,
+      resumedFrom: state && !state.done ? state.rows : 0,
+      batches: state?.batches ?? 0,
+      bytes: state?.bytes ?? 0,
+      checksum: state?.checksum ?? emptyState().checksum,
+      ms: 0,
+      rowsPerSec: 0
+    };
+  }
+
+  async function runTable(spec) {
+    const state = checkpoint.tables[spec.table] ??= emptyState();
+    const entry = report.tables[spec.table];
+    const tableStartedAt = performance.now();
+    entry.status = 'running';
+
+    let rows = [];
+    let bytes = 0;
+    let checksumSum = 0n;
+    let lastId = null;
+
+    const commit = async () => {
+      if (!dryRun) {
+        const { error } = await target.from(spec.table).upsert(rows, { onConflict: 'id' });
+        if (error) throw new Error(`${spec.table}: ${error.message}`);
+      }
+      state.lastId = idCodec.encode(lastId);
+      state.rows += rows.length;
+      state.batches++;
+      state.bytes += bytes;
+      state.checksum = addChecksum(state.checksum, checksumSum);
+      if (useCheckpoint) saveCheckpoint(checkpointPath, checkpoint);
+
+      entry.migrated += rows.length;
+      Object.assign(entry, { rows: state.rows, batches: state.batches, bytes: state.bytes, checksum: state.checksum });
+      rows = [];
+      bytes = 0;
+      checksumSum = 0n;
+      memory.sample();
+      await onBatch?.(spec.table, state);
+    };
+
+    const filter = state.lastId === null ? {} : { _id: { $gt: idCodec.decode(state.lastId) } };
+    const cursor = source.collection(spec.collection).find(filter).sort({ _id: 1 }).batchSize(batchSize);
+    for await (const doc of cursor) {
+      const row = spec.toRow(doc);
+      const json = canonicalJson(row);
+      const rowBytes = Buffer.byteLength(json);
+      if (rows.length > 0 && bytes + rowBytes > maxBatchBytes) {
+        await commit();
+        if (signal?.aborted) break;
+      }
+      rows.push(row);
+      bytes += rowBytes;
+      checksumSum += rowHash(json);
+      lastId = doc._id;
+      if (rows.length >= batchSize) {
+        await commit();
+        if (signal?.aborted) break;
+      }
+    }
+    if (rows.length > 0 && !signal?.aborted) await commit();
+
+    entry.ms = performance.now() - tableStartedAt;
+    entry.rowsPerSec = entry.ms > 0 ? Math.round(entry.migrated / (entry.ms / 1000)) : 0;
+    if (signal?.aborted) {
+      entry.status = 'aborted';
+      return;
+    }
+    state.done = true;
+    if (useCheckpoint) saveCheckpoint(checkpointPath, checkpoint);
+    entry.status = 'done';
+  }
+
+  const finished = new Set(selected.filter(spec => checkpoint.tables[spec.table]?.done).map(spec => spec.table));
+  const queue = selected.filter(spec => !finished.has(spec.table));
+  const running = new Map();
+
+  while (queue.length > 0 || running.size > 0) {
+    if (!report.error && !signal?.aborted) {
+      for (const spec of [...queue]) {
+        if (running.size >= workers) break;
+        if (!spec.dependsOn.every(dependency => !names.has(dependency) || finished.has(dependency))) continue;
+        queue.splice(queue.indexOf(spec), 1);
+        running.set(spec.table, runTable(spec).then(() => ({ table: spec.table }), error => ({ table: spec.table, error })));
+      }
+    }
+    if (running.size === 0) break;
+
+    const { table, error } = await Promise.race(running.values());
+    running.delete(table);
+    if (error) {
+      report.tables[table].status = 'failed';
+      report.error ??= error.message;
+    } else if (report.tables[table].status === 'done') {
+      finished.add(table);
+    }
+  }
+
+  report.elapsedMs = performance.now() - startedAt;
+  report.rows = Object.values(report.tables).reduce((sum, entry) => sum + entry.migrated, 0);
+  report.rowsPerSec = report.elapsedMs > 0 ? Math.round(report.rows / (report.elapsedMs / 1000)) : 0;
+  report.aborted = Boolean(signal?.aborted);
+  Object.assign(report, memory.stop());
+  return report;
+}
@@ -0,0 +1,118 @@
+// Mongo collections migrated to Supabase tables, in the shape
+// scripts/migrate-to-supabase.mjs writes them. `dependsOn` lists the tables
+// that must be fully migrated before this one starts (foreign keys, or rows
+// the app expects to exist first); `toRow` maps one document to its row.
+
+function documentId(doc) {
+  return doc._id.toString();
+}
+
+export const MIGRATION_TABLES = [
+  {
+    table: 'users',
+    collection: 'users',
+    dependsOn: [],
+    toRow: user => ({
+      id: user.id || documentId(user),
+      team_name: user.team_name,
+      created_at: user.created_at,
+      updated_at: user.updated_at
+    })
+  },
+  {
+    table: 'league_seasons',
+    collection: 'league_seasons',
+    dependsOn: [],
+    toRow: season => ({
+      id: documentId(season),
+      league_id: season.league_id,
+      season: season.season,
+      status: season.status,
+      teams: season.teams,
+      created_at: season.created_at,
+      started_at: season.started_at,
+      completed_at: season.completed_at
+    })
+  },
+  {
+    table: 'matches',
+    collection: 'matches',
+    dependsOn: ['users', 'league_seasons'],
+    toRow: match => ({
+      id: match.id || documentId(match),
+      home_team_id: match.home_team_id,
+      away_team_id: match.away_team_id,
+      league: match.league,
+      season: match.season,
+      match_type: match.match_type || 'T20',
+      scheduled_time: match.scheduled_time,
+      pitch_type: match.pitch_type || 'Normal',
+      weather: match.weather || 'Sunny',
+      venue: match.venue,
+      status: match.status,
+      home_score: match.home_score || 0,
+      away_score: match.away_score || 0,
+      home_wickets: match.home_wickets || 0,
+      away_wickets: match.away_wickets || 0,
+      home_overs: match.home_overs || 0,
+      away_overs: match.away_overs || 0,
+      result: match.result || { winner: null, homeScore: 0, awayScore: 0 },
+      win_margin: match.win_margin,
+      win_type: match.win_type,
+      target: match.target,
+      commentary: match.commentary || [],
+      current_innings: match.current_innings,
+      current_over: match.current_over || 0,
+      current_ball: match.current_ball || 0,
+      current_runs: match.current_runs || 0,
+      current_wickets: match.current_wickets || 0,
+      live_commentary: match.live_commentary || [],
+      match_data: match.match_data,
+      round: match.round,
+      match_number: match.match_number,
+      created_at: match.created_at,
+      updated_at: match.updated_at
+    })
+  },
+  {
+    table: 'leagues',
+    collection: 'leagues',
+    dependsOn: [],
+    toRow: league => ({
+      id: documentId(league),
+      name: league.name,
+      season: league.season,
+      teams: league.teams || [],
+      status: league.status || 'active',
+      format: league.format || 't20',
+      start_date: league.startDate,
+      end_date: league.endDate,
+      rules: league.rules || {},
+      prize_money: league.prizeMoney,
+      sponsor: league.sponsor,
+      description: league.description,
+      created_at: league.createdAt,
+      updated_at: league.updatedAt
+    })
+  },
+  {
+    // teams.league references leagues(id)
+    table: 'teams',
+    collection: 'teams',
+    dependsOn: ['leagues'],
+    toRow: team => ({
+      id: documentId(team),
+      name: team.name,
+      league: team.league,
+      players: team.players || [],
+      captain: team.captain,
+      coach: team.coach,
+      founded: team.founded,
+      home_ground: team.homeGround,
+      logo: team.logo,
+      status: team.status || 'active',
+      created_at: team.createdAt,
+      updated_at: team.updatedAt
+    })
+  }
+];
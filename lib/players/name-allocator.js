@@ -0,0 +1,236 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { countryNames } from '../country-names.js';
+
+// Unique player names for generated squads.
+//
+// Every country's name space is its first names crossed with its last names
+// (pools deduplicated), and a bitmap per country marks the combinations some
+// player already carries. The taken names are read from the players table
+// once per process, with keyset pages over players.name, and kept up to date
+// as this process inserts, renames and deletes players, so a squad's names
+// are picked in memory. A picked name is reserved straight away, so
+// concurrent registrations never pick the same one. Writers in other
+// processes are covered by one batched check of the picked names before they
+// are used.
+//
+// The index lives on globalThis so every route bundle in the process shares
+// (and updates) the same one.
+const INDEX_KEY = Symbol.for('cricket-pro.players.names');
+
+const DEFAULT_COUNTRY = 'England';
+const LOAD_PAGE_SIZE = 1000;
+// Below this share of free names, picks come from a list of the free ones
+// instead of random draws
+const SAMPLING_MIN_FREE = 0.25;
+
+class NameSpace {
+  constructor(country, { firstNames, lastNames }) {
+    this.country = country;
+    this.firstNames = [...new Set(firstNames)];
+    this.lastNames = [...new Set(lastNames)];
+    this.capacity = this.firstNames.length * this.lastNames.length;
+    this.taken = new Uint8Array(this.capacity);
+    this.free = this.capacity;
+    this.positions = new Map();
+    for (let f = 0; f < this.firstNames.length; f++) {
+      for (let l = 0; l < this.lastNames.length; l++) {
+        this.positions.set(`${this.firstNames[f]} ${this.lastNames[l]}`, f * this.lastNames.length + l);
+      }
+    }
+  }
+
+  nameAt(position) {
+    const lastCount = this.lastNames.length;
+    return `${this.firstNames[Math.floor(position / lastCount)]} ${this.lastNames[position % lastCount]}`;
+  }
+
+  // Flag a name as taken (or free); false when it is not in this space
+  mark(name, taken) {
+    const position = this.positions.get(name);
+    if (position === undefined || this.taken[position] === Number(taken)) return false;
+    this.taken[position] = Number(taken);
+    this.free += taken ? -1 : 1;
+    return true;
+  }
+
+  // Positions of up to `count` free names, in random order
+  pick(count) {
+    count = Math.min(count, this.free);
+    const picked = [];
+    if (this.free / this.capacity >= SAMPLING_MIN_FREE) {
+      const seen = new Set();
+      while (picked.length < count) {
+        const position = Math.floor(Math.random() * this.capacity);
+        if (this.taken[position] || seen.has(position)) continue;
+        seen.add(position);
+        picked.push(position);
+      }
+      return picked;
+    }
+
+    const free = [];
+    for (let position = 0; position < this.capacity; position++) {
+      if (!this.taken[position]) free.push(position);
+    }
+    for (let i = 0; i < count; i++) {
+      const j = i + Math.floor(Math.random() * (free.length - i));
+      [free[i], free[j]] = [free[j], free[i]];
+      picked.push(free[i]);
+    }
+    return picked;
+  }
+}
+
+function getState() {
+  return globalThis[INDEX_KEY] ??= { spaces: null, loading: null, loadedAt: null, loadedNames: 0 };
+}
+
+function buildSpaces() {
+  return new Map(Object.entries(countryNames).map(([country, pools]) => [country, new NameSpace(country, pools)]));
+}
+
+// A full name is taken everywhere it can be generated: uniqueness is global,
+// and countries share first and last names
+function markEverywhere(spaces, name, taken) {
+  for (const space of spaces.values()) space.mark(name, taken);
+}
+
+async function loadIndex() {
+  const spaces = buildSpaces();
+  let last = null;
+  let loaded = 0;
+
+  for (;;) {
+    let query = supabaseAdmin
+      .from('players')
+      .select('name')
+      .order('name', { ascending: true })
+      .limit(LOAD_PAGE_SIZE);
+
+    if (last !== null) query = query.gt('name', last);
+
+    const { data, error } = await query;
+    if (error) throw error;
+
+    for (const { name } of data) markEverywhere(spaces, name, true);
+    loaded += data.length;
+    if (data.length < LOAD_PAGE_SIZE) break;
+    last = data[data.length - 1].name;
+  }
+
+  return { spaces, loaded };
+}
+
+// The name spaces with every stored name marked, loaded on first use; a
+// failed load is retried by the next caller
+async function getSpaces() {
+  const state = getState();
+  if (state.spaces) return state.spaces;
+
+  state.loading ??= loadIndex().then(
+    ({ spaces, loaded }) => {
+      state.spaces = spaces;
+      state.loadedAt = new Date().toISOString();
+      state.loadedNames = loaded;
+      return spaces;
+    },
+    (error) => {
+      state.loading = null;
+      throw error;
+    }
+  );
+  return state.loading;
+}
+
+// Reserve `count` unused names of a country's pools (England's for an unknown
+// country). Returns { names, checked } where `checked` says whether the
+// batched safety check ran; fewer names come back when the country's space
+// is exhausted. Reserved names stay taken until released with releaseNames().
+export async function allocateNames(country, count) {
+  const spaces = await getSpaces();
+  const space = spaces.get(country) || spaces.get(DEFAULT_COUNTRY);
+
+  const reserve = (positions) => positions.map((position) => {
+    const name = space.nameAt(position);
+    markEverywhere(spaces, name, true);
+    return name;
+  });
+
+  const names = reserve(space.pick(count));
+  if (names.length === 0) return { names, checked: false };
+
+  // Names another process has used since the index was loaded are marked
+  // and replaced; the replacements are not checked again
+  const { data: existing, error } = await supabaseAdmin
+    .from('players')
+    .select('name')
+    .in('name', names);
+
+  if (error) {
+    releaseNames(names);
+    throw error;
+  }
+
+  if (existing.length > 0) {
+    const used = new Set(existing.map(player => player.name));
+    const replacements = reserve(space.pick(used.size));
+    const available = names.filter(name => !used.has(name));
+    return { names: [...available, ...replacements], checked: true };
+  }
+
+  return { names, checked: true };
+}
+
+// Return reserved names whose players were never written
+export function releaseNames(names) {
+  const { spaces } = getState();
+  if (!spaces) return;
+  for (const name of names) markEverywhere(spaces, name, false);
+}
+
+// Release the names of renamed or deleted players that no stored player
+// carries any more; one query for the whole batch
+export async function releaseUnusedNames(names) {
+  const { spaces } = getState();
+  const candidates = [...new Set(names.filter(Boolean))];
+  if (!spaces || candidates.length === 0) return;
+
+  const { data: carried, error } = await supabaseAdmin
+    .from('players')
+    .select('name')
+    .in('name', candidates);
+
+  if (error) throw error;
+
+  const stillUsed = new Set(carried.map(player => player.name));
+  releaseNames(candidates.filter(name => !stillUsed.has(name)));
+}
+
+// Record the names of players written outside allocateNames()
+export function markTaken(names) {
+  const { spaces } = getState();
+  if (!spaces) return;
+  for (const name of names) {
+    if (name) markEverywhere(spaces, name, true);
+  }
+}
+
+// Per-country { capacity, taken, remaining } of the name spaces
+export async function nameCapacity() {
+  const spaces = await getSpaces();
+  const { loadedAt, loadedNames } = getState();
+  const countries = {};
+  for (const [country, space] of spaces) {
+    countries[country] = { capacity: space.capacity, taken: space.capacity - space.free, remaining: space.free };
+  }
+  return { loadedAt, loadedNames, countries };
+}
+
+// Drop the index; the next allocation reloads it from the players table
+export function resetNameIndex() {
+  const state = getState();
+  state.spaces = null;
+  state.loading = null;
+  state.loadedAt = null;
+  state.loadedNames = 0;
+}
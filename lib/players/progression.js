@@ -0,0 +1,512 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { createRandom, hashString } from '../simulation/random.js';
+import { pinReplays, replayMatches } from '../simulation/replay.js';
+
+// Weekly player progression: form, fatigue, experience, age, skills, rating,
+// market value and wage move once a week.
+//
+// The workload of the matches completed since the previous run (balls faced
+// and bowled, runs and wickets, matches played) is read first. Players are
+// then read in keyset pages over id; each page is unpacked into typed-array
+// columns, advanced by a few loops over those columns (fatigue and recovery,
+// form, experience, aging, skill growth and decline, repricing) and diffed
+// with what was read. Only the rows that changed are written back, with bulk
+// upserts, while the next page is being read.
+//
+// A run is named after its ISO week ('2026-W42') and recorded in
+// player_progression_runs with its cutoff: matches completed up to the cutoff
+// are applied, and the next run starts from there. Every draw is seeded from
+// the week and the player id, so a failed run repeated for the same week
+// computes the same values; rows it already wrote carry the week in
+// progressed_week and are left alone.
+//
+// Progression changes the attributes match replays are fingerprinted with,
+// so every match read for workload has the inputs of its XIs pinned into its
+// replay record (pinReplays) before any player is written.
+
+export const FORMS = ['Excellent', 'Good', 'Average', 'Poor', 'Terrible'];
+export const FATIGUE_LEVELS = ['Fresh', 'Slightly tired', 'Tired', 'Very tired', 'Exhausted'];
+export const SKILLS = ['batting', 'bowling', 'keeping', 'technique', 'fielding', 'endurance', 'power', 'captaincy'];
+
+// Columns a run may change
+export const PROGRESSION_COLUMNS = ['age', ...SKILLS, 'experience', 'form', 'fatigue', 'rating', 'market_value', 'wage'];
+
+const PLAYER_COLUMNS = ['id', 'user_id', 'name', ...PROGRESSION_COLUMNS, 'progressed_week'].join(', ');
+// Besides what replays read, the columns a pinned match is upserted with
+const MATCH_COLUMNS = 'id, home_team_id, away_team_id, league, season, scheduled_time, weather, pitch_type, match_data, updated_at';
+
+export const PAGE_SIZE = 5000;
+export const WRITE_BATCH = 1000;
+const MATCH_PAGE_SIZE = 500;
+const DIFF_SAMPLES = 20;
+// A first run applies the workload of the last week only; older matches are
+// still pinned
+const FIRST_RUN_WORKLOAD_DAYS = 7;
+
+const AVERAGE_FORM = FORMS.indexOf('Average');
+const EXHAUSTED = FATIGUE_LEVELS.length - 1;
+// Match impact (runs + WICKET_IMPACT per wicket, per match) from which a
+// player's form heads for Excellent, Good, Average and Poor; below is Terrible
+const FORM_IMPACT = [35, 22, 12, 6];
+const WICKET_IMPACT = 20;
+const FORM_SWING = 0.1;
+// Balls a player absorbs per fatigue level: FATIGUE_BALLS plus endurance. A
+// ball bowled counts BOWLING_LOAD times.
+const FATIGUE_BALLS = 60;
+const BOWLING_LOAD = 2;
+// Expected weekly change of a mid-range skill by age (up to the age given)
+const SKILL_CURVE = [[21, 0.6], [24, 0.4], [27, 0.2], [30, 0], [33, -0.25], [Infinity, -0.5]];
+// Skills trained by match practice, up to PRACTICE_BONUS a week for
+// PRACTICE_BALLS balls faced or bowled
+const PRACTICE = { batting: 'faced', technique: 'faced', power: 'faced', bowling: 'bowled' };
+const PRACTICE_BALLS = { faced: 120, bowled: 48 };
+const PRACTICE_BONUS = 0.5;
+// Market value by age and form, per rating point
+const VALUE_PER_RATING = 1000;
+const AGE_VALUE = [[23, 1.3], [27, 1.15], [30, 1], [33, 0.8], [Infinity, 0.6]];
+const FORM_VALUE = [1.1, 1.05, 1, 0.95, 0.9];
+// Values within this share of their target are left alone; others close a
+// quarter of the gap, in steps of VALUE_STEP
+const VALUE_TOLERANCE = 0.05;
+const VALUE_STEP = 500;
+// Wages are renegotiated on birthdays, at a share of market value
+const WAGE_SHARE = 0.4;
+const MIN_WAGE = 10000;
+
+const byAge = (curve, age) => curve.find(([upTo]) => age <= upTo)[1];
+const levelOf = (levels, value, fallback) => (levels.includes(value) ? levels.indexOf(value) : fallback);
+const clamp = (value, min, max) => Math.min(max, Math.max(min, value));
+
+// ISO week of a date: '2026-W42'
+export function progressionWeek(date = new Date()) {
+  const day = new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()));
+  day.setUTCDate(day.getUTCDate() + 4 - (day.getUTCDay() || 7));
+  const week = Math.ceil(((day - Date.UTC(day.getUTCFullYear(), 0, 1)) / 86400000 + 1) / 7);
+  return `${day.getUTCFullYear()}-W${String(week).padStart(2, '0')}`;
+}
+
+// Week of the year (1-53) a player has a birthday in
+function birthdayWeek(id) {
+  return hashString(`birthday:${id}`) % 52 + 1;
+}
+
+function emptyWorkload() {
+  return { ballsFaced: 0, ballsBowled: 0, runs: 0, wickets: 0, matches: 0 };
+}
+
+// Player ids by name for each team of a match: the pinned XIs where the
+// replay record has them, the team's squad otherwise
+function namesOf(match, squadNames) {
+  const replay = match.match_data?.replay;
+  if (!replay?.squads) return [squadNames.get(match.home_team_id), squadNames.get(match.away_team_id)];
+  return replay.squads.map((squad, side) => new Map(
+    squad.flatMap((values, index) => (values ? [[values[0], replay.xi[side][index]]] : []))
+  ));
+}
+
+function addInnings(workload, innings, battingIds, bowlingIds) {
+  for (const score of innings?.batsmanScores || []) {
+    const id = battingIds?.get(score?.name);
+    if (!id) continue;
+    const entry = workload.get(id) ?? workload.set(id, emptyWorkload()).get(id);
+    entry.ballsFaced += score.balls || 0;
+    entry.runs += score.runs || 0;
+    entry.matches++;
+  }
+  for (const figure of innings?.bowlingFigures || []) {
+    const id = bowlingIds?.get(figure?.name);
+    if (!id) continue;
+    const entry = workload.get(id) ?? workload.set(id, emptyWorkload()).get(id);
+    entry.ballsBowled += Math.round((figure.overs || 0) * 6);
+    entry.wickets += figure.wickets || 0;
+  }
+}
+
+// Names of the squads of `teamIds`, for matches whose scorecards are stored
+async function squadNamesOf(teamIds) {
+  const squads = new Map(teamIds.map(teamId => [teamId, new Map()]));
+  if (teamIds.length === 0) return squads;
+
+  const { data, error } = await supabaseAdmin
+    .from('players')
+    .select('id, user_id, name')
+    .in('user_id', teamIds);
+
+  if (error) throw error;
+  for (const player of data) squads.get(player.user_id).set(player.name, player.id);
+  return squads;
+}
+
+async function pinMatches(matches, dryRun) {
+  const pinned = await pinReplays(matches);
+  const writes = [];
+  let changed = 0;
+  for (const match of matches) {
+    if (!pinned.has(match.id)) continue;
+    const replay = pinned.get(match.id);
+    if (!replay) {
+      changed++;
+      continue;
+    }
+    match.match_data = { ...match.match_data, replay };
+    writes.push(match);
+  }
+
+  if (!dryRun && writes.length > 0) {
+    const { error } = await supabaseAdmin
+      .from('matches')
+      .upsert(writes.map(({ id, home_team_id, away_team_id, league, season, scheduled_time, match_data }) => (
+        { id, home_team_id, away_team_id, league, season, scheduled_time, match_data }
+      )));
+    if (error) throw error;
+  }
+  return { pinned: writes.length, changed };
+}
+
+// Workload of the matches completed in (since, cutoff], as a Map of player id
+// to { ballsFaced, ballsBowled, runs, wickets, matches }. Every match in the
+// window is pinned; only those completed after `workloadSince` add workload.
+export async function loadWorkload({ since = null, cutoff, workloadSince = since, dryRun = false }) {
+  const workload = new Map();
+  const report = { read: 0, applied: 0, pinned: 0, unreplayable: 0 };
+
+  for (let from = 0; ; from += MATCH_PAGE_SIZE) {
+    let query = supabaseAdmin
+      .from('matches')
+      .select(MATCH_COLUMNS)
+      .eq('status', 'completed')
+      .lte('updated_at', cutoff);
+    if (since) query = query.gt('updated_at', since);
+    const { data: matches, error } = await query
+      .order('updated_at', { ascending: true })
+      .order('id', { ascending: true })
+      .range(from, from + MATCH_PAGE_SIZE - 1);
+
+    if (error) throw error;
+    report.read += matches.length;
+
+    // Matches whose inputs had already changed can neither be pinned nor
+    // replayed; their workload is lost unless their scorecards are stored
+    const { pinned, changed } = await pinMatches(matches, dryRun);
+    report.pinned += pinned;
+
+    const counted = matches.filter(match => !workloadSince || match.updated_at > workloadSince);
+    const replayed = await replayMatches(counted.filter(match => !match.match_data?.firstInnings));
+    const squadNames = await squadNamesOf([...new Set(counted
+      .filter(match => !match.match_data?.replay?.squads)
+      .flatMap(match => [match.home_team_id, match.away_team_id]))]);
+
+    for (const match of counted) {
+      const data = match.match_data?.firstInnings ? match.match_data : replayed.get(match.id)?.match_data;
+      if (!data) continue;
+      const [homeIds, awayIds] = namesOf(match, squadNames);
+      addInnings(workload, data.firstInnings, homeIds, awayIds);
+      addInnings(workload, data.secondInnings, awayIds, homeIds);
+      report.applied++;
+    }
+    report.unreplayable += changed;
+
+    if (matches.length < MATCH_PAGE_SIZE) break;
+  }
+
+  return { workload, matches: report };
+}
+
+// One week of progression for a page of players (rows with PLAYER_COLUMNS).
+// Returns the rows to write (identity, every progression column and
+// progressed_week) and the changes by column.
+export function progressPlayers(players, workload, week) {
+  const n = players.length;
+  const weekOfYear = Number(week.slice(week.indexOf('W') + 1));
+
+  // Columns in
+  const age = new Int32Array(n);
+  const experience = new Int32Array(n);
+  const form = new Int8Array(n);
+  const fatigue = new Int8Array(n);
+  const marketValue = new Float64Array(n);
+  const wage = new Float64Array(n);
+  const skills = SKILLS.map(() => new Int32Array(n));
+  const ballsFaced = new Float64Array(n);
+  const ballsBowled = new Float64Array(n);
+  const impact = new Float64Array(n);
+  const played = new Int32Array(n);
+  const birthday = new Uint8Array(n);
+  const draws = new Float64Array(n * (SKILLS.length + 2));
+
+  for (let i = 0; i < n; i++) {
+    const player = players[i];
+    age[i] = player.age ?? 25;
+    experience[i] = player.experience ?? 0;
+    form[i] = levelOf(FORMS, player.form, AVERAGE_FORM);
+    fatigue[i] = levelOf(FATIGUE_LEVELS, player.fatigue, 0);
+    marketValue[i] = player.market_value ?? 0;
+    wage[i] = player.wage ?? MIN_WAGE;
+    for (let s = 0; s < SKILLS.length; s++) skills[s][i] = player[SKILLS[s]] ?? 50;
+
+    const load = workload.get(player.id);
+    if (load) {
+      ballsFaced[i] = load.ballsFaced;
+      ballsBowled[i] = load.ballsBowled;
+      played[i] = load.matches;
+      impact[i] = load.matches > 0 ? (load.runs + WICKET_IMPACT * load.wickets) / load.matches : 0;
+    }
+    birthday[i] = birthdayWeek(player.id) === weekOfYear ? 1 : 0;
+
+    const random = createRandom(hashString(`${week}:${player.id}`));
+    for (let d = i * (SKILLS.length + 2), end = d + SKILLS.length + 2; d < end; d++) draws[d] = random();
+  }
+
+  const stride = SKILLS.length + 2;
+  const endurance = skills[SKILLS.indexOf('endurance')];
+
+  // Fatigue: a level of recovery a week (two when rested), plus a level per
+  // FATIGUE_BALLS + endurance balls of workload
+  const nextFatigue = new Int8Array(n);
+  for (let i = 0; i < n; i++) {
+    const load = ballsFaced[i] + BOWLING_LOAD * ballsBowled[i];
+    const recovery = played[i] > 0 ? 1 : 2;
+    nextFatigue[i] = clamp(fatigue[i] - recovery + Math.floor(load / (FATIGUE_BALLS + endurance[i])), 0, EXHAUSTED);
+  }
+
+  // Form: a step towards what the week's impact earns (Average when rested),
+  // with an occasional swing either way
+  const nextForm = new Int8Array(n);
+  for (let i = 0; i < n; i++) {
+    let target = AVERAGE_FORM;
+    if (played[i] > 0) {
+      target = FORM_IMPACT.findIndex(threshold => impact[i] >= threshold);
+      if (target === -1) target = FORMS.length - 1;
+    }
+    const u = draws[i * stride];
+    const swing = u < FORM_SWING / 2 ? -1 : u > 1 - FORM_SWING / 2 ? 1 : 0;
+    nextForm[i] = clamp(form[i] + Math.sign(target - form[i]) + swing, 0, FORMS.length - 1);
+  }
+
+  // Experience and age
+  const nextExperience = new Int32Array(n);
+  const nextAge = new Int32Array(n);
+  for (let i = 0; i < n; i++) {
+    nextExperience[i] = Math.min(100, experience[i] + 2 * played[i] + Math.floor((ballsFaced[i] + ballsBowled[i]) / 60));
+    nextAge[i] = age[i] + birthday[i];
+  }
+
+  // Skills: growth while young, decline with age, both smaller towards the
+  // ends of the scale; match practice helps the skills used. Fractional
+  // changes are rounded stochastically.
+  const nextSkills = SKILLS.map(() => new Int32Array(n));
+  const rating = new Int32Array(n);
+  const rate = new Float64Array(n);
+  for (let i = 0; i < n; i++) rate[i] = byAge(SKILL_CURVE, nextAge[i]);
+  for (let s = 0; s < SKILLS.length; s++) {
+    const skill = skills[s];
+    const next = nextSkills[s];
+    const kind = PRACTICE[SKILLS[s]];
+    const practice = kind === 'faced' ? ballsFaced : kind === 'bowled' ? ballsBowled : null;
+    for (let i = 0; i < n; i++) {
+      const value = skill[i];
+      let change = rate[i] >= 0 ? rate[i] * (100 - value) / 50 : rate[i] * value / 50;
+      if (practice) change += PRACTICE_BONUS * Math.min(1, practice[i] / PRACTICE_BALLS[kind]) * (100 - value) / 100;
+      next[i] = clamp(value + Math.floor(change + draws[i * stride + 1 + s]), 1, 100);
+      rating[i] += next[i];
+    }
+  }
+  for (let i = 0; i < n; i++) rating[i] = Math.floor(rating[i] / SKILLS.length);
+
+  // Market value: a quarter of the way to rating, age and form's price once
+  // off by more than VALUE_TOLERANCE; wages follow on birthdays
+  const nextValue = new Float64Array(n);
+  const nextWage = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    const target = rating[i] * VALUE_PER_RATING * byAge(AGE_VALUE, nextAge[i]) * FORM_VALUE[nextForm[i]];
+    const gap = target - marketValue[i];
+    nextValue[i] = Math.abs(gap) > target * VALUE_TOLERANCE
+      ? Math.max(VALUE_STEP, Math.round((marketValue[i] + gap / 4) / VALUE_STEP) * VALUE_STEP)
+      : marketValue[i];
+    nextWage[i] = birthday[i] ? Math.max(MIN_WAGE, Math.round(nextValue[i] * WAGE_SHARE / 100) * 100) : wage[i];
+  }
+
+  // Diff and rows out
+  const rows = [];
+  const changes = Object.fromEntries(PROGRESSION_COLUMNS.map(column => [column, 0]));
+  for (let i = 0; i < n; i++) {
+    const player = players[i];
+    const after = {
+      age: nextAge[i],
+      experience: nextExperience[i],
+      form: FORMS[nextForm[i]],
+      fatigue: FATIGUE_LEVELS[nextFatigue[i]],
+      rating: rating[i],
+      market_value: nextValue[i],
+      wage: nextWage[i]
+    };
+    for (let s = 0; s < SKILLS.length; s++) after[SKILLS[s]] = nextSkills[s][i];
+
+    let changed = false;
+    for (const column of PROGRESSION_COLUMNS) {
+      if (after[column] !== player[column]) {
+        changes[column]++;
+        changed = true;
+      }
+    }
+    if (changed) rows.push({ id: player.id, user_id: player.user_id, name: player.name, ...after, progressed_week: week });
+  }
+
+  return { rows, changes };
+}
+
+// Changed columns of a written row: { id, name, before, after }
+function diffOf(player, row) {
+  const before = {};
+  const after = {};
+  for (const column of PROGRESSION_COLUMNS) {
+    if (row[column] !== player[column]) {
+      before[column] = player[column];
+      after[column] = row[column];
+    }
+  }
+  return { id: player.id, name: player.name, before, after };
+}
+
+function readPlayers(after, pageSize) {
+  let query = supabaseAdmin.from('players').select(PLAYER_COLUMNS);
+  if (after !== null) query = query.gt('id', after);
+  return query
+    .order('id', { ascending: true })
+    .limit(pageSize)
+    .then(({ data, error }) => {
+      if (error) throw error;
+      return data;
+    });
+}
+
+async function writePlayers(rows, writeBatch) {
+  const batches = [];
+  for (let i = 0; i < rows.length; i += writeBatch) batches.push(rows.slice(i, i + writeBatch));
+  await Promise.all(batches.map(async batch => {
+    const { error } = await supabaseAdmin.from('players').upsert(batch);
+    if (error) throw error;
+  }));
+  return batches.length;
+}
+
+async function runOf(week) {
+  const { data, error } = await supabaseAdmin
+    .from('player_progression_runs')
+    .select('*')
+    .eq('id', week)
+    .maybeSingle();
+
+  if (error) throw error;
+  return data;
+}
+
+// Cutoff of the latest completed run before `week`
+async function previousCutoff(week) {
+  const { data, error } = await supabaseAdmin
+    .from('player_progression_runs')
+    .select('cutoff')
+    .eq('status', 'completed')
+    .lt('id', week)
+    .order('id', { ascending: false })
+    .limit(1);
+
+  if (error) throw error;
+  return data[0]?.cutoff ?? null;
+}
+
+// Progress every player by one week. With dryRun nothing is written (no
+// players, pins or run record) and the report carries up to `samples` diffs.
+// Returns the report; { skipped: true } when the week has already run.
+export async function runProgression({
+  week = null,
+  now = new Date(),
+  dryRun = false,
+  pageSize = PAGE_SIZE,
+  writeBatch = WRITE_BATCH,
+  samples = DIFF_SAMPLES,
+  onPage = null
+} = {}) {
+  const startedAt = performance.now();
+  week ??= progressionWeek(now);
+
+  const existing = await runOf(week);
+  if (existing?.status === 'completed') return { week, skipped: true, run: existing };
+
+  const cutoff = existing?.cutoff ?? now.toISOString();
+  const since = await previousCutoff(week);
+  const workloadSince = since ?? new Date(new Date(cutoff).getTime() - FIRST_RUN_WORKLOAD_DAYS * 86400000).toISOString();
+  if (!dryRun && !existing) {
+    const { error } = await supabaseAdmin.from('player_progression_runs').insert({ id: week, cutoff, status: 'running' });
+    if (error) throw error;
+  }
+
+  const { workload, matches } = await loadWorkload({ since, cutoff, workloadSince, dryRun });
+  const workloadMs = performance.now() - startedAt;
+
+  const report = {
+    week,
+    cutoff,
+    since,
+    dryRun,
+    skipped: false,
+    matches,
+    playersRead: 0,
+    playersSkipped: 0,
+    playersChanged: 0,
+    pages: 0,
+    writes: 0,
+    computeMs: 0,
+    changes: Object.fromEntries(PROGRESSION_COLUMNS.map(column => [column, 0])),
+    diffs: []
+  };
+
+  let next = readPlayers(null, pageSize);
+  for (;;) {
+    const page = await next;
+    if (page.length === 0) break;
+    next = page.length === pageSize ? readPlayers(page[page.length - 1].id, pageSize) : Promise.resolve([]);
+
+    const computeStartedAt = performance.now();
+    const pending = page.filter(player => player.progressed_week !== week);
+    const { rows, changes } = progressPlayers(pending, workload, week);
+    report.computeMs += performance.now() - computeStartedAt;
+
+    report.pages++;
+    report.playersRead += page.length;
+    report.playersSkipped += page.length - pending.length;
+    report.playersChanged += rows.length;
+    for (const [column, count] of Object.entries(changes)) report.changes[column] += count;
+
+    if (dryRun) {
+      if (report.diffs.length < samples) {
+        const byId = new Map(pending.map(player => [player.id, player]));
+        for (const row of rows.slice(0, samples - report.diffs.length)) report.diffs.push(diffOf(byId.get(row.id), row));
+      }
+    } else {
+      const updatedAt = new Date().toISOString();
+      report.writes += await writePlayers(rows.map(row => ({ ...row, updated_at: updatedAt })), writeBatch);
+    }
+    onPage?.({ page: report.pages, players: report.playersRead, changed: report.playersChanged });
+  }
+
+  if (!dryRun) {
+    const { error } = await supabaseAdmin
+      .from('player_progression_runs')
+      .update({
+        status: 'completed',
+        players_read: report.playersRead,
+        players_changed: report.playersChanged,
+        matches_applied: matches.applied,
+        matches_pinned: matches.pinned,
+        completed_at: new Date().toISOString()
+      })
+      .eq('id', week);
+    if (error) throw error;
+  }
+
+  report.workloadMs = workloadMs;
+  report.ms = performance.now() - startedAt;
+  report.playersPerSec = Math.round(report.playersRead / (report.ms / 1000));
+  return report;
+}
@@ -0,0 +1,163 @@
+import { renderBallCommentary } from './commentary.js';
+import { createRandom } from './random.js';
+
+// Compact ball-by-ball log of one innings.
+//
+// Every delivery is a fixed-width 6-byte record:
+//   [0] over (1-based)   [1] ball within the over, as simulateInnings numbers it
+//   [2] batsman index    [3] bowler index (into the `batsmen`/`bowlers` tables)
+//   [4] outcome: bits 0-2 runs, bit 3 wicket, bits 4-5 extras, bits 6-7 milestone
+//   [5] wicket type (0 = none)
+// stored base64-encoded next to the name tables, the chase target and a
+// commentary seed. Totals, rates and phase flags are recomputed on decode and
+// commentary text is rendered lazily from the templates with a per-ball seed.
+
+export const BALL_LOG_VERSION = 1;
+export const RECORD_BYTES = 6;
+
+const MAX_OVERS = 20;
+const EXTRAS = [null, 'wide', 'no-ball', 'bye'];
+const MILESTONES = [null, 'fifty', 'century'];
+const WICKET_TYPES = [null, 'bowled', 'caught', 'lbw', 'caught behind', 'run out'];
+
+export class BallLogWriter {
+  constructor(capacity = 128) {
+    this.bytes = new Uint8Array(capacity * RECORD_BYTES);
+    this.length = 0;
+  }
+
+  push({ over, ball, batsman, bowler, runs, isWicket, wicketType, extras, milestone }) {
+    const offset = this.length * RECORD_BYTES;
+    if (offset + RECORD_BYTES > this.bytes.length) {
+      const grown = new Uint8Array(this.bytes.length * 2);
+      grown.set(this.bytes);
+      this.bytes = grown;
+    }
+
+    this.bytes[offset] = over;
+    this.bytes[offset + 1] = ball;
+    this.bytes[offset + 2] = batsman;
+    this.bytes[offset + 3] = bowler;
+    this.bytes[offset + 4] = (runs & 7)
+      | (isWicket ? 8 : 0)
+      | (Math.max(EXTRAS.indexOf(extras || null), 0) << 4)
+      | (Math.max(MILESTONES.indexOf(milestone || null), 0) << 6);
+    this.bytes[offset + 5] = isWicket ? Math.max(WICKET_TYPES.indexOf(wicketType), 0) : 0;
+    this.length++;
+  }
+
+  // JSON-serialisable log; `target` is only set for a chasing innings
+  finish({ batsmen, bowlers, target = null, seed }) {
+    return {
+      v: BALL_LOG_VERSION,
+      seed: seed >>> 0,
+      target,
+      batsmen,
+      bowlers,
+      balls: Buffer.from(this.bytes.buffer, this.bytes.byteOffset, this.length * RECORD_BYTES).toString('base64')
+    };
+  }
+}
+
+function recordsOf(log) {
+  return Buffer.from(log.balls || '', 'base64');
+}
+
+export function ballCount(log) {
+  return Math.floor(recordsOf(log).length / RECORD_BYTES);
+}
+
+// Seed of the commentary line of the `index`-th delivery (1-based)
+export function ballSeed(log, index) {
+  return (log.seed + Math.imul(index, 0x9e3779b9)) >>> 0;
+}
+
+// Decode every delivery into the shape simulateInnings reports (without the
+// commentary text), plus its 1-based index and wicket type
+export function* iterateBalls(log) {
+  const records = recordsOf(log);
+  const count = Math.floor(records.length / RECORD_BYTES);
+  const target = log.target || null;
+  let totalRuns = 0;
+  let wickets = 0;
+
+  for (let i = 0; i < count; i++) {
+    const offset = i * RECORD_BYTES;
+    const over = records[offset];
+    const outcome = records[offset + 4];
+    const runs = outcome & 7;
+    const isWicket = (outcome & 8) !== 0;
+    const extras = EXTRAS[(outcome >> 4) & 3];
+    const balls = i + 1;
+
+    // simulateInnings adds batting runs to the total; extras are not counted
+    if (!extras) totalRuns += runs;
+    if (isWicket) wickets++;
+
+    let requiredRunRate = null;
+    let ballsLeft = null;
+    if (target) {
+      ballsLeft = MAX_OVERS * 6 - balls;
+      requiredRunRate = parseFloat(ballsLeft > 0 ? ((target - totalRuns) / (ballsLeft / 6)).toFixed(2) : '0.00');
+    }
+
+    yield {
+      index: balls,
+      over,
+      ball: records[offset + 1],
+      runs,
+      totalRuns,
+      wickets,
+      batsman: log.batsmen[records[offset + 2]],
+      bowler: log.bowlers[records[offset + 3]],
+      isWicket,
+      wicketType: WICKET_TYPES[records[offset + 5]],
+      extras,
+      milestone: MILESTONES[(outcome >> 6) & 3],
+      currentRunRate: parseFloat((totalRuns / (balls / 6)).toFixed(2)),
+      requiredRunRate,
+      isPowerplay: over - 1 < 6,
+      isDeathOvers: over - 1 >= 17,
+      pressure: target ? target - totalRuns : null,
+      ballsLeft
+    };
+  }
+}
+
+// Runs, wickets and overs of the innings, as simulateInnings reports them
+export function inningsTotals(log) {
+  let last = null;
+  for (const ball of iterateBalls(log)) last = ball;
+  const balls = last ? last.index : 0;
+  return {
+    runs: last ? last.totalRuns : 0,
+    wickets: last ? last.wickets : 0,
+    overs: Math.floor(balls / 6) + (balls % 6 > 0 ? (balls % 6) / 10 : 0)
+  };
+}
+
+// Decoded delivery with its commentary line rendered from the per-ball seed
+export function withCommentary(log, ball) {
+  return { ...ball, commentary: renderBallCommentary(ball, createRandom(ballSeed(log, ball.index))) };
+}
+
+// Deliveries of a range, selected by 1-based ball index (`from`/`to`), by over
+// (`fromOver`/`toOver`) or as the `last` N balls, among the first `until`
+// balls when given (those bowled so far in a live match). Commentary is only
+// rendered for the balls returned.
+export function sliceBalls(log, { from = null, to = null, fromOver = null, toOver = null, last = null, until = null, commentary = true } = {}) {
+  const total = until === null ? ballCount(log) : Math.min(ballCount(log), until);
+  const first = last ? Math.max(total - last + 1, 1) : (from || 1);
+  const final = Math.min(to || total, total);
+  const balls = [];
+
+  for (const ball of iterateBalls(log)) {
+    if (ball.index < first) continue;
+    if (ball.index > final) break;
+    if (fromOver && ball.over < fromOver) continue;
+    if (toOver && ball.over > toOver) break;
+    balls.push(commentary ? withCommentary(log, ball) : ball);
+  }
+
+  return { totalBalls: total, balls };
+}
@@ -0,0 +1,302 @@
+import {
+  getWeatherEffect,
+  getPitchEffect,
+  getFormMultiplier,
+  getFatigueMultiplier,
+  isSpinBowler
+} from './innings.js';
+
+const MAX_OVERS = 20;
+const MAX_BALLS = MAX_OVERS * 6;
+const MAX_BOWLER_OVERS = 4;
+
+// Batch T20 innings simulation for Monte Carlo runs.
+//
+// Reproduces the outcome model of simulateInnings (conditions, Dusty-pitch spin
+// bonus, powerplay/death adjustments, chase pressure, extras, 4-over cap) but
+// simulates `n` innings at once with typed-array state and no commentary, so
+// thousands of what-if innings cost a few milliseconds.
+//
+// options:
+//   n                number of innings to simulate (default 1000)
+//   target           chase target for second innings; a number or an array-like
+//                    of per-innings targets (used as `runs > target`, like simulateInnings)
+//   matchConditions  { weather, pitchType }
+//   isSecondInnings  enables chase pressure and early termination
+//   perPlayer        also accumulate per-batsman and per-bowler sums
+//   random           uniform [0, 1) generator (default Math.random)
+export function simulateInningsBatch(battingTeam, bowlingTeam, options = {}) {
+  const {
+    n = 1000,
+    target = null,
+    matchConditions = {},
+    isSecondInnings = false,
+    perPlayer = false,
+    random = Math.random
+  } = options;
+  const { weather = 'Sunny', pitchType = 'Normal' } = matchConditions;
+
+  const numBatsmen = battingTeam.length;
+  const numBowlers = bowlingTeam.length;
+  const weatherEffect = getWeatherEffect(weather);
+  const pitchEffect = getPitchEffect(pitchType);
+
+  // Per-player skills are fixed for the whole innings, so resolve them once
+  const batSkill = new Float64Array(numBatsmen);
+  battingTeam.forEach((batsman, index) => {
+    const skill = (batsman.batting + batsman.technique + batsman.power) / 3;
+    batSkill[index] = skill * getFormMultiplier(batsman.form) * getFatigueMultiplier(batsman.fatigue)
+      - (weatherEffect.battingPenalty + pitchEffect.battingPenalty);
+  });
+
+  const bowlSkill = new Float64Array(numBowlers);
+  bowlingTeam.forEach((bowler, index) => {
+    let skill = (bowler.bowling + bowler.technique) / 2 + weatherEffect.bowlingBonus + pitchEffect.bowlingBonus;
+    if (pitchEffect.spinBonus && isSpinBowler(bowler)) {
+      skill += pitchEffect.spinBonus;
+    }
+    bowlSkill[index] = skill;
+  });
+
+  // Innings state, one slot per simulated innings
+  const runs = new Int32Array(n);
+  const wickets = new Int32Array(n);
+  const balls = new Int32Array(n);
+  const striker = new Int32Array(n);
+  const nonStriker = new Int32Array(n).fill(1);
+  const lastBowler = new Int32Array(n).fill(-1);
+  const bowlerOvers = new Uint8Array(n * numBowlers);
+  const finished = new Uint8Array(n);
+  const targets = new Float64Array(n);
+  const hasTarget = new Uint8Array(n);
+
+  for (let i = 0; i < n; i++) {
+    const t = target !== null && typeof target === 'object' ? target[i] : target;
+    targets[i] = t || 0;
+    hasTarget[i] = t ? 1 : 0;
+  }
+
+  // Optional per-player sums across all innings
+  const batRuns = perPlayer ? new Float64Array(numBatsmen) : null;
+  const batBalls = perPlayer ? new Float64Array(numBatsmen) : null;
+  const batFours = perPlayer ? new Float64Array(numBatsmen) : null;
+  const batSixes = perPlayer ? new Float64Array(numBatsmen) : null;
+  const batOuts = perPlayer ? new Float64Array(numBatsmen) : null;
+  const bowlOvers = perPlayer ? new Float64Array(numBowlers) : null;
+  const bowlMaidens = perPlayer ? new Float64Array(numBowlers) : null;
+  const bowlRuns = perPlayer ? new Float64Array(numBowlers) : null;
+  const bowlWickets = perPlayer ? new Float64Array(numBowlers) : null;
+
+  const candidates = new Int32Array(numBowlers);
+
+  for (let over = 0; over < MAX_OVERS; over++) {
+    const isPowerplay = over < 6;
+    const isDeathOvers = over >= 17;
+    const batsmanBonus = isPowerplay ? 5 : isDeathOvers ? 3 : 0;
+    const bowlerBonus = isDeathOvers ? 2 : 0;
+    const baseWicketChance = isDeathOvers ? 8 : 5;
+    const phaseAggression = isPowerplay ? 1.2 : isDeathOvers ? 1.5 : 1.0;
+    let active = 0;
+
+    for (let i = 0; i < n; i++) {
+      if (finished[i]) continue;
+      active++;
+
+      // Bowler selection: 4-over cap, no consecutive overs
+      const offset = i * numBowlers;
+      let available = 0;
+      for (let b = 0; b < numBowlers; b++) {
+        if (bowlerOvers[offset + b] < MAX_BOWLER_OVERS) available++;
+      }
+      const capApplies = available > 0;
+      if (!capApplies) available = numBowlers;
+
+      let count = 0;
+      for (let b = 0; b < numBowlers; b++) {
+        if (capApplies && bowlerOvers[offset + b] >= MAX_BOWLER_OVERS) continue;
+        if (b === lastBowler[i] && available > 1) continue;
+        candidates[count++] = b;
+      }
+      const bowler = candidates[Math.floor(random() * count)];
+      bowlerOvers[offset + bowler]++;
+      lastBowler[i] = bowler;
+
+      // Work on locals for the over and write the state back afterwards
+      const bowlerSkill = bowlSkill[bowler] + bowlerBonus;
+      const target_i = targets[i];
+      const chasing = isSecondInnings && hasTarget[i] === 1;
+      let inningsRuns = runs[i];
+      let inningsWickets = wickets[i];
+      let inningsBalls = balls[i];
+      let onStrike = striker[i];
+      let offStrike = nonStriker[i];
+      let overRuns = 0;
+      let overWickets = 0;
+      let overConceded = 0;
+      let legal = 0;
+
+      while (legal < 6 && inningsWickets < 10) {
+        inningsBalls++;
+
+        if (random() < 0.05) {
+          // Extras count against the bowler but not the batting total
+          overConceded++;
+          if (random() < 0.9) {
+            continue; // wide or no-ball, re-bowled
+          }
+        } else {
+          const s = onStrike;
+          const batsmanSkill = batSkill[s] + batsmanBonus;
+          const wicketChance = (bowlerSkill - batsmanSkill) / 10 + baseWicketChance;
+
+          if (random() * 100 < wicketChance && wicketChance > 0) {
+            inningsWickets++;
+            overWickets++;
+            if (perPlayer) {
+              batOuts[s]++;
+              bowlWickets[bowler]++;
+            }
+            if (inningsWickets < 10 && s + inningsWickets + 1 < numBatsmen) {
+              onStrike = inningsWickets + 1;
+            }
+          } else {
+            let pressureFactor = 1.0;
+            if (chasing) {
+              const requiredRate = (target_i - inningsRuns) / ((MAX_BALLS - inningsBalls) / 6);
+              const currentRate = inningsRuns > 0 ? inningsRuns / (inningsBalls / 6) : 0;
+              if (requiredRate > currentRate + 2) {
+                pressureFactor = 1.2;
+              } else if (requiredRate < currentRate - 1) {
+                pressureFactor = 0.8;
+              }
+            }
+
+            const aggression = pressureFactor * phaseAggression;
+            const runChance = random() * 100;
+            let ballRuns = 0;
+
+            if (runChance < (batsmanSkill / 10) * aggression) {
+              if (runChance < (batsmanSkill / 50) * aggression) {
+                ballRuns = 6;
+                if (perPlayer) batSixes[s]++;
+              } else if (runChance < (batsmanSkill / 25) * aggression) {
+                ballRuns = 4;
+                if (perPlayer) batFours[s]++;
+              } else {
+                ballRuns = Math.floor(random() * 3) + 1;
+              }
+            }
+
+            if (perPlayer) {
+              batRuns[s] += ballRuns;
+              batBalls[s]++;
+            }
+            inningsRuns += ballRuns;
+            overRuns += ballRuns;
+            overConceded += ballRuns;
+
+            if (ballRuns % 2 === 1) {
+              onStrike = offStrike;
+              offStrike = s;
+            }
+          }
+        }
+
+        legal++;
+        if (isSecondInnings && inningsRuns > target_i) {
+          finished[i] = 1;
+          break;
+        }
+      }
+
+      if (perPlayer) {
+        bowlOvers[bowler]++;
+        bowlRuns[bowler] += overConceded;
+        if (overRuns === 0 && overWickets === 0) bowlMaidens[bowler]++;
+      }
+
+      // Change strike at end of over
+      runs[i] = inningsRuns;
+      wickets[i] = inningsWickets;
+      balls[i] = inningsBalls;
+      striker[i] = offStrike;
+      nonStriker[i] = onStrike;
+
+      if (wickets[i] >= 10) finished[i] = 1;
+    }
+
+    if (active === 0) break;
+  }
+
+  const result = {
+    n,
+    runs,
+    wickets,
+    balls,
+    distributions: {
+      runs: summarizeSamples(runs, 10),
+      wickets: summarizeSamples(wickets, 1),
+      balls: summarizeSamples(balls, 6)
+    }
+  };
+
+  if (perPlayer) {
+    result.batsmen = battingTeam.map((batsman, index) => ({
+      name: batsman.name,
+      runs: batRuns[index],
+      balls: batBalls[index],
+      fours: batFours[index],
+      sixes: batSixes[index],
+      dismissals: batOuts[index]
+    }));
+    result.bowlers = bowlingTeam.map((bowler, index) => ({
+      name: bowler.name,
+      overs: bowlOvers[index],
+      maidens: bowlMaidens[index],
+      runs: bowlRuns[index],
+      wickets: bowlWickets[index]
+    }));
+  }
+
+  return result;
+}
+
+// Mean, spread, percentiles and a fixed-width histogram of integer samples
+export function summarizeSamples(samples, bucketSize = 1) {
+  const n = samples.length;
+  if (n === 0) {
+    return { mean: 0, sd: 0, min: 0, max: 0, percentiles: {}, histogram: { bucketSize, start: 0, counts: [] } };
+  }
+
+  const sorted = Int32Array.from(samples).sort();
+  let sum = 0;
+  let sumSquares = 0;
+  for (let i = 0; i < n; i++) {
+    sum += sorted[i];
+    sumSquares += sorted[i] * sorted[i];
+  }
+  const mean = sum / n;
+  const variance = Math.max(0, sumSquares / n - mean * mean);
+  const percentile = (p) => sorted[Math.min(n - 1, Math.floor(p * n))];
+
+  const start = Math.floor(sorted[0] / bucketSize) * bucketSize;
+  const counts = new Array(Math.floor((sorted[n - 1] - start) / bucketSize) + 1).fill(0);
+  for (let i = 0; i < n; i++) {
+    counts[Math.floor((sorted[i] - start) / bucketSize)]++;
+  }
+
+  return {
+    mean,
+    sd: Math.sqrt(variance),
+    min: sorted[0],
+    max: sorted[n - 1],
+    percentiles: {
+      p5: percentile(0.05),
+      p25: percentile(0.25),
+      p50: percentile(0.5),
+      p75: percentile(0.75),
+      p95: percentile(0.95)
+    },
+    histogram: { bucketSize, start, counts }
+  };
+}
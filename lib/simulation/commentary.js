@@ -0,0 +1,126 @@
+// Commentary templates for a single delivery. Every generator takes an
+// optional Math.random-compatible source so a line can be re-rendered
+// identically from a stored seed (see ball-log.js).
+
+export function generateWicketCommentary(batsman, bowler, wicketType, runs, wicketNumber, random = Math.random) {
+  const wicketComments = {
+    bowled: [
+      `BOWLED! ${bowler.name} crashes through the defenses of ${batsman.name}!`,
+      `Timber! ${batsman.name} is clean bowled by a beauty from ${bowler.name}!`,
+      `What a delivery! ${bowler.name} rattles the stumps and ${batsman.name} has to go!`
+    ],
+    caught: [
+      `CAUGHT! ${batsman.name} finds the fielder and ${bowler.name} gets his reward!`,
+      `Gone! ${batsman.name} tries to go big but holes out to the fielder!`,
+      `Excellent catch! ${batsman.name} is dismissed and ${bowler.name} is delighted!`
+    ],
+    lbw: [
+      `LBW! ${batsman.name} is trapped in front by ${bowler.name}!`,
+      `Plumb! ${batsman.name} is caught dead in front of the stumps!`,
+      `That looked stone dead! ${batsman.name} has to walk back!`
+    ],
+    'caught behind': [
+      `CAUGHT BEHIND! ${batsman.name} edges it to the keeper!`,
+      `Gone! The keeper takes a sharp catch behind the stumps!`,
+      `Thin edge! ${batsman.name} nicks it and the keeper does the rest!`
+    ],
+    'run out': [
+      `RUN OUT! Poor communication and ${batsman.name} has to go!`,
+      `Direct hit! ${batsman.name} is short of the crease!`,
+      `Brilliant fielding! ${batsman.name} is caught well short!`
+    ]
+  };
+  
+  const comments = wicketComments[wicketType] || [`OUT! ${batsman.name} is dismissed by ${bowler.name}`];
+  let comment = comments[Math.floor(random() * comments.length)];
+  
+  if (wicketNumber <= 3) {
+    comment += ` Early breakthrough for the bowling side!`;
+  } else if (wicketNumber >= 8) {
+    comment += ` The tail is crumbling now!`;
+  }
+  
+  return comment;
+}
+
+export function generateBoundaryCommentary(batsman, bowler, runs, totalRuns, isPowerplay, isDeathOvers, random = Math.random) {
+  const sixComments = [
+    `SIX! ${batsman.name} sends it sailing over the ropes!`,
+    `Maximum! What a strike from ${batsman.name}!`,
+    `Gone all the way! ${batsman.name} absolutely crunches that one!`,
+    `Into the crowd! ${batsman.name} connects beautifully!`,
+    `Massive hit! ${batsman.name} clears the boundary with ease!`
+  ];
+  
+  const fourComments = [
+    `FOUR! ${batsman.name} finds the gap beautifully!`,
+    `Cracking shot! ${batsman.name} pierces the field!`,
+    `Exquisite timing! ${batsman.name} guides it to the fence!`,
+    `Brilliant stroke! ${batsman.name} finds the boundary!`,
+    `Perfect placement! ${batsman.name} beats the field!`
+  ];
+  
+  let comments = runs === 6 ? sixComments : fourComments;
+  let comment = comments[Math.floor(random() * comments.length)];
+  
+  if (isPowerplay) {
+    comment += ` Making the most of the powerplay restrictions!`;
+  } else if (isDeathOvers) {
+    comment += ` Crucial runs in the death overs!`;
+  }
+  
+  return comment;
+}
+
+export function generateDotBallCommentary(batsman, bowler, isPowerplay, isDeathOvers, random = Math.random) {
+  const dotComments = [
+    `Dot ball. ${bowler.name} keeps it tight.`,
+    `Good length from ${bowler.name}, ${batsman.name} defends.`,
+    `${batsman.name} can't get it away, excellent bowling.`,
+    `${bowler.name} hits the right length, no runs.`,
+    `Solid defense from ${batsman.name}.`
+  ];
+  
+  let comment = dotComments[Math.floor(random() * dotComments.length)];
+  
+  if (isDeathOvers) {
+    comment += ` Pressure building in the death overs!`;
+  } else if (isPowerplay) {
+    comment += ` Good tight bowling despite the field restrictions.`;
+  }
+  
+  return comment;
+}
+
+// Commentary line for one delivery described by its outcome: extras, wicket
+// (with type), runs and milestone, plus the batsman/bowler names, totals and
+// phase flags of a ball-log entry
+export function renderBallCommentary(ball, random = Math.random) {
+  const batsman = { name: ball.batsman };
+  const bowler = { name: ball.bowler };
+  let comment;
+
+  if (ball.extras === 'wide') {
+    comment = `Wide ball! ${bowler.name} strays down the leg side`;
+  } else if (ball.extras === 'no-ball') {
+    comment = `No ball! ${bowler.name} oversteps the crease`;
+  } else if (ball.extras === 'bye') {
+    comment = `Bye! The ball beats everyone`;
+  } else if (ball.isWicket) {
+    comment = generateWicketCommentary(batsman, bowler, ball.wicketType, ball.totalRuns, ball.wickets, random);
+  } else if (ball.runs === 4 || ball.runs === 6) {
+    comment = generateBoundaryCommentary(batsman, bowler, ball.runs, ball.totalRuns, ball.isPowerplay, ball.isDeathOvers, random);
+  } else if (ball.runs > 0) {
+    comment = `${batsman.name} works it for ${ball.runs} run${ball.runs > 1 ? 's' : ''}`;
+  } else {
+    comment = generateDotBallCommentary(batsman, bowler, ball.isPowerplay, ball.isDeathOvers, random);
+  }
+
+  if (ball.milestone === 'fifty') {
+    comment += ` FIFTY for ${batsman.name}! What a knock!`;
+  } else if (ball.milestone === 'century') {
+    comment += ` CENTURY! ${batsman.name} reaches three figures!`;
+  }
+
+  return comment;
+}
@@ -0,0 +1,326 @@
+import { BallLogWriter, ballSeed } from './ball-log.js';
+import { renderBallCommentary } from './commentary.js';
+import { createRandom } from './random.js';
+import {
+  OUTCOME,
+  OUTCOME_RUNS,
+  PRESSURE,
+  cellOffset,
+  chasePressure,
+  compileMatchups,
+  drawOutcome,
+  matchupTable,
+  phaseOfOver,
+  wicketRoll
+} from './matchups.js';
+
+const WICKET_TYPES = ['bowled', 'caught', 'lbw', 'caught behind', 'run out'];
+
+export {
+  generateWicketCommentary,
+  generateBoundaryCommentary,
+  generateDotBallCommentary
+} from './commentary.js';
+
+// Weather and pitch effects
+export function getWeatherEffect(weather) {
+  switch(weather) {
+    case 'Overcast': return { bowlingBonus: 5, battingPenalty: 3 };
+    case 'Rainy': return { bowlingBonus: 8, battingPenalty: 5 };
+    case 'Sunny': return { bowlingBonus: 0, battingPenalty: 0 };
+    default: return { bowlingBonus: 0, battingPenalty: 0 };
+  }
+}
+
+export function getPitchEffect(pitchType) {
+  switch(pitchType) {
+    case 'Green': return { bowlingBonus: 6, battingPenalty: 4 };
+    case 'Dusty': return { bowlingBonus: 3, battingPenalty: 2, spinBonus: 5 };
+    case 'Flat': return { bowlingBonus: -3, battingPenalty: -3 };
+    default: return { bowlingBonus: 0, battingPenalty: 0 };
+  }
+}
+
+// Player condition multipliers applied to batting skill
+export function getFormMultiplier(form) {
+  return form === 'Excellent' ? 1.15 :
+         form === 'Good' ? 1.05 :
+         form === 'Poor' ? 0.9 :
+         form === 'Terrible' ? 0.8 : 1.0;
+}
+
+export function getFatigueMultiplier(fatigue) {
+  return fatigue === 'Fresh' ? 1.0 :
+         fatigue === 'Slightly tired' ? 0.95 :
+         fatigue === 'Tired' ? 0.9 : 0.85;
+}
+
+export function isSpinBowler(bowler) {
+  return Boolean(bowler.bowler_type?.includes('spin') || bowler.bowler_type?.includes('Spin'));
+}
+
+// Enhanced T20 Match simulation functions
+//
+// Delivery outcomes are drawn from matchup tables compiled once per innings
+// (see matchups.js). Every delivery is recorded in a compact ball log (see
+// ball-log.js) whose commentary can be rendered later; `options.commentary: false` skips building
+// the per-ball commentary objects. Every draw (bowler choice, delivery outcome,
+// commentary line) comes from `options.seed`, so the same squads, conditions
+// and seed always replay the same innings.
+export function simulateInnings(battingTeam, bowlingTeam, target = null, matchConditions = {}, isSecondInnings = false, options = {}) {
+  const maxOvers = 20;
+  const { commentary: withCommentary = true, seed = Math.floor(Math.random() * 4294967296) } = options;
+  const random = createRandom(seed);
+  const ballLog = new BallLogWriter();
+  
+  let runs = 0;
+  let wickets = 0;
+  let ballCount = 0;
+  let commentary = [];
+  let currentBatsman1 = 0;
+  let currentBatsman2 = 1;
+  let bowlerOvers = {}; // Track overs bowled by each bowler
+  let partnerships = [];
+  let currentPartnership = { batsman1: battingTeam[0].name, batsman2: battingTeam[1].name, runs: 0, balls: 0 };
+  let fallOfWickets = [];
+  let bowlingFigures = {};
+  let lastBowler = -1;
+  
+  // Initialize batting scores
+  let batsmanScores = battingTeam.map(() => ({ 
+    runs: 0, balls: 0, fours: 0, sixes: 0, out: false, outType: null, bowler: null, strikeRate: 0 
+  }));
+  
+  // Skills, form, fatigue and conditions are fixed for the innings
+  const matchups = compileMatchups(battingTeam, bowlingTeam, matchConditions);
+  
+  for (let over = 0; over < maxOvers && wickets < 10; over++) {
+    const isPowerplay = over < 6;
+    const isDeathOvers = over >= 17;
+    const phase = phaseOfOver(over);
+    
+    // Bowling restrictions - can't bowl more than 4 overs
+    let availableBowlers = bowlingTeam.filter((_, index) => (bowlerOvers[index] || 0) < 4);
+    if (availableBowlers.length === 0) availableBowlers = bowlingTeam; // Fallback
+    
+    // Select bowler (can't bowl consecutive overs)
+    let bowlerIndex;
+    do {
+      bowlerIndex = Math.floor(random() * availableBowlers.length);
+      bowlerIndex = bowlingTeam.findIndex(b => b.id === availableBowlers[bowlerIndex].id);
+    } while (bowlerIndex === lastBowler && availableBowlers.length > 1);
+    
+    const bowler = bowlingTeam[bowlerIndex];
+    bowlerOvers[bowlerIndex] = (bowlerOvers[bowlerIndex] || 0) + 1;
+    lastBowler = bowlerIndex;
+    
+    // Initialize bowling figures
+    if (!bowlingFigures[bowler.id]) {
+      bowlingFigures[bowler.id] = { 
+        name: bowler.name, overs: 0, maidens: 0, runs: 0, wickets: 0, economy: 0 
+      };
+    }
+    
+    let overRuns = 0;
+    let overWickets = 0;
+    
+    for (let ball = 0; ball < 6 && wickets < 10; ball++) {
+      ballCount++;
+      currentPartnership.balls++;
+      
+      // Get current players
+      const strikerIndex = currentBatsman1;
+      const batsman = battingTeam[currentBatsman1];
+      const nonStriker = battingTeam[currentBatsman2];
+      
+      // Outcome from the innings' matchup tables: one lookup, one draw
+      const pressure = isSecondInnings && target ? chasePressure(target, runs, ballCount, maxOvers * 6) : PRESSURE.NORMAL;
+      const table = matchupTable(matchups, strikerIndex, bowlerIndex, phase, pressure);
+      const cell = cellOffset(phase, pressure);
+      const roll = random();
+      const outcome = drawOutcome(table, cell, roll);
+      let ballRuns = OUTCOME_RUNS[outcome];
+      let isWicket = false;
+      let wicketType = null;
+      let extras = null;
+      let milestone = null;
+      
+      if (outcome <= OUTCOME.BYE) {
+        if (outcome === OUTCOME.WIDE) {
+          extras = 'wide';
+          ball--; // Wide ball doesn't count as a legal delivery
+        } else if (outcome === OUTCOME.NO_BALL) {
+          extras = 'no-ball';
+          ball--; // No ball doesn't count as a legal delivery
+        } else {
+          extras = 'bye';
+        }
+      } else if (outcome === OUTCOME.WICKET) {
+        // Wicket
+        isWicket = true;
+        overWickets++;
+        wicketType = WICKET_TYPES[Math.floor(wicketRoll(table, cell, roll) * WICKET_TYPES.length)];
+        
+        batsmanScores[currentBatsman1].out = true;
+        batsmanScores[currentBatsman1].outType = wicketType;
+        batsmanScores[currentBatsman1].bowler = bowler.name;
+        
+        fallOfWickets.push({
+          wicket: wickets + 1,
+          batsman: batsman.name,
+          runs: runs,
+          over: over + 1,
+          ball: ball + 1,
+          bowler: bowler.name,
+          type: wicketType
+        });
+        
+        // End current partnership
+        partnerships.push({...currentPartnership});
+        
+        wickets++;
+        
+        // Next batsman comes in
+        if (wickets < 10 && currentBatsman1 + wickets + 1 < battingTeam.length) {
+          currentBatsman1 = wickets + 1;
+          currentPartnership = {
+            batsman1: battingTeam[currentBatsman1].name,
+            batsman2: battingTeam[currentBatsman2].name,
+            runs: 0,
+            balls: 0
+          };
+        }
+      } else {
+        // Runs scored
+        if (outcome === OUTCOME.SIX) {
+          batsmanScores[currentBatsman1].sixes++;
+        } else if (outcome === OUTCOME.FOUR) {
+          batsmanScores[currentBatsman1].fours++;
+        }
+        
+        batsmanScores[currentBatsman1].runs += ballRuns;
+        batsmanScores[currentBatsman1].balls++;
+        
+        // Check for milestones
+        if (batsmanScores[currentBatsman1].runs === 50) {
+          milestone = 'fifty';
+        } else if (batsmanScores[currentBatsman1].runs === 100) {
+          milestone = 'century';
+        }
+        
+        runs += ballRuns;
+        overRuns += ballRuns;
+        currentPartnership.runs += ballRuns;
+        
+        // Change strike on odd runs
+        if (ballRuns % 2 === 1) {
+          [currentBatsman1, currentBatsman2] = [currentBatsman2, currentBatsman1];
+        }
+      }
+      
+      // Update bowling figures
+      bowlingFigures[bowler.id].runs += ballRuns;
+      if (isWicket) bowlingFigures[bowler.id].wickets++;
+      
+      ballLog.push({
+        over: over + 1,
+        ball: ball + 1,
+        batsman: strikerIndex,
+        bowler: bowlerIndex,
+        runs: ballRuns,
+        isWicket,
+        wicketType,
+        extras,
+        milestone
+      });
+
+      if (withCommentary) {
+        // Calculate rates
+        const currentRunRate = ballCount > 0 ? (runs / (ballCount / 6)).toFixed(2) : '0.00';
+        let requiredRunRate = null;
+        if (isSecondInnings && target) {
+          const ballsLeft = (maxOvers * 6) - ballCount;
+          requiredRunRate = ballsLeft > 0 ? ((target - runs) / (ballsLeft / 6)).toFixed(2) : '0.00';
+        }
+        
+        const delivery = {
+          over: over + 1,
+          ball: ball + 1,
+          runs: ballRuns,
+          totalRuns: runs,
+          wickets: wickets,
+          batsman: batsman.name,
+          bowler: bowler.name,
+          commentary: null,
+          isWicket: isWicket,
+          extras: extras,
+          milestone: milestone,
+          currentRunRate: parseFloat(currentRunRate),
+          requiredRunRate: requiredRunRate ? parseFloat(requiredRunRate) : null,
+          isPowerplay: isPowerplay,
+          isDeathOvers: isDeathOvers,
+          pressure: isSecondInnings && target ? (target - runs) : null,
+          ballsLeft: isSecondInnings && target ? (maxOvers * 6) - ballCount : null
+        };
+        // Same line as the ball log renders for this delivery later
+        delivery.commentary = renderBallCommentary({ ...delivery, wicketType }, createRandom(ballSeed({ seed }, ballCount)));
+        commentary.push(delivery);
+      }
+      
+      // Check if target achieved in second innings
+      if (isSecondInnings && runs > target) {
+        break;
+      }
+    }
+    
+    // Update bowling figures for the over
+    bowlingFigures[bowler.id].overs++;
+    if (overRuns === 0 && overWickets === 0) {
+      bowlingFigures[bowler.id].maidens++;
+    }
+    
+    // Change strike at end of over
+    [currentBatsman1, currentBatsman2] = [currentBatsman2, currentBatsman1];
+    
+    // Check if target achieved in second innings
+    if (isSecondInnings && runs > target) {
+      break;
+    }
+  }
+  
+  // Finalize current partnership
+  if (currentPartnership.balls > 0) {
+    partnerships.push(currentPartnership);
+  }
+  
+  // Calculate final bowling figures
+  Object.keys(bowlingFigures).forEach(bowlerId => {
+    const figure = bowlingFigures[bowlerId];
+    figure.economy = figure.overs > 0 ? (figure.runs / figure.overs).toFixed(2) : '0.00';
+  });
+  
+  // Calculate batting strike rates
+  batsmanScores.forEach((score, index) => {
+    score.strikeRate = score.balls > 0 ? ((score.runs / score.balls) * 100).toFixed(2) : '0.00';
+    score.name = battingTeam[index].name;
+  });
+  
+  return {
+    runs,
+    wickets,
+    overs: Math.floor(ballCount / 6) + (ballCount % 6 > 0 ? (ballCount % 6) / 10 : 0),
+    balls: ballCount,
+    commentary,
+    ballLog: ballLog.finish({
+      batsmen: battingTeam.map(player => player.name),
+      bowlers: bowlingTeam.map(player => player.name),
+      target: isSecondInnings && target ? target : null,
+      seed
+    }),
+    batsmanScores,
+    bowlingFigures: Object.values(bowlingFigures),
+    partnerships,
+    fallOfWickets,
+    runRate: ballCount > 0 ? (runs / (ballCount / 6)).toFixed(2) : '0.00'
+  };
+}
@@ -0,0 +1,165 @@
+import { simulateInnings } from './innings.js';
+import { squadFingerprint } from './projection.js';
+import { deriveSeed, hashString } from './random.js';
+
+// Bumped whenever the engine would play the same inputs differently, which
+// invalidates the replay records of matches simulated before
+export const REPLAY_VERSION = 1;
+
+// Match columns served by default; commentary, live_commentary and the
+// ball-by-ball log are fetched separately
+export const MATCH_COLUMNS = [
+  'id', 'home_team_id', 'away_team_id', 'league', 'season', 'match_type', 'scheduled_time',
+  'pitch_type', 'weather', 'venue', 'status', 'home_score', 'away_score', 'home_wickets',
+  'away_wickets', 'home_overs', 'away_overs', 'result', 'win_margin', 'win_type', 'target',
+  'current_innings', 'current_over', 'current_ball', 'current_runs', 'current_wickets',
+  'match_data', 'round', 'match_number', 'created_at', 'updated_at'
+].join(', ');
+
+// Scorecard of one innings as stored in matches.match_data
+function inningsSummary(innings, battingTeamId, bowlingTeamId) {
+  return {
+    battingTeamId,
+    bowlingTeamId,
+    runs: innings.runs,
+    wickets: innings.wickets,
+    overs: innings.overs,
+    runRate: innings.runRate,
+    batsmanScores: innings.batsmanScores,
+    bowlingFigures: innings.bowlingFigures,
+    fallOfWickets: innings.fallOfWickets,
+    partnerships: innings.partnerships
+  };
+}
+
+// Seed of a match's simulation, stored in its replay record
+export function matchSeed(match) {
+  return hashString(match.id);
+}
+
+function conditionsOf(match) {
+  return { weather: match.weather || 'Sunny', pitchType: match.pitch_type || 'Normal' };
+}
+
+// Identity of everything a match simulation reads besides its seed: engine
+// version, conditions, the two XIs in batting order and every attribute the
+// outcome model reads, plus the names the scorecards and commentary print
+export function matchFingerprint(match, homeXI, awayXI) {
+  const { weather, pitchType } = conditionsOf(match);
+  const names = [...homeXI, ...awayXI].map(player => player.name).join('|');
+  return hashString([REPLAY_VERSION, weather, pitchType, squadFingerprint(homeXI), squadFingerprint(awayXI), names].join('#'))
+    .toString(16)
+    .padStart(8, '0');
+}
+
+// What a match stores to be replayed: its seed, the fingerprint of its inputs
+// and the ids of the two XIs (null for replacement players)
+export function replayRecord(match, homeXI, awayXI, seed) {
+  const ids = xi => xi.map(player => (player.replacement ? null : player.id));
+  return { v: REPLAY_VERSION, seed, fingerprint: matchFingerprint(match, homeXI, awayXI), xi: [ids(homeXI), ids(awayXI)] };
+}
+
+// Both innings of a match (the home side bats first), each seeded from the
+// match seed so either can be regenerated
+export function simulateMatchInnings(match, homeXI, awayXI, seed = matchSeed(match), { commentary = false } = {}) {
+  const matchConditions = conditionsOf(match);
+  const first = simulateInnings(homeXI, awayXI, null, matchConditions, false, {
+    commentary,
+    seed: deriveSeed(seed, 1)
+  });
+  const second = simulateInnings(awayXI, homeXI, first.runs, matchConditions, true, {
+    commentary,
+    seed: deriveSeed(seed, 2)
+  });
+  return { first, second };
+}
+
+// Scorecards of both innings as served in match_data
+export function matchScorecards(match, first, second) {
+  return {
+    firstInnings: inningsSummary(first, match.home_team_id, match.away_team_id),
+    secondInnings: inningsSummary(second, match.away_team_id, match.home_team_id)
+  };
+}
+
+// Ball-by-ball simulation of a whole T20 (the home side bats first). Returns
+// the match columns: scores, result, scorecards and the replay record in
+// match_data and the compact per-innings ball logs in ball_log; no commentary
+// text is produced. See storedMatchColumns() for what is written.
+export function simulateMatchBallByBall(match, squads, teams) {
+  const homeXI = squads.get(match.home_team_id);
+  const awayXI = squads.get(match.away_team_id);
+  const seed = matchSeed(match);
+  const { first, second } = simulateMatchInnings(match, homeXI, awayXI, seed);
+
+  const columns = matchResultColumns(match, first, second, teams);
+
+  return {
+    ...columns,
+    match_data: {
+      homeScore: first.runs,
+      awayScore: second.runs,
+      winner: columns.result.winner,
+      result: columns.result.result,
+      completedAt: columns.updated_at,
+      ...matchScorecards(match, first, second),
+      replay: replayRecord(match, homeXI, awayXI, seed)
+    },
+    ball_log: [first.ballLog, second.ballLog]
+  };
+}
+
+// Columns written for a simulated match: its result and a match_data of a
+// few hundred bytes. Scorecards and ball logs are regenerated on demand from
+// the replay record (see replay.js).
+export function storedMatchColumns(simulated) {
+  const { ball_log: ballLogs, match_data: { firstInnings, secondInnings, ...summary }, ...columns } = simulated;
+  return { ...columns, match_data: summary };
+}
+
+// Score and result columns of a completed match from the totals ({ runs,
+// wickets, overs }) of its two innings, the home side batting first
+export function matchResultColumns(match, first, second, teams) {
+  const homeName = teams.get(match.home_team_id)?.team_name || 'Home Team';
+  const awayName = teams.get(match.away_team_id)?.team_name || 'Away Team';
+
+  let winner, result, winMargin, winType;
+  if (first.runs > second.runs) {
+    winner = homeName;
+    result = 'Home team won';
+    winMargin = first.runs - second.runs;
+    winType = 'runs';
+  } else if (second.runs > first.runs) {
+    winner = awayName;
+    result = 'Away team won';
+    winMargin = 10 - second.wickets;
+    winType = 'wickets';
+  } else {
+    winner = 'Draw';
+    result = 'Match tied';
+    winMargin = 0;
+    winType = 'tie';
+  }
+
+  return {
+    status: 'completed',
+    home_score: first.runs,
+    away_score: second.runs,
+    home_wickets: first.wickets,
+    away_wickets: second.wickets,
+    home_overs: first.overs,
+    away_overs: second.overs,
+    target: first.runs + 1,
+    result: {
+      winner,
+      homeScore: first.runs,
+      awayScore: second.runs,
+      result,
+      winMargin,
+      winType
+    },
+    win_margin: winMargin,
+    win_type: winType,
+    updated_at: new Date().toISOString()
+  };
+}
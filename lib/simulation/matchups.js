@@ -0,0 +1,164 @@
+import {
+  getWeatherEffect,
+  getPitchEffect,
+  getFormMultiplier,
+  getFatigueMultiplier,
+  isSpinBowler
+} from './innings.js';
+
+// Precompiled matchup outcome tables for the per-ball engine.
+//
+// Everything simulateInnings' outcome model depends on apart from the chase
+// situation is fixed for an innings: player skills, form and fatigue,
+// weather and pitch, the spin bonus and the phase adjustments. So it is
+// resolved once, into cumulative outcome thresholds for every
+// batsman/bowler pair, phase (powerplay, middle, death overs) and chase
+// pressure level. A delivery is then a table lookup plus one uniform draw.
+
+// Outcomes of a delivery, in threshold order; `dot` takes what is left
+export const OUTCOME = {
+  WIDE: 0,
+  NO_BALL: 1,
+  BYE: 2,
+  WICKET: 3,
+  SIX: 4,
+  FOUR: 5,
+  ONE: 6,
+  TWO: 7,
+  THREE: 8,
+  DOT: 9
+};
+
+export const OUTCOME_NAMES = ['wide', 'no-ball', 'bye', 'wicket', 'six', 'four', 'one', 'two', 'three', 'dot'];
+export const OUTCOME_RUNS = [1, 1, 1, 0, 6, 4, 1, 2, 3, 0];
+
+export const PHASE = { POWERPLAY: 0, MIDDLE: 1, DEATH: 2 };
+
+// Chase pressure levels and the aggression factor each applies
+export const PRESSURE = { LOW: 0, NORMAL: 1, HIGH: 2 };
+export const PRESSURE_FACTORS = [0.8, 1.0, 1.2];
+
+const THRESHOLDS = OUTCOME.DOT;
+const PHASES = 3;
+const PRESSURES = 3;
+
+// Extras: 5% of deliveries, split 60/30/10 between wides, no-balls and byes
+const EXTRA_CHANCE = 0.05;
+const WIDE_CHANCE = EXTRA_CHANCE * 0.6;
+const NO_BALL_CHANCE = EXTRA_CHANCE * 0.3;
+
+export function phaseOfOver(over) {
+  return over < 6 ? PHASE.POWERPLAY : over >= 17 ? PHASE.DEATH : PHASE.MIDDLE;
+}
+
+// Pressure of a chase after `balls` deliveries with `runs` scored
+export function chasePressure(target, runs, balls, maxBalls = 120) {
+  const requiredRate = (target - runs) / ((maxBalls - balls) / 6);
+  const currentRate = runs > 0 ? (runs / (balls / 6)) : 0;
+  if (requiredRate > currentRate + 2) return PRESSURE.HIGH;
+  if (requiredRate < currentRate - 1) return PRESSURE.LOW;
+  return PRESSURE.NORMAL;
+}
+
+// Probability that a roll uniform on [0, 100) falls below `value`
+function below(value) {
+  return Math.min(Math.max(value, 0), 100) / 100;
+}
+
+// Cumulative thresholds of one cell, written at `offset`
+function compileCell(thresholds, offset, batsmanSkill, bowlerSkill, phase, aggression) {
+  const wicketChance = (bowlerSkill - batsmanSkill) / 10 + (phase === PHASE.DEATH ? 8 : 5);
+  const wicket = below(wicketChance);
+  const six = below((batsmanSkill / 50) * aggression);
+  const boundary = below((batsmanSkill / 25) * aggression);
+  const scoring = below((batsmanSkill / 10) * aggression);
+  const inPlay = (1 - EXTRA_CHANCE) * (1 - wicket);
+  const running = inPlay * (scoring - boundary) / 3;
+
+  thresholds[offset + OUTCOME.WIDE] = WIDE_CHANCE;
+  thresholds[offset + OUTCOME.NO_BALL] = WIDE_CHANCE + NO_BALL_CHANCE;
+  let cumulative = thresholds[offset + OUTCOME.BYE] = EXTRA_CHANCE;
+  thresholds[offset + OUTCOME.WICKET] = cumulative += (1 - EXTRA_CHANCE) * wicket;
+  thresholds[offset + OUTCOME.SIX] = cumulative += inPlay * six;
+  thresholds[offset + OUTCOME.FOUR] = cumulative += inPlay * (boundary - six);
+  thresholds[offset + OUTCOME.ONE] = cumulative += running;
+  thresholds[offset + OUTCOME.TWO] = cumulative += running;
+  thresholds[offset + OUTCOME.THREE] = cumulative += running;
+}
+
+// Compile the outcome tables of an innings. Player skills are resolved here;
+// the thresholds of a cell are filled the first time matchupTable() is asked
+// for it, since an innings only meets a fraction of the pairs and phases.
+export function compileMatchups(battingTeam, bowlingTeam, matchConditions = {}) {
+  const { weather = 'Sunny', pitchType = 'Normal' } = matchConditions;
+  const weatherEffect = getWeatherEffect(weather);
+  const pitchEffect = getPitchEffect(pitchType);
+  const numBatsmen = battingTeam.length;
+  const numBowlers = bowlingTeam.length;
+
+  const batSkill = new Float64Array(numBatsmen);
+  battingTeam.forEach((batsman, index) => {
+    const skill = (batsman.batting + batsman.technique + batsman.power) / 3;
+    batSkill[index] = skill * getFormMultiplier(batsman.form) * getFatigueMultiplier(batsman.fatigue)
+      - (weatherEffect.battingPenalty + pitchEffect.battingPenalty);
+  });
+
+  const bowlSkill = new Float64Array(numBowlers);
+  bowlingTeam.forEach((bowler, index) => {
+    let skill = (bowler.bowling + bowler.technique) / 2 + weatherEffect.bowlingBonus + pitchEffect.bowlingBonus;
+    if (pitchEffect.spinBonus && isSpinBowler(bowler)) {
+      skill += pitchEffect.spinBonus;
+    }
+    bowlSkill[index] = skill;
+  });
+
+  return { numBatsmen, numBowlers, batSkill, bowlSkill, tables: new Array(numBatsmen * numBowlers).fill(null) };
+}
+
+// Outcome thresholds of a batsman/bowler pair; a cell (phase and pressure
+// level) is compiled on first use, recognisable by its zero wide threshold
+export function matchupTable(matchups, batsman, bowler, phase, pressure = PRESSURE.NORMAL) {
+  const pair = batsman * matchups.numBowlers + bowler;
+  const table = matchups.tables[pair] ??= new Float64Array(PHASES * PRESSURES * THRESHOLDS);
+  const offset = cellOffset(phase, pressure);
+  if (table[offset] === 0) {
+    const batsmanSkill = matchups.batSkill[batsman] + (phase === PHASE.POWERPLAY ? 5 : phase === PHASE.DEATH ? 3 : 0);
+    const bowlerSkill = matchups.bowlSkill[bowler] + (phase === PHASE.DEATH ? 2 : 0);
+    const phaseAggression = phase === PHASE.POWERPLAY ? 1.2 : phase === PHASE.DEATH ? 1.5 : 1.0;
+    compileCell(table, offset, batsmanSkill, bowlerSkill, phase, PRESSURE_FACTORS[pressure] * phaseAggression);
+  }
+  return table;
+}
+
+// Offset of a phase and pressure level's thresholds within a pair's table
+export function cellOffset(phase, pressure = PRESSURE.NORMAL) {
+  return (phase * PRESSURES + pressure) * THRESHOLDS;
+}
+
+// Outcome of a delivery for a uniform draw `u` in [0, 1)
+export function drawOutcome(table, offset, u) {
+  for (let outcome = 0; outcome < THRESHOLDS; outcome++) {
+    if (u < table[offset + outcome]) return outcome;
+  }
+  return OUTCOME.DOT;
+}
+
+// Where `u` fell inside the wicket band, rescaled to [0, 1); picks the mode of
+// dismissal without another draw
+export function wicketRoll(table, offset, u) {
+  const low = table[offset + OUTCOME.BYE];
+  const high = table[offset + OUTCOME.WICKET];
+  return Math.min((u - low) / (high - low), 0.999999);
+}
+
+// Probabilities of every outcome of one cell (for tests and benchmarks)
+export function outcomeProbabilities(table, offset) {
+  const probabilities = new Array(OUTCOME_NAMES.length);
+  let previous = 0;
+  for (let outcome = 0; outcome < THRESHOLDS; outcome++) {
+    probabilities[outcome] = table[offset + outcome] - previous;
+    previous = table[offset + outcome];
+  }
+  probabilities[OUTCOME.DOT] = 1 - previous;
+  return probabilities;
+}
@@ -0,0 +1,244 @@
+import { simulateInningsBatch } from './batch.js';
+import { createRandom, hashString } from './random.js';
+
+const WIN_POINTS = 4;
+const TIE_POINTS = 2;
+
+// Total innings simulated for a cold projection. Fixture samples are split from
+// this budget so a full 20-team double round-robin stays well under a second;
+// season completions then resample them, which is cheap.
+const INNINGS_BUDGET = 32000;
+const MIN_SAMPLES_PER_FIXTURE = 32;
+const MAX_SAMPLES_PER_FIXTURE = 512;
+
+export function defaultSamplesPerFixture(fixtureCount) {
+  const samples = Math.floor(INNINGS_BUDGET / (2 * Math.max(1, fixtureCount)));
+  return Math.min(MAX_SAMPLES_PER_FIXTURE, Math.max(MIN_SAMPLES_PER_FIXTURE, samples));
+}
+
+function ballsToOvers(balls) {
+  return Math.min(balls, 120) / 6;
+}
+
+// Identity of a playing XI for sample caching: changes whenever the selection
+// or any attribute the outcome model reads changes
+export function squadFingerprint(xi) {
+  return hashString(xi.map(p => [p.id, p.batting, p.bowling, p.technique, p.power, p.form, p.fatigue, p.bowler_type].join(':')).join('|'));
+}
+
+// Simulate `samples` independent outcomes of one fixture with the batch engine:
+// home bats first, away chases each sampled total.
+export function simulateFixtureSamples(homeXI, awayXI, matchConditions, samples, random) {
+  const first = simulateInningsBatch(homeXI, awayXI, { n: samples, matchConditions, random });
+  const second = simulateInningsBatch(awayXI, homeXI, {
+    n: samples,
+    target: first.runs,
+    matchConditions,
+    isSecondInnings: true,
+    random
+  });
+
+  return {
+    homeRuns: first.runs,
+    homeBalls: first.balls,
+    awayRuns: second.runs,
+    awayBalls: second.balls
+  };
+}
+
+function percentilesOf(values, fractions) {
+  const sorted = Float64Array.from(values).sort();
+  const result = {};
+  for (const [name, fraction] of Object.entries(fractions)) {
+    result[name] = sorted[Math.min(sorted.length - 1, Math.floor(fraction * sorted.length))];
+  }
+  return result;
+}
+
+// Monte Carlo season completion.
+//
+// Starts from the current league table (calculateLeagueStandings output),
+// simulates `samplesPerFixture` outcomes of every remaining fixture once (sized
+// from INNINGS_BUDGET by default), then builds `simulations` seeded season
+// completions by resampling those outcomes.
+// Returns per-team distributions of finishing position, points and NRR plus a
+// pre-game win probability for every remaining fixture.
+export function projectSeason({
+  standings,
+  fixtures,
+  squads,
+  simulations = 2000,
+  samplesPerFixture = defaultSamplesPerFixture(fixtures.length),
+  seed = 1,
+  fixtureCache = null
+}) {
+  const teamCount = standings.length;
+  const teamIndex = new Map(standings.map((team, index) => [team.id, index]));
+  const fingerprints = new Map();
+  for (const [teamId, xi] of squads) {
+    fingerprints.set(teamId, squadFingerprint(xi));
+  }
+
+  // Outcome samples for each remaining fixture
+  const simulated = [];
+  for (const fixture of fixtures) {
+    const home = teamIndex.get(fixture.home_team_id);
+    const away = teamIndex.get(fixture.away_team_id);
+    if (home === undefined || away === undefined) continue;
+
+    const matchConditions = { weather: fixture.weather || 'Sunny', pitchType: fixture.pitch_type || 'Normal' };
+    const cacheKey = [
+      fixture.id,
+      fingerprints.get(fixture.home_team_id),
+      fingerprints.get(fixture.away_team_id),
+      matchConditions.weather,
+      matchConditions.pitchType,
+      samplesPerFixture,
+      seed
+    ].join(':');
+
+    let samples = fixtureCache?.get(cacheKey);
+    if (!samples) {
+      samples = simulateFixtureSamples(
+        squads.get(fixture.home_team_id),
+        squads.get(fixture.away_team_id),
+        matchConditions,
+        samplesPerFixture,
+        createRandom(hashString(`${seed}:${fixture.id}`))
+      );
+      fixtureCache?.set(cacheKey, samples);
+    }
+
+    simulated.push({ fixture, home, away, samples });
+  }
+
+  // Pre-game win probabilities straight from the fixture samples
+  const matches = simulated.map(({ fixture, samples }) => {
+    let homeWins = 0;
+    let awayWins = 0;
+    let homeRuns = 0;
+    let awayRuns = 0;
+    for (let k = 0; k < samplesPerFixture; k++) {
+      if (samples.homeRuns[k] > samples.awayRuns[k]) homeWins++;
+      else if (samples.awayRuns[k] > samples.homeRuns[k]) awayWins++;
+      homeRuns += samples.homeRuns[k];
+      awayRuns += samples.awayRuns[k];
+    }
+    return {
+      matchId: fixture.id,
+      round: fixture.round,
+      match_number: fixture.match_number,
+      home_team_id: fixture.home_team_id,
+      away_team_id: fixture.away_team_id,
+      homeWinProbability: homeWins / samplesPerFixture,
+      awayWinProbability: awayWins / samplesPerFixture,
+      tieProbability: (samplesPerFixture - homeWins - awayWins) / samplesPerFixture,
+      expectedHomeScore: homeRuns / samplesPerFixture,
+      expectedAwayScore: awayRuns / samplesPerFixture
+    };
+  });
+
+  // Season completions
+  const basePoints = Float64Array.from(standings, team => team.points || 0);
+  const baseRunsFor = Float64Array.from(standings, team => team.runsFor || 0);
+  const baseRunsAgainst = Float64Array.from(standings, team => team.runsAgainst || 0);
+  const baseOversFor = Float64Array.from(standings, team => team.oversFor || 0);
+  const baseOversAgainst = Float64Array.from(standings, team => team.oversAgainst || 0);
+
+  const points = new Float64Array(teamCount);
+  const runsFor = new Float64Array(teamCount);
+  const runsAgainst = new Float64Array(teamCount);
+  const oversFor = new Float64Array(teamCount);
+  const oversAgainst = new Float64Array(teamCount);
+  const nrr = new Float64Array(teamCount);
+
+  const pointsSamples = new Float64Array(teamCount * simulations);
+  const nrrSamples = new Float64Array(teamCount * simulations);
+  const positionCounts = new Int32Array(teamCount * teamCount);
+  const order = Array.from({ length: teamCount }, (_, index) => index);
+  const random = createRandom(seed);
+
+  for (let s = 0; s < simulations; s++) {
+    points.set(basePoints);
+    runsFor.set(baseRunsFor);
+    runsAgainst.set(baseRunsAgainst);
+    oversFor.set(baseOversFor);
+    oversAgainst.set(baseOversAgainst);
+
+    for (const { home, away, samples } of simulated) {
+      const k = Math.floor(random() * samplesPerFixture);
+      const homeScore = samples.homeRuns[k];
+      const awayScore = samples.awayRuns[k];
+      const homeOvers = ballsToOvers(samples.homeBalls[k]);
+      const awayOvers = ballsToOvers(samples.awayBalls[k]);
+
+      runsFor[home] += homeScore;
+      runsAgainst[home] += awayScore;
+      oversFor[home] += homeOvers;
+      oversAgainst[home] += awayOvers;
+      runsFor[away] += awayScore;
+      runsAgainst[away] += homeScore;
+      oversFor[away] += awayOvers;
+      oversAgainst[away] += homeOvers;
+
+      if (homeScore > awayScore) {
+        points[home] += WIN_POINTS;
+      } else if (awayScore > homeScore) {
+        points[away] += WIN_POINTS;
+      } else {
+        points[home] += TIE_POINTS;
+        points[away] += TIE_POINTS;
+      }
+    }
+
+    for (let t = 0; t < teamCount; t++) {
+      const rateFor = oversFor[t] > 0 ? runsFor[t] / oversFor[t] : 0;
+      const rateAgainst = oversAgainst[t] > 0 ? runsAgainst[t] / oversAgainst[t] : 0;
+      nrr[t] = rateFor - rateAgainst;
+      pointsSamples[t * simulations + s] = points[t];
+      nrrSamples[t * simulations + s] = nrr[t];
+    }
+
+    // Same ordering as the league table: points, then net run rate
+    order.sort((a, b) => (points[b] - points[a]) || (nrr[b] - nrr[a]));
+    for (let position = 0; position < teamCount; position++) {
+      positionCounts[order[position] * teamCount + position]++;
+    }
+  }
+
+  const spread = { p10: 0.1, p50: 0.5, p90: 0.9 };
+  const teams = standings.map((team, t) => {
+    const teamPoints = pointsSamples.subarray(t * simulations, (t + 1) * simulations);
+    const teamNrr = nrrSamples.subarray(t * simulations, (t + 1) * simulations);
+    const positions = Array.from(positionCounts.subarray(t * teamCount, (t + 1) * teamCount), count => count / simulations);
+    const meanPosition = positions.reduce((sum, probability, index) => sum + probability * (index + 1), 0);
+
+    return {
+      id: team.id,
+      name: team.name,
+      current: {
+        played: team.played,
+        points: team.points,
+        netRunRate: team.netRunRate
+      },
+      points: {
+        mean: teamPoints.reduce((sum, value) => sum + value, 0) / simulations,
+        ...percentilesOf(teamPoints, spread)
+      },
+      netRunRate: {
+        mean: teamNrr.reduce((sum, value) => sum + value, 0) / simulations,
+        ...percentilesOf(teamNrr, spread)
+      },
+      position: {
+        mean: meanPosition,
+        distribution: positions
+      },
+      titleProbability: positions[0] || 0,
+      topFourProbability: positions.slice(0, 4).reduce((sum, probability) => sum + probability, 0)
+    };
+  });
+
+  teams.sort((a, b) => a.position.mean - b.position.mean);
+
+  return { simulations, samplesPerFixture, seed, teams, matches };
+}
@@ -0,0 +1,31 @@
+// Seedable pseudo-random numbers for reproducible simulations
+
+// 32-bit FNV-1a hash, used to turn ids and cache keys into seeds
+export function hashString(value) {
+  let hash = 0x811c9dc5;
+  const str = String(value);
+  for (let i = 0; i < str.length; i++) {
+    hash ^= str.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+// Seed of a labelled sub-stream of `seed` (an innings of a match, a fixture of
+// a projection), so each part can be regenerated on its own
+export function deriveSeed(seed, label) {
+  return hashString(`${seed}:${label}`);
+}
+
+// Mulberry32: small, fast and good enough for Monte Carlo sampling.
+// Returns a Math.random-compatible function producing floats in [0, 1).
+export function createRandom(seed) {
+  let state = (typeof seed === 'number' ? seed : hashString(seed)) >>> 0;
+  return function random() {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
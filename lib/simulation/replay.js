@@ -0,0 +1,225 @@
+import { supabaseAdmin } from '../supabase/client.js';
+import { REPLAY_VERSION, matchFingerprint, matchScorecards, simulateMatchInnings } from './match.js';
+import { XI_COLUMNS, replacementPlayer } from './squads.js';
+
+// Regenerates the scorecards and ball logs of a simulated match from the
+// replay record in its match_data (seed, input fingerprint, XI ids).
+//
+// The XIs are read back by id and checked against the fingerprint before
+// anything is replayed: a player whose attributes or name changed since the
+// match was played would replay a different match, so such matches report
+// their inputs as changed instead. Writers that change players on purpose
+// (weekly progression, lib/players/progression.js; player edits and deletes,
+// pinPlayerReplays) first pin the inputs of the matches they touch: a pinned
+// record carries the simulated attributes of both XIs and replays without
+// reading players at all. Recently replayed matches are kept in a small LRU
+// on globalThis so a scorecard followed by commentary pages simulates once.
+const CACHE_KEY = Symbol.for('cricket-pro.simulation.replays');
+
+export const REPLAY_CACHE_SIZE = 128;
+
+const cache = globalThis[CACHE_KEY] ??= {
+  entries: new Map(),
+  stats: { hits: 0, misses: 0, changed: 0 }
+};
+
+// Player attributes a pinned replay record stores, in this order, for every
+// XI slot (null for replacement players)
+export const PINNED_FIELDS = ['name', 'batting', 'bowling', 'technique', 'power', 'form', 'fatigue', 'bowler_type'];
+
+// Columns a match is read with to be pinned and upserted back
+const PINNED_MATCH_COLUMNS = 'id, home_team_id, away_team_id, league, season, scheduled_time, weather, pitch_type, match_data';
+
+export const INPUTS_CHANGED = 'Match inputs changed since it was played; it can no longer be replayed';
+
+function cacheKey(match, replay) {
+  return `${match.id}:${replay.seed}:${replay.fingerprint}`;
+}
+
+function remember(key, detail) {
+  cache.entries.set(key, detail);
+  if (cache.entries.size > REPLAY_CACHE_SIZE) {
+    cache.entries.delete(cache.entries.keys().next().value);
+  }
+}
+
+function replayable(match) {
+  const replay = match.match_data?.replay;
+  return replay?.v === REPLAY_VERSION ? replay : null;
+}
+
+function pinnedPlayer(id, values) {
+  const player = { id };
+  PINNED_FIELDS.forEach((field, index) => { player[field] = values[index]; });
+  return player;
+}
+
+// Rebuild an XI from its stored ids, or from the pinned attributes when the
+// record has them; null when a player no longer exists
+function rebuildXI(teamId, ids, playersById, pinned = null) {
+  const xi = [];
+  for (const [index, id] of ids.entries()) {
+    const player = id === null ? replacementPlayer(teamId, index + 1)
+      : pinned ? pinnedPlayer(id, pinned[index]) : playersById.get(id);
+    if (!player) return null;
+    xi.push(player);
+  }
+  return xi;
+}
+
+// Read the XIs of every unpinned record with one players query
+async function loadXIPlayers(replays) {
+  const ids = [...new Set(replays.filter(replay => !replay.squads).flatMap(replay => replay.xi.flat().filter(id => id !== null)))];
+  const playersById = new Map();
+  if (ids.length === 0) return playersById;
+
+  const { data, error } = await supabaseAdmin
+    .from('players')
+    .select(XI_COLUMNS)
+    .in('id', ids);
+
+  if (error) throw error;
+  for (const player of data) playersById.set(player.id, player);
+  return playersById;
+}
+
+// Both XIs of a match as it was played, or null when its inputs changed
+function playedXIs(match, replay, playersById) {
+  const homeXI = rebuildXI(match.home_team_id, replay.xi[0], playersById, replay.squads?.[0]);
+  const awayXI = rebuildXI(match.away_team_id, replay.xi[1], playersById, replay.squads?.[1]);
+  if (!homeXI || !awayXI || matchFingerprint(match, homeXI, awayXI) !== replay.fingerprint) return null;
+  return [homeXI, awayXI];
+}
+
+// Replay matches with a replay record (rows with id, home_team_id,
+// away_team_id, weather, pitch_type and match_data). Returns a Map of match
+// id to { ball_log, match_data } with full scorecards, or to null when the
+// match's inputs changed; matches without a record are left out. The XIs of
+// every match not in the cache are read with one players query.
+export async function replayMatches(matches) {
+  const replayed = new Map();
+  const pending = [];
+
+  for (const match of matches) {
+    const replay = replayable(match);
+    if (!replay) continue;
+    const key = cacheKey(match, replay);
+    const cached = cache.entries.get(key);
+    if (cached) {
+      cache.stats.hits++;
+      cache.entries.delete(key);
+      cache.entries.set(key, cached);
+      replayed.set(match.id, cached);
+    } else {
+      pending.push({ match, replay, key });
+    }
+  }
+
+  if (pending.length === 0) return replayed;
+
+  const playersById = await loadXIPlayers(pending.map(({ replay }) => replay));
+
+  for (const { match, replay, key } of pending) {
+    cache.stats.misses++;
+    const xis = playedXIs(match, replay, playersById);
+    if (!xis) {
+      cache.stats.changed++;
+      replayed.set(match.id, null);
+      continue;
+    }
+
+    const [homeXI, awayXI] = xis;
+    const { first, second } = simulateMatchInnings(match, homeXI, awayXI, replay.seed);
+    const detail = {
+      ball_log: [first.ballLog, second.ballLog],
+      match_data: { ...match.match_data, ...matchScorecards(match, first, second) }
+    };
+    remember(key, detail);
+    replayed.set(match.id, detail);
+  }
+
+  return replayed;
+}
+
+// Pinned replay records of matches (rows as for replayMatches) whose inputs
+// are about to change: a Map of match id to the record with the attributes
+// of both XIs added under `squads`, or to null when the inputs already
+// changed. Matches without a record, or already pinned, are left out. Nothing
+// is written; the caller stores the records in match_data.replay.
+export async function pinReplays(matches) {
+  const pending = matches
+    .map(match => ({ match, replay: replayable(match) }))
+    .filter(({ replay }) => replay && !replay.squads);
+  const pinned = new Map();
+  if (pending.length === 0) return pinned;
+
+  const playersById = await loadXIPlayers(pending.map(({ replay }) => replay));
+  for (const { match, replay } of pending) {
+    const xis = playedXIs(match, replay, playersById);
+    pinned.set(match.id, xis && {
+      ...replay,
+      squads: xis.map(xi => xi.map(player => (player.replacement ? null : PINNED_FIELDS.map(field => player[field]))))
+    });
+  }
+  return pinned;
+}
+
+// Pin the completed matches the given players (rows with id and user_id)
+// played for their current team, before those players are edited or
+// deleted: the pinned records are written back to match_data.replay with one
+// upsert. Returns the number of matches pinned.
+export async function pinPlayerReplays(players) {
+  const teamIds = [...new Set(players.map(player => player.user_id).filter(Boolean))];
+  if (teamIds.length === 0) return 0;
+
+  const teams = `(${teamIds.map(id => `"${id}"`).join(',')})`;
+  const { data: matches, error } = await supabaseAdmin
+    .from('matches')
+    .select(PINNED_MATCH_COLUMNS)
+    .eq('status', 'completed')
+    .or(`home_team_id.in.${teams},away_team_id.in.${teams}`);
+
+  if (error) throw error;
+
+  const playerIds = new Set(players.map(player => player.id));
+  const played = matches.filter(match => replayable(match)?.xi.some(ids => ids.some(id => playerIds.has(id))));
+  const pinned = await pinReplays(played);
+  const writes = played
+    .filter(match => pinned.get(match.id))
+    .map(({ id, home_team_id, away_team_id, league, season, scheduled_time, match_data }) => (
+      { id, home_team_id, away_team_id, league, season, scheduled_time, match_data: { ...match_data, replay: pinned.get(id) } }
+    ));
+
+  if (writes.length > 0) {
+    const { error: upsertError } = await supabaseAdmin.from('matches').upsert(writes);
+    if (upsertError) throw upsertError;
+  }
+  return writes.length;
+}
+
+// Ball logs and scorecards of one match: { ball_log, match_data }, each the
+// stored one when the row has it (live matches, matches simulated before
+// replay records) and replayed otherwise, or null when neither exists. Only
+// the `parts` asked for are replayed. Returns { detail }, or { error } when
+// the match can no longer be replayed.
+export async function matchDetail(match, parts = ['ball_log', 'match_data']) {
+  const detail = {
+    ball_log: Array.isArray(match.ball_log) && match.ball_log.length > 0 ? match.ball_log : null,
+    match_data: match.match_data?.firstInnings ? match.match_data : null
+  };
+  if (parts.every(part => detail[part]) || !replayable(match)) return { detail };
+
+  const replayed = (await replayMatches([match])).get(match.id);
+  if (!replayed) return { error: INPUTS_CHANGED };
+  return { detail: { ball_log: detail.ball_log || replayed.ball_log, match_data: detail.match_data || replayed.match_data } };
+}
+
+// Cache size and hit/miss/changed counters since the process started
+export function replayStats() {
+  return { size: cache.entries.size, capacity: REPLAY_CACHE_SIZE, ...cache.stats };
+}
+
+// Forget every cached replay (tests and benchmarks)
+export function clearReplays() {
+  cache.entries.clear();
+}
@@ -0,0 +1,88 @@
+import { supabaseAdmin } from '../supabase/client.js';
+
+// Stand-in player used when a team has no usable squad
+const REPLACEMENT_PLAYER = {
+  batting: 50,
+  bowling: 50,
+  technique: 50,
+  power: 50,
+  form: 'Average',
+  fatigue: 'Fresh',
+  bowler_type: 'Right-arm medium'
+};
+
+// Player columns the simulation reads
+export const XI_COLUMNS = 'id, user_id, name, rating, batting, bowling, technique, power, form, fatigue, bowler_type';
+
+// Replacement player filling position `number` (1-based) of a team's XI
+export function replacementPlayer(teamId, number) {
+  return { ...REPLACEMENT_PLAYER, id: `${teamId}_replacement_${number}`, name: `Replacement ${number}`, replacement: true };
+}
+
+// Pick the playing XI for a team: main lineup order first, then best-rated
+// squad players, padded with replacement players so every side has eleven.
+export function selectPlayingXI(teamId, lineup, players) {
+  const byId = new Map(players.map(p => [p.id, p]));
+  const xi = [];
+  const picked = new Set();
+
+  for (const playerId of lineup?.players || []) {
+    const player = byId.get(playerId);
+    if (player && !picked.has(player.id) && xi.length < 11) {
+      xi.push(player);
+      picked.add(player.id);
+    }
+  }
+
+  if (xi.length < 11) {
+    const bench = players
+      .filter(p => !picked.has(p.id))
+      .sort((a, b) => (b.rating || 0) - (a.rating || 0));
+    for (const player of bench) {
+      if (xi.length >= 11) break;
+      xi.push(player);
+    }
+  }
+
+  while (xi.length < 11) xi.push(replacementPlayer(teamId, xi.length + 1));
+
+  return xi;
+}
+
+// Load the playing XI of every team in one lineups query and one players query
+export async function loadPlayingXIs(teamIds) {
+  const ids = [...new Set(teamIds)];
+  const squads = new Map();
+  if (ids.length === 0) return squads;
+
+  const [lineupsResult, playersResult] = await Promise.all([
+    supabaseAdmin
+      .from('lineups')
+      .select('user_id, players')
+      .in('user_id', ids)
+      .eq('is_main', true),
+    supabaseAdmin
+      .from('players')
+      .select(XI_COLUMNS)
+      .in('user_id', ids)
+  ]);
+
+  if (lineupsResult.error) throw lineupsResult.error;
+  if (playersResult.error) throw playersResult.error;
+
+  const lineupsByTeam = new Map();
+  for (const lineup of lineupsResult.data || []) {
+    if (!lineupsByTeam.has(lineup.user_id)) lineupsByTeam.set(lineup.user_id, lineup);
+  }
+
+  const playersByTeam = new Map(ids.map(id => [id, []]));
+  for (const player of playersResult.data || []) {
+    playersByTeam.get(player.user_id)?.push(player);
+  }
+
+  for (const id of ids) {
+    squads.set(id, selectPlayingXI(id, lineupsByTeam.get(id), playersByTeam.get(id)));
+  }
+
+  return squads;
+}
@@ -1,16 +1,70 @@
 import { createClient } from '@supabase/supabase-js'
+import { createLocalClient } from './local.js'
+import { recordQuery } from './query-stats.js'
+
+// SUPABASE_LOCAL=1 swaps both clients for the in-process stand-in in
+// lib/supabase/local.js (offline development, tests and benchmarks).
+// SUPABASE_LOCAL_LATENCY_MS injects a fixed delay per query and
+// SUPABASE_LOCAL_DATA persists the tables to a JSON file.
+const useLocal = process.env.SUPABASE_LOCAL === '1' || process.env.SUPABASE_LOCAL === 'true'
+
+function getLocalClient() {
+  // Shared across route bundles and hot reloads within one server process
+  const key = Symbol.for('cricket-pro.supabase.local')
+  if (!globalThis[key]) {
+    globalThis[key] = createLocalClient({
+      latencyMs: Number(process.env.SUPABASE_LOCAL_LATENCY_MS) || 0,
+      dataFile: process.env.SUPABASE_LOCAL_DATA || null
+    })
+  }
+  return globalThis[key]
+}
+
+const OPERATIONS = { GET: 'select', HEAD: 'select', POST: 'insert', PATCH: 'update', DELETE: 'delete' }
+
+// Rows of a PostgREST response, from its Content-Range ("0-24/*", "*/0")
+function rowsOf(response) {
+  const range = response.headers.get('content-range')?.split('/')[0]
+  if (!range || range === '*') return 0
+  const [from, to] = range.split('-').map(Number)
+  return to - from + 1
+}
+
+// Report each PostgREST round trip to query-stats.js with its table, kind
+// and duration; the stand-in reports its own queries
+function recordingFetch(url, options = {}) {
+  const startedAt = performance.now()
+  return fetch(url, options).then((response) => {
+    const match = String(url).match(/\/rest\/v1\/([^?/]+)/)
+    if (match) {
+      const method = (options.method || 'GET').toUpperCase()
+      const upsert = method === 'POST' && /resolution=/.test(new Headers(options.headers).get('prefer') || '')
+      recordQuery(rowsOf(response), {
+        table: match[1],
+        operation: upsert ? 'upsert' : OPERATIONS[method] || method.toLowerCase(),
+        ms: performance.now() - startedAt
+      })
+    }
+    return response
+  })
+}
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
 const supabaseKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY
 
-if (!supabaseUrl || !supabaseKey) {
+if (!useLocal && (!supabaseUrl || !supabaseKey)) {
   throw new Error('Missing Supabase environment variables')
 }
 
-export const supabase = createClient(supabaseUrl, supabaseKey)
+const remoteOptions = { global: { fetch: recordingFetch } }
+
+export const supabase = useLocal ? getLocalClient() : createClient(supabaseUrl, supabaseKey, remoteOptions)
 
 // For server-side operations with service role key
-export const supabaseAdmin = createClient(
-  supabaseUrl,
-  process.env.SUPABASE_SERVICE_ROLE_KEY || supabaseKey
-)
+export const supabaseAdmin = useLocal
+  ? getLocalClient()
+  : createClient(
+    supabaseUrl,
+    process.env.SUPABASE_SERVICE_ROLE_KEY || supabaseKey,
+    remoteOptions
+  )
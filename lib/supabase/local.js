@@ -0,0 +1,817 @@
+import { randomUUID } from 'node:crypto';
+import fs from 'node:fs';
+import path from 'node:path';
+import { recordQuery } from './query-stats.js';
+
+// In-process stand-in for the Supabase/PostgREST query builder.
+//
+// Implements the subset the API routes use (from/select/eq/neq/gt/gte/lt/lte/
+// in/is/or/filter/match/order/limit/range/single/maybeSingle/insert/update/
+// upsert/delete, plus count/head selects) over in-memory tables created from
+// lib/supabase/schema.sql. Primary keys, UNIQUE constraints and every
+// CREATE INDEX (bar partial ones) become hash indexes that eq/in filters use
+// for lookups.
+// Errors mirror PostgREST codes (PGRST116, 23505, 23502, 23514, 42703, PGRST204)
+// so route error handling behaves the same as against a live project.
+//
+// Every executed query is counted on client.stats and reported to
+// query-stats.js, and `latencyMs` adds a fixed delay per round trip.
+
+const DEFAULT_SCHEMA_PATH = path.join(process.cwd(), 'lib', 'supabase', 'schema.sql');
+
+const NUMERIC_TYPES = new Set(['INTEGER', 'INT', 'BIGINT', 'SMALLINT', 'DECIMAL', 'NUMERIC', 'REAL', 'FLOAT', 'DOUBLE']);
+const NULL_KEY = '\u0000null';
+
+function postgrestError(code, message, details = null, hint = null) {
+  return { code, message, details, hint };
+}
+
+function sleep(ms) {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+function clone(value) {
+  return value === null || typeof value !== 'object' ? value : structuredClone(value);
+}
+
+// ---------------------------------------------------------------------------
+// Schema parsing
+
+function splitTopLevel(text, separator = ',') {
+  const parts = [];
+  let depth = 0;
+  let quoted = false;
+  let current = '';
+  for (const char of text) {
+    if (char === "'") quoted = !quoted;
+    if (!quoted) {
+      if (char === '(') depth++;
+      if (char === ')') depth--;
+      if (char === separator && depth === 0) {
+        parts.push(current);
+        current = '';
+        continue;
+      }
+    }
+    current += char;
+  }
+  if (current.trim()) parts.push(current);
+  return parts.map(part => part.trim()).filter(Boolean);
+}
+
+function parseDefault(expression, column) {
+  if (/^NOW\(\)$/i.test(expression)) {
+    return column.type === 'DATE'
+      ? () => new Date().toISOString().slice(0, 10)
+      : () => new Date().toISOString();
+  }
+  if (/^uuid_generate_v4\(\)$/i.test(expression)) return () => randomUUID();
+  if (/^(true|false)$/i.test(expression)) {
+    const value = expression.toLowerCase() === 'true';
+    return () => value;
+  }
+  if (/^-?\d+(\.\d+)?$/.test(expression)) {
+    const value = Number(expression);
+    return () => value;
+  }
+
+  const literal = expression.replace(/^'|'$/g, '').replace(/''/g, "'");
+  if (column.isArray) return () => [];
+  if (column.type === 'JSONB' || column.type === 'JSON') {
+    const value = JSON.parse(literal);
+    return () => structuredClone(value);
+  }
+  return () => literal;
+}
+
+export function parseSchema(sql) {
+  const tables = {};
+  const stripped = sql.replace(/--.*$/gm, '');
+
+  for (const match of stripped.matchAll(/CREATE TABLE\s+(\w+)\s*\(([\s\S]*?)\n\);/gi)) {
+    const [, name, body] = match;
+    const table = { name, columns: {}, primaryKey: null, uniques: [], indexes: [] };
+
+    for (const definition of splitTopLevel(body)) {
+      const constraint = definition.match(/^UNIQUE\s*\(([^)]+)\)/i);
+      if (constraint) {
+        table.uniques.push(constraint[1].split(',').map(column => column.trim()));
+        continue;
+      }
+
+      const [columnName, rawType] = definition.split(/\s+/);
+      const column = {
+        name: columnName,
+        type: rawType.replace(/\[\]$/, '').toUpperCase(),
+        isArray: rawType.endsWith('[]'),
+        notNull: /\bNOT NULL\b/i.test(definition) || /\bPRIMARY KEY\b/i.test(definition),
+        default: null,
+        allowed: null
+      };
+
+      const defaultMatch = definition.match(/\bDEFAULT\s+('(?:[^']|'')*'|[\w.-]+(?:\(\))?)/i);
+      if (defaultMatch) column.default = parseDefault(defaultMatch[1], column);
+
+      const checkMatch = definition.match(/CHECK\s*\(\s*\w+\s+IN\s*\(([^)]*)\)\s*\)/i);
+      if (checkMatch) {
+        column.allowed = new Set(splitTopLevel(checkMatch[1]).map(value => value.replace(/^'|'$/g, '')));
+      }
+
+      if (/\bPRIMARY KEY\b/i.test(definition)) table.primaryKey = columnName;
+      if (/\bUNIQUE\b/i.test(definition)) table.uniques.push([columnName]);
+
+      table.columns[columnName] = column;
+    }
+
+    tables[name] = table;
+  }
+
+  // Partial indexes serve ordered scans in Postgres; hash indexes cannot
+  for (const match of stripped.matchAll(/CREATE INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]+)\)(\s+WHERE\b)?/gi)) {
+    const [, indexName, tableName, columns, partial] = match;
+    if (partial) continue;
+    tables[tableName]?.indexes.push({ name: indexName, columns: columns.split(',').map(column => column.trim()) });
+  }
+
+  return tables;
+}
+
+// ---------------------------------------------------------------------------
+// Tables
+
+class Table {
+  constructor(definition) {
+    this.name = definition.name;
+    this.columns = definition.columns;
+    this.primaryKey = definition.primaryKey;
+    this.rows = new Map();
+    this.indexes = new Map();
+
+    const unique = [[this.primaryKey], ...definition.uniques];
+    this.uniqueKeys = unique.map(columns => columns.join(','));
+    for (const columns of [...unique, ...definition.indexes.map(index => index.columns)]) {
+      const key = columns.join(',');
+      if (!this.indexes.has(key)) this.indexes.set(key, { columns, entries: new Map() });
+    }
+  }
+
+  // Coerce a value to the column's storage type, as Postgres would on write
+  coerce(columnName, value) {
+    const column = this.columns[columnName];
+    if (!column || value === null || value === undefined) return value ?? null;
+    if (column.isArray || column.type === 'JSONB' || column.type === 'JSON') return clone(value);
+    if (NUMERIC_TYPES.has(column.type)) {
+      const number = Number(value);
+      return Number.isNaN(number) ? value : number;
+    }
+    if (column.type === 'BOOLEAN') return value === true || value === 'true';
+    if (typeof value === 'object') return value;
+    return String(value);
+  }
+
+  indexKey(row, columns) {
+    return columns.map(column => {
+      const value = row[column];
+      return value === null || value === undefined ? NULL_KEY : String(value);
+    }).join('\u0001');
+  }
+
+  addToIndexes(row) {
+    for (const index of this.indexes.values()) {
+      const key = this.indexKey(row, index.columns);
+      let ids = index.entries.get(key);
+      if (!ids) {
+        ids = new Set();
+        index.entries.set(key, ids);
+      }
+      ids.add(row[this.primaryKey]);
+    }
+  }
+
+  removeFromIndexes(row) {
+    for (const index of this.indexes.values()) {
+      const key = this.indexKey(row, index.columns);
+      const ids = index.entries.get(key);
+      if (!ids) continue;
+      ids.delete(row[this.primaryKey]);
+      if (ids.size === 0) index.entries.delete(key);
+    }
+  }
+
+  unknownColumn(values) {
+    return Object.keys(values).find(column => !this.columns[column]);
+  }
+
+  // Full row for insert: defaults for missing columns, coerced values
+  buildRow(values) {
+    const row = {};
+    for (const [name, column] of Object.entries(this.columns)) {
+      if (values[name] !== undefined) {
+        row[name] = this.coerce(name, values[name]);
+      } else {
+        row[name] = column.default ? column.default() : null;
+      }
+    }
+    return row;
+  }
+
+  validate(row) {
+    for (const [name, column] of Object.entries(this.columns)) {
+      const value = row[name];
+      if (column.notNull && (value === null || value === undefined)) {
+        return postgrestError(
+          '23502',
+          `null value in column "${name}" of relation "${this.name}" violates not-null constraint`
+        );
+      }
+      if (column.allowed && value !== null && !column.allowed.has(value)) {
+        return postgrestError(
+          '23514',
+          `new row for relation "${this.name}" violates check constraint "${this.name}_${name}_check"`
+        );
+      }
+    }
+    return null;
+  }
+
+  // Unique violation check for a batch of new row versions. `replacing` holds
+  // the primary keys of rows being overwritten so they don't conflict with
+  // their own new version.
+  checkUnique(rows, replacing = new Set()) {
+    for (const uniqueKey of this.uniqueKeys) {
+      const index = this.indexes.get(uniqueKey);
+      const seen = new Set();
+      for (const row of rows) {
+        if (index.columns.some(column => row[column] === null || row[column] === undefined)) continue;
+        const key = this.indexKey(row, index.columns);
+        const existing = index.entries.get(key);
+        const conflict = existing && [...existing].some(id => !replacing.has(id));
+        if (conflict || seen.has(key)) {
+          return postgrestError(
+            '23505',
+            `duplicate key value violates unique constraint "${this.name}_${index.columns.join('_')}_key"`,
+            `Key (${index.columns.join(', ')})=(${index.columns.map(column => row[column]).join(', ')}) already exists.`
+          );
+        }
+        seen.add(key);
+      }
+    }
+    return null;
+  }
+
+  // Candidate rows for a set of filters, narrowed through the best usable index
+  candidates(filters) {
+    const equalities = new Map();
+    const memberships = new Map();
+    for (const filter of filters) {
+      if (filter.op === 'eq') equalities.set(filter.column, filter.value);
+      if (filter.op === 'in') memberships.set(filter.column, filter.value);
+    }
+
+    let best = null;
+    for (const index of this.indexes.values()) {
+      if (index.columns.every(column => equalities.has(column))) {
+        const key = this.indexKey(Object.fromEntries(equalities), index.columns);
+        const ids = index.entries.get(key) || new Set();
+        if (!best || ids.size < best.size) best = ids;
+      } else if (index.columns.length === 1 && memberships.has(index.columns[0])) {
+        const ids = new Set();
+        for (const value of memberships.get(index.columns[0])) {
+          for (const id of index.entries.get(this.indexKey({ [index.columns[0]]: value }, index.columns)) || []) {
+            ids.add(id);
+          }
+        }
+        if (!best || ids.size < best.size) best = ids;
+      }
+    }
+
+    // An index matching most of the table is no cheaper than a scan
+    if (!best || best.size * 2 > this.rows.size) return this.rows.values();
+    return [...best].map(id => this.rows.get(id));
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Filters
+
+function compare(a, b) {
+  if (a === b) return 0;
+  if (typeof a === 'number' && typeof b === 'number') return a - b;
+  const left = String(a);
+  const right = String(b);
+  return left < right ? -1 : left > right ? 1 : 0;
+}
+
+function rowComparator(orders) {
+  return (a, b) => {
+    for (const { column, ascending, nullsFirst } of orders) {
+      const left = a[column];
+      const right = b[column];
+      const leftNull = left === null || left === undefined;
+      const rightNull = right === null || right === undefined;
+      if (leftNull || rightNull) {
+        if (leftNull && rightNull) continue;
+        return leftNull === nullsFirst ? -1 : 1;
+      }
+      const order = compare(left, right);
+      if (order !== 0) return ascending ? order : -order;
+    }
+    return 0;
+  };
+}
+
+// The first `count` rows in comparator order, as a stable sort would give them
+function topRows(rows, count, comparator) {
+  const top = [];
+  for (const row of rows) {
+    if (top.length === count && comparator(row, top[count - 1]) >= 0) continue;
+    let low = 0;
+    let high = top.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (comparator(row, top[middle]) < 0) high = middle;
+      else low = middle + 1;
+    }
+    top.splice(low, 0, row);
+    if (top.length > count) top.pop();
+  }
+  return top;
+}
+
+function likeToRegExp(pattern, flags) {
+  const escaped = String(pattern).replace(/[.+?^${}()|[\]\\]/g, '\\$&').replace(/%/g, '.*').replace(/_/g, '.');
+  return new RegExp(`^${escaped}$`, flags);
+}
+
+function matchesFilter(row, filter) {
+  if (filter.op === 'or') return filter.filters.some(inner => matchesFilter(row, inner));
+  if (filter.op === 'and') return filter.filters.every(inner => matchesFilter(row, inner));
+  if (filter.op === 'not') return !matchesFilter(row, filter.filter);
+
+  const value = row[filter.column];
+  const target = filter.value;
+  const isNull = value === null || value === undefined;
+
+  switch (filter.op) {
+    case 'eq': return !isNull && compare(value, target) === 0;
+    case 'neq': return !isNull && compare(value, target) !== 0;
+    case 'gt': return !isNull && compare(value, target) > 0;
+    case 'gte': return !isNull && compare(value, target) >= 0;
+    case 'lt': return !isNull && compare(value, target) < 0;
+    case 'lte': return !isNull && compare(value, target) <= 0;
+    // compare() equality is string equality; long lists are matched by hash
+    case 'in': return !isNull && (filter.members ??= new Set(target.map(String))).has(String(value));
+    case 'is': return target === null ? isNull : value === target;
+    case 'like': return !isNull && likeToRegExp(target, '').test(value);
+    case 'ilike': return !isNull && likeToRegExp(target, 'i').test(value);
+    case 'cs': return Array.isArray(value) && [].concat(target).every(item => value.includes(item));
+    default:
+      throw postgrestError('PGRST100', `"${filter.op}" is not a supported operator`);
+  }
+}
+
+function parseFilterValue(op, raw) {
+  if (op === 'in') return splitTopLevel(raw.replace(/^\(|\)$/g, '')).map(item => item.replace(/^"|"$/g, ''));
+  if (op === 'is') return raw === 'null' ? null : raw === 'true' ? true : raw === 'false' ? false : raw;
+  if (op === 'like' || op === 'ilike') return raw.replace(/\*/g, '%');
+  return raw;
+}
+
+// PostgREST logic tree syntax: "a.eq.1,b.in.(x,y),and(c.gt.2,d.lt.3)"
+function parseLogicTree(expression) {
+  return splitTopLevel(expression).map(part => {
+    const group = part.match(/^(and|or)\((.*)\)$/);
+    if (group) return { op: group[1], filters: parseLogicTree(group[2]) };
+
+    const [column, ...rest] = part.split('.');
+    let op = rest.shift();
+    let negate = false;
+    if (op === 'not') {
+      negate = true;
+      op = rest.shift();
+    }
+    const filter = { column, op, value: parseFilterValue(op, rest.join('.')) };
+    return negate ? { op: 'not', filter } : filter;
+  });
+}
+
+// ---------------------------------------------------------------------------
+// Query builder
+
+class LocalQueryBuilder {
+  constructor(client, tableName) {
+    this.client = client;
+    this.tableName = tableName;
+    this.operation = 'select';
+    this.columns = '*';
+    this.returning = false;
+    this.countMode = null;
+    this.head = false;
+    this.filters = [];
+    this.orders = [];
+    this.limitCount = null;
+    this.offset = 0;
+    this.singleMode = null;
+    this.values = null;
+    this.upsertOptions = null;
+  }
+
+  select(columns = '*', { count = null, head = false } = {}) {
+    if (this.operation === 'select') {
+      this.columns = columns;
+      this.countMode = count;
+      this.head = head;
+    } else {
+      this.returning = true;
+      this.columns = columns;
+    }
+    return this;
+  }
+
+  insert(values) {
+    this.operation = 'insert';
+    this.values = [].concat(values);
+    return this;
+  }
+
+  upsert(values, { onConflict, ignoreDuplicates = false } = {}) {
+    this.operation = 'upsert';
+    this.values = [].concat(values);
+    this.upsertOptions = { onConflict, ignoreDuplicates };
+    return this;
+  }
+
+  update(values) {
+    this.operation = 'update';
+    this.values = values;
+    return this;
+  }
+
+  delete() {
+    this.operation = 'delete';
+    return this;
+  }
+
+  addFilter(column, op, value) {
+    this.filters.push({ column, op, value });
+    return this;
+  }
+
+  eq(column, value) { return this.addFilter(column, 'eq', value); }
+  neq(column, value) { return this.addFilter(column, 'neq', value); }
+  gt(column, value) { return this.addFilter(column, 'gt', value); }
+  gte(column, value) { return this.addFilter(column, 'gte', value); }
+  lt(column, value) { return this.addFilter(column, 'lt', value); }
+  lte(column, value) { return this.addFilter(column, 'lte', value); }
+  in(column, values) { return this.addFilter(column, 'in', [...values]); }
+  is(column, value) { return this.addFilter(column, 'is', value); }
+  like(column, pattern) { return this.addFilter(column, 'like', pattern); }
+  ilike(column, pattern) { return this.addFilter(column, 'ilike', pattern); }
+  contains(column, value) { return this.addFilter(column, 'cs', value); }
+
+  not(column, op, value) {
+    this.filters.push({ op: 'not', filter: { column, op, value: typeof value === 'string' ? parseFilterValue(op, value) : value } });
+    return this;
+  }
+
+  filter(column, op, value) {
+    return this.addFilter(column, op, typeof value === 'string' ? parseFilterValue(op, value) : value);
+  }
+
+  match(query) {
+    for (const [column, value] of Object.entries(query)) this.eq(column, value);
+    return this;
+  }
+
+  or(expression) {
+    this.filters.push({ op: 'or', filters: parseLogicTree(expression) });
+    return this;
+  }
+
+  order(column, { ascending = true, nullsFirst = !ascending } = {}) {
+    this.orders.push({ column, ascending, nullsFirst });
+    return this;
+  }
+
+  limit(count) {
+    this.limitCount = count;
+    return this;
+  }
+
+  range(from, to) {
+    this.offset = from;
+    this.limitCount = to - from + 1;
+    return this;
+  }
+
+  single() {
+    this.singleMode = 'single';
+    return this;
+  }
+
+  maybeSingle() {
+    this.singleMode = 'maybe';
+    return this;
+  }
+
+  then(onFulfilled, onRejected) {
+    return this.client.execute(this).then(onFulfilled, onRejected);
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Client
+
+export class LocalSupabaseClient {
+  constructor({ schema, latencyMs = 0, dataFile = null } = {}) {
+    this.latencyMs = latencyMs;
+    this.dataFile = dataFile;
+    this.tables = {};
+    this.stats = { queries: 0, rows: 0, byTable: {} };
+    this.flushTimer = null;
+
+    const definitions = parseSchema(schema ?? fs.readFileSync(DEFAULT_SCHEMA_PATH, 'utf8'));
+    for (const definition of Object.values(definitions)) {
+      this.tables[definition.name] = new Table(definition);
+    }
+
+    if (dataFile && fs.existsSync(dataFile)) {
+      this.load(JSON.parse(fs.readFileSync(dataFile, 'utf8')));
+    }
+  }
+
+  from(tableName) {
+    return new LocalQueryBuilder(this, tableName);
+  }
+
+  // Bulk-load rows ({ table: [rows] }) without counting queries
+  load(data) {
+    for (const [tableName, rows] of Object.entries(data)) {
+      const table = this.tables[tableName];
+      if (!table) continue;
+      for (const values of rows) {
+        const row = table.buildRow(values);
+        const previous = table.rows.get(row[table.primaryKey]);
+        if (previous) table.removeFromIndexes(previous);
+        table.rows.set(row[table.primaryKey], row);
+        table.addToIndexes(row);
+      }
+    }
+  }
+
+  dump() {
+    return Object.fromEntries(Object.values(this.tables).map(table => [table.name, [...table.rows.values()]]));
+  }
+
+  reset() {
+    for (const table of Object.values(this.tables)) {
+      table.rows.clear();
+      for (const index of table.indexes.values()) index.entries.clear();
+    }
+    this.resetStats();
+  }
+
+  resetStats() {
+    this.stats = { queries: 0, rows: 0, byTable: {} };
+  }
+
+  record(tableName, operation, rowCount, ms) {
+    this.stats.queries++;
+    this.stats.rows += rowCount;
+    const tableStats = this.stats.byTable[tableName] ??= {};
+    tableStats[operation] = (tableStats[operation] || 0) + 1;
+    recordQuery(rowCount, { table: tableName, operation, ms });
+  }
+
+  scheduleFlush() {
+    if (!this.dataFile || this.flushTimer) return;
+    this.flushTimer = setTimeout(() => {
+      this.flushTimer = null;
+      fs.writeFileSync(this.dataFile, JSON.stringify(this.dump()));
+    }, 200);
+    this.flushTimer.unref?.();
+  }
+
+  async execute(query) {
+    const startedAt = performance.now();
+    if (this.latencyMs > 0) await sleep(this.latencyMs);
+
+    let result;
+    try {
+      result = this.run(query);
+    } catch (error) {
+      if (!error?.code) throw error;
+      result = { data: null, error, count: null, status: 400, statusText: 'Bad Request' };
+    }
+
+    const rowCount = Array.isArray(result.data) ? result.data.length : result.data ? 1 : 0;
+    this.record(query.tableName, query.operation, rowCount, performance.now() - startedAt);
+    if (query.operation !== 'select' && !result.error) this.scheduleFlush();
+    return result;
+  }
+
+  run(query) {
+    const table = this.tables[query.tableName];
+    if (!table) {
+      throw postgrestError('42P01', `relation "public.${query.tableName}" does not exist`);
+    }
+
+    for (const filter of query.filters) this.checkFilterColumns(table, filter);
+
+    let rows;
+    let status = 200;
+
+    switch (query.operation) {
+      case 'select':
+        rows = this.selectRows(table, query);
+        break;
+      case 'insert':
+        rows = this.insertRows(table, query.values);
+        status = 201;
+        break;
+      case 'upsert':
+        rows = this.upsertRows(table, query.values, query.upsertOptions);
+        status = 201;
+        break;
+      case 'update':
+        rows = this.updateRows(table, query);
+        break;
+      case 'delete':
+        rows = this.deleteRows(table, query);
+        break;
+    }
+
+    const count = query.countMode ? rows.total ?? rows.length : null;
+    const returnsRows = query.operation === 'select' ? !query.head : query.returning;
+    let data = returnsRows ? this.project(table, rows, query.columns) : null;
+
+    if (query.singleMode && returnsRows) {
+      if (data.length === 1) {
+        data = data[0];
+      } else if (data.length === 0 && query.singleMode === 'maybe') {
+        data = null;
+      } else {
+        return {
+          data: null,
+          error: postgrestError(
+            'PGRST116',
+            'JSON object requested, multiple (or no) rows returned',
+            `The result contains ${data.length} rows`
+          ),
+          count,
+          status: 406,
+          statusText: 'Not Acceptable'
+        };
+      }
+    }
+
+    return { data, error: null, count, status, statusText: status === 201 ? 'Created' : 'OK' };
+  }
+
+  checkFilterColumns(table, filter) {
+    if (filter.filters) {
+      for (const inner of filter.filters) this.checkFilterColumns(table, inner);
+    } else if (filter.filter) {
+      this.checkFilterColumns(table, filter.filter);
+    } else if (!table.columns[filter.column]) {
+      throw postgrestError('42703', `column ${table.name}.${filter.column} does not exist`);
+    } else {
+      filter.value = Array.isArray(filter.value) && filter.op === 'in'
+        ? filter.value.map(value => table.coerce(filter.column, value))
+        : filter.op === 'is' || filter.op === 'cs' ? filter.value : table.coerce(filter.column, filter.value);
+    }
+  }
+
+  matching(table, filters) {
+    const rows = [];
+    for (const row of table.candidates(filters)) {
+      if (filters.every(filter => matchesFilter(row, filter))) rows.push(row);
+    }
+    return rows;
+  }
+
+  selectRows(table, query) {
+    let rows = this.matching(table, query.filters);
+    const total = rows.length;
+    const end = query.limitCount === null ? null : query.offset + query.limitCount;
+
+    if (query.orders.length > 0) {
+      const byOrder = rowComparator(query.orders);
+      // A short page of a long result keeps only the rows it needs
+      rows = end !== null && end * 8 < rows.length ? topRows(rows, end, byOrder) : rows.sort(byOrder);
+    }
+
+    if (query.offset || end !== null) {
+      rows = rows.slice(query.offset, end === null ? undefined : end);
+    }
+    rows.total = total;
+    return rows;
+  }
+
+  project(table, rows, columns) {
+    const selected = splitTopLevel(columns || '*');
+    if (selected.includes('*')) return rows.map(row => clone(row));
+
+    const fields = selected.map(field => {
+      const [alias, column] = field.includes(':') ? field.split(':').map(part => part.trim()) : [field, field];
+      if (!table.columns[column]) {
+        throw postgrestError('42703', `column ${table.name}.${column} does not exist`);
+      }
+      return [alias, column];
+    });
+
+    return rows.map(row => {
+      const projected = {};
+      for (const [alias, column] of fields) projected[alias] = clone(row[column]);
+      return projected;
+    });
+  }
+
+  checkWriteColumns(table, values) {
+    const unknown = table.unknownColumn(values);
+    if (unknown) {
+      throw postgrestError('PGRST204', `Could not find the '${unknown}' column of '${table.name}' in the schema cache`);
+    }
+  }
+
+  // Validate a batch of new row versions, then apply it atomically
+  commit(table, rows, replacing = new Set()) {
+    for (const row of rows) {
+      const error = table.validate(row);
+      if (error) throw error;
+    }
+    const error = table.checkUnique(rows, replacing);
+    if (error) throw error;
+
+    for (const id of replacing) {
+      const previous = table.rows.get(id);
+      if (previous) {
+        table.removeFromIndexes(previous);
+        table.rows.delete(id);
+      }
+    }
+    for (const row of rows) {
+      table.rows.set(row[table.primaryKey], row);
+      table.addToIndexes(row);
+    }
+    return rows;
+  }
+
+  insertRows(table, values) {
+    for (const row of values) this.checkWriteColumns(table, row);
+    return this.commit(table, values.map(row => table.buildRow(row)));
+  }
+
+  upsertRows(table, values, { onConflict, ignoreDuplicates }) {
+    const conflictColumns = (onConflict || table.primaryKey).split(',').map(column => column.trim());
+    const index = table.indexes.get(conflictColumns.join(','));
+    if (!index) {
+      throw postgrestError('42P10', 'there is no unique or exclusion constraint matching the ON CONFLICT specification');
+    }
+
+    const rows = [];
+    const replacing = new Set();
+    for (const row of values) {
+      this.checkWriteColumns(table, row);
+      const key = table.indexKey(row, conflictColumns);
+      const [existingId] = index.entries.get(key) || [];
+      const existing = existingId !== undefined ? table.rows.get(existingId) : null;
+
+      if (!existing) {
+        rows.push(table.buildRow(row));
+      } else if (!ignoreDuplicates) {
+        const merged = { ...existing };
+        for (const [column, value] of Object.entries(row)) merged[column] = table.coerce(column, value);
+        replacing.add(existingId);
+        rows.push(merged);
+      }
+    }
+
+    return this.commit(table, rows, replacing);
+  }
+
+  updateRows(table, query) {
+    this.checkWriteColumns(table, query.values);
+    const targets = this.matching(table, query.filters);
+    const replacing = new Set(targets.map(row => row[table.primaryKey]));
+    const rows = targets.map(row => {
+      const updated = { ...row };
+      for (const [column, value] of Object.entries(query.values)) updated[column] = table.coerce(column, value);
+      return updated;
+    });
+    return this.commit(table, rows, replacing);
+  }
+
+  deleteRows(table, query) {
+    const rows = this.matching(table, query.filters);
+    for (const row of rows) {
+      table.removeFromIndexes(row);
+      table.rows.delete(row[table.primaryKey]);
+    }
+    return rows;
+  }
+}
+
+export function createLocalClient(options = {}) {
+  return new LocalSupabaseClient(options);
+}
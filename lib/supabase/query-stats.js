@@ -0,0 +1,49 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+
+// Per-request accounting of database round trips and simulation time.
+//
+// Both Supabase clients report every query here (the stand-in on execution,
+// the remote client on each PostgREST response) and simulations report the
+// time they ran; trackQueries() scopes the totals to one piece of work
+// (lib/metrics/route.js opens one per request). The storage lives on
+// globalThis so route bundles that each load their own copy of this module
+// share it.
+const SCOPE_KEY = Symbol.for('cricket-pro.supabase.query-scope');
+const queryScope = globalThis[SCOPE_KEY] ??= new AsyncLocalStorage();
+
+// Queries kept per scope for the slow-request breakdown
+const MAX_LOGGED_QUERIES = 200;
+
+// `detail` is { table, operation, ms } where the client knows it
+export function recordQuery(rows = 0, detail = null) {
+  const scope = queryScope.getStore();
+  if (scope) {
+    scope.queries++;
+    scope.rows += rows;
+    if (detail) {
+      scope.dbMs += detail.ms;
+      if (scope.log.length < MAX_LOGGED_QUERIES) scope.log.push({ ...detail, rows });
+    }
+  }
+}
+
+// Time spent simulating matches on behalf of the current scope (in worker
+// threads too: the caller reports it when the result comes back)
+export function recordSimulation(ms) {
+  const scope = queryScope.getStore();
+  if (scope) scope.simulationMs += ms;
+}
+
+// Run `callback` with a fresh counter; returns its result together with the
+// number of queries (and rows, where the client knows them) issued inside it,
+// the time spent waiting on them and simulating, and the queries themselves
+export async function trackQueries(callback) {
+  const scope = { queries: 0, rows: 0, dbMs: 0, simulationMs: 0, log: [] };
+  const result = await queryScope.run(scope, callback);
+  return { result, ...scope };
+}
+
+// Counter of the innermost trackQueries() scope, or null outside one
+export function currentQueryStats() {
+  return queryScope.getStore() || null;
+}
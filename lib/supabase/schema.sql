@@ -97,9 +97,13 @@ CREATE TABLE matches (
   current_runs INTEGER DEFAULT 0,
   current_wickets INTEGER DEFAULT 0,
   live_commentary JSONB DEFAULT '[]',
+  ball_log JSONB,
   match_data JSONB,
   round INTEGER,
   match_number INTEGER,
+  started_at TIMESTAMP WITH TIME ZONE,
+  paused_at TIMESTAMP WITH TIME ZONE,
+  resumed_at TIMESTAMP WITH TIME ZONE,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -131,6 +135,7 @@ CREATE TABLE players (
   market_value INTEGER DEFAULT 10000,
   is_for_sale BOOLEAN DEFAULT false,
   sale_price INTEGER DEFAULT 0,
+  progressed_week TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -151,20 +156,81 @@ CREATE TABLE lineups (
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- League standings table (running totals per team and season, updated as
+-- matches complete)
+CREATE TABLE league_standings (
+  id TEXT PRIMARY KEY,
+  league TEXT NOT NULL,
+  season TEXT NOT NULL,
+  team_id TEXT NOT NULL,
+  played INTEGER DEFAULT 0,
+  won INTEGER DEFAULT 0,
+  lost INTEGER DEFAULT 0,
+  tied INTEGER DEFAULT 0,
+  points INTEGER DEFAULT 0,
+  runs_for INTEGER DEFAULT 0,
+  runs_against INTEGER DEFAULT 0,
+  overs_for DECIMAL DEFAULT 0,
+  overs_against DECIMAL DEFAULT 0,
+  highest_score INTEGER,
+  lowest_score INTEGER,
+  form TEXT[] DEFAULT '{}',
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  UNIQUE(league, season, team_id)
+);
+
+-- Season snapshots table (frozen history of completed seasons)
+CREATE TABLE season_snapshots (
+  id TEXT PRIMARY KEY,
+  league_id TEXT NOT NULL,
+  season TEXT NOT NULL,
+  standings JSONB NOT NULL,
+  aggregates JSONB,
+  top_performers JSONB,
+  etag TEXT NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  UNIQUE(league_id, season)
+);
+
+-- Weekly player progression runs (lib/players/progression.js): matches
+-- completed up to `cutoff` have had their workload applied
+CREATE TABLE player_progression_runs (
+  id TEXT PRIMARY KEY,
+  cutoff TIMESTAMP WITH TIME ZONE NOT NULL,
+  status TEXT DEFAULT 'running' CHECK (status IN ('running', 'completed')),
+  players_read INTEGER DEFAULT 0,
+  players_changed INTEGER DEFAULT 0,
+  matches_applied INTEGER DEFAULT 0,
+  matches_pinned INTEGER DEFAULT 0,
+  started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  completed_at TIMESTAMP WITH TIME ZONE
+);
+
 -- Indexes for better performance
 CREATE INDEX idx_matches_league_season ON matches(league, season);
 CREATE INDEX idx_matches_status ON matches(status);
 CREATE INDEX idx_matches_scheduled_time ON matches(scheduled_time);
 CREATE INDEX idx_matches_home_team ON matches(home_team_id);
 CREATE INDEX idx_matches_away_team ON matches(away_team_id);
+CREATE INDEX idx_matches_status_updated_at ON matches(status, updated_at);
 CREATE INDEX idx_leagues_status ON leagues(status);
 CREATE INDEX idx_league_seasons_league_id ON league_seasons(league_id);
 CREATE INDEX idx_teams_league ON teams(league);
 CREATE INDEX idx_players_user_id ON players(user_id);
+CREATE INDEX idx_players_name ON players(name);
 CREATE INDEX idx_players_squad_type ON players(squad_type);
 CREATE INDEX idx_players_is_for_sale ON players(is_for_sale);
+-- Marketplace search (lib/marketplace/search.js): keyset pages over listed
+-- players in (sort column, id) order, scanned in either direction
+CREATE INDEX idx_players_market_rating ON players(rating, id) WHERE is_for_sale;
+CREATE INDEX idx_players_market_price ON players(sale_price, id) WHERE is_for_sale;
+CREATE INDEX idx_players_market_value ON players(market_value, id) WHERE is_for_sale;
+CREATE INDEX idx_players_market_bowler_type ON players(bowler_type, rating, id) WHERE is_for_sale;
+CREATE INDEX idx_players_market_nationality ON players(nationality, rating, id) WHERE is_for_sale;
 CREATE INDEX idx_lineups_user_id ON lineups(user_id);
 CREATE INDEX idx_lineups_is_main ON lineups(is_main);
+CREATE INDEX idx_league_standings_league_season ON league_standings(league, season);
+CREATE INDEX idx_season_snapshots_league_id ON season_snapshots(league_id);
 
 -- Row Level Security (RLS) policies
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
@@ -174,6 +240,9 @@ ALTER TABLE teams ENABLE ROW LEVEL SECURITY;
 ALTER TABLE matches ENABLE ROW LEVEL SECURITY;
 ALTER TABLE players ENABLE ROW LEVEL SECURITY;
 ALTER TABLE lineups ENABLE ROW LEVEL SECURITY;
+ALTER TABLE league_standings ENABLE ROW LEVEL SECURITY;
+ALTER TABLE season_snapshots ENABLE ROW LEVEL SECURITY;
+ALTER TABLE player_progression_runs ENABLE ROW LEVEL SECURITY;
 
 -- Allow all operations for authenticated users (adjust as needed)
 CREATE POLICY "Allow all operations for authenticated users" ON users FOR ALL USING (auth.role() = 'authenticated');
@@ -183,6 +252,9 @@ CREATE POLICY "Allow all operations for authenticated users" ON teams FOR ALL US
 CREATE POLICY "Allow all operations for authenticated users" ON matches FOR ALL USING (auth.role() = 'authenticated');
 CREATE POLICY "Allow all operations for authenticated users" ON players FOR ALL USING (auth.role() = 'authenticated');
 CREATE POLICY "Allow all operations for authenticated users" ON lineups FOR ALL USING (auth.role() = 'authenticated');
+CREATE POLICY "Allow all operations for authenticated users" ON league_standings FOR ALL USING (auth.role() = 'authenticated');
+CREATE POLICY "Allow all operations for authenticated users" ON season_snapshots FOR ALL USING (auth.role() = 'authenticated');
+CREATE POLICY "Allow all operations for authenticated users" ON player_progression_runs FOR ALL USING (auth.role() = 'authenticated');
 
 -- Allow read operations for anonymous users
 CREATE POLICY "Allow read operations for anonymous users" ON users FOR SELECT USING (true);
@@ -192,3 +264,6 @@ CREATE POLICY "Allow read operations for anonymous users" ON teams FOR SELECT US
 CREATE POLICY "Allow read operations for anonymous users" ON matches FOR SELECT USING (true);
 CREATE POLICY "Allow read operations for anonymous users" ON players FOR SELECT USING (true);
 CREATE POLICY "Allow read operations for anonymous users" ON lineups FOR SELECT USING (true);
+CREATE POLICY "Allow read operations for anonymous users" ON league_standings FOR SELECT USING (true);
+CREATE POLICY "Allow read operations for anonymous users" ON season_snapshots FOR SELECT USING (true);
+CREATE POLICY "Allow read operations for anonymous users" ON player_progression_runs FOR SELECT USING (true);
@@ -9,6 +9,11 @@ const nextConfig = {
   experimental: {
     // Remove if not using Server Components
 
+    // The simulation worker is started by path (lib/jobs/simulation-queue.js),
+    // which the bundler does not follow: ship the script and its imports
+    outputFileTracingIncludes: {
+      '/api/**/*': ['./lib/jobs/simulation-worker.js', './lib/simulation/**/*.js'],
+    },
   },
   webpack(config, { dev }) {
     if (dev) {
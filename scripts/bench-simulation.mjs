@@ -0,0 +1,461 @@
+// Simulation engine harness: throughput benchmark and parity samples.
+//
+//   node scripts/bench-simulation.mjs bench  [--n 20000] [--json]
+//   node scripts/bench-simulation.mjs parity [--n 4000]
+//   node scripts/bench-simulation.mjs projection [--teams 20] [--n 2000] [--json]
+//   node scripts/bench-simulation.mjs ball-log [--n 200] [--json]
+//   node scripts/bench-simulation.mjs matchups [--n 20000] [--json]
+//
+// `bench` reports simulated innings per second for the per-ball engine
+// (simulateInnings) and the batch engine (simulateInningsBatch).
+// `parity` prints JSON summary statistics from both engines for a set of
+// fixed scenarios; tests/test_simulation_parity.py compares them.
+// `projection` times a cold and a warm season projection for a double
+// round-robin in which no match has been played yet.
+// `ball-log` compares the stored size of per-ball commentary objects with the
+// compact ball log, and the GET /api/matches/:id payload before (whole row
+// with commentary) and after (row without logs plus the latest over).
+// `matchups` times the per-delivery outcome derivation simulateInnings used
+// before matchup tables (lib/simulation/matchups.js) against a table lookup,
+// and samples both for every scenario, phase and pressure level so
+// tests/test_matchup_tables.py can check the outcome distributions agree.
+
+import {
+  simulateInnings,
+  getWeatherEffect,
+  getPitchEffect,
+  getFormMultiplier,
+  getFatigueMultiplier,
+  isSpinBowler
+} from '../lib/simulation/innings.js';
+import {
+  OUTCOME,
+  OUTCOME_NAMES,
+  PRESSURE_FACTORS,
+  cellOffset,
+  compileMatchups,
+  drawOutcome,
+  matchupTable,
+  outcomeProbabilities,
+  phaseOfOver,
+  wicketRoll
+} from '../lib/simulation/matchups.js';
+import { createRandom } from '../lib/simulation/random.js';
+import { simulateInningsBatch } from '../lib/simulation/batch.js';
+import { projectSeason } from '../lib/simulation/projection.js';
+import { calculateLeagueStandings } from '../lib/league/standings.js';
+import { iterateBalls, sliceBalls } from '../lib/simulation/ball-log.js';
+
+const FORMS = ['Excellent', 'Good', 'Average', 'Poor', 'Terrible'];
+const FATIGUE = ['Fresh', 'Slightly tired', 'Tired', 'Very tired', 'Exhausted'];
+const BOWLER_TYPES = ['Right-arm fast', 'Left-arm fast', 'Right-arm medium', 'Left-arm medium', 'Right-arm spin', 'Left-arm spin', 'Wicket-keeper'];
+
+// Deterministic squad so runs are comparable between machines and commits
+function buildTeam(prefix, seed) {
+  let state = seed >>> 0;
+  const next = () => {
+    state = (Math.imul(state, 1664525) + 1013904223) >>> 0;
+    return state / 4294967296;
+  };
+  const skill = () => Math.floor(next() * 100) + 1;
+
+  return Array.from({ length: 11 }, (_, index) => ({
+    id: `${prefix}_${index + 1}`,
+    name: `${prefix} Player ${index + 1}`,
+    batting: skill(),
+    bowling: skill(),
+    technique: skill(),
+    power: skill(),
+    form: FORMS[Math.floor(next() * FORMS.length)],
+    fatigue: FATIGUE[Math.floor(next() * FATIGUE.length)],
+    bowler_type: BOWLER_TYPES[Math.floor(next() * BOWLER_TYPES.length)]
+  }));
+}
+
+const home = buildTeam('Home', 7);
+const away = buildTeam('Away', 11);
+
+const SCENARIOS = [
+  { name: 'sunny-normal', matchConditions: { weather: 'Sunny', pitchType: 'Normal' } },
+  { name: 'rainy-dusty', matchConditions: { weather: 'Rainy', pitchType: 'Dusty' } },
+  { name: 'overcast-green', matchConditions: { weather: 'Overcast', pitchType: 'Green' } },
+  { name: 'flat-chase', matchConditions: { weather: 'Sunny', pitchType: 'Flat' }, isSecondInnings: true, target: 30 }
+];
+
+function parseArgs(argv) {
+  const args = { mode: argv[0] || 'bench', n: null, teams: 20, json: false };
+  for (let i = 1; i < argv.length; i++) {
+    if (argv[i] === '--n') args.n = parseInt(argv[++i]);
+    if (argv[i] === '--teams') args.teams = parseInt(argv[++i]);
+    if (argv[i] === '--json') args.json = true;
+  }
+  return args;
+}
+
+function runScalar(scenario, n) {
+  const samples = { runs: [], wickets: [], balls: [] };
+  const batsmanRuns = new Array(home.length).fill(0);
+  for (let i = 0; i < n; i++) {
+    const innings = simulateInnings(home, away, scenario.target ?? null, scenario.matchConditions, Boolean(scenario.isSecondInnings));
+    samples.runs.push(innings.runs);
+    samples.wickets.push(innings.wickets);
+    samples.balls.push(innings.balls);
+    innings.batsmanScores.forEach((score, index) => { batsmanRuns[index] += score.runs; });
+  }
+  return { samples, batsmanRuns };
+}
+
+function runBatch(scenario, n) {
+  const result = simulateInningsBatch(home, away, {
+    n,
+    target: scenario.target ?? null,
+    matchConditions: scenario.matchConditions,
+    isSecondInnings: Boolean(scenario.isSecondInnings),
+    perPlayer: true
+  });
+  return {
+    samples: { runs: Array.from(result.runs), wickets: Array.from(result.wickets), balls: Array.from(result.balls) },
+    batsmanRuns: result.batsmen.map(b => b.runs)
+  };
+}
+
+function moments(values) {
+  const n = values.length;
+  const mean = values.reduce((sum, v) => sum + v, 0) / n;
+  const variance = values.reduce((sum, v) => sum + (v - mean) ** 2, 0) / Math.max(1, n - 1);
+  return { n, mean, sd: Math.sqrt(variance) };
+}
+
+function summarize({ samples, batsmanRuns }, n) {
+  return {
+    runs: moments(samples.runs),
+    wickets: moments(samples.wickets),
+    balls: moments(samples.balls),
+    batsmanRunsMean: batsmanRuns.map(total => total / n)
+  };
+}
+
+function parity(n) {
+  return SCENARIOS.map(scenario => ({
+    scenario: scenario.name,
+    scalar: summarize(runScalar(scenario, n), n),
+    batch: summarize(runBatch(scenario, n), n)
+  }));
+}
+
+function bench(n) {
+  const scenario = SCENARIOS[0];
+  const results = {};
+
+  // Warm up both engines before timing
+  runScalar(scenario, 200);
+  runBatch(scenario, 200);
+
+  const scalarN = Math.max(1, Math.floor(n / 10));
+  let start = process.hrtime.bigint();
+  runScalar(scenario, scalarN);
+  let seconds = Number(process.hrtime.bigint() - start) / 1e9;
+  results.perBall = { innings: scalarN, seconds, inningsPerSecond: scalarN / seconds };
+
+  start = process.hrtime.bigint();
+  simulateInningsBatch(home, away, { n, matchConditions: scenario.matchConditions });
+  seconds = Number(process.hrtime.bigint() - start) / 1e9;
+  results.batch = { innings: n, seconds, inningsPerSecond: n / seconds };
+
+  start = process.hrtime.bigint();
+  simulateInningsBatch(home, away, { n, matchConditions: scenario.matchConditions, perPlayer: true });
+  seconds = Number(process.hrtime.bigint() - start) / 1e9;
+  results.batchPerPlayer = { innings: n, seconds, inningsPerSecond: n / seconds };
+
+  results.speedup = results.batch.inningsPerSecond / results.perBall.inningsPerSecond;
+  return results;
+}
+
+function projection(teamCount, simulations) {
+  const users = Array.from({ length: teamCount }, (_, index) => ({ id: `team_${index + 1}`, team_name: `Team ${index + 1}` }));
+  const squads = new Map(users.map((user, index) => [user.id, buildTeam(user.id, index + 1)]));
+  const fixtures = [];
+  for (const home of users) {
+    for (const away of users) {
+      if (home.id !== away.id) {
+        fixtures.push({ id: `match_${fixtures.length + 1}`, home_team_id: home.id, away_team_id: away.id, round: 1, match_number: fixtures.length + 1 });
+      }
+    }
+  }
+
+  const standings = calculateLeagueStandings(users, []);
+  const fixtureCache = new Map();
+  const run = () => {
+    const start = process.hrtime.bigint();
+    projectSeason({ standings, fixtures, squads, simulations, seed: 42, fixtureCache });
+    return Number(process.hrtime.bigint() - start) / 1e9;
+  };
+
+  return { teams: teamCount, fixtures: fixtures.length, simulations, coldSeconds: run(), warmSeconds: run() };
+}
+
+function mean(values) {
+  return values.reduce((sum, value) => sum + value, 0) / values.length;
+}
+
+function ballLog(matches) {
+  const bytes = (value) => Buffer.byteLength(JSON.stringify(value));
+  const sizes = { commentary: [], ballLog: [], payloadBefore: [], payloadAfter: [], balls: [] };
+  let roundTrip = true;
+  let deterministic = true;
+  let decodeSeconds = 0;
+  let renderSeconds = 0;
+
+  for (let i = 0; i < matches; i++) {
+    const first = simulateInnings(home, away, null, { weather: 'Sunny', pitchType: 'Flat' }, false);
+    const second = simulateInnings(away, home, first.runs, { weather: 'Sunny', pitchType: 'Flat' }, true);
+    const innings = [first, second];
+    const row = {
+      id: `match_${i}`, home_team_id: 'home', away_team_id: 'away', league: 'default', season: '1',
+      status: 'completed', home_score: first.runs, away_score: second.runs,
+      match_data: { firstInnings: { batsmanScores: first.batsmanScores, bowlingFigures: first.bowlingFigures }, secondInnings: { batsmanScores: second.batsmanScores, bowlingFigures: second.bowlingFigures } }
+    };
+
+    const commentary = innings.map(entry => entry.commentary);
+    const logs = innings.map(entry => entry.ballLog);
+    sizes.commentary.push(bytes(commentary));
+    sizes.ballLog.push(bytes(logs));
+    sizes.balls.push(first.commentary.length + second.commentary.length);
+    sizes.payloadBefore.push(bytes({ ...row, commentary: commentary.flat() }));
+
+    let start = process.hrtime.bigint();
+    const latestOver = sliceBalls(logs[1], { last: 6 });
+    renderSeconds += Number(process.hrtime.bigint() - start) / 1e9;
+    sizes.payloadAfter.push(bytes(row) + bytes(latestOver));
+    deterministic &&= JSON.stringify(latestOver) === JSON.stringify(sliceBalls(logs[1], { last: 6 }));
+
+    for (const entry of innings) {
+      start = process.hrtime.bigint();
+      const decoded = [...iterateBalls(entry.ballLog)];
+      decodeSeconds += Number(process.hrtime.bigint() - start) / 1e9;
+      roundTrip &&= decoded.length === entry.commentary.length && decoded.every((ball, index) => {
+        const { index: _index, wicketType, ...fields } = ball;
+        const { commentary: _text, ...expected } = entry.commentary[index];
+        return JSON.stringify(fields) === JSON.stringify(expected);
+      });
+    }
+  }
+
+  return {
+    matches,
+    ballsPerMatch: mean(sizes.balls),
+    commentaryBytes: mean(sizes.commentary),
+    ballLogBytes: mean(sizes.ballLog),
+    storageRatio: mean(sizes.commentary) / mean(sizes.ballLog),
+    payloadBeforeBytes: mean(sizes.payloadBefore),
+    payloadAfterBytes: mean(sizes.payloadAfter),
+    payloadRatio: mean(sizes.payloadBefore) / mean(sizes.payloadAfter),
+    decodeMicrosPerInnings: (decodeSeconds / (matches * 2)) * 1e6,
+    renderMicrosPerOver: (renderSeconds / matches) * 1e6,
+    roundTrip,
+    deterministic
+  };
+}
+
+// Outcome of one delivery derived the way simulateInnings did before matchup
+// tables: skills, form, fatigue, conditions and spin re-evaluated per ball,
+// then separate draws for extras, wicket and runs
+function legacyDelivery(batsman, bowler, weatherEffect, pitchEffect, over, pressureFactor, random) {
+  const isPowerplay = over < 6;
+  const isDeathOvers = over >= 17;
+  let batsmanSkill = (batsman.batting + batsman.technique + batsman.power) / 3;
+  batsmanSkill = batsmanSkill * getFormMultiplier(batsman.form) * getFatigueMultiplier(batsman.fatigue);
+  let bowlerSkill = (bowler.bowling + bowler.technique) / 2;
+  bowlerSkill += weatherEffect.bowlingBonus + pitchEffect.bowlingBonus;
+  batsmanSkill -= weatherEffect.battingPenalty + pitchEffect.battingPenalty;
+  if (pitchEffect.spinBonus && isSpinBowler(bowler)) {
+    bowlerSkill += pitchEffect.spinBonus;
+  }
+  if (isPowerplay) batsmanSkill += 5;
+  if (isDeathOvers) {
+    batsmanSkill += 3;
+    bowlerSkill += 2;
+  }
+
+  const outcomeRoll = random() * 100;
+  if (random() < 0.05) {
+    const extraType = random();
+    return extraType < 0.6 ? OUTCOME.WIDE : extraType < 0.9 ? OUTCOME.NO_BALL : OUTCOME.BYE;
+  }
+
+  const wicketChance = (bowlerSkill - batsmanSkill) / 10 + (isDeathOvers ? 8 : 5);
+  if (outcomeRoll < wicketChance && wicketChance > 0) {
+    random(); // mode of dismissal
+    return OUTCOME.WICKET;
+  }
+
+  const aggression = pressureFactor * (isPowerplay ? 1.2 : isDeathOvers ? 1.5 : 1.0);
+  const runChance = random() * 100;
+  if (runChance < (batsmanSkill / 10) * aggression) {
+    if (runChance < (batsmanSkill / 50) * aggression) return OUTCOME.SIX;
+    if (runChance < (batsmanSkill / 25) * aggression) return OUTCOME.FOUR;
+    return OUTCOME.ONE + Math.floor(random() * 3);
+  }
+  return OUTCOME.DOT;
+}
+
+function timeBest(runs, callback) {
+  let best = Infinity;
+  for (let i = 0; i < runs; i++) {
+    const start = process.hrtime.bigint();
+    callback();
+    best = Math.min(best, Number(process.hrtime.bigint() - start) / 1e9);
+  }
+  return best;
+}
+
+function matchups(samplesPerCell) {
+  const PHASE_OVERS = [0, 10, 18];
+  const distribution = { cells: 0, samplesPerCell, maxZ: 0, worst: null, wicketTypeMaxZ: 0 };
+  const wicketTypes = new Array(5).fill(0);
+  let wickets = 0;
+
+  for (const scenario of SCENARIOS) {
+    const weatherEffect = getWeatherEffect(scenario.matchConditions.weather);
+    const pitchEffect = getPitchEffect(scenario.matchConditions.pitchType);
+    const compiled = compileMatchups(home, away, scenario.matchConditions);
+
+    for (let batsman = 0; batsman < home.length; batsman++) {
+      const bowler = (batsman * 3 + 1) % away.length;
+      for (const over of PHASE_OVERS) {
+        for (let pressure = 0; pressure < PRESSURE_FACTORS.length; pressure++) {
+          const table = matchupTable(compiled, batsman, bowler, phaseOfOver(over), pressure);
+          const offset = cellOffset(phaseOfOver(over), pressure);
+          const expected = outcomeProbabilities(table, offset);
+          const observed = new Array(OUTCOME_NAMES.length).fill(0);
+          const random = createRandom(`${scenario.name}:${batsman}:${over}:${pressure}`);
+
+          for (let i = 0; i < samplesPerCell; i++) {
+            observed[legacyDelivery(home[batsman], away[bowler], weatherEffect, pitchEffect, over, PRESSURE_FACTORS[pressure], random)]++;
+
+            const u = random();
+            if (drawOutcome(table, offset, u) === OUTCOME.WICKET) {
+              wicketTypes[Math.floor(wicketRoll(table, offset, u) * wicketTypes.length)]++;
+              wickets++;
+            }
+          }
+
+          observed.forEach((count, outcome) => {
+            const p = expected[outcome];
+            const variance = samplesPerCell * p * (1 - p);
+            const z = variance > 0 ? Math.abs(count - samplesPerCell * p) / Math.sqrt(variance) : (count === 0 ? 0 : Infinity);
+            if (z > distribution.maxZ) {
+              distribution.maxZ = z;
+              distribution.worst = { scenario: scenario.name, batsman, bowler, over, pressure, outcome: OUTCOME_NAMES[outcome], expected: p, observed: count / samplesPerCell };
+            }
+          });
+          distribution.cells++;
+        }
+      }
+    }
+  }
+
+  for (const count of wicketTypes) {
+    const p = 1 / wicketTypes.length;
+    distribution.wicketTypeMaxZ = Math.max(distribution.wicketTypeMaxZ, Math.abs(count - wickets * p) / Math.sqrt(wickets * p * (1 - p)));
+  }
+
+  // Hot-path throughput over the same mixed stream of deliveries
+  const deliveries = 1_000_000;
+  const scenario = SCENARIOS[1];
+  const weatherEffect = getWeatherEffect(scenario.matchConditions.weather);
+  const pitchEffect = getPitchEffect(scenario.matchConditions.pitchType);
+  const stream = createRandom('deliveries');
+  const batsmen = new Uint8Array(deliveries);
+  const bowlers = new Uint8Array(deliveries);
+  const overs = new Uint8Array(deliveries);
+  const pressures = new Uint8Array(deliveries);
+  for (let i = 0; i < deliveries; i++) {
+    batsmen[i] = Math.floor(stream() * home.length);
+    bowlers[i] = Math.floor(stream() * away.length);
+    overs[i] = Math.floor(stream() * 20);
+    pressures[i] = Math.floor(stream() * PRESSURE_FACTORS.length);
+  }
+
+  let checksum = 0;
+  const before = timeBest(5, () => {
+    const random = createRandom(1);
+    for (let i = 0; i < deliveries; i++) {
+      checksum += legacyDelivery(home[batsmen[i]], away[bowlers[i]], weatherEffect, pitchEffect, overs[i], PRESSURE_FACTORS[pressures[i]], random);
+    }
+  });
+  const after = timeBest(5, () => {
+    const random = createRandom(1);
+    const compiled = compileMatchups(home, away, scenario.matchConditions);
+    for (let i = 0; i < deliveries; i++) {
+      const phase = phaseOfOver(overs[i]);
+      const table = matchupTable(compiled, batsmen[i], bowlers[i], phase, pressures[i]);
+      checksum += drawOutcome(table, cellOffset(phase, pressures[i]), random());
+    }
+  });
+
+  simulateInnings(home, away, null, scenario.matchConditions, false, { commentary: false });
+  const innings = 2000;
+  const inningsSeconds = timeBest(3, () => {
+    for (let i = 0; i < innings; i++) {
+      simulateInnings(home, away, 160, scenario.matchConditions, i % 2 === 1, { commentary: false });
+    }
+  });
+
+  return {
+    distribution,
+    throughput: {
+      deliveries,
+      beforeBallsPerSecond: deliveries / before,
+      afterBallsPerSecond: deliveries / after,
+      speedup: before / after,
+      inningsPerSecond: innings / inningsSeconds,
+      checksum
+    }
+  };
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+if (args.mode === 'parity') {
+  console.log(JSON.stringify(parity(args.n || 4000)));
+} else if (args.mode === 'projection') {
+  const results = projection(args.teams, args.n || 2000);
+  if (args.json) {
+    console.log(JSON.stringify(results));
+  } else {
+    console.log(`${results.teams} teams, ${results.fixtures} fixtures, ${results.simulations} season completions`);
+    console.log(`cold ${results.coldSeconds.toFixed(3)}s  warm ${results.warmSeconds.toFixed(3)}s`);
+  }
+} else if (args.mode === 'matchups') {
+  const results = matchups(args.n || 20000);
+  if (args.json) {
+    console.log(JSON.stringify(results));
+  } else {
+    const { distribution, throughput } = results;
+    console.log(`${distribution.cells} cells x ${distribution.samplesPerCell} deliveries: max |z| ${distribution.maxZ.toFixed(2)}, wicket types max |z| ${distribution.wicketTypeMaxZ.toFixed(2)}`);
+    console.log(`per-ball derivation ${Math.round(throughput.beforeBallsPerSecond).toLocaleString()} balls/s  matchup tables ${Math.round(throughput.afterBallsPerSecond).toLocaleString()} balls/s  (${throughput.speedup.toFixed(1)}x)`);
+    console.log(`simulateInnings without commentary ${Math.round(throughput.inningsPerSecond).toLocaleString()} innings/s`);
+  }
+} else if (args.mode === 'ball-log') {
+  const results = ballLog(args.n || 200);
+  if (args.json) {
+    console.log(JSON.stringify(results));
+  } else {
+    console.log(`${results.matches} matches, ${results.ballsPerMatch.toFixed(0)} deliveries per match`);
+    console.log(`storage  commentary ${Math.round(results.commentaryBytes).toLocaleString()} B  ball log ${Math.round(results.ballLogBytes).toLocaleString()} B  (${results.storageRatio.toFixed(1)}x smaller)`);
+    console.log(`payload  whole row ${Math.round(results.payloadBeforeBytes).toLocaleString()} B  row + latest over ${Math.round(results.payloadAfterBytes).toLocaleString()} B  (${results.payloadRatio.toFixed(1)}x smaller)`);
+    console.log(`decode ${results.decodeMicrosPerInnings.toFixed(1)}us/innings  render latest over ${results.renderMicrosPerOver.toFixed(1)}us`);
+  }
+} else {
+  const results = bench(args.n || 20000);
+  if (args.json) {
+    console.log(JSON.stringify(results));
+  } else {
+    for (const [engine, stats] of Object.entries(results)) {
+      if (engine === 'speedup') continue;
+      console.log(`${engine.padEnd(16)} ${stats.innings.toString().padStart(7)} innings  ${stats.seconds.toFixed(3)}s  ${Math.round(stats.inningsPerSecond).toLocaleString()} innings/s`);
+    }
+    console.log(`speedup          ${results.speedup.toFixed(1)}x`);
+  }
+}
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Async load generator for the T20 Cricket backend.
+
+Drives a weighted mix of concurrent virtual users against the main API
+endpoints over a pooled keep-alive HTTP client and reports p50/p95/p99
+latency, throughput and error rate per endpoint. Fixture teams are
+registered up front under fresh credentials so every run starts from
+known users, and the report can be written as JSON to diff runs over time.
+Needs aiohttp (pip install aiohttp); it is not part of the pytest suite.
+
+Usage:
+    python scripts/load_generate.py --users 50 --duration 60 --output load_report.json
+    python scripts/load_generate.py --mix "matches=40,leagues=20,quick_sim=0" --baseline load_report.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime
+
+import aiohttp
+
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:3000/api")
+FIXTURE_USER = {
+    "password": "loadtest123",
+    "country": "India",
+    "nationality": "Indian",
+}
+
+# Default scenario weights, see build_request for what each scenario sends
+DEFAULT_MIX = {
+    "matches": 25,
+    "user_matches": 15,
+    "leagues": 15,
+    "players": 10,
+    "lineups": 10,
+    "marketplace": 10,
+    "next_match": 10,
+    "quick_sim": 5,
+}
+
+
+def build_request(name, user_id):
+    """Return (method, endpoint, params, body) for a scenario name"""
+    if name == "matches":
+        return "GET", "/matches", {"limit": "50"}, None
+    if name == "user_matches":
+        return "GET", "/matches", {"userId": user_id, "status": "completed", "limit": "20"}, None
+    if name == "leagues":
+        return "GET", "/leagues", None, None
+    if name == "players":
+        return "GET", "/players", {"userId": user_id}, None
+    if name == "lineups":
+        return "GET", "/lineups", {"userId": user_id}, None
+    if name == "marketplace":
+        return "GET", "/marketplace", None, None
+    if name == "next_match":
+        return "GET", "/matches/next", {"userId": user_id}, None
+    if name == "quick_sim":
+        return "POST", "/matches/quick-sim", None, {"userId": user_id}
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def parse_mix(value):
+    """Parse 'matches=30,leagues=10' into a weight dict layered over the default mix"""
+    mix = dict(DEFAULT_MIX)
+    if not value:
+        return mix
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario '{name}', expected one of {sorted(DEFAULT_MIX)}")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadTester:
+    def __init__(self, base_url, users, duration, mix, pool_size, think_time, fixture_users, timeout):
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.mix = mix
+        self.pool_size = pool_size
+        self.think_time = think_time
+        self.fixture_users = fixture_users
+        self.timeout = timeout
+        self.user_ids = []
+        self.samples = {}
+
+    def register_fixture_users(self):
+        """Register the fixture teams the virtual users act as"""
+        run_id = uuid.uuid4().hex[:8]
+
+        for index in range(self.fixture_users):
+            user_data = dict(FIXTURE_USER)
+            user_data["email"] = f"load_{run_id}_{index}@cricket.com"
+            user_data["username"] = f"load_{run_id}_{index}"
+            user_data["team_name"] = f"Load Test XI {run_id}-{index}"
+
+            request = urllib.request.Request(
+                f"{self.base_url}/auth/register",
+                data=json.dumps(user_data).encode(),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    self.user_ids.append(json.load(response).get("id"))
+            except (urllib.error.URLError, OSError) as error:
+                status = error.code if isinstance(error, urllib.error.HTTPError) else "No response"
+                print(f"⚠️  Could not register fixture user {index}: {status}")
+
+        if not self.user_ids:
+            raise RuntimeError("No fixture users available, is the backend running?")
+
+    def record(self, name, elapsed_ms, status, error=None):
+        entry = self.samples.setdefault(name, {"latencies": [], "statuses": {}, "errors": 0, "exceptions": []})
+        entry["latencies"].append(elapsed_ms)
+        key = str(status)
+        entry["statuses"][key] = entry["statuses"].get(key, 0) + 1
+        if error or not (200 <= status < 300):
+            entry["errors"] += 1
+        if error and len(entry["exceptions"]) < 5:
+            entry["exceptions"].append(error)
+
+    async def virtual_user(self, session, deadline, rng):
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            method, endpoint, params, body = build_request(name, rng.choice(self.user_ids))
+            started = time.perf_counter()
+            try:
+                async with session.request(method, f"{self.base_url}{endpoint}", params=params, json=body) as response:
+                    await response.read()
+                    self.record(name, (time.perf_counter() - started) * 1000, response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.record(name, (time.perf_counter() - started) * 1000, 0, error=f"{type(e).__name__}: {e}")
+
+            if self.think_time > 0:
+                await asyncio.sleep(rng.uniform(0, 2 * self.think_time) / 1000)
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.monotonic()
+        deadline = started + self.duration
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*[
+                self.virtual_user(session, deadline, random.Random(index))
+                for index in range(self.users)
+            ])
+
+        return time.monotonic() - started
+
+    def build_report(self, wall_time):
+        endpoints = {}
+        all_latencies = []
+        total_errors = 0
+
+        for name, entry in sorted(self.samples.items()):
+            latencies = sorted(entry["latencies"])
+            all_latencies.extend(latencies)
+            total_errors += entry["errors"]
+            method, endpoint, _, _ = build_request(name, "{userId}")
+            endpoints[name] = {
+                "request": f"{method} {endpoint}",
+                "count": len(latencies),
+                "errors": entry["errors"],
+                "error_rate": entry["errors"] / len(latencies) if latencies else 0.0,
+                "throughput_rps": len(latencies) / wall_time if wall_time else 0.0,
+                "latency_ms": {
+                    "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "p50": percentile(latencies, 0.50),
+                    "p95": percentile(latencies, 0.95),
+                    "p99": percentile(latencies, 0.99),
+                    "max": latencies[-1] if latencies else 0.0,
+                },
+                "statuses": entry["statuses"],
+                "sample_exceptions": entry["exceptions"],
+            }
+
+        all_latencies.sort()
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "base_url": self.base_url,
+            "config": {
+                "users": self.users,
+                "duration_s": self.duration,
+                "pool_size": self.pool_size,
+                "think_time_ms": self.think_time,
+                "fixture_users": len(self.user_ids),
+                "mix": self.mix,
+            },
+            "wall_time_s": wall_time,
+            "total": {
+                "count": len(all_latencies),
+                "errors": total_errors,
+                "error_rate": total_errors / len(all_latencies) if all_latencies else 0.0,
+                "throughput_rps": len(all_latencies) / wall_time if wall_time else 0.0,
+                "latency_ms": {
+                    "p50": percentile(all_latencies, 0.50),
+                    "p95": percentile(all_latencies, 0.95),
+                    "p99": percentile(all_latencies, 0.99),
+                },
+            },
+            "endpoints": endpoints,
+        }
+
+
+def print_report(report, baseline=None):
+    print("\n" + "=" * 96)
+    print("🏏 T20 CRICKET BACKEND LOAD REPORT 🏏")
+    print("=" * 96)
+    print(f"{'Endpoint':<34}{'count':>8}{'rps':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'Δp95':>10}")
+
+    for name, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        delta = ""
+        if baseline and name in baseline.get("endpoints", {}):
+            previous = baseline["endpoints"][name]["latency_ms"]["p95"]
+            if previous:
+                delta = f"{(latency['p95'] - previous) / previous * 100:+.0f}%"
+        print(f"{stats['request']:<34}{stats['count']:>8}{stats['throughput_rps']:>9.1f}"
+              f"{stats['error_rate'] * 100:>7.1f}%{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}{delta:>10}")
+
+    total = report["total"]
+    print("-" * 96)
+    print(f"{'TOTAL':<34}{total['count']:>8}{total['throughput_rps']:>9.1f}{total['error_rate'] * 100:>7.1f}%"
+          f"{total['latency_ms']['p50']:>9.1f}{total['latency_ms']['p95']:>9.1f}{total['latency_ms']['p99']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async load generator for the T20 Cricket backend")
+    parser.add_argument("--base-url", default=BASE_URL, help="API base URL including /api")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="run length in seconds")
+    parser.add_argument("--mix", default="", help="scenario weights, e.g. 'matches=30,quick_sim=0'")
+    parser.add_argument("--pool-size", type=int, default=50, help="max keep-alive connections")
+    parser.add_argument("--think-time", type=float, default=0, help="mean pause between requests per user (ms)")
+    parser.add_argument("--fixture-users", type=int, default=4, help="teams registered for the run")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="previous JSON report to compare p95 latency against")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    tester = LoadTester(
+        base_url=base_url,
+        users=args.users,
+        duration=args.duration,
+        mix=parse_mix(args.mix),
+        pool_size=args.pool_size,
+        think_time=args.think_time,
+        fixture_users=args.fixture_users,
+        timeout=args.timeout,
+    )
+
+    print("🏏 T20 Cricket Backend Load Test")
+    print(f"📡 Testing URL: {base_url}")
+    print(f"👥 {args.users} virtual users for {args.duration:.0f}s, mix: {tester.mix}")
+
+    tester.register_fixture_users()
+    wall_time = asyncio.run(tester.run())
+    report = tester.build_report(wall_time)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+
+    sys.exit(0 if report["total"]["count"] > 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
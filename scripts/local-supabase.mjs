@@ -0,0 +1,167 @@
+// Harness for the in-process Supabase stand-in (lib/supabase/local.js).
+//
+//   node scripts/local-supabase.mjs check
+//       run the query-builder subset the routes use and print the results as JSON
+//   node scripts/local-supabase.mjs bench [--players 100000] [--json]
+//       indexed vs unindexed lookups and round-trip counting at scale
+
+import { createLocalClient } from '../lib/supabase/local.js';
+import { trackQueries } from '../lib/supabase/query-stats.js';
+
+function parseArgs(argv) {
+  const args = { mode: argv[0] || 'check', players: 100000, json: false };
+  for (let i = 1; i < argv.length; i++) {
+    if (argv[i] === '--players') args.players = parseInt(argv[++i]);
+    if (argv[i] === '--json') args.json = true;
+  }
+  return args;
+}
+
+function user(id, overrides = {}) {
+  return { id, email: `${id}@cricket.com`, username: id, team_name: `Team ${id}`, country: 'England', ...overrides };
+}
+
+function player(id, userId, overrides = {}) {
+  return { id, user_id: userId, name: `Player ${id}`, rating: 50, ...overrides };
+}
+
+async function check() {
+  const db = createLocalClient();
+  const results = {};
+
+  const inserted = await db.from('users').insert([user('u1'), user('u2'), user('u3', { coins: 100 })]).select();
+  results.insert = { count: inserted.data.length, coinsDefault: inserted.data[0].coins, status: inserted.status };
+
+  const minimal = await db.from('users').insert(user('u4'));
+  results.insertMinimal = { data: minimal.data, error: minimal.error };
+
+  const duplicate = await db.from('users').insert(user('u5', { email: 'u1@cricket.com' }));
+  results.duplicate = duplicate.error;
+
+  const missing = await db.from('users').insert({ id: 'u6' });
+  results.notNull = missing.error;
+
+  const unknown = await db.from('users').insert(user('u7', { password: 'secret' }));
+  results.unknownColumn = unknown.error;
+
+  const badStatus = await db.from('matches').insert({
+    id: 'm0', home_team_id: 'u1', away_team_id: 'u2', league: 'default', season: '2025',
+    scheduled_time: new Date().toISOString(), status: 'abandoned'
+  });
+  results.check = badStatus.error;
+
+  const single = await db.from('users').select('team_name').eq('id', 'u2').single();
+  results.single = single.data;
+
+  const none = await db.from('users').select('id').eq('id', 'nobody').single();
+  results.singleMissing = none.error;
+
+  const maybe = await db.from('users').select('id').eq('id', 'nobody').maybeSingle();
+  results.maybeSingle = { data: maybe.data, error: maybe.error };
+
+  const either = await db.from('users').select('id').or('email.eq.u2@cricket.com,username.eq.u3');
+  results.or = either.data.map(row => row.id).sort();
+
+  await db.from('players').insert([
+    player('p1', 'u1', { rating: 70, is_for_sale: true }),
+    player('p2', 'u1', { rating: 90 }),
+    player('p3', 'u2', { rating: 60, is_for_sale: true }),
+    player('p4', 'u3', { rating: 80 })
+  ]);
+
+  const ordered = await db.from('players').select('id, rating').in('user_id', ['u1', 'u2']).order('rating', { ascending: false }).limit(2);
+  results.inOrderLimit = ordered.data;
+
+  const forSale = await db.from('players').select('id').eq('is_for_sale', 'true').neq('user_id', 'u2');
+  results.eqNeq = forSale.data.map(row => row.id);
+
+  const counted = await db.from('players').select('*', { count: 'exact', head: true }).lt('rating', 80);
+  results.countHead = { count: counted.count, data: counted.data };
+
+  const updated = await db.from('players').update({ rating: 95, user_id: 'u2' }).eq('id', 'p2').select().single();
+  const moved = await db.from('players').select('id').eq('user_id', 'u2');
+  results.update = { rating: updated.data.rating, teamU2: moved.data.map(row => row.id).sort() };
+
+  const upserted = await db.from('players').upsert([
+    { id: 'p3', user_id: 'u2', name: 'Renamed', rating: 61 },
+    { id: 'p5', user_id: 'u3', name: 'New Player', rating: 40 }
+  ]).select();
+  results.upsert = upserted.data.map(row => [row.id, row.name, row.is_for_sale]);
+
+  const removed = await db.from('players').delete().eq('user_id', 'u3').select();
+  const remaining = await db.from('players').select('id').eq('user_id', 'u3');
+  results.delete = { removed: removed.data.length, remaining: remaining.data.length };
+
+  const badColumn = await db.from('players').select('id, nope');
+  results.badColumn = badColumn.error;
+
+  const badTable = await db.from('nope').select('*');
+  results.badTable = badTable.error;
+
+  const tracked = await trackQueries(async () => {
+    await db.from('users').select('id');
+    await db.from('players').select('id').eq('user_id', 'u1');
+    return 'done';
+  });
+  results.tracked = tracked;
+  results.stats = { queries: db.stats.queries, byTable: db.stats.byTable };
+
+  const slow = createLocalClient({ latencyMs: 25 });
+  const startedAt = performance.now();
+  await slow.from('users').select('id');
+  results.latencyMs = performance.now() - startedAt;
+
+  return results;
+}
+
+async function bench({ players: playerCount }) {
+  const db = createLocalClient();
+  const teamCount = Math.ceil(playerCount / 20);
+
+  const users = Array.from({ length: teamCount }, (_, t) => user(`u${t}`));
+  const players = Array.from({ length: playerCount }, (_, p) => player(`p${p}`, `u${p % teamCount}`, { rating: p % 100 }));
+  let startedAt = performance.now();
+  db.load({ users, players });
+  const loadMs = performance.now() - startedAt;
+
+  const lookups = 2000;
+  startedAt = performance.now();
+  for (let i = 0; i < lookups; i++) {
+    await db.from('players').select('id, rating').eq('user_id', `u${i % teamCount}`);
+  }
+  const indexedMs = (performance.now() - startedAt) / lookups;
+
+  const scans = 20;
+  startedAt = performance.now();
+  for (let i = 0; i < scans; i++) {
+    await db.from('players').select('id').eq('rating', i);
+  }
+  const scanMs = (performance.now() - startedAt) / scans;
+
+  const { queries } = await trackQueries(async () => {
+    const ids = Array.from({ length: 20 }, (_, i) => `u${i}`);
+    await db.from('players').select('id').in('user_id', ids);
+    for (const id of ids) await db.from('players').select('id').eq('user_id', id);
+  });
+
+  return { players: playerCount, teams: teamCount, loadMs, indexedLookupMs: indexedMs, fullScanMs: scanMs, roundTrips: queries };
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+if (args.mode === 'check') {
+  console.log(JSON.stringify(await check()));
+} else if (args.mode === 'bench') {
+  const results = await bench(args);
+  if (args.json) {
+    console.log(JSON.stringify(results));
+  } else {
+    console.log(`${results.players} players / ${results.teams} teams loaded in ${results.loadMs.toFixed(0)}ms`);
+    console.log(`indexed eq(user_id): ${results.indexedLookupMs.toFixed(3)}ms/query`);
+    console.log(`unindexed eq(rating): ${results.fullScanMs.toFixed(3)}ms/query`);
+    console.log(`1 in() + 20 eq() lookups: ${results.roundTrips} round trips`);
+  }
+} else {
+  console.error(`Unknown mode: ${args.mode}`);
+  process.exit(1);
+}
@@ -0,0 +1,121 @@
+// Streaming, resumable migration from MongoDB to Supabase
+// (lib/migration/migrator.js).
+//
+//   node scripts/migrate-to-supabase.mjs [--dry-run] [--tables users,matches]
+//       [--batch-size 500] [--max-batch-bytes 4194304] [--workers 2]
+//       [--checkpoint .migration-checkpoint.json] [--restart] [--json]
+//
+// Reads MONGO_URL and DB_NAME, and writes through the Supabase admin client
+// (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY, or SUPABASE_LOCAL=1).
+// A run that stops (error, Ctrl-C, kill) resumes from the checkpoint when
+// started again; --restart migrates everything from the beginning.
+// --dry-run reads and maps every document and prints the row counts and
+// checksums a migration would write, without writing anything.
+
+import 'dotenv/config';
+import { supabaseAdmin } from '../lib/supabase/client.js';
+import { DEFAULT_OPTIONS, migrate } from '../lib/migration/migrator.js';
+
+function parseArgs(argv) {
+  const args = {
+    dryRun: false,
+    only: null,
+    batchSize: DEFAULT_OPTIONS.batchSize,
+    maxBatchBytes: DEFAULT_OPTIONS.maxBatchBytes,
+    workers: DEFAULT_OPTIONS.workers,
+    checkpointPath: '.migration-checkpoint.json',
+    restart: false,
+    json: false
+  };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--dry-run') args.dryRun = true;
+    if (argv[i] === '--tables') args.only = argv[++i].split(',').map(name => name.trim()).filter(Boolean);
+    if (argv[i] === '--batch-size') args.batchSize = parseInt(argv[++i]);
+    if (argv[i] === '--max-batch-bytes') args.maxBatchBytes = parseInt(argv[++i]);
+    if (argv[i] === '--workers') args.workers = parseInt(argv[++i]);
+    if (argv[i] === '--checkpoint') args.checkpointPath = argv[++i];
+    if (argv[i] === '--restart') args.restart = true;
+    if (argv[i] === '--json') args.json = true;
+  }
+  return args;
+}
+
+function megabytes(bytes) {
+  return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+}
+
+function printReport(report) {
+  console.log(`\n${'table'.padEnd(16)}${'status'.padEnd(10)}${'rows'.padStart(10)}${'this run'.padStart(10)}${'rows/s'.padStart(10)}${'size'.padStart(11)}  checksum`);
+  for (const [table, entry] of Object.entries(report.tables)) {
+    console.log(
+      `${table.padEnd(16)}${entry.status.padEnd(10)}${String(entry.rows).padStart(10)}${String(entry.migrated).padStart(10)}` +
+      `${String(entry.rowsPerSec).padStart(10)}${megabytes(entry.bytes).padStart(11)}  ${entry.checksum}`
+    );
+  }
+  console.log(`\n${report.rows} rows in ${(report.elapsedMs / 1000).toFixed(1)}s (${report.rowsPerSec} rows/s), ` +
+    `peak heap ${megabytes(report.peakHeapBytes)}, peak RSS ${megabytes(report.peakRssBytes)}`);
+}
+
+const args = parseArgs(process.argv.slice(2));
+const mongoUrl = process.env.MONGO_URL;
+if (!mongoUrl) {
+  console.error('Missing required environment variable MONGO_URL');
+  process.exit(1);
+}
+
+let mongodb;
+try {
+  mongodb = await import('mongodb');
+} catch {
+  console.error('The mongodb driver is required for the migration (yarn add mongodb)');
+  process.exit(1);
+}
+
+// Checkpoints keep ObjectIds as { $oid } so the cursor resumes on the same type
+const objectIds = {
+  encode: id => (id instanceof mongodb.ObjectId ? { $oid: id.toHexString() } : id),
+  decode: value => (value?.$oid ? new mongodb.ObjectId(value.$oid) : value)
+};
+
+// The first Ctrl-C finishes the batches in flight and saves the checkpoint
+const controller = new AbortController();
+for (const signal of ['SIGINT', 'SIGTERM']) {
+  process.once(signal, () => {
+    console.log('\nStopping after the current batches...');
+    controller.abort();
+  });
+}
+
+let lastProgress = 0;
+function progress(table, state) {
+  if (args.json || performance.now() - lastProgress < 1000) return;
+  lastProgress = performance.now();
+  console.log(`  ${table}: ${state.rows} rows in ${state.batches} batches`);
+}
+
+const mongoClient = new mongodb.MongoClient(mongoUrl);
+let report;
+try {
+  await mongoClient.connect();
+  if (!args.json) {
+    console.log(`${args.dryRun ? 'Dry run' : 'Migrating'} from MongoDB to Supabase ` +
+      `(batches of ${args.batchSize} rows / ${megabytes(args.maxBatchBytes)}, ${args.workers} workers)`);
+  }
+  report = await migrate(mongoClient.db(process.env.DB_NAME), supabaseAdmin, {
+    ...args,
+    idCodec: objectIds,
+    signal: controller.signal,
+    onBatch: progress
+  });
+} finally {
+  await mongoClient.close();
+}
+
+if (args.json) {
+  console.log(JSON.stringify(report));
+} else {
+  printReport(report);
+  if (report.error) console.error(`\nMigration failed: ${report.error}`);
+  if (report.error || report.aborted) console.error(`Committed batches are in ${args.checkpointPath}; run again to resume`);
+}
+process.exit(report.error || report.aborted ? 1 : 0);
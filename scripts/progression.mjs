@@ -0,0 +1,179 @@
+// Weekly player progression (lib/players/progression.js). Schedule `run` once
+// a week (cron); a week that has already run is skipped.
+//
+//   node scripts/progression.mjs run [--week 2026-W42] [--json]
+//       progress every player by one week and write the changed rows
+//   node scripts/progression.mjs dry-run [--week 2026-W42] [--samples 20] [--json]
+//       compute the same week without writing anything; prints the changes
+//       by column and a sample of player diffs
+//   node scripts/progression.mjs bench [--players 100000] [--matches 2500] [--json]
+//       dry-run and run one week over synthetic players and simulated
+//       matches on the in-process Supabase stand-in, then the week after
+//
+// `bench` always uses the stand-in (SUPABASE_LOCAL=1); the other modes use
+// whatever lib/supabase/client.js is configured for.
+
+import 'dotenv/config';
+
+function parseArgs(argv) {
+  const args = { mode: argv[0] || 'dry-run', week: null, samples: 20, players: 100000, matches: null, json: false };
+  for (let i = 1; i < argv.length; i++) {
+    if (argv[i] === '--week') args.week = argv[++i];
+    if (argv[i] === '--samples') args.samples = parseInt(argv[++i]);
+    if (argv[i] === '--players') args.players = parseInt(argv[++i]);
+    if (argv[i] === '--matches') args.matches = parseInt(argv[++i]);
+    if (argv[i] === '--json') args.json = true;
+  }
+  return args;
+}
+
+const FORMS = ['Excellent', 'Good', 'Average', 'Poor', 'Terrible'];
+const FATIGUE = ['Fresh', 'Slightly tired', 'Tired', 'Very tired', 'Exhausted'];
+const BOWLER_TYPES = ['Right-arm fast', 'Left-arm fast', 'Right-arm medium', 'Left-arm medium', 'Right-arm spin', 'Left-arm spin'];
+const SQUAD_SIZE = 20;
+
+// Deterministic, uncorrelated column values
+const mix = (i, salt) => (Math.imul(i + 1, 2654435761) ^ Math.imul(salt, 40503)) >>> 0;
+
+// `players` synthetic players in squads of SQUAD_SIZE, and `matches`
+// completed matches between pairs of those teams, simulated and stored the
+// way the simulation job stores them (replay records, no scorecards)
+async function seedBench(db, players, matches, completedAt) {
+  const { simulateMatchBallByBall, storedMatchColumns } = await import('../lib/simulation/match.js');
+  const { selectPlayingXI } = await import('../lib/simulation/squads.js');
+
+  const teams = Math.ceil(players / SQUAD_SIZE);
+  const rows = Array.from({ length: players }, (_, i) => {
+    const skill = salt => 1 + mix(i, salt) % 100;
+    const row = {
+      id: `player-${String(i).padStart(7, '0')}`,
+      user_id: `team-${Math.floor(i / SQUAD_SIZE)}`,
+      name: `Player ${i}`,
+      age: 18 + mix(i, 1) % 20,
+      batting: skill(2),
+      bowling: skill(3),
+      keeping: skill(4),
+      technique: skill(5),
+      fielding: skill(6),
+      endurance: skill(7),
+      power: skill(8),
+      captaincy: skill(9),
+      experience: mix(i, 10) % 100,
+      form: FORMS[mix(i, 11) % FORMS.length],
+      fatigue: FATIGUE[mix(i, 12) % FATIGUE.length],
+      wage: 10000 + mix(i, 13) % 50000,
+      bowler_type: BOWLER_TYPES[mix(i, 14) % BOWLER_TYPES.length]
+    };
+    row.rating = Math.floor((row.batting + row.bowling + row.keeping + row.technique + row.fielding + row.endurance + row.power + row.captaincy) / 8);
+    row.market_value = row.rating * 1000 + mix(i, 15) % 10000;
+    return row;
+  });
+
+  const squads = new Map();
+  for (let t = 0; t < teams; t++) {
+    const teamId = `team-${t}`;
+    squads.set(teamId, selectPlayingXI(teamId, null, rows.slice(t * SQUAD_SIZE, (t + 1) * SQUAD_SIZE)));
+  }
+
+  const matchRows = [];
+  for (let m = 0; m < matches; m++) {
+    const match = {
+      id: `bench-match-${m}`,
+      home_team_id: `team-${(2 * m) % teams}`,
+      away_team_id: `team-${(2 * m + 1) % teams}`,
+      league: 'bench',
+      season: '1',
+      scheduled_time: completedAt
+    };
+    const simulated = simulateMatchBallByBall(match, squads, new Map());
+    matchRows.push({ ...match, ...storedMatchColumns(simulated), updated_at: completedAt });
+  }
+
+  db.load({ players: rows, matches: matchRows });
+}
+
+function printReport(report) {
+  if (report.skipped) {
+    console.log(`${report.week}: already ran (cutoff ${report.run.cutoff}), skipped`);
+    return;
+  }
+  console.log(`${report.week}${report.dryRun ? ' (dry run)' : ''}: matches since ${report.since ?? 'the start'} up to ${report.cutoff}`);
+  console.log(`  matches: ${report.matches.read} read, ${report.matches.applied} applied, ${report.matches.pinned} pinned, ${report.matches.unreplayable} unreplayable`);
+  console.log(`  players: ${report.playersRead} read, ${report.playersChanged} changed, ${report.playersSkipped} already progressed, ${report.writes} writes`);
+  console.log(`  ${(report.ms / 1000).toFixed(2)}s (${report.playersPerSec} players/s, ${(report.computeMs / 1000).toFixed(2)}s computing)`);
+  console.log(`  changes: ${Object.entries(report.changes).map(([column, count]) => `${column} ${count}`).join(', ')}`);
+  for (const diff of report.diffs) {
+    const changes = Object.keys(diff.after).map(column => `${column} ${JSON.stringify(diff.before[column])} -> ${JSON.stringify(diff.after[column])}`);
+    console.log(`  ${diff.id} ${diff.name}: ${changes.join(', ')}`);
+  }
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+if (args.mode === 'bench') {
+  process.env.SUPABASE_LOCAL = '1';
+  const { supabaseAdmin: db } = await import('../lib/supabase/client.js');
+  const { runProgression } = await import('../lib/players/progression.js');
+
+  const now = new Date();
+  const matches = args.matches ?? Math.floor(args.players / SQUAD_SIZE / 2);
+  let startedAt = performance.now();
+  await seedBench(db, args.players, matches, new Date(now.getTime() - 86400000).toISOString());
+  const seedMs = performance.now() - startedAt;
+
+  db.resetStats();
+  const dryRun = await runProgression({ now, dryRun: true, samples: 0 });
+  const dryRunQueries = db.stats.queries;
+  db.resetStats();
+  const run = await runProgression({ now });
+  const queries = structuredClone(db.stats.byTable);
+
+  startedAt = performance.now();
+  const rerun = await runProgression({ now });
+  const rerunMs = performance.now() - startedAt;
+
+  // A week later, with no new matches: rested players settle
+  const nextWeek = await runProgression({ now: new Date(now.getTime() + 7 * 86400000) });
+
+  const result = {
+    players: args.players,
+    matches,
+    seedMs: Math.round(seedMs),
+    dryRun: { ms: Math.round(dryRun.ms), queries: dryRunQueries, changed: dryRun.playersChanged },
+    run: {
+      ms: Math.round(run.ms),
+      workloadMs: Math.round(run.workloadMs),
+      computeMs: Math.round(run.computeMs),
+      playersPerSec: run.playersPerSec,
+      changed: run.playersChanged,
+      pages: run.pages,
+      writes: run.writes,
+      matches: run.matches,
+      changes: run.changes,
+      queries
+    },
+    rerun: { skipped: rerun.skipped, ms: Math.round(rerunMs) },
+    nextWeek: { ms: Math.round(nextWeek.ms), changed: nextWeek.playersChanged, writes: nextWeek.writes, matches: nextWeek.matches.read }
+  };
+
+  if (args.json) {
+    console.log(JSON.stringify(result));
+  } else {
+    console.log(`${args.players} players, ${matches} matches (seeded in ${(seedMs / 1000).toFixed(1)}s)`);
+    console.log(`  dry run: ${(dryRun.ms / 1000).toFixed(2)}s, ${dryRun.playersChanged} players would change, ${dryRunQueries} queries`);
+    console.log(`  run:     ${(run.ms / 1000).toFixed(2)}s (${run.playersPerSec} players/s, workload ${(run.workloadMs / 1000).toFixed(2)}s, compute ${(run.computeMs / 1000).toFixed(2)}s), ${run.playersChanged} rows in ${run.writes} writes over ${run.pages} pages`);
+    console.log(`  rerun:   ${rerun.skipped ? 'skipped' : 'ran again'} in ${rerunMs.toFixed(1)}ms`);
+    console.log(`  next week: ${(nextWeek.ms / 1000).toFixed(2)}s, ${nextWeek.playersChanged} rows in ${nextWeek.writes} writes`);
+  }
+} else if (args.mode === 'run' || args.mode === 'dry-run') {
+  const { runProgression } = await import('../lib/players/progression.js');
+  const report = await runProgression({ week: args.week, dryRun: args.mode === 'dry-run', samples: args.samples });
+  if (args.json) {
+    console.log(JSON.stringify(report));
+  } else {
+    printReport(report);
+  }
+} else {
+  console.error(`Unknown mode: ${args.mode}`);
+  process.exit(1);
+}
@@ -0,0 +1,57 @@
+// Maintenance for the league_standings table (lib/league/standings-store.js).
+//
+//   node scripts/standings.mjs check [--league default] [--season 3]
+//       compare the stored rows with a full recomputation from completed
+//       matches; exits 1 when any season is inconsistent
+//   node scripts/standings.mjs rebuild [--league default] [--season 3]
+//       replace the stored rows with a full recomputation
+//
+// Without --season every season of the league is processed.
+
+import 'dotenv/config';
+import { supabaseAdmin } from '../lib/supabase/client.js';
+import { checkStandings, rebuildStandings } from '../lib/league/standings-store.js';
+
+function parseArgs(argv) {
+  const args = { mode: argv[0] || 'check', league: 'default', season: null };
+  for (let i = 1; i < argv.length; i++) {
+    if (argv[i] === '--league') args.league = argv[++i];
+    if (argv[i] === '--season') args.season = argv[++i];
+  }
+  return args;
+}
+
+async function seasonsOf(league) {
+  const { data, error } = await supabaseAdmin
+    .from('league_seasons')
+    .select('season')
+    .eq('league_id', league)
+    .order('season', { ascending: true });
+
+  if (error) throw error;
+  return data.map(row => row.season);
+}
+
+const args = parseArgs(process.argv.slice(2));
+const seasons = args.season ? [args.season] : await seasonsOf(args.league);
+
+if (args.mode === 'check') {
+  let consistent = true;
+  for (const season of seasons) {
+    const report = await checkStandings(args.league, season);
+    consistent &&= report.consistent;
+    console.log(`${args.league} season ${season}: ${report.teams} teams, ${report.consistent ? 'consistent' : `${report.mismatches.length} mismatches`}`);
+    for (const mismatch of report.mismatches) {
+      console.log(`  ${mismatch.teamId} ${mismatch.field}: stored ${JSON.stringify(mismatch.stored)}, expected ${JSON.stringify(mismatch.expected)}`);
+    }
+  }
+  process.exit(consistent ? 0 : 1);
+} else if (args.mode === 'rebuild') {
+  for (const season of seasons) {
+    const { teams } = await rebuildStandings(args.league, season);
+    console.log(`${args.league} season ${season}: rebuilt ${teams} rows`);
+  }
+} else {
+  console.error(`Unknown mode: ${args.mode}`);
+  process.exit(1);
+}
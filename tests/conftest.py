@@ -0,0 +1,364 @@
+"""
+Shared fixtures for tests that drive the Next.js route handlers in-process.
+
+The scenarios of a test module test_<feature>.py live next to it in
+test_<feature>.mjs (helpers in tests/harness/routes.mjs) and run on the local
+Supabase stand-in (SUPABASE_LOCAL=1); they need node and the project's
+node_modules.
+
+The API tests (test_api_*.py) talk HTTP to tests/harness/server.mjs, one
+server per pytest worker with a database of its own, or to a running
+deployment given with --base-url. Every test registers its own teams, so the
+suite runs in any order and in parallel (pytest -n auto). When a worker's
+tests are done, its server's per-route query maxima (/api/health/metrics) are
+checked against QUERY_BUDGET and ROUTE_QUERY_BUDGETS.
+"""
+
+import http.client
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIO_RUNNER = os.path.join(REPO_ROOT, "tests", "harness", "run-scenario.mjs")
+LOADER = os.path.join(REPO_ROOT, "tests", "harness", "register.mjs")
+API_SERVER = os.path.join(REPO_ROOT, "tests", "harness", "server.mjs")
+SERVER_START_TIMEOUT = 30
+
+# Most Supabase queries one request to a route may make, as recorded in the
+# server's metrics over the whole API suite; routes without an entry of their
+# own get QUERY_BUDGET
+QUERY_BUDGET = 5
+ROUTE_QUERY_BUDGETS = {
+    "GET /api/bootstrap": 8,
+    "POST /api/auth/register": 8,
+}
+QUERIES_MAX_METRIC = re.compile(r'^cricket_http_request_queries_max\{route="((?:[^"\\]|\\.)*)"\} (\S+)$')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("api", "API suite")
+    group.addoption(
+        "--base-url", default=os.environ.get("API_BASE_URL"),
+        help="run the API tests against this deployment (e.g. http://localhost:3000/api) "
+             "instead of an in-process server"
+    )
+    group.addoption(
+        "--update-baseline", action="store_true",
+        help="record the measured latencies, payload sizes and query counts as the new API baseline"
+    )
+    group.addoption(
+        "--query-budget", type=int, default=None, metavar="N",
+        help=f"fail any route whose requests made more than N Supabase queries (default {QUERY_BUDGET}); "
+             "checked against --base-url deployments only when given"
+    )
+    group.addoption(
+        "--route-budget", action="append", default=[], metavar="ROUTE=N",
+        help='query budget of one route label, e.g. "POST /api/matches/quick-sim=200" (repeatable)'
+    )
+
+
+def pytest_configure(config):
+    query_budgets(config)
+
+
+def query_budgets(config):
+    """(default budget, {route label: budget}) from the options over the defaults"""
+    budgets = dict(ROUTE_QUERY_BUDGETS)
+    for entry in config.getoption("--route-budget"):
+        route, _, limit = entry.rpartition("=")
+        if not route or not limit.isdigit():
+            raise pytest.UsageError(f"--route-budget expects ROUTE=N, got {entry!r}")
+        budgets[route] = int(limit)
+    return config.getoption("--query-budget") or QUERY_BUDGET, budgets
+
+
+def check_query_budgets(client, config):
+    """Scrape the server's metrics and fail every route whose worst request
+    made more queries than its budget"""
+    response = client.get("/health/metrics")
+    assert response.status == 200, f"metrics endpoint returned {response.status}"
+    routes = {}
+    for line in response.body.decode().splitlines():
+        match = QUERIES_MAX_METRIC.match(line)
+        if match:
+            routes[match.group(1).replace('\\"', '"')] = float(match.group(2))
+    assert routes, "no per-route query metrics found"
+
+    budget, route_budgets = query_budgets(config)
+    over = [
+        f"{route}: {int(queries)} queries (budget {route_budgets.get(route, budget)})"
+        for route, queries in sorted(routes.items())
+        if queries > route_budgets.get(route, budget)
+    ]
+    assert not over, "routes over their query budget:\n" + "\n".join(over)
+
+
+def require_node():
+    if shutil.which("node") is None:
+        pytest.skip("node is required to run the route handlers")
+    probe = subprocess.run(
+        ["node", "--input-type=module", "-e", "await import('next/server')"],
+        cwd=REPO_ROOT, capture_output=True
+    )
+    if probe.returncode != 0:
+        pytest.skip("next is not installed (run yarn install)")
+
+
+@pytest.fixture(scope="module")
+def route_scenario(request):
+    """Return a callable running a scenario of this module's route harness
+    (test_<feature>.mjs next to it) and parsing its JSON result"""
+    require_node()
+    harness = os.path.splitext(request.module.__file__)[0] + ".mjs"
+
+    def run(name, *args, timeout=300):
+        completed = subprocess.run(
+            ["node", "--no-warnings", "--import", LOADER, SCENARIO_RUNNER, harness, name, *args],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=timeout
+        )
+        if completed.returncode != 0:
+            pytest.fail(
+                f"scenario {name!r} of {os.path.basename(harness)} exited with {completed.returncode}:\n"
+                f"{completed.stderr[-4000:]}",
+                pytrace=False
+            )
+        # Routes log to stdout; the scenario result is the last line
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    return run
+
+
+class ApiResponse:
+    """Status, headers and raw body of one API call, with its wall time"""
+
+    def __init__(self, status, headers, body, elapsed_ms):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+    @property
+    def queries(self):
+        """Supabase queries the request made (X-Query-Count), when reported"""
+        value = self.headers.get("x-query-count")
+        return int(value) if value is not None else None
+
+
+class ApiClient:
+    """Minimal keep-alive JSON client for one API base URL"""
+
+    def __init__(self, base_url, timeout=60):
+        parts = urlsplit(base_url)
+        self.base_url = base_url.rstrip("/")
+        self.prefix = parts.path.rstrip("/")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.timeout = timeout
+        self.connection = None
+
+    def connect(self):
+        factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return factory(self.netloc, timeout=self.timeout)
+
+    def request(self, method, endpoint, json_body=None, params=None, headers=None):
+        target = self.prefix + endpoint
+        if params:
+            target += ("&" if "?" in target else "?") + urlencode(params)
+        body = None if json_body is None else json.dumps(json_body).encode()
+        request_headers = {"Content-Type": "application/json", **(headers or {})}
+
+        # One reconnect when the server closed the kept-alive connection
+        for attempt in range(2):
+            self.connection = self.connection or self.connect()
+            started = time.perf_counter()
+            try:
+                self.connection.request(method, target, body=body, headers=request_headers)
+                response = self.connection.getresponse()
+                payload = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            return ApiResponse(response.status, {k.lower(): v for k, v in response.getheaders()}, payload, elapsed_ms)
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, json_body=None, **kwargs):
+        return self.request("POST", endpoint, json_body=json_body if json_body is not None else {}, **kwargs)
+
+    def put(self, endpoint, json_body=None, **kwargs):
+        return self.request("PUT", endpoint, json_body=json_body if json_body is not None else {}, **kwargs)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+def start_api_server(log_path, env=None):
+    """Start tests/harness/server.mjs on a free port; returns (process, base URL)"""
+    require_node()
+    log = open(log_path, "w")
+    process = subprocess.Popen(
+        ["node", "--no-warnings", "--import", LOADER, API_SERVER],
+        cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT,
+        env={**os.environ, "SUPABASE_LOCAL": "1", "LIVE_BALL_INTERVAL_MS": "10", **(env or {})}
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        with open(log_path) as output:
+            for line in output:
+                if line.startswith("listening "):
+                    return process, f"http://127.0.0.1:{line.split()[1]}/api"
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    process.kill()
+    with open(log_path) as output:
+        raise RuntimeError(f"API server did not start:\n{output.read()}")
+
+
+def stop_api_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+@pytest.fixture(scope="session")
+def api(request, tmp_path_factory):
+    """Client of the API under test: --base-url, or a server of this worker's own.
+    The query budgets are checked once the session is done with it."""
+    base_url = request.config.getoption("--base-url")
+    process = None
+    if not base_url:
+        process, base_url = start_api_server(tmp_path_factory.mktemp("api") / "server.log")
+    client = ApiClient(base_url)
+    try:
+        yield client
+        # A deployment's metrics cover its whole lifetime, not just this run
+        if process or request.config.getoption("--query-budget") is not None:
+            check_query_budgets(client, request.config)
+    finally:
+        client.close()
+        if process:
+            stop_api_server(process)
+
+
+def register_user(client, country="England", **overrides):
+    """Register a team under unique credentials; returns the user"""
+    tag = uuid.uuid4().hex[:12]
+    user = {
+        "email": f"team_{tag}@cricket.com",
+        "password": "testpass123",
+        "username": f"team_{tag}",
+        "team_name": f"Test XI {tag}",
+        "country": country,
+        "nationality": country,
+        **overrides,
+    }
+    response = client.post("/auth/register", user)
+    assert response.status == 201, response.body
+    return response.json()
+
+
+@pytest.fixture
+def register_team(api):
+    return lambda **overrides: register_user(api, **overrides)
+
+
+@pytest.fixture
+def team(register_team):
+    return register_team()
+
+
+@pytest.fixture
+def opponent(register_team):
+    return register_team()
+
+
+@pytest.fixture
+def match(api, team, opponent):
+    """A scheduled match between this test's two teams"""
+    response = api.post("/matches", {
+        "home_team_id": team["id"],
+        "away_team_id": opponent["id"],
+        "league": f"test-{uuid.uuid4().hex[:8]}",
+        "weather": "Overcast",
+        "pitch_type": "Green",
+    })
+    assert response.status == 201, response.body
+    return response.json()
+
+
+def poll_until(poll, predicate, timeout=30, interval=0.02):
+    """Call `poll` until `predicate` holds for its result; returns that result"""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = poll()
+        if predicate(result) or time.monotonic() > deadline:
+            return result
+        time.sleep(interval)
+
+
+@pytest.fixture
+def wait_for():
+    return poll_until
+
+
+def simulate_match(client, match_id):
+    """Queue a match's simulation and wait for its job; returns the finished job"""
+    submitted = client.post(f"/matches/{match_id}/simulate")
+    assert submitted.status in (200, 202), submitted.body
+    job_id = submitted.json()["id"]
+    job = poll_until(lambda: client.get(f"/jobs/{job_id}").json(), lambda job: job["status"] in ("done", "failed"))
+    assert job["status"] == "done", job
+    return job
+
+
+@pytest.fixture
+def simulate(api):
+    return lambda match_id: simulate_match(api, match_id)
+
+
+def seed_league(client, team_count=6, scheduled=3):
+    """Register `team_count` teams in the current default season, play every pairing
+    once and schedule a few more; returns (teams, completed matches)"""
+    teams = [register_user(client) for _ in range(team_count)]
+    season = client.get("/leagues").json()["season"]
+
+    def create(home, away):
+        response = client.post("/matches", {
+            "home_team_id": home["id"],
+            "away_team_id": away["id"],
+            "league": "default",
+            "season": season,
+        })
+        assert response.status == 201, response.body
+        return response.json()
+
+    completed = []
+    for index, home in enumerate(teams):
+        for away in teams[index + 1:]:
+            match = create(home, away)
+            simulate_match(client, match["id"])
+            completed.append(match)
+    for index in range(scheduled):
+        create(teams[-1 - index], teams[index])
+    return teams, completed
@@ -0,0 +1,16 @@
+// Node ESM resolve hook for running route handlers outside Next: maps the
+// jsconfig "@/..." alias to the repository root and adds the .js extension
+// Next's bundler would resolve.
+import { pathToFileURL } from 'node:url';
+import path from 'node:path';
+
+const REPO_ROOT = path.resolve(path.dirname(new URL(import.meta.url).pathname), '..', '..');
+
+export async function resolve(specifier, context, nextResolve) {
+  if (specifier.startsWith('@/')) {
+    let target = path.join(REPO_ROOT, specifier.slice(2));
+    if (!path.extname(target)) target += '.js';
+    return { url: pathToFileURL(target).href, shortCircuit: true };
+  }
+  return nextResolve(specifier, context);
+}
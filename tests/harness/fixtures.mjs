@@ -0,0 +1,81 @@
+// Deterministic league fixtures for route harnesses running on the local
+// Supabase stand-in.
+
+import { emptyStandingsRow } from '../../lib/league/standings.js';
+
+const FORMS = ['Poor', 'Average', 'Good', 'Excellent'];
+const BOWLER_TYPES = ['Right-arm fast', 'Left-arm medium', 'Right-arm off-spin', 'Left-arm orthodox'];
+
+export function seedLeague(db, { teams = 10, rounds = 4, league = 'default', season = '1', playersPerTeam = 15 } = {}) {
+  const users = [];
+  const players = [];
+  const lineups = [];
+  const matches = [];
+  const teamIds = [];
+
+  for (let t = 0; t < teams; t++) {
+    const userId = `team-${t}`;
+    teamIds.push(userId);
+    users.push({
+      id: userId,
+      email: `${userId}@cricket.com`,
+      username: userId,
+      team_name: `Team ${t}`,
+      country: 'England'
+    });
+
+    const squad = [];
+    for (let p = 0; p < playersPerTeam; p++) {
+      const id = `${userId}-player-${p}`;
+      squad.push(id);
+      players.push({
+        id,
+        user_id: userId,
+        name: `Player ${t}-${p}`,
+        age: 20 + (p % 15),
+        batting: 40 + ((t * 7 + p * 13) % 50),
+        bowling: 40 + ((t * 11 + p * 5) % 50),
+        technique: 40 + ((t * 3 + p * 17) % 50),
+        power: 40 + ((t * 13 + p * 7) % 50),
+        rating: 40 + ((t * 5 + p * 11) % 50),
+        form: FORMS[(t + p) % FORMS.length],
+        bowler_type: BOWLER_TYPES[p % BOWLER_TYPES.length]
+      });
+    }
+
+    lineups.push({ id: `${userId}-lineup`, user_id: userId, name: 'Main Lineup', players: squad.slice(0, 11), is_main: true });
+  }
+
+  // Circle-method pairings, one full set of games per round
+  let matchNumber = 0;
+  for (let round = 0; round < rounds; round++) {
+    for (let i = 0; i < Math.floor(teams / 2); i++) {
+      const home = (round + i) % teams;
+      const away = (round + teams - 1 - i) % teams;
+      if (home === away) continue;
+      matchNumber++;
+      matches.push({
+        id: `${league}-${season}-match-${matchNumber}`,
+        home_team_id: teamIds[home],
+        away_team_id: teamIds[away],
+        league,
+        season,
+        scheduled_time: new Date(Date.UTC(2025, 0, 1 + round, 12, i)).toISOString(),
+        created_at: new Date(Date.UTC(2025, 0, 1, 0, 0, matchNumber)).toISOString(),
+        round: round + 1,
+        match_number: matchNumber
+      });
+    }
+  }
+
+  db.load({
+    users,
+    players,
+    lineups,
+    matches,
+    league_seasons: [{ id: `${league}-${season}`, league_id: league, season, status: 'active', teams: teamIds }],
+    league_standings: teamIds.map(teamId => emptyStandingsRow(league, season, teamId))
+  });
+
+  return { teamIds, matchIds: matches.map(match => match.id) };
+}
@@ -0,0 +1,100 @@
+// Local stand-in for the slice of the MongoDB driver the migrator uses:
+// db.collection(name).find(filter).sort({ _id: 1 }).batchSize(n), iterated
+// with for await, plus countDocuments(). Only the { _id: { $gt } } filter a
+// resumed cursor sends is supported.
+//
+// A collection is either an array of documents or { count, make(i) }, whose
+// documents are generated on demand in _id order so a large collection never
+// sits in memory; the cursor hands them out one driver batch at a time and
+// counts the batches (getMores) it served.
+
+export function objectId(index) {
+  return index.toString(16).padStart(24, '0');
+}
+
+class FixtureCursor {
+  constructor(collection, filter) {
+    const unsupported = Object.keys(filter).filter(key => key !== '_id');
+    if (unsupported.length > 0 || (filter._id && Object.keys(filter._id).some(op => op !== '$gt'))) {
+      throw new Error(`Unsupported filter ${JSON.stringify(filter)}`);
+    }
+    this.collection = collection;
+    this.after = filter._id?.$gt ?? null;
+    this.size = 1000;
+    this.closed = false;
+  }
+
+  sort(spec) {
+    if (JSON.stringify(spec) !== JSON.stringify({ _id: 1 })) throw new Error('Only { _id: 1 } sorts are supported');
+    return this;
+  }
+
+  batchSize(size) {
+    this.size = size;
+    return this;
+  }
+
+  async close() {
+    this.closed = true;
+  }
+
+  async *[Symbol.asyncIterator]() {
+    const { source, stats } = this.collection;
+    let index = this.after === null ? 0 : source.indexAfter(this.after);
+    try {
+      while (index < source.count && !this.closed) {
+        // One round trip per driver batch
+        await new Promise(resolve => setImmediate(resolve));
+        stats.getMores++;
+        const end = Math.min(index + this.size, source.count);
+        const batch = [];
+        for (; index < end; index++) batch.push(source.get(index));
+        stats.documents += batch.length;
+        yield* batch;
+      }
+    } finally {
+      this.closed = true;
+    }
+  }
+}
+
+function arraySource(docs) {
+  const sorted = [...docs].sort((a, b) => (a._id < b._id ? -1 : a._id > b._id ? 1 : 0));
+  return {
+    count: sorted.length,
+    get: index => structuredClone(sorted[index]),
+    indexAfter: id => {
+      const index = sorted.findIndex(doc => doc._id > id);
+      return index === -1 ? sorted.length : index;
+    }
+  };
+}
+
+function generatedSource({ count, make }) {
+  return {
+    count,
+    get: index => ({ _id: objectId(index), ...make(index) }),
+    indexAfter: id => parseInt(id, 16) + 1
+  };
+}
+
+export function createMongoFixture(collections) {
+  const stats = {};
+  const sources = {};
+  for (const [name, definition] of Object.entries(collections)) {
+    sources[name] = Array.isArray(definition) ? arraySource(definition) : generatedSource(definition);
+    stats[name] = { getMores: 0, documents: 0 };
+  }
+
+  return {
+    stats,
+    collection(name) {
+      const source = sources[name] ?? arraySource([]);
+      const collectionStats = stats[name] ??= { getMores: 0, documents: 0 };
+      return {
+        find: (filter = {}) => new FixtureCursor({ source, stats: collectionStats }, filter),
+        countDocuments: async () => source.count
+      };
+    }
+  };
+}
@@ -0,0 +1,4 @@
+// node --import ./tests/harness/register.mjs <script>
+import { register } from 'node:module';
+
+register('./alias-loader.mjs', import.meta.url);
@@ -0,0 +1,91 @@
+// Helpers of the route harness scenarios (tests/test_*.mjs, run by
+// ./run-scenario.mjs): API route handlers called in-process against the local
+// Supabase stand-in.
+
+process.env.SUPABASE_LOCAL = '1';
+
+export const { supabaseAdmin: db } = await import('@/lib/supabase/client');
+export const { invalidateTeams } = await import('@/lib/league/team-directory');
+
+export const BASE_URL = 'http://localhost:3000/api';
+
+export function catchAll() {
+  return import('@/app/api/[[...path]]/route');
+}
+
+export async function call(handler, path, { method = 'GET', body, params, headers = {} } = {}) {
+  const request = new Request(`${BASE_URL}${path}`, {
+    method,
+    headers: { 'Content-Type': 'application/json', ...headers },
+    body: body === undefined ? undefined : JSON.stringify(body)
+  });
+  const response = await handler(request, params ? { params } : undefined);
+  const text = await response.text();
+  return {
+    status: response.status,
+    queries: Number(response.headers.get('X-Query-Count')),
+    etag: response.headers.get('ETag'),
+    cacheControl: response.headers.get('Cache-Control'),
+    body: text ? JSON.parse(text) : null
+  };
+}
+
+// Open an SSE stream on a route and collect its events (with arrival times)
+// until it closes or is cancelled
+export async function openStream(handler, path, { params, headers = {} } = {}) {
+  const request = new Request(`${BASE_URL}${path}`, { headers });
+  const response = await handler(request, { params });
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  const stream = { status: response.status, contentType: response.headers.get('Content-Type'), events: [], reader };
+  let buffer = '';
+
+  stream.done = (async () => {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      const arrivedAt = Date.now();
+      buffer += decoder.decode(value, { stream: true });
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const event = { id: null, event: 'message', data: null, arrivedAt };
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('id: ')) event.id = Number(line.slice(4));
+          else if (line.startsWith('event: ')) event.event = line.slice(7);
+          else if (line.startsWith('data: ')) event.data = line.slice(6);
+        }
+        if (event.data !== null) stream.events.push(event);
+        stream.onEvent?.(event);
+      }
+    }
+  })();
+
+  return stream;
+}
+
+export function heapUsed() {
+  globalThis.gc?.();
+  return process.memoryUsage().heapUsed;
+}
+
+export function percentile(values, p) {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : null;
+}
+
+export const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Poll GET /api/jobs/:id until the job has finished; the response body is
+// the job's result (or its status when it failed)
+export async function awaitJob(jobId, { intervalMs = 5 } = {}) {
+  const { GET } = await import('@/app/api/jobs/[id]/route');
+  for (;;) {
+    const job = await call(GET, `/jobs/${jobId}`, { params: { id: jobId } });
+    if (job.status !== 200 || job.body.status === 'done' || job.body.status === 'failed') {
+      return { ...job, job: job.body, body: job.body.result ?? job.body };
+    }
+    await sleep(intervalMs);
+  }
+}
@@ -0,0 +1,21 @@
+// Runs one route harness scenario and prints its result as JSON. The
+// scenarios of tests/test_<feature>.py are the default export of
+// tests/test_<feature>.mjs next to it.
+//
+//   node --import ./tests/harness/register.mjs tests/harness/run-scenario.mjs tests/test_standings.mjs standings
+
+import path from 'node:path';
+import { pathToFileURL } from 'node:url';
+
+process.env.SUPABASE_LOCAL = '1';
+
+const [modulePath, name, ...args] = process.argv.slice(2);
+const { default: scenarios } = await import(pathToFileURL(path.resolve(modulePath)).href);
+
+const scenario = scenarios[name];
+if (!scenario) {
+  console.error(`Unknown scenario: ${name}. ${modulePath} has: ${Object.keys(scenarios).join(', ')}`);
+  process.exit(1);
+}
+
+console.log(JSON.stringify(await scenario(...args)));
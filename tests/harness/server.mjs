@@ -0,0 +1,144 @@
+// HTTP server for the Python API suite: serves the app/api route handlers
+// in-process on the local Supabase stand-in, so every server (one per pytest
+// worker) starts from an empty database of its own.
+//
+//   node --import ./tests/harness/register.mjs tests/harness/server.mjs [port]
+//
+// Prints "listening <port>" once ready (port 0, the default, picks a free
+// one). Requests are routed like the App Router does: static segments before
+// dynamic ones, catch-alls last.
+
+import http from 'node:http';
+import { readdir } from 'node:fs/promises';
+import path from 'node:path';
+import { fileURLToPath, pathToFileURL } from 'node:url';
+
+process.env.SUPABASE_LOCAL = '1';
+
+const API_DIR = fileURLToPath(new URL('../../app/api/', import.meta.url));
+
+// Segment kinds in routing priority order
+const STATIC = 0;
+const DYNAMIC = 1;
+const CATCH_ALL = 2;
+const OPTIONAL_CATCH_ALL = 3;
+
+function parseSegment(segment) {
+  let match;
+  if ((match = /^\[\[\.\.\.(\w+)\]\]$/.exec(segment))) return { kind: OPTIONAL_CATCH_ALL, name: match[1] };
+  if ((match = /^\[\.\.\.(\w+)\]$/.exec(segment))) return { kind: CATCH_ALL, name: match[1] };
+  if ((match = /^\[(\w+)\]$/.exec(segment))) return { kind: DYNAMIC, name: match[1] };
+  return { kind: STATIC, value: segment };
+}
+
+async function findRoutes(dir, segments = []) {
+  const routes = [];
+  for (const entry of await readdir(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      routes.push(...await findRoutes(full, [...segments, parseSegment(entry.name)]));
+    } else if (entry.name === 'route.js') {
+      routes.push({ segments, file: full, module: null });
+    }
+  }
+  return routes;
+}
+
+// More specific routes first: compare segment kinds left to right
+function bySpecificity(a, b) {
+  for (let i = 0; i < Math.max(a.segments.length, b.segments.length); i++) {
+    const kindA = a.segments[i]?.kind ?? -1;
+    const kindB = b.segments[i]?.kind ?? -1;
+    if (kindA !== kindB) return kindA - kindB;
+  }
+  return 0;
+}
+
+// Params of `route` for the path segments, or null when it does not match
+function matchRoute(route, parts) {
+  const params = {};
+  for (let i = 0; i < route.segments.length; i++) {
+    const segment = route.segments[i];
+    if (segment.kind === CATCH_ALL || segment.kind === OPTIONAL_CATCH_ALL) {
+      const rest = parts.slice(i);
+      if (rest.length === 0 && segment.kind === CATCH_ALL) return null;
+      if (rest.length > 0) params[segment.name] = rest;
+      return params;
+    }
+    if (i >= parts.length) return null;
+    if (segment.kind === STATIC && segment.value !== parts[i]) return null;
+    if (segment.kind === DYNAMIC) params[segment.name] = parts[i];
+  }
+  return parts.length === route.segments.length ? params : null;
+}
+
+const routes = (await findRoutes(API_DIR)).sort(bySpecificity);
+
+function resolve(pathname) {
+  if (!pathname.startsWith('/api')) return null;
+  const parts = pathname.slice(4).split('/').filter(Boolean).map(decodeURIComponent);
+  for (const route of routes) {
+    const params = matchRoute(route, parts);
+    if (params) return { route, params };
+  }
+  return null;
+}
+
+async function readBody(req) {
+  const chunks = [];
+  for await (const chunk of req) chunks.push(chunk);
+  return chunks.length > 0 ? Buffer.concat(chunks) : null;
+}
+
+async function handle(req, res) {
+  const url = new URL(req.url, `http://${req.headers.host || 'localhost'}`);
+  const resolved = resolve(url.pathname);
+  const handler = resolved && (resolved.route.module ??= await import(pathToFileURL(resolved.route.file).href))[req.method];
+  if (!handler) {
+    res.writeHead(resolved ? 405 : 404, { 'Content-Type': 'application/json' });
+    res.end(JSON.stringify({ error: resolved ? 'Method not allowed' : 'Not found' }));
+    return;
+  }
+
+  // Streams (SSE) are cancelled when the client goes away
+  const aborted = new AbortController();
+  res.on('close', () => aborted.abort());
+
+  const body = req.method === 'GET' || req.method === 'HEAD' ? null : await readBody(req);
+  const request = new Request(url, { method: req.method, headers: req.headers, body, signal: aborted.signal });
+  const response = await handler(request, { params: resolved.params });
+
+  res.writeHead(response.status, Object.fromEntries(response.headers));
+  if (!response.body) {
+    res.end();
+    return;
+  }
+  const reader = response.body.getReader();
+  try {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      res.write(value);
+    }
+  } catch {
+    // client disconnected mid-stream
+  }
+  res.end();
+}
+
+const server = http.createServer((req, res) => {
+  handle(req, res).catch(error => {
+    console.error('Harness server error:', error);
+    if (!res.headersSent) res.writeHead(500, { 'Content-Type': 'application/json' });
+    res.end(JSON.stringify({ error: error.message }));
+  });
+});
+
+// Route handlers log to stdout; the readiness line is the one the suite waits for
+server.listen(Number(process.argv[2]) || 0, '127.0.0.1', () => {
+  console.log(`listening ${server.address().port}`);
+});
+
+for (const signal of ['SIGINT', 'SIGTERM']) {
+  process.on(signal, () => server.close(() => process.exit(0)));
+}
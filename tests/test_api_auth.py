@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Registration and login over HTTP: every registered team gets its squad and
+main lineup, and credentials are unique.
+"""
+
+SQUAD_SIZE = 20
+
+
+def test_registration_creates_squad_and_lineup(api, team):
+    assert team["id"]
+    assert "password" not in team
+    assert team["coins"] == 50000
+
+    players = api.get("/players", params={"userId": team["id"]})
+    assert players.status == 200
+    squad = players.json()
+    assert len(squad) == SQUAD_SIZE
+    assert len({player["name"] for player in squad}) == SQUAD_SIZE
+
+    lineups = api.get("/lineups", params={"userId": team["id"]}).json()
+    main = [lineup for lineup in lineups if lineup["is_main"]]
+    assert len(main) == 1
+    assert sorted(main[0]["players"]) == sorted(player["id"] for player in squad)
+
+
+def test_duplicate_registration_is_rejected(api, register_team, team):
+    response = api.post("/auth/register", {
+        "email": team["email"],
+        "password": "another",
+        "username": f"{team['username']}_2",
+        "team_name": "Duplicate XI",
+        "country": "England",
+    })
+    assert response.status == 400
+
+
+def test_registration_requires_every_field(api):
+    response = api.post("/auth/register", {"email": "incomplete@cricket.com"})
+    assert response.status == 400
+
+
+def test_login(api, team):
+    response = api.post("/auth/login", {"email": team["email"], "password": "testpass123"})
+    assert response.status == 200
+    assert response.json()["id"] == team["id"]
+    assert "password" not in response.json()
+
+
+def test_login_with_unknown_email_fails(api):
+    response = api.post("/auth/login", {"email": "nobody@cricket.com", "password": "x"})
+    assert response.status == 401
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+GET /api/bootstrap: the dashboard and squad view models in one response,
+read with concurrent, projected queries and revalidated with an ETag.
+
+Besides agreeing with the endpoints it replaces, a dashboard load is compared
+with the six sequential requests the page used to make (players, the team's
+matches, all matches, leagues, lineups, marketplace). Each flow runs on a
+fresh server of its own, seeded with the same league on the local Supabase
+stand-in with a simulated per-query latency, and is timed cold (first load)
+and warm (median of repeat loads), with the bytes and queries of each load.
+"""
+
+import statistics
+
+import pytest
+
+from tests.conftest import ApiClient, seed_league, start_api_server, stop_api_server
+
+QUERY_LATENCY_MS = "5"
+WARM_LOADS = 7
+
+SQUAD_PLAYER_FIELDS = {
+    "id", "name", "age", "form", "rating", "batting", "bowling", "keeping", "captaincy",
+    "batting_style", "bowler_type", "market_value", "is_for_sale",
+}
+
+
+def legacy_requests(user_id):
+    return [
+        ("/players", {"userId": user_id}),
+        ("/matches", {"userId": user_id}),
+        ("/matches", None),
+        ("/leagues", None),
+        ("/lineups", {"userId": user_id}),
+        ("/marketplace", {"limit": 6}),
+    ]
+
+
+def load(client, requests, etag=None):
+    """One page load: the requests in sequence, as the page makes them"""
+    responses = [
+        client.get(path, params=params, headers={"If-None-Match": etag} if etag else None)
+        for path, params in requests
+    ]
+    assert all(response.status in (200, 304) for response in responses), [r.status for r in responses]
+    return {
+        "ms": sum(response.elapsed_ms for response in responses),
+        "bytes": sum(len(response.body) for response in responses),
+        "queries": sum(response.queries or 0 for response in responses),
+        "requests": len(responses),
+        "statuses": [response.status for response in responses],
+        "etag": responses[-1].headers.get("etag"),
+    }
+
+
+def summarize(cold, warm):
+    return {
+        "cold": cold,
+        "warm_ms": statistics.median(run["ms"] for run in warm),
+        "warm_bytes": statistics.median(run["bytes"] for run in warm),
+        "warm_statuses": warm[-1]["statuses"],
+    }
+
+
+def measure_flow(tmp_path_factory, flow):
+    process, base_url = start_api_server(
+        tmp_path_factory.mktemp(flow) / "server.log",
+        env={"SUPABASE_LOCAL_LATENCY_MS": QUERY_LATENCY_MS},
+    )
+    client = ApiClient(base_url)
+    try:
+        teams, _ = seed_league(client)
+        user_id, other_id = teams[0]["id"], teams[1]["id"]
+        # Another team's load first, so that neither flow's cold load pays
+        # for importing its route bundles
+        if flow == "legacy":
+            requests = legacy_requests(user_id)
+            load(client, legacy_requests(other_id))
+            cold = load(client, requests)
+            return summarize(cold, [load(client, requests) for _ in range(WARM_LOADS)])
+
+        requests = [("/bootstrap", {"userId": user_id})]
+        load(client, [("/bootstrap", {"userId": other_id})])
+        cold = load(client, requests)
+        revalidated = [load(client, requests, etag=cold["etag"]) for _ in range(WARM_LOADS)]
+        refetched = [load(client, requests) for _ in range(WARM_LOADS)]
+        return {**summarize(cold, revalidated), "warm_200_ms": statistics.median(run["ms"] for run in refetched)}
+    finally:
+        client.close()
+        stop_api_server(process)
+
+
+@pytest.fixture(scope="module")
+def flows(request, tmp_path_factory):
+    if request.config.getoption("--base-url"):
+        pytest.skip("the load comparison runs on fresh in-process servers, not --base-url")
+    return {flow: measure_flow(tmp_path_factory, flow) for flow in ("legacy", "bootstrap")}
+
+
+def test_bootstrap_agrees_with_the_endpoints_it_replaces(api, team, opponent, match):
+    response = api.get("/bootstrap", params={"userId": team["id"]})
+    assert response.status == 200
+    bootstrap = response.json()
+
+    players = api.get("/players", params={"userId": team["id"]}).json()
+    assert [player["id"] for player in bootstrap["players"]] == [player["id"] for player in players]
+    assert all(set(player) == SQUAD_PLAYER_FIELDS for player in bootstrap["players"])
+
+    lineups = api.get("/lineups", params={"userId": team["id"]}).json()
+    assert [(l["id"], l["is_main"], l["players"]) for l in bootstrap["lineups"]] == \
+        [(l["id"], l["is_main"], l["players"]) for l in lineups]
+
+    assert [m["id"] for m in bootstrap["matches"]] == [match["id"]]
+    assert bootstrap["user"]["coins"] == team["coins"]
+
+    league = api.get("/leagues").json()
+    assert bootstrap["league"]["season"] == league["season"]
+    assert [row["id"] for row in bootstrap["league"]["leagueTable"]] == [row["id"] for row in league["leagueTable"][:8]]
+    assert all(m["status"] == "completed" and "match_data" not in m for m in bootstrap["recentMatches"])
+
+
+def test_squad_view(api, team):
+    bootstrap = api.get("/bootstrap", params={"userId": team["id"], "view": "squad"}).json()
+    assert set(bootstrap) == {"user", "players", "lineups"}
+    assert len(bootstrap["players"]) == 20
+
+
+def test_rejects_bad_requests(api):
+    assert api.get("/bootstrap").status == 400
+    assert api.get("/bootstrap", params={"userId": "x", "view": "market"}).status == 400
+    assert api.get("/bootstrap", params={"userId": "no-such-team"}).status == 404
+
+
+def test_conditional_requests(api, team):
+    params = {"userId": team["id"], "view": "squad"}
+    first = api.get("/bootstrap", params=params)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    repeat = api.get("/bootstrap", params=params, headers={"If-None-Match": etag})
+    assert repeat.status == 304
+    assert repeat.body == b""
+    assert repeat.headers["etag"] == etag
+
+    player = first.json()["players"][0]
+    listed = api.post("/marketplace/list", {"player_id": player["id"], "sale_price": 25000})
+    assert listed.status == 200, listed.body
+    changed = api.get("/bootstrap", params=params, headers={"If-None-Match": etag})
+    assert changed.status == 200
+    assert changed.headers["etag"] != etag
+    listed_player = next(squad_player for squad_player in changed.json()["players"] if squad_player["id"] == player["id"])
+    assert listed_player["is_for_sale"]
+
+
+def test_cold_load_is_faster_than_six_requests(flows, record_property):
+    legacy, bootstrap = flows["legacy"]["cold"], flows["bootstrap"]["cold"]
+    record_property("legacy_cold_ms", round(legacy["ms"], 1))
+    record_property("bootstrap_cold_ms", round(bootstrap["ms"], 1))
+    record_property("legacy_bytes", legacy["bytes"])
+    record_property("bootstrap_bytes", bootstrap["bytes"])
+    record_property("legacy_queries", legacy["queries"])
+    record_property("bootstrap_queries", bootstrap["queries"])
+    assert (legacy["requests"], bootstrap["requests"]) == (6, 1)
+    assert bootstrap["ms"] < legacy["ms"]
+    assert bootstrap["bytes"] * 2 < legacy["bytes"]
+
+
+def test_warm_load_revalidates_without_a_body(flows, record_property):
+    legacy, bootstrap = flows["legacy"], flows["bootstrap"]
+    record_property("legacy_warm_ms", round(legacy["warm_ms"], 1))
+    record_property("bootstrap_warm_ms", round(bootstrap["warm_ms"], 1))
+    record_property("bootstrap_warm_200_ms", round(bootstrap["warm_200_ms"], 1))
+    assert bootstrap["warm_statuses"] == [304]
+    assert bootstrap["warm_bytes"] == 0
+    assert bootstrap["warm_ms"] * 2 < legacy["warm_ms"]
+    assert bootstrap["warm_200_ms"] * 2 < legacy["warm_ms"]
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Latency, payload-size and query budgets per API endpoint, checked against
+tests/api_baseline.json.
+
+A fresh server of this module's own (the local Supabase stand-in with a
+simulated per-query latency) is seeded with a fixed league: teams, simulated
+and scheduled matches. Every endpoint is then called a few times warm and its
+median wall time, median response size and query count (X-Query-Count) are
+compared with the baseline, within the tolerances recorded in the file. A
+change that doubles the time of GET /api/leagues or the payload of GET
+/api/matches fails here. Routes not listed here are still held to the query
+budgets of conftest.py, checked from /api/health/metrics after the API suite.
+
+After an intended change, record the new numbers and commit the file:
+
+    python -m pytest tests/test_api_budgets.py --update-baseline
+"""
+
+import json
+import os
+import statistics
+
+import pytest
+
+from tests.conftest import ApiClient, REPO_ROOT, seed_league, start_api_server, stop_api_server
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "tests", "api_baseline.json")
+
+MEASURED_CALLS = 9
+QUERY_LATENCY_MS = "5"
+
+# Defaults when the baseline file does not set them
+TOLERANCES = {"latency": 1.75, "latencyFloorMs": 5, "bytes": 1.25}
+
+# Endpoint name -> (path, params) for the seeded league; {match} cycles
+# through the completed matches and {team} through the teams
+ENDPOINTS = {
+    "GET /leagues": ("/leagues", None),
+    "GET /matches": ("/matches", None),
+    "GET /matches?status=completed": ("/matches", {"status": "completed"}),
+    "GET /matches?userId": ("/matches", {"userId": "{team}"}),
+    "GET /matches/:id": ("/matches/{match}", None),
+    "GET /matches/:id/scorecard": ("/matches/{match}/scorecard", None),
+    "GET /matches/:id/balls": ("/matches/{match}/balls", {"innings": 1, "last": 12}),
+    "GET /players?userId": ("/players", {"userId": "{team}"}),
+    "GET /lineups?userId": ("/lineups", {"userId": "{team}"}),
+    "GET /marketplace/list": ("/marketplace/list", None),
+    "GET /bootstrap": ("/bootstrap", {"userId": "{team}"}),
+    "GET /bootstrap?view=squad": ("/bootstrap", {"userId": "{team}", "view": "squad"}),
+}
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {"tolerances": TOLERANCES, "endpoints": {}}
+    with open(BASELINE_PATH) as baseline:
+        return json.load(baseline)
+
+
+def save_baseline(measured, tolerances):
+    temporary = f"{BASELINE_PATH}.tmp"
+    with open(temporary, "w") as baseline:
+        json.dump({"tolerances": tolerances, "endpoints": measured}, baseline, indent=2)
+        baseline.write("\n")
+    os.replace(temporary, BASELINE_PATH)
+
+
+def fill(value, team, match):
+    return value.format(team=team["id"], match=match["id"]) if isinstance(value, str) else value
+
+
+def measure(client, endpoint, teams, matches):
+    path, params = ENDPOINTS[endpoint]
+    samples = [(teams[call % len(teams)], matches[call % len(matches)]) for call in range(MEASURED_CALLS)]
+
+    def call(team, match):
+        response = client.get(
+            fill(path, team, match),
+            params={key: fill(value, team, match) for key, value in (params or {}).items()},
+        )
+        assert response.status == 200, f"{endpoint}: {response.status} {response.body[:200]}"
+        return response
+
+    # Every sample once cold (replays, team caches), then measured warm
+    for team, match in samples:
+        call(team, match)
+    warm = [call(team, match) for team, match in samples]
+    return {
+        "ms": round(statistics.median(response.elapsed_ms for response in warm), 2),
+        "bytes": round(statistics.median(len(response.body) for response in warm)),
+        "queries": max(response.queries or 0 for response in warm),
+    }
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return load_baseline()
+
+
+@pytest.fixture(scope="module")
+def measured(request, tmp_path_factory, baseline):
+    if request.config.getoption("--base-url"):
+        pytest.skip("budgets are measured on a fresh in-process server, not --base-url")
+
+    process, base_url = start_api_server(
+        tmp_path_factory.mktemp("budgets") / "server.log",
+        env={"SUPABASE_LOCAL_LATENCY_MS": QUERY_LATENCY_MS},
+    )
+    client = ApiClient(base_url)
+    try:
+        teams, matches = seed_league(client)
+        results = {endpoint: measure(client, endpoint, teams, matches) for endpoint in ENDPOINTS}
+    finally:
+        client.close()
+        stop_api_server(process)
+
+    if request.config.getoption("--update-baseline"):
+        save_baseline(results, {**TOLERANCES, **baseline.get("tolerances", {})})
+    return results
+
+
+@pytest.fixture
+def budget(request, measured, baseline, record_property):
+    endpoint = request.node.callspec.params["endpoint"]
+    if request.config.getoption("--update-baseline"):
+        pytest.skip(f"baseline updated for {endpoint}")
+    recorded = baseline["endpoints"].get(endpoint)
+    if recorded is None:
+        pytest.fail(f"{endpoint} has no baseline; record one with --update-baseline")
+    for key, value in measured[endpoint].items():
+        record_property(key, value)
+    return measured[endpoint], recorded, {**TOLERANCES, **baseline.get("tolerances", {})}
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_latency_budget(endpoint, budget):
+    current, recorded, tolerances = budget
+    limit = max(recorded["ms"] * tolerances["latency"], tolerances["latencyFloorMs"])
+    assert current["ms"] <= limit, (
+        f"{endpoint} took {current['ms']}ms (median), over its {limit:.1f}ms budget "
+        f"(baseline {recorded['ms']}ms)"
+    )
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_payload_budget(endpoint, budget):
+    current, recorded, tolerances = budget
+    limit = recorded["bytes"] * tolerances["bytes"]
+    assert current["bytes"] <= limit, (
+        f"{endpoint} returned {current['bytes']} bytes, over its {limit:.0f} byte budget "
+        f"(baseline {recorded['bytes']})"
+    )
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_query_budget(endpoint, budget):
+    current, recorded, _ = budget
+    assert current["queries"] <= recorded["queries"], (
+        f"{endpoint} made {current['queries']} queries, baseline {recorded['queries']}"
+    )
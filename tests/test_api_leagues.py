@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+The league table over HTTP: a simulated match between a test's own teams
+shows up in the current season's standings with the full set of statistics,
+and the table stays ordered by points then net run rate.
+"""
+
+STANDINGS_FIELDS = {
+    "played", "won", "lost", "points", "netRunRate", "form", "averageScore",
+    "winPercentage", "highestScore", "lowestScore", "runsFor", "runsAgainst",
+}
+
+
+def play_league_match(api, simulate, home, away):
+    """Simulate a match between two teams in the current default season"""
+    season = api.get("/leagues").json()["season"]
+    created = api.post("/matches", {
+        "home_team_id": home["id"],
+        "away_team_id": away["id"],
+        "league": "default",
+        "season": season,
+    })
+    assert created.status == 201, created.body
+    return simulate(created.json()["id"])["result"]
+
+
+def test_completed_match_enters_the_league_table(api, team, opponent, simulate):
+    played = play_league_match(api, simulate, team, opponent)
+
+    table = api.get("/leagues").json()["leagueTable"]
+    rows = {row["id"]: row for row in table if row["id"] in (team["id"], opponent["id"])}
+    assert set(rows) == {team["id"], opponent["id"]}
+
+    home, away = rows[team["id"]], rows[opponent["id"]]
+    for row in (home, away):
+        assert STANDINGS_FIELDS <= set(row)
+        assert row["played"] == 1
+        assert len(row["form"]) == 1
+    assert (home["runsFor"], home["runsAgainst"]) == (played["home_score"], played["away_score"])
+    assert (away["runsFor"], away["runsAgainst"]) == (played["away_score"], played["home_score"])
+    assert home["won"] + away["won"] <= 1
+
+
+def test_league_table_is_sorted_by_points_then_net_run_rate(api, register_team, simulate):
+    teams = [register_team() for _ in range(3)]
+    for home, away in ((0, 1), (1, 2), (2, 0)):
+        play_league_match(api, simulate, teams[home], teams[away])
+
+    table = api.get("/leagues").json()["leagueTable"]
+    assert {team["id"] for team in teams} <= {row["id"] for row in table}
+    keys = [(row["points"], float(row["netRunRate"])) for row in table]
+    assert keys == sorted(keys, reverse=True)
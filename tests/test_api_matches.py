@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Matches over HTTP: creation with conditions, the live start/pause/resume
+cycle, background simulation with its replayed scorecards and ball-by-ball
+commentary, and list filtering. Each test plays its own teams and match.
+"""
+
+SCORECARD_FIELDS = {"batsmanScores", "bowlingFigures", "partnerships", "fallOfWickets", "runRate"}
+BATTING_FIELDS = {"name", "runs", "balls", "fours", "sixes", "strikeRate"}
+BOWLING_FIELDS = {"name", "overs", "maidens", "runs", "wickets", "economy"}
+PARTNERSHIP_FIELDS = {"batsman1", "batsman2", "runs", "balls"}
+WICKET_FIELDS = {"wicket", "batsman", "runs", "over", "ball", "bowler", "type"}
+
+
+def test_match_keeps_its_conditions(match):
+    assert match["status"] == "scheduled"
+    assert (match["weather"], match["pitch_type"]) == ("Overcast", "Green")
+    for field in ("current_innings", "current_over", "current_ball", "live_commentary"):
+        assert field in match
+
+
+def test_live_match_start_pause_resume(api, match, wait_for):
+    path = f"/matches/{match['id']}"
+    assert api.get(f"{path}/start").status == 200
+    assert api.get(path).json()["status"] in ("in-progress", "completed")
+    assert api.get(f"{path}/start").status == 400
+
+    assert api.get(f"{path}/pause").status == 200
+    assert api.get(path).json()["status"] == "paused"
+
+    assert api.get(f"{path}/resume").status == 200
+    finished = wait_for(lambda: api.get(path).json(), lambda row: row["status"] == "completed")
+    assert finished["status"] == "completed"
+    assert finished["result"]["winner"]
+
+
+def test_simulation_job_and_scorecards(api, match, simulate):
+    job = simulate(match["id"])
+    result = job["result"]
+    assert result["status"] == "completed"
+    assert result["home_score"] == result["match_data"]["homeScore"]
+    assert all(count > 0 for count in result["totalBalls"])
+
+    response = api.get(f"/matches/{match['id']}/scorecard")
+    assert response.status == 200
+    scorecard = response.json()
+    for innings in (scorecard["firstInnings"], scorecard["secondInnings"]):
+        assert SCORECARD_FIELDS <= set(innings)
+        assert BATTING_FIELDS <= set(innings["batsmanScores"][0])
+        assert BOWLING_FIELDS <= set(innings["bowlingFigures"][0])
+        assert PARTNERSHIP_FIELDS <= set(innings["partnerships"][0])
+    wickets = scorecard["firstInnings"]["fallOfWickets"] + scorecard["secondInnings"]["fallOfWickets"]
+    assert all(WICKET_FIELDS <= set(wicket) for wicket in wickets)
+
+    # The stored row is the summary; the scorecards were replayed
+    assert "firstInnings" not in api.get(f"/matches/{match['id']}").json()["match_data"]
+
+
+def test_ball_by_ball_commentary(api, match, simulate):
+    simulate(match["id"])
+    path = f"/matches/{match['id']}/balls"
+    first = api.get(path, params={"innings": 1, "from": 1, "to": 1000}).json()["balls"]
+    second = api.get(path, params={"innings": 2, "from": 1, "to": 1000}).json()["balls"]
+
+    # Sides can be bowled out early, so only the log's shape is fixed
+    assert [ball["index"] for ball in first] == list(range(1, len(first) + 1))
+    assert [ball["index"] for ball in second] == list(range(1, len(second) + 1))
+    assert all(isinstance(ball["commentary"], str) and ball["commentary"] for ball in first + second)
+    assert first[0]["isPowerplay"]
+    assert any(ball["isDeathOvers"] for ball in first) == (first[-1]["over"] >= 18)
+    assert all(ball["currentRunRate"] is not None for ball in first)
+    assert all(ball["requiredRunRate"] is None for ball in first)
+    # The engine sets no chase target after a first innings of 0
+    assert any(ball["requiredRunRate"] is not None for ball in second) == (first[-1]["totalRuns"] > 0)
+
+    row = api.get(f"/matches/{match['id']}").json()
+    assert (first[-1]["totalRuns"], second[-1]["totalRuns"]) == (row["home_score"], row["away_score"])
+
+
+def test_match_list_filters(api, team, opponent, register_team, simulate):
+    outsider = register_team()
+    played = api.post("/matches", {"home_team_id": team["id"], "away_team_id": opponent["id"]}).json()
+    api.post("/matches", {"home_team_id": opponent["id"], "away_team_id": team["id"]})
+    api.post("/matches", {"home_team_id": opponent["id"], "away_team_id": outsider["id"]})
+    simulate(played["id"])
+
+    mine = api.get("/matches", params={"userId": team["id"]}).json()
+    assert len(mine) == 2
+    assert all(team["id"] in (m["home_team_id"], m["away_team_id"]) for m in mine)
+
+    for status in ("scheduled", "completed"):
+        matches = api.get("/matches", params={"status": status}).json()
+        assert matches and all(m["status"] == status for m in matches)
+
+    completed = api.get("/matches", params={"userId": team["id"], "status": "completed"}).json()
+    assert [m["id"] for m in completed] == [played["id"]]
@@ -0,0 +1,74 @@
+// Route harness scenarios of test_ball_log.py (route_scenario in tests/conftest.py)
+
+import { awaitJob, call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Ball-by-ball simulation stored as a compact log and served in ranges
+  async 'ball-log'() {
+    const { matchIds: [matchId] } = seedLeague(db, { teams: 4, rounds: 2 });
+    const { GET, POST } = await catchAll();
+    const { checkStandings } = await import('@/lib/league/standings-store');
+    const matchPath = (...rest) => ({ params: { path: ['matches', matchId, ...rest] } });
+
+    const submitted = await call(POST, `/matches/${matchId}/simulate`, { method: 'POST', ...matchPath('simulate') });
+    const simulated = await awaitJob(submitted.body.id);
+    const again = await call(POST, `/matches/${matchId}/simulate`, { method: 'POST', ...matchPath('simulate') });
+
+    const summary = await call(GET, `/matches/${matchId}`, matchPath());
+    const full = await call(GET, `/matches/${matchId}?include=commentary`, matchPath());
+    const latest = await call(GET, `/matches/${matchId}/balls`, matchPath('balls'));
+    const latestAgain = await call(GET, `/matches/${matchId}/balls`, matchPath('balls'));
+    const deathOvers = await call(GET, `/matches/${matchId}/balls?innings=1&fromOver=19&toOver=20`, matchPath('balls'));
+    const opening = await call(GET, `/matches/${matchId}/balls?innings=1&from=1&to=12&commentary=false`, matchPath('balls'));
+    const firstInnings = await call(GET, `/matches/${matchId}/balls?innings=1&from=1&to=1000&commentary=false`, matchPath('balls'));
+    const missing = await call(GET, `/matches/${matchId}/balls?innings=3`, matchPath('balls'));
+    const lastOf = (page) => page.body.balls[page.body.balls.length - 1];
+
+    return {
+      simulate: {
+        submitStatus: submitted.status,
+        status: simulated.status,
+        againStatus: again.status,
+        againSameJob: again.body.id === submitted.body.id,
+        totalBalls: simulated.body.totalBalls,
+        hasBallLog: 'ball_log' in simulated.body,
+        battingTeamIds: [simulated.body.match_data.firstInnings.battingTeamId, simulated.body.match_data.secondInnings.battingTeamId]
+      },
+      summary: {
+        keys: Object.keys(summary.body),
+        bytes: JSON.stringify(summary.body).length,
+        fullBytes: JSON.stringify(full.body).length,
+        fullHasBallLog: Array.isArray(full.body.ball_log)
+      },
+      latest: {
+        innings: latest.body.innings,
+        target: latest.body.target,
+        count: latest.body.balls.length,
+        indexes: latest.body.balls.map(ball => ball.index),
+        totalBalls: latest.body.totalBalls,
+        commentaryTypes: [...new Set(latest.body.balls.map(ball => typeof ball.commentary))],
+        deterministic: JSON.stringify(latest.body) === JSON.stringify(latestAgain.body),
+        finalRuns: lastOf(latest).totalRuns,
+        awayScore: summary.body.away_score,
+        awayWickets: summary.body.away_wickets,
+        finalWickets: lastOf(latest).wickets
+      },
+      deathOvers: {
+        overs: [...new Set(deathOvers.body.balls.map(ball => ball.over))]
+      },
+      opening: {
+        indexes: opening.body.balls.map(ball => ball.index),
+        hasCommentary: opening.body.balls.some(ball => 'commentary' in ball)
+      },
+      firstInnings: {
+        finalRuns: lastOf(firstInnings).totalRuns,
+        homeScore: summary.body.home_score,
+        count: firstInnings.body.balls.length,
+        totalBalls: firstInnings.body.totalBalls
+      },
+      missingStatus: missing.status,
+      standingsConsistent: (await checkStandings('default', '1')).consistent
+    };
+  }
+};
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compact ball-by-ball log (lib/simulation/ball-log.js): lossless round trip of the
+per-ball fields, storage and payload size against the JSON commentary objects, and
+the GET /api/matches/:id/balls range endpoint.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS = os.path.join(REPO_ROOT, "scripts", "bench-simulation.mjs")
+
+
+@pytest.fixture(scope="module")
+def sizes():
+    if shutil.which("node") is None:
+        pytest.skip("node is required to run the simulation engine")
+    completed = subprocess.run(
+        ["node", "--no-warnings", HARNESS, "ball-log", "--n", "50", "--json"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("ball-log")
+
+
+def test_ball_log_round_trips_every_field(sizes):
+    assert sizes["roundTrip"], "decoded balls must match simulateInnings' per-ball objects"
+    assert sizes["deterministic"], "commentary rendered from the per-ball seed must be stable"
+
+
+def test_ball_log_is_much_smaller(sizes):
+    assert sizes["storageRatio"] > 10, f"only {sizes['storageRatio']:.1f}x smaller"
+    assert sizes["payloadRatio"] > 4, f"payload only {sizes['payloadRatio']:.1f}x smaller"
+
+
+def test_simulate_stores_ball_log(results):
+    simulate = results["simulate"]
+    assert simulate["submitStatus"] == 202
+    assert simulate["status"] == 200
+    # Resubmitting the finished match returns its job instead of simulating again
+    assert simulate["againStatus"] == 200
+    assert simulate["againSameJob"]
+    assert not simulate["hasBallLog"]
+    assert simulate["battingTeamIds"] == ["team-0", "team-3"]
+    assert all(count > 0 for count in simulate["totalBalls"])
+    assert results["standingsConsistent"]
+
+
+def test_match_row_omits_logs_by_default(results):
+    summary = results["summary"]
+    assert not {"commentary", "live_commentary", "ball_log"} & set(summary["keys"])
+    assert summary["fullHasBallLog"]
+    assert summary["bytes"] < summary["fullBytes"]
+
+
+def test_latest_balls_page(results):
+    latest = results["latest"]
+    assert latest["innings"] == 2
+    assert latest["count"] == 6
+    assert latest["indexes"] == list(range(latest["totalBalls"] - 5, latest["totalBalls"] + 1))
+    assert latest["commentaryTypes"] == ["string"]
+    assert latest["deterministic"]
+    assert latest["finalRuns"] == latest["awayScore"]
+    assert latest["finalWickets"] == latest["awayWickets"]
+
+
+def test_ranges_by_over_and_ball(results):
+    assert set(results["deathOvers"]["overs"]) <= {19, 20}
+    assert results["opening"]["indexes"] == list(range(1, 13))
+    assert not results["opening"]["hasCommentary"]
+    first = results["firstInnings"]
+    assert first["finalRuns"] == first["homeScore"]
+    assert first["count"] == first["totalBalls"]
+    assert results["missingStatus"] == 404
@@ -0,0 +1,130 @@
+// Route harness scenarios of test_fast_forward.py (route_scenario in tests/conftest.py)
+
+import { BASE_URL, call, db, invalidateTeams } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Whole-season fast-forward against finishing the season with repeated
+  // 5-match quick-sims: wall time, requests and queries, streamed progress,
+  // standings and the completed season
+  async 'fast-forward'(teamCount = '10', legacy = 'true') {
+    const teams = Number(teamCount);
+    const seed = () => seedLeague(db, { teams, rounds: 2 * (teams - 1) });
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const { checkStandings } = await import('@/lib/league/standings-store');
+    const results = { teams };
+
+    if (legacy === 'true') {
+      seed();
+      const startedAt = performance.now();
+      let requests = 0;
+      let queries = 0;
+      for (;;) {
+        const response = await call(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: 'team-0', limit: 5 } });
+        requests++;
+        queries += response.queries;
+        if (response.status !== 200) break;
+      }
+      results.legacy = { requests, queries, wallMs: performance.now() - startedAt };
+      db.reset();
+      invalidateTeams();
+    }
+
+    const { matchIds } = seed();
+    const fastForward = (body, headers) => call(quickSim, '/matches/quick-sim', { method: 'POST', body: { mode: 'fast-forward', ...body }, headers });
+
+    // The first three rounds with streamed progress, then the rest of the season
+    const request = new Request(`${BASE_URL}/matches/quick-sim`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'application/x-ndjson' },
+      body: JSON.stringify({ mode: 'fast-forward', throughRound: 3 })
+    });
+    const streamed = await quickSim(request);
+    const lines = (await streamed.text()).trim().split('\n').map(line => JSON.parse(line));
+    const partial = lines[lines.length - 1];
+
+    const startedAt = performance.now();
+    const rest = await fastForward({});
+    const wallMs = performance.now() - startedAt;
+    const again = await fastForward({});
+
+    const { data: matches } = await db.from('matches').select('status, round').in('id', matchIds);
+    const { data: seasonRow } = await db.from('league_seasons').select('status, completed_at').eq('league_id', 'default').maybeSingle();
+    const { data: snapshot } = await db.from('season_snapshots').select('id').eq('league_id', 'default').maybeSingle();
+    const played = rest.body.standings.reduce((sum, team) => sum + team.played, 0);
+
+    return {
+      ...results,
+      matches: matchIds.length,
+      streamed: {
+        contentType: streamed.headers.get('Content-Type'),
+        phases: [...new Set(lines.map(line => line.phase))],
+        simulated: partial.simulated,
+        rounds: partial.rounds,
+        seasonCompleted: partial.seasonCompleted,
+        remaining: partial.remaining
+      },
+      fastForward: {
+        status: rest.status,
+        simulated: rest.body.simulated,
+        rounds: rest.body.rounds,
+        chunks: rest.body.chunks,
+        queries: rest.queries,
+        wallMs,
+        timings: rest.body.timings,
+        seasonCompleted: rest.body.seasonCompleted
+      },
+      againStatus: again.status,
+      allCompleted: matches.every(match => match.status === 'completed'),
+      standingsPlayed: played,
+      standingsConsistent: (await checkStandings('default', '1')).consistent,
+      season: { status: seasonRow.status, hasCompletedAt: Boolean(seasonRow.completed_at) },
+      snapshotFrozen: Boolean(snapshot)
+    };
+  },
+
+  // A fast-forward whose second chunk write fails, then the retried run
+  async 'fast-forward-failure'() {
+    process.env.SIMULATION_WORKERS = '0';
+    seedLeague(db, { teams: 20, rounds: 38 });
+    const { fastForwardSeason } = await import('@/lib/league/fast-forward');
+    const { checkStandings } = await import('@/lib/league/standings-store');
+    const { data: season } = await db.from('league_seasons').select('*').eq('id', 'default-1').single();
+
+    const from = db.from.bind(db);
+    let writes = 0;
+    db.from = (table) => {
+      const builder = from(table);
+      if (table !== 'matches') return builder;
+      const upsert = builder.upsert.bind(builder);
+      builder.upsert = (...args) => {
+        const query = upsert(...args);
+        if (++writes === 2) query.then = (resolve) => resolve({ data: null, error: { code: '08006', message: 'connection failure' } });
+        return query;
+      };
+      return builder;
+    };
+    const failure = await fastForwardSeason(season).then(() => null, error => error.message);
+    db.from = from;
+
+    const played = async () => {
+      const { data: standings } = await db.from('league_standings').select('played').eq('league', 'default').eq('season', '1');
+      return standings.reduce((sum, row) => sum + row.played, 0);
+    };
+    const { count: completed } = await db.from('matches').select('id', { count: 'exact', head: true }).eq('status', 'completed');
+    const afterFailure = { completed, played: await played(), consistent: (await checkStandings('default', '1')).consistent };
+
+    const retried = await fastForwardSeason(season);
+
+    return {
+      failure,
+      afterFailure,
+      retried: {
+        simulated: retried.simulated,
+        seasonCompleted: retried.seasonCompleted,
+        played: await played(),
+        consistent: (await checkStandings('default', '1')).consistent
+      }
+    };
+  }
+};
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Whole-season fast-forward (POST /api/matches/quick-sim with mode
+"fast-forward", lib/league/fast-forward.js) against finishing the season with
+repeated 5-match quick-sims, for 10, 20 and 50 team double round-robins on
+the local stand-in.
+"""
+
+import pytest
+
+TEAM_COUNTS = [10, 20, 50]
+
+
+@pytest.fixture(scope="module", params=TEAM_COUNTS, ids=lambda teams: f"{teams}-teams")
+def results(request, route_scenario):
+    return route_scenario("fast-forward", str(request.param))
+
+
+@pytest.fixture(scope="module")
+def failure(route_scenario):
+    return route_scenario("fast-forward-failure")
+
+
+def test_season_is_finished_and_closed(results):
+    teams = results["teams"]
+    assert results["matches"] == teams * (teams - 1)
+    assert results["allCompleted"]
+    assert results["fastForward"]["seasonCompleted"]
+    assert results["season"] == {"status": "completed", "hasCompletedAt": True}
+    assert results["snapshotFrozen"]
+    # Nothing left to fast-forward once the season is closed
+    assert results["againStatus"] == 404
+
+
+def test_standings_count_every_match_once(results):
+    assert results["standingsPlayed"] == 2 * results["matches"]
+    assert results["standingsConsistent"]
+
+
+def test_chunks_written_before_a_failure_reach_the_standings(failure):
+    assert failure["failure"] == "connection failure"
+    # The first chunk of 250 matches was written before the second failed
+    assert failure["afterFailure"] == {"completed": 250, "played": 500, "consistent": True}
+    # 20 teams, 380 matches: the retry plays the rest once
+    assert failure["retried"] == {"simulated": 130, "seasonCompleted": True, "played": 760, "consistent": True}
+
+
+def test_streamed_progress_up_to_a_round(results):
+    streamed = results["streamed"]
+    assert streamed["contentType"].startswith("application/x-ndjson")
+    assert streamed["phases"] == ["simulate", "standings", "done", "result"]
+    assert streamed["rounds"] == [1, 3]
+    assert streamed["simulated"] == 3 * (results["teams"] // 2)
+    assert not streamed["seasonCompleted"]
+    assert streamed["remaining"] == results["matches"] - streamed["simulated"]
+    assert results["fastForward"]["rounds"] == [4, 2 * (results["teams"] - 1)]
+
+
+def test_queries_scale_with_chunks_not_matches(results, record_property):
+    fast = results["fastForward"]
+    legacy = results["legacy"]
+    record_property("teams", results["teams"])
+    record_property("fast_forward_wall_ms", round(fast["wallMs"]))
+    record_property("fast_forward_queries", fast["queries"])
+    record_property("quick_sim_requests", legacy["requests"])
+    record_property("quick_sim_queries", legacy["queries"])
+    record_property("quick_sim_wall_ms", round(legacy["wallMs"]))
+    assert fast["queries"] <= 15 + fast["chunks"], fast
+    assert fast["queries"] * 5 < legacy["queries"]
+    assert legacy["requests"] > results["matches"] / 5
@@ -0,0 +1,158 @@
+// Route harness scenarios of test_fixtures.py (route_scenario in tests/conftest.py)
+
+import { awaitJob, call, catchAll, db, heapUsed } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Fixture generation and chunked scheduling from 10 to 1000 teams: streamed
+  // against materialised generation, divisions of up to 20 teams scheduled
+  // through the route, an idempotent rerun and a retried transient failure
+  async fixtures(...teamCounts) {
+    const v8 = await import('node:v8');
+    const vm = await import('node:vm');
+    v8.setFlagsFromString('--expose-gc');
+    globalThis.gc ??= vm.runInNewContext('gc');
+    const { fixtureCount, seasonFixtures } = await import('@/lib/league/fixtures');
+    const { POST: schedule } = await import('@/app/api/matches/schedule/route');
+    const DIVISION_SIZE = 20;
+    const results = [];
+
+    for (const teams of (teamCounts.length ? teamCounts : ['10', '100', '1000']).map(Number)) {
+      const teamIds = Array.from({ length: teams }, (_, i) => `team-${i}`);
+      const result = { teams };
+
+      // One division of every team, generated and discarded row by row
+      let startedAt = performance.now();
+      let baseline = heapUsed();
+      let peak = 0;
+      let rows = 0;
+      let sampleMs = 0;
+      for (const row of seasonFixtures([{ id: 'all', teamIds }], '1', { startAt: 0 })) {
+        if (++rows % 50000 === 0) {
+          const sampledAt = performance.now();
+          peak = Math.max(peak, heapUsed() - baseline);
+          sampleMs += performance.now() - sampledAt;
+        }
+      }
+      const generateMs = performance.now() - startedAt - sampleMs;
+      result.generate = { rows, ms: generateMs, peakBytes: Math.max(peak, heapUsed() - baseline) };
+
+      if (teams <= 200) {
+        baseline = heapUsed();
+        startedAt = performance.now();
+        const materialized = [...seasonFixtures([{ id: 'all', teamIds }], '1', { startAt: 0 })];
+        const ms = performance.now() - startedAt;
+        result.materialized = { rows: materialized.length, ms, bytes: heapUsed() - baseline };
+      }
+
+      // Divisions of up to DIVISION_SIZE teams through the schedule route;
+      // each `teams` row lists a player of the user owning it
+      db.reset();
+      const leagues = [];
+      const teamRows = [];
+      const divisionOf = new Map();
+      for (let d = 0; d * DIVISION_SIZE < teams; d++) {
+        const id = `00000000-0000-4000-8000-${String(d).padStart(12, '0')}`;
+        leagues.push({ id, name: `Division ${d + 1}`, season: '1', status: 'active' });
+        for (const teamId of teamIds.slice(d * DIVISION_SIZE, (d + 1) * DIVISION_SIZE)) {
+          teamRows.push({ id: `${id}-${teamId}`, name: `Team ${teamId}`, league: id, players: [`${teamId}-player-0`], status: 'active' });
+          divisionOf.set(teamId, id);
+        }
+      }
+      const owned = teamIds.map(teamId => ({ id: `${teamId}-player-0`, user_id: teamId, name: `Player ${teamId}` }));
+      db.load({ leagues, teams: teamRows, players: owned });
+
+      baseline = heapUsed();
+      startedAt = performance.now();
+      const scheduled = await call(schedule, '/matches/schedule', { method: 'POST', body: { divisions: true, season: '1' } });
+      const insertMs = performance.now() - startedAt;
+      const rerun = await call(schedule, '/matches/schedule', { method: 'POST', body: { divisions: true, season: '1' } });
+
+      const { data: stored } = await db.from('matches').select('league, home_team_id, away_team_id, round');
+      const pairs = new Set(stored.map(match => `${match.home_team_id}|${match.away_team_id}`));
+      const perTeam = new Map();
+      for (const match of stored) {
+        for (const teamId of [match.home_team_id, match.away_team_id]) perTeam.set(teamId, (perTeam.get(teamId) || 0) + 1);
+      }
+      const { count: seasons } = await db.from('league_seasons').select('id', { count: 'exact', head: true }).eq('season', '1');
+      const { count: standings } = await db.from('league_standings').select('id', { count: 'exact', head: true }).eq('season', '1');
+
+      result.schedule = {
+        status: scheduled.status,
+        divisions: scheduled.body.divisions.length,
+        inserted: scheduled.body.totalMatches,
+        expected: scheduled.body.divisions.reduce((sum, division) => sum + fixtureCount(division.teamsCount), 0),
+        chunks: scheduled.body.chunks,
+        queries: scheduled.queries,
+        ms: insertMs,
+        heapBytes: process.memoryUsage().heapUsed - baseline,
+        stored: stored.length,
+        uniquePairings: pairs.size,
+        crossDivision: stored.filter(match => divisionOf.get(match.home_team_id) !== match.league || divisionOf.get(match.away_team_id) !== match.league).length,
+        matchesPerTeam: [...new Set(perTeam.values())],
+        seasons,
+        standings
+      };
+      result.rerun = { status: rerun.status, inserted: rerun.body.totalMatches, existing: rerun.body.existingMatches };
+      results.push(result);
+    }
+
+    // A transient failure of the first chunk is retried
+    db.reset();
+    seedLeague(db, { teams: 6, rounds: 0 });
+    const from = db.from.bind(db);
+    let failures = 1;
+    db.from = (table) => {
+      const builder = from(table);
+      if (table !== 'matches') return builder;
+      const upsert = builder.upsert.bind(builder);
+      builder.upsert = (...args) => {
+        if (failures-- > 0) {
+          const query = upsert(...args);
+          query.then = (resolve) => resolve({ data: null, error: { code: '08006', message: 'connection failure' } });
+          return query;
+        }
+        return upsert(...args);
+      };
+      return builder;
+    };
+    const retried = await call(schedule, '/matches/schedule', { method: 'POST', body: { leagueId: 'default' } });
+    db.from = from;
+
+    // A division fixture read back and simulated: the owners' names and XIs
+    db.reset();
+    process.env.SIMULATION_WORKERS = '0';
+    seedLeague(db, { teams: 4, rounds: 0 });
+    const divisionId = '00000000-0000-4000-8000-000000000099';
+    db.load({
+      leagues: [{ id: divisionId, name: 'Division 99', season: '1', status: 'active' }],
+      teams: [
+        ...[0, 1, 2].map(t => ({ id: `${divisionId}-${t}`, name: `Club ${t}`, league: divisionId, players: [`team-${t}-player-3`, `team-${t}-player-0`], status: 'active' })),
+        { id: `${divisionId}-empty`, name: 'Club without players', league: divisionId, players: [], status: 'active' }
+      ]
+    });
+    const division = await call(schedule, '/matches/schedule', { method: 'POST', body: { divisions: true, season: '1' } });
+    const { GET, POST } = await catchAll();
+    const listed = await call(GET, '/matches?userId=team-0', { params: { path: ['matches'] } });
+    const fixture = listed.body.find(match => match.league === divisionId);
+    const submitted = await call(POST, `/matches/${fixture.id}/simulate`, { method: 'POST', params: { path: ['matches', fixture.id, 'simulate'] } });
+    const played = await awaitJob(submitted.body.id);
+
+    return {
+      sizes: results,
+      retry: { status: retried.status, inserted: retried.body.totalMatches, retries: retried.body.retries },
+      division: {
+        status: division.status,
+        inserted: division.body.totalMatches,
+        teams: division.body.divisions[0].teamsCount,
+        unownedTeams: division.body.divisions[0].unownedTeams,
+        fixtures: listed.body.filter(match => match.league === divisionId).length,
+        teamIds: [fixture.home_team_id, fixture.away_team_id].sort(),
+        names: [fixture.home_team_name, fixture.away_team_name].sort(),
+        jobStatus: played.job.status,
+        playedNames: [played.body.home_team_name, played.body.away_team_name].sort(),
+        replacements: played.body.match_data.replay.xi.flat().filter(id => id === null).length
+      }
+    };
+  }
+};
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Fixture generation and scheduling (lib/league/fixtures.js, POST
+/api/matches/schedule): double round-robins streamed into chunked bulk
+inserts for 10 to 1000 teams, with divisions from the leagues and teams
+tables, idempotent reruns and retried chunks.
+"""
+
+import math
+
+import pytest
+
+TEAM_COUNTS = [10, 100, 1000]
+DIVISION_SIZE = 20
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("fixtures", *map(str, TEAM_COUNTS))
+
+
+@pytest.fixture(scope="module")
+def sizes(results):
+    return {size["teams"]: size for size in results["sizes"]}
+
+
+@pytest.mark.parametrize("teams", TEAM_COUNTS)
+def test_generation_streams_in_constant_memory(sizes, teams, record_property):
+    generate = sizes[teams]["generate"]
+    record_property("generate_ms", round(generate["ms"]))
+    record_property("generate_peak_bytes", generate["peakBytes"])
+    assert generate["rows"] == teams * (teams - 1)
+    assert generate["peakBytes"] < 1024 * 1024, generate
+    materialized = sizes[teams].get("materialized")
+    if materialized and materialized["rows"] > 1000:
+        assert materialized["bytes"] > 10 * generate["peakBytes"]
+
+
+@pytest.mark.parametrize("teams", TEAM_COUNTS)
+def test_divisions_are_scheduled_in_chunks(sizes, teams, record_property):
+    schedule = sizes[teams]["schedule"]
+    divisions = math.ceil(teams / DIVISION_SIZE)
+    record_property("insert_ms", round(schedule["ms"]))
+    record_property("insert_queries", schedule["queries"])
+    assert schedule["status"] == 200
+    assert schedule["divisions"] == divisions
+    assert schedule["inserted"] == schedule["expected"] == schedule["stored"] == schedule["uniquePairings"]
+    assert schedule["crossDivision"] == 0
+    assert schedule["matchesPerTeam"] == [2 * (min(teams, DIVISION_SIZE) - 1)]
+    assert schedule["seasons"] == divisions
+    assert schedule["standings"] == teams
+    assert schedule["chunks"] == math.ceil(schedule["inserted"] / 1000)
+    assert schedule["queries"] <= schedule["chunks"] + divisions + 5
+
+
+@pytest.mark.parametrize("teams", TEAM_COUNTS)
+def test_rerun_adds_nothing(sizes, teams):
+    rerun = sizes[teams]["rerun"]
+    assert rerun == {"status": 200, "inserted": 0, "existing": sizes[teams]["schedule"]["inserted"]}
+
+
+def test_transient_failure_is_retried(results):
+    assert results["retry"] == {"status": 200, "inserted": 30, "retries": 1}
+
+
+def test_division_fixtures_are_played_by_the_team_owners(results):
+    division = results["division"]
+    assert division["status"] == 200
+    # Three owned clubs; the club without players is left out
+    assert division["teams"] == 3 and division["unownedTeams"] == 1
+    assert division["inserted"] == 6
+    assert division["fixtures"] == 4
+    assert "team-0" in division["teamIds"]
+    expected = sorted(f"Team {team_id.split('-')[1]}" for team_id in division["teamIds"])
+    assert division["names"] == division["playedNames"] == expected
+    assert division["jobStatus"] == "done"
+    assert division["replacements"] == 0
@@ -0,0 +1,140 @@
+// Route harness scenarios of test_live_stream.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db, heapUsed, openStream, percentile, sleep } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Hundreds of SSE subscribers on one live match: fan-out latency, memory per
+  // subscriber, Last-Event-ID resume, pause/resume and replay after completion
+  async 'live-stream'(subscriberCount = '300') {
+    process.env.LIVE_BALL_INTERVAL_MS = '5';
+    const v8 = await import('node:v8');
+    const vm = await import('node:vm');
+    v8.setFlagsFromString('--expose-gc');
+    globalThis.gc ??= vm.runInNewContext('gc');
+
+    const { matchIds: [matchId] } = seedLeague(db, { teams: 4, rounds: 2 });
+    const { GET } = await catchAll();
+    const { liveFeedStats } = await import('@/lib/live/match-feed');
+    const { checkStandings } = await import('@/lib/league/standings-store');
+    const matchPath = (...rest) => ({ params: { path: ['matches', matchId, ...rest] } });
+    const streamOf = (headers = {}) => openStream(GET, `/matches/${matchId}/stream`, { ...matchPath('stream'), headers });
+
+    const missing = await call(GET, '/matches/no-such-match/stream', { params: { path: ['matches', 'no-such-match', 'stream'] } });
+
+    const baseline = heapUsed();
+    const subscribers = [];
+    for (let i = 0; i < Number(subscriberCount); i++) subscribers.push(await streamOf());
+    const perSubscriberBytes = Math.round((heapUsed() - baseline) / subscribers.length);
+
+    // One client drops after event 20 and reconnects with Last-Event-ID
+    // (an innings lasts at least ten balls, so every match has 43 events)
+    const resumer = { first: await streamOf(), second: null };
+    const resumed = new Promise(resolve => {
+      resumer.first.onEvent = (event) => {
+        if (event.id === 20) {
+          resumer.first.reader.cancel();
+          streamOf({ 'Last-Event-ID': '20' }).then(stream => { resumer.second = stream; resolve(); });
+        }
+      };
+    });
+
+    // Pause once the first innings is under way, check nothing is released
+    // and that the balls endpoint only serves bowled balls, then resume
+    const probe = subscribers[0];
+    const paused = new Promise(resolve => {
+      probe.onEvent = (event) => {
+        if (event.id !== 31) return;
+        probe.onEvent = null;
+        (async () => {
+          const pausedResponse = await call(GET, `/matches/${matchId}/pause`, matchPath('pause'));
+          const releasedBefore = liveFeedStats(matchId).released;
+          await sleep(50);
+          const releasedAfter = liveFeedStats(matchId).released;
+          const balls = await call(GET, `/matches/${matchId}/balls?commentary=false`, matchPath('balls'));
+          const future = await call(GET, `/matches/${matchId}/balls?innings=2`, matchPath('balls'));
+          const resumedResponse = await call(GET, `/matches/${matchId}/resume`, matchPath('resume'));
+          resolve({
+            statuses: [pausedResponse.status, resumedResponse.status],
+            releasedBefore,
+            releasedAfter,
+            ballsServed: balls.body.totalBalls,
+            ballsEventsSeen: Math.floor((releasedBefore - 1) / 2),
+            futureInningsStatus: future.status
+          });
+        })();
+      };
+    });
+
+    const started = await call(GET, `/matches/${matchId}/start`, matchPath('start'));
+    const startedAgain = await call(GET, `/matches/${matchId}/start`, matchPath('start'));
+    const pause = await paused;
+    await resumed;
+    await Promise.all(subscribers.map(stream => stream.done));
+    await resumer.second.done;
+
+    const stats = liveFeedStats(matchId);
+    const storedMatch = async () => (await db.from('matches').select('*').eq('id', matchId).single()).data;
+    let stored = await storedMatch();
+    for (let i = 0; i < 200 && stored.status !== 'completed'; i++) {
+      await sleep(10);
+      stored = await storedMatch();
+    }
+
+    const idsOf = (stream) => stream.events.filter(event => event.id !== null).map(event => event.id);
+    const contentOf = (stream) => stream.events.filter(event => event.id !== null).map(event => `${event.id}|${event.event}|${event.data}`).join('\n');
+    const expectedIds = Array.from({ length: stats.total }, (_, i) => i + 1);
+    const latencies = [];
+    for (const stream of subscribers) {
+      for (const event of stream.events) {
+        if (event.id !== null) latencies.push(event.arrivedAt - stats.releasedAt[event.id - 1]);
+      }
+    }
+
+    const reference = contentOf(subscribers[1]);
+    const replay = await streamOf({ 'Last-Event-ID': '0' });
+    await replay.done;
+    globalThis[Symbol.for('cricket-pro.live.feeds')].clear();
+    const restored = await streamOf({ 'Last-Event-ID': '0' });
+    await restored.done;
+    const late = await streamOf();
+    await late.done;
+
+    const finalState = JSON.parse(subscribers[1].events.filter(event => event.event === 'state').pop().data);
+    const snapshot = JSON.parse(subscribers[1].events[0].data);
+
+    return {
+      missingStatus: missing.status,
+      contentType: subscribers[0].contentType,
+      startStatuses: [started.status, startedAgain.status],
+      subscribers: subscribers.length,
+      firstSnapshot: { event: subscribers[1].events[0].event, status: snapshot.status },
+      totalEvents: stats.total,
+      allComplete: subscribers.every(stream => JSON.stringify(idsOf(stream)) === JSON.stringify(expectedIds)),
+      allIdentical: subscribers.every(stream => contentOf(stream) === reference),
+      eventTypes: [...new Set(subscribers[1].events.map(event => event.event))].sort(),
+      pauseEvents: subscribers[1].events.filter(event => event.event === 'state' && event.id === null).map(event => JSON.parse(event.data).status),
+      pause,
+      resume: {
+        firstLastId: idsOf(resumer.first).pop(),
+        secondFirstId: idsOf(resumer.second)[0],
+        contiguous: JSON.stringify([...idsOf(resumer.first), ...idsOf(resumer.second)]) === JSON.stringify(expectedIds)
+      },
+      latencyMs: { p50: percentile(latencies, 0.5), p95: percentile(latencies, 0.95), max: percentile(latencies, 1) },
+      perSubscriberBytes,
+      remainingSubscribers: stats.subscribers,
+      final: {
+        status: stored.status,
+        homeScore: stored.home_score,
+        awayScore: stored.away_score,
+        stateHomeScore: finalState.homeScore,
+        stateAwayScore: finalState.awayScore,
+        hasScorecards: Boolean(stored.match_data?.firstInnings?.batsmanScores)
+      },
+      replayIdentical: contentOf(replay) === reference,
+      restoredIdentical: contentOf(restored) === reference,
+      lateEvents: late.events.map(event => event.event),
+      standingsConsistent: (await checkStandings('default', '1')).consistent
+    };
+  }
+};
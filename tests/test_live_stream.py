@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Live match stream (GET /api/matches/:id/stream, lib/live/match-feed.js): one
+producer per match fanned out to hundreds of concurrent subscribers on the local
+stand-in, with Last-Event-ID resume, pause/resume and replay of the finished match.
+"""
+
+import pytest
+
+SUBSCRIBERS = 300
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("live-stream", str(SUBSCRIBERS))
+
+
+def test_stream_endpoint(results):
+    assert results["missingStatus"] == 404
+    assert results["contentType"].startswith("text/event-stream")
+    assert results["startStatuses"] == [200, 400]
+    assert results["firstSnapshot"] == {"event": "snapshot", "status": "scheduled"}
+    assert results["eventTypes"] == ["ball", "score", "snapshot", "state"]
+
+
+def test_every_subscriber_receives_the_whole_match(results):
+    assert results["subscribers"] == SUBSCRIBERS
+    assert results["allComplete"], "each subscriber must see event ids 1..N with no gaps"
+    assert results["allIdentical"]
+    assert results["remainingSubscribers"] == 0
+
+
+def test_fan_out_latency_and_memory(results, record_property):
+    latency = results["latencyMs"]
+    record_property("latency_p50_ms", latency["p50"])
+    record_property("latency_p95_ms", latency["p95"])
+    record_property("bytes_per_subscriber", results["perSubscriberBytes"])
+    assert latency["p95"] < 250, f"p95 delivery latency {latency['p95']} ms across {SUBSCRIBERS} subscribers"
+    assert results["perSubscriberBytes"] < 64 * 1024, f"{results['perSubscriberBytes']} bytes per subscriber"
+
+
+def test_last_event_id_resume(results):
+    resume = results["resume"]
+    assert resume["firstLastId"] == 20
+    assert resume["secondFirstId"] == 21
+    assert resume["contiguous"]
+
+
+def test_pause_and_resume(results):
+    pause = results["pause"]
+    assert pause["statuses"] == [200, 200]
+    assert pause["releasedAfter"] == pause["releasedBefore"], "nothing is released while paused"
+    assert pause["ballsServed"] <= pause["ballsEventsSeen"], "the balls endpoint must not run ahead of the stream"
+    assert pause["futureInningsStatus"] == 404
+    assert results["pauseEvents"] == ["paused", "in-progress"]
+
+
+def test_match_completes_and_replays(results):
+    final = results["final"]
+    assert final["status"] == "completed"
+    assert (final["homeScore"], final["awayScore"]) == (final["stateHomeScore"], final["stateAwayScore"])
+    assert final["hasScorecards"]
+    assert results["standingsConsistent"]
+    assert results["replayIdentical"], "Last-Event-ID: 0 replays the live events"
+    assert results["restoredIdentical"], "a feed rebuilt from the stored logs numbers events identically"
+    assert results["lateEvents"] == ["snapshot"]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Behaviour of the in-process Supabase/PostgREST stand-in (lib/supabase/local.js).
+
+The query-builder subset the routes use is exercised through
+scripts/local-supabase.mjs; results and error codes must match what the routes
+expect from a live PostgREST (PGRST116 on single(), 23505 on duplicates, ...).
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS = os.path.join(REPO_ROOT, "scripts", "local-supabase.mjs")
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run the stand-in")
+
+
+def run_harness(*args):
+    """Run the node harness and return its parsed JSON output"""
+    completed = subprocess.run(
+        ["node", "--no-warnings", HARNESS, *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+@pytest.fixture(scope="module")
+def results():
+    return run_harness("check")
+
+
+def test_insert_applies_schema_defaults(results):
+    assert results["insert"] == {"count": 3, "coinsDefault": 50000, "status": 201}
+    assert results["insertMinimal"] == {"data": None, "error": None}
+
+
+@pytest.mark.parametrize("case, code", [
+    ("duplicate", "23505"),
+    ("notNull", "23502"),
+    ("unknownColumn", "PGRST204"),
+    ("check", "23514"),
+    ("singleMissing", "PGRST116"),
+    ("badColumn", "42703"),
+    ("badTable", "42P01"),
+])
+def test_errors_use_postgrest_codes(results, case, code):
+    assert results[case]["code"] == code
+
+
+def test_filters_order_and_limit(results):
+    assert results["single"] == {"team_name": "Team u2"}
+    assert results["maybeSingle"] == {"data": None, "error": None}
+    assert results["or"] == ["u2", "u3"]
+    assert results["inOrderLimit"] == [{"id": "p2", "rating": 90}, {"id": "p1", "rating": 70}]
+    assert results["eqNeq"] == ["p1"]
+    assert results["countHead"] == {"count": 2, "data": None}
+
+
+def test_writes_keep_indexes_consistent(results):
+    assert results["update"] == {"rating": 95, "teamU2": ["p2", "p3"]}
+    assert results["upsert"] == [["p3", "Renamed", True], ["p5", "New Player", False]]
+    assert results["delete"] == {"removed": 2, "remaining": 0}
+
+
+def test_queries_are_counted(results):
+    tracked = results["tracked"]
+    assert {key: tracked[key] for key in ("result", "queries", "rows", "simulationMs")} == {
+        "result": "done", "queries": 2, "rows": 5, "simulationMs": 0
+    }
+    assert [(query["table"], query["operation"]) for query in tracked["log"]] == [("users", "select"), ("players", "select")]
+    assert sum(query["rows"] for query in tracked["log"]) == 5
+    assert tracked["dbMs"] >= sum(query["ms"] for query in tracked["log"]) - 1e-6
+    assert results["stats"]["queries"] == 23
+    assert results["stats"]["byTable"]["players"]["select"] == 7
+
+
+def test_injected_latency(results):
+    assert results["latencyMs"] >= 24
+
+
+def test_indexed_lookups_beat_scans():
+    bench = run_harness("bench", "--players", "20000", "--json")
+    assert bench["roundTrips"] == 21
+    assert bench["indexedLookupMs"] < bench["fullScanMs"]
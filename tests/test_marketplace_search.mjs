@@ -0,0 +1,146 @@
+// Route harness scenarios of test_marketplace_search.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db, percentile } from './harness/routes.mjs';
+
+export default {
+  // Marketplace search over `listed` players for sale (and a quarter as many
+  // unlisted): page latency and payload against the unbounded listing it
+  // replaced, the same at the first and a deep page, and a filtered walk
+  // through every page checked against the rows it should return
+  async marketplace(listed = '100000') {
+    const { GET } = await catchAll();
+    const count = Number(listed);
+    const BOWLER_TYPES = ['Right-arm fast', 'Left-arm fast', 'Right-arm medium', 'Left-arm medium', 'Right-arm spin', 'Left-arm spin'];
+    const COUNTRIES = ['England', 'India', 'Australia', 'Pakistan', 'South Africa'];
+    const PAGES = 40;
+
+    db.reset();
+    // Deterministic, uncorrelated column values
+    const mix = (i, salt) => (Math.imul(i + 1, 2654435761) ^ Math.imul(salt, 40503)) >>> 0;
+    const players = Array.from({ length: count + Math.floor(count / 4) }, (_, i) => ({
+      id: `player-${String(i).padStart(7, '0')}`,
+      user_id: `team-${i % 500}`,
+      name: `Player ${i}`,
+      age: 18 + mix(i, 1) % 20,
+      batting: 1 + mix(i, 2) % 100,
+      bowling: 1 + mix(i, 3) % 100,
+      keeping: 1 + mix(i, 4) % 100,
+      captaincy: 1 + mix(i, 5) % 100,
+      rating: 20 + mix(i, 6) % 80,
+      nationality: COUNTRIES[mix(i, 7) % COUNTRIES.length],
+      bowler_type: BOWLER_TYPES[mix(i, 8) % BOWLER_TYPES.length],
+      market_value: 1000 + mix(i, 9) % 500000,
+      is_for_sale: i < count,
+      sale_price: i < count ? 1000 + mix(i, 10) % 1000000 : 0
+    }));
+    db.load({ players });
+    const forSale = players.slice(0, count);
+
+    const search = async (query) => {
+      const startedAt = performance.now();
+      const response = await call(GET, `/marketplace?${query}`, { params: { path: ['marketplace'] } });
+      return { ...response, ms: performance.now() - startedAt, bytes: JSON.stringify(response.body).length };
+    };
+
+    // The replaced listing: every player for sale, every column
+    let startedAt = performance.now();
+    const { data: everything } = await db.from('players').select('*').eq('is_for_sale', true).order('rating', { ascending: false });
+    const legacy = { ms: performance.now() - startedAt, rows: everything.length, bytes: JSON.stringify(everything).length };
+
+    // PAGES pages sorted by rating
+    const pages = [];
+    const seen = [];
+    let cursor = null;
+    for (let i = 0; i < PAGES; i++) {
+      const page = await search(`sort=rating${cursor ? `&cursor=${cursor}` : ''}`);
+      pages.push(page);
+      seen.push(...page.body.players);
+      cursor = page.body.nextCursor;
+    }
+    const expectedOrder = [...forSale].sort((a, b) => b.rating - a.rating || (a.id < b.id ? 1 : -1)).slice(0, seen.length);
+
+    // Every page of a filtered search sorted by price
+    const filter = { bowler_type: 'Left-arm spin', nationality: 'India', batting_min: 60, age_max: 30, sale_price_max: 500000 };
+    const expected = forSale
+      .filter(p => p.bowler_type === filter.bowler_type && p.nationality === filter.nationality && p.batting >= filter.batting_min
+        && p.age <= filter.age_max && p.sale_price <= filter.sale_price_max)
+      .sort((a, b) => a.sale_price - b.sale_price || (a.id < b.id ? -1 : 1));
+    const walked = [];
+    let walkPages = 0;
+    cursor = null;
+    do {
+      const query = new URLSearchParams({ ...filter, sort: 'price', limit: '100', fields: 'name,bowler_type,nationality' });
+      if (cursor) query.set('cursor', cursor);
+      const page = await search(query.toString());
+      walkPages++;
+      walked.push(...page.body.players);
+      cursor = page.body.nextCursor;
+    } while (cursor);
+
+    // Listed players without a price or rating, walked in small pages both
+    // ways: nulls sort above every value, as in Postgres
+    const nullable = Array.from({ length: 30 }, (_, i) => ({
+      id: `nullable-${String(i).padStart(2, '0')}`,
+      user_id: 'team-0',
+      name: `Nullable ${i}`,
+      nationality: 'Ireland',
+      rating: i % 4 === 0 ? null : 50 + i % 3,
+      sale_price: i % 3 === 0 ? null : 1000 * (1 + i % 5),
+      is_for_sale: true
+    }));
+    db.load({ players: nullable });
+    const nullsHighest = (column, ascending) => (a, b) => {
+      const [left, right] = [a[column], b[column]];
+      const order = left === right ? 0 : left === null ? 1 : right === null ? -1 : left - right;
+      return (ascending ? order : -order) || (a.id < b.id ? -1 : 1) * (ascending ? 1 : -1);
+    };
+    const nullWalks = {};
+    for (const [sort, column, order] of [['price', 'sale_price', 'asc'], ['price', 'sale_price', 'desc'], ['rating', 'rating', 'desc']]) {
+      const ids = [];
+      const statuses = new Set();
+      cursor = null;
+      do {
+        const query = new URLSearchParams({ nationality: 'Ireland', sort, order, limit: '4' });
+        if (cursor) query.set('cursor', cursor);
+        const page = await search(query.toString());
+        statuses.add(page.status);
+        if (page.status !== 200) break;
+        ids.push(...page.body.players.map(p => p.id));
+        cursor = page.body.nextCursor;
+      } while (cursor);
+      const expectedIds = [...nullable].sort(nullsHighest(column, order === 'asc')).map(p => p.id);
+      nullWalks[`${sort}-${order}`] = { statuses: [...statuses], matches: JSON.stringify(ids) === JSON.stringify(expectedIds) };
+    }
+
+    const bad = await Promise.all(['sort=age', 'order=up', 'limit=ten', 'cursor=nonsense', 'fields=password', 'batting_min=high']
+      .map(async query => (await search(query)).status));
+
+    const latencies = pages.map(page => page.ms);
+    return {
+      listed: count,
+      legacy,
+      page: {
+        statuses: [...new Set(pages.map(page => page.status))],
+        queries: [...new Set(pages.map(page => page.queries))],
+        rows: pages[0].body.players.length,
+        bytes: pages[0].bytes,
+        columns: Object.keys(pages[0].body.players[0]).sort(),
+        shallowP50Ms: percentile(latencies.slice(0, 10), 0.5),
+        deepP50Ms: percentile(latencies.slice(-10), 0.5),
+        p50Ms: percentile(latencies, 0.5),
+        p95Ms: percentile(latencies, 0.95)
+      },
+      ordered: JSON.stringify(seen.map(p => p.id)) === JSON.stringify(expectedOrder.map(p => p.id)),
+      uniqueAcrossPages: new Set(seen.map(p => p.id)).size === seen.length,
+      walk: {
+        pages: walkPages,
+        rows: walked.length,
+        expected: expected.length,
+        matches: JSON.stringify(walked.map(p => p.id)) === JSON.stringify(expected.map(p => p.id)),
+        columns: Object.keys(walked[0] || {}).sort()
+      },
+      nullWalks,
+      badRequests: bad
+    };
+  }
+};
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Marketplace search (lib/marketplace/search.js, GET /api/marketplace):
+filtered, sorted pages of players for sale with keyset cursors and column
+projection, benchmarked at 100k listed players against the unbounded
+listing it replaced.
+"""
+
+import pytest
+
+LISTED = 100000
+PAGE_SIZE = 24
+CARD_COLUMNS = sorted([
+    "id", "user_id", "name", "age", "nationality", "batting_style", "bowler_type",
+    "batting", "bowling", "keeping", "captaincy", "rating", "market_value", "sale_price"
+])
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("marketplace", str(LISTED))
+
+
+def test_page_is_one_query_of_card_columns(results):
+    page = results["page"]
+    assert page["statuses"] == [200]
+    assert page["queries"] == [1]
+    assert page["rows"] == PAGE_SIZE
+    assert page["columns"] == CARD_COLUMNS
+
+
+def test_page_is_a_fraction_of_the_full_listing(results, record_property):
+    page, legacy = results["page"], results["legacy"]
+    record_property("page_p50_ms", round(page["p50Ms"], 1))
+    record_property("page_p95_ms", round(page["p95Ms"], 1))
+    record_property("page_bytes", page["bytes"])
+    record_property("legacy_ms", round(legacy["ms"]))
+    record_property("legacy_bytes", legacy["bytes"])
+    assert legacy["rows"] == LISTED
+    assert page["bytes"] * 1000 < legacy["bytes"]
+    assert page["p95Ms"] * 5 < legacy["ms"]
+
+
+def test_deep_pages_cost_the_same_as_the_first(results):
+    page = results["page"]
+    assert page["deepP50Ms"] < 2 * page["shallowP50Ms"]
+
+
+def test_pages_follow_the_sort_without_gaps_or_repeats(results):
+    assert results["ordered"]
+    assert results["uniqueAcrossPages"]
+
+
+def test_filtered_walk_returns_exactly_the_matching_rows(results):
+    walk = results["walk"]
+    assert walk["expected"] > 100
+    assert walk["matches"]
+    assert walk["rows"] == walk["expected"]
+    assert walk["columns"] == ["bowler_type", "id", "name", "nationality", "sale_price"]
+
+
+@pytest.mark.parametrize("walk", ["price-asc", "price-desc", "rating-desc"])
+def test_null_sort_values_page_like_any_other(results, walk):
+    # Listed players with a null sale_price or rating, in pages of 4
+    assert results["nullWalks"][walk] == {"statuses": [200], "matches": True}
+
+
+def test_invalid_parameters_are_rejected(results):
+    assert results["badRequests"] == [400] * 6
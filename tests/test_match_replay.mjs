@@ -0,0 +1,144 @@
+// Route harness scenarios of test_match_replay.py (route_scenario in tests/conftest.py)
+
+import { awaitJob, call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Seeded simulation stored as a replay record and regenerated on demand
+  async replay() {
+    process.env.SIMULATION_WORKERS = '0';
+    const { matchIds: [matchId, otherId] } = seedLeague(db, { teams: 4, rounds: 3 });
+    const { GET, POST } = await catchAll();
+    const { simulateMatchBallByBall } = await import('@/lib/simulation/match');
+    const { loadPlayingXIs } = await import('@/lib/simulation/squads');
+    const { getTeams } = await import('@/lib/league/team-directory');
+    const { simulateInnings } = await import('@/lib/simulation/innings');
+    const { sliceBalls } = await import('@/lib/simulation/ball-log');
+    const { clearReplays, replayStats } = await import('@/lib/simulation/replay');
+    const { fastForwardSeason } = await import('@/lib/league/fast-forward');
+    const matchPath = (id, ...rest) => ({ params: { path: ['matches', id, ...rest] } });
+    const timed = async (fn) => {
+      const startedAt = performance.now();
+      const response = await fn();
+      return { ...response, ms: performance.now() - startedAt };
+    };
+
+    // The engine: same inputs and seed, same match; another seed, another match
+    const { data: [match, other] } = await db.from('matches').select('*').in('id', [matchId, otherId]).order('match_number');
+    const squads = await loadPlayingXIs([match.home_team_id, match.away_team_id, other.home_team_id, other.away_team_id]);
+    const teams = await getTeams([...squads.keys()]);
+    const strip = ({ updated_at, match_data: { completedAt, ...data }, ...columns }) => JSON.stringify({ ...columns, match_data: data });
+    const once = simulateMatchBallByBall(match, squads, teams);
+    const twice = simulateMatchBallByBall(match, squads, teams);
+    const reseeded = simulateMatchBallByBall({ ...match, id: 'another-id' }, squads, teams);
+
+    // Inline commentary is the line the ball log renders later
+    const home = squads.get(match.home_team_id);
+    const away = squads.get(match.away_team_id);
+    const innings = simulateInnings(home, away, null, {}, false, { seed: 42 });
+    const rendered = sliceBalls(innings.ballLog, { from: 1, to: 1000 }).balls.map(ball => ball.commentary);
+
+    const submitted = await call(POST, `/matches/${matchId}/simulate`, { method: 'POST', ...matchPath(matchId, 'simulate') });
+    const simulated = await awaitJob(submitted.body.id);
+    const { data: stored } = await db.from('matches').select('*').eq('id', matchId).single();
+    const legacy = { match_data: simulated.body.match_data, ball_log: once.ball_log };
+
+    clearReplays();
+    const cold = await timed(() => call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard')));
+    const warm = await timed(() => call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard')));
+    const balls = await call(GET, `/matches/${matchId}/balls?innings=2&last=6`, matchPath(matchId, 'balls'));
+    const full = await call(GET, `/matches/${matchId}?include=commentary`, matchPath(matchId));
+    const scheduled = await call(GET, `/matches/${otherId}/scorecard`, matchPath(otherId, 'scorecard'));
+
+    // A player of the home XI changes after the match: it can no longer be replayed
+    const playerId = stored.match_data.replay.xi[0][0];
+    const { data: player } = await db.from('players').select('batting').eq('id', playerId).single();
+    await db.from('players').update({ batting: player.batting + 1 }).eq('id', playerId);
+    const cached = await call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard'));
+    clearReplays();
+    const changed = await call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard'));
+    const changedBalls = await call(GET, `/matches/${matchId}/balls`, matchPath(matchId, 'balls'));
+    await db.from('players').update({ batting: player.batting }).eq('id', playerId);
+    const restored = await call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard'));
+    const stats = replayStats();
+
+    // Edits and deletes through the API pin the match first, so it still
+    // replays the same; an edit that leaves the inputs alone pins nothing
+    const { PUT: putPlayer } = await import('@/app/api/players/[id]/route');
+    const { PUT, DELETE } = await catchAll();
+    const pinnedBefore = JSON.stringify(stored.match_data);
+    const priced = await call(PUT, `/players/${playerId}`, { method: 'PUT', body: { sale_price: 5000 }, params: { path: ['players', playerId] } });
+    const { data: { match_data: afterPricing } } = await db.from('matches').select('match_data').eq('id', matchId).single();
+    const edited = await call(putPlayer, `/players/${playerId}`, { method: 'PUT', body: { name: 'Renamed Player', batting: player.batting + 5 }, params: { id: playerId } });
+    const deletedId = stored.match_data.replay.xi[1][0];
+    const deleted = await call(DELETE, `/players/${deletedId}`, { method: 'DELETE', params: { path: ['players', deletedId] } });
+    clearReplays();
+    const afterEdits = await call(GET, `/matches/${matchId}/scorecard`, matchPath(matchId, 'scorecard'));
+    const { data: { match_data: pinnedData } } = await db.from('matches').select('match_data').eq('id', matchId).single();
+
+    // A completed season's top performers come from replayed scorecards
+    const { data: season } = await db.from('league_seasons').select('*').eq('id', 'default-1').single();
+    await fastForwardSeason(season);
+    const { data: snapshot } = await db.from('season_snapshots').select('top_performers').eq('id', 'default:1').single();
+    const { data: seasonRows } = await db.from('matches').select('match_data, ball_log').eq('status', 'completed');
+
+    return {
+      engine: {
+        deterministic: strip(once) === strip(twice),
+        seedMatters: strip(once) !== strip(reseeded),
+        storedSeed: once.match_data.replay.seed,
+        fingerprint: once.match_data.replay.fingerprint,
+        inlineCommentaryMatches: JSON.stringify(innings.commentary.map(ball => ball.commentary)) === JSON.stringify(rendered)
+      },
+      stored: {
+        status: stored.status,
+        bytes: JSON.stringify({ match_data: stored.match_data, ball_log: stored.ball_log }).length,
+        legacyBytes: JSON.stringify(legacy).length,
+        hasBallLog: Array.isArray(stored.ball_log),
+        hasScorecards: Boolean(stored.match_data.firstInnings),
+        replayKeys: Object.keys(stored.match_data.replay).sort()
+      },
+      scorecard: {
+        statuses: [cold.status, warm.status],
+        queries: [cold.queries, warm.queries],
+        ms: [cold.ms, warm.ms],
+        replayed: cold.body.replayed,
+        matchesJob: JSON.stringify([cold.body.firstInnings, cold.body.secondInnings]) ===
+          JSON.stringify([simulated.body.match_data.firstInnings, simulated.body.match_data.secondInnings]),
+        matchesEngine: JSON.stringify(cold.body.firstInnings) === JSON.stringify(once.match_data.firstInnings),
+        scheduledStatus: scheduled.status
+      },
+      balls: {
+        status: balls.status,
+        count: balls.body.balls.length,
+        finalRuns: balls.body.balls[balls.body.balls.length - 1].totalRuns,
+        awayScore: stored.away_score,
+        commentaryTypes: [...new Set(balls.body.balls.map(ball => typeof ball.commentary))],
+        fullHasBallLog: Array.isArray(full.body.ball_log) && full.body.ball_log.length === 2,
+        fullHasScorecards: Boolean(full.body.match_data.firstInnings)
+      },
+      changed: {
+        cachedStatus: cached.status,
+        status: changed.status,
+        error: changed.body.error,
+        ballsStatus: changedBalls.status,
+        restoredStatus: restored.status
+      },
+      stats,
+      edits: {
+        statuses: [priced.status, edited.status, deleted.status],
+        pinnedByPricing: JSON.stringify(afterPricing) !== pinnedBefore,
+        pinned: pinnedData.replay.squads?.length === 2,
+        status: afterEdits.status,
+        unchanged: JSON.stringify([afterEdits.body.firstInnings, afterEdits.body.secondInnings]) ===
+          JSON.stringify([cold.body.firstInnings, cold.body.secondInnings])
+      },
+      season: {
+        matches: seasonRows.length,
+        compact: seasonRows.every(row => !row.ball_log && !row.match_data.firstInnings && row.match_data.replay),
+        runScorers: snapshot.top_performers.runScorers.length,
+        wicketTakers: snapshot.top_performers.wicketTakers.length
+      }
+    };
+  }
+};
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Seeded match simulation (lib/simulation/replay.js): a simulated match stores a
+replay record (seed, input fingerprint, XI ids) instead of its scorecards and
+ball logs, which GET /api/matches/:id/scorecard, /balls and ?include=commentary
+regenerate on demand with recently replayed matches memoized.
+"""
+
+import pytest
+
+# Stored match_data (and no ball log) of a simulated match
+MAX_STORED_BYTES = 1024
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("replay")
+
+
+def test_simulation_is_a_function_of_inputs_and_seed(results):
+    engine = results["engine"]
+    assert engine["deterministic"], "the same squads, conditions and seed must play the same match"
+    assert engine["seedMatters"]
+    assert 0 <= engine["storedSeed"] < 2 ** 32
+    assert len(engine["fingerprint"]) == 8
+    assert engine["inlineCommentaryMatches"], "inline commentary must match the lines rendered from the ball log"
+
+
+def test_stores_replay_record_only(results):
+    stored = results["stored"]
+    assert stored["status"] == "completed"
+    assert not stored["hasBallLog"]
+    assert not stored["hasScorecards"]
+    assert stored["replayKeys"] == ["fingerprint", "seed", "v", "xi"]
+    assert stored["bytes"] < MAX_STORED_BYTES
+    assert stored["bytes"] * 10 < stored["legacyBytes"]
+
+
+def test_scorecard_is_replayed_and_memoized(results, record_property):
+    scorecard = results["scorecard"]
+    record_property("cold_ms", round(scorecard["ms"][0], 2))
+    record_property("warm_ms", round(scorecard["ms"][1], 2))
+    assert scorecard["statuses"] == [200, 200]
+    assert scorecard["replayed"]
+    assert scorecard["matchesJob"], "the replayed scorecards must be those the job returned"
+    assert scorecard["matchesEngine"]
+    # The match row, then the XIs by id; a memoized replay only reads the row
+    assert scorecard["queries"] == [2, 1]
+    assert scorecard["scheduledStatus"] == 404
+
+
+def test_balls_and_commentary_are_replayed(results):
+    balls = results["balls"]
+    assert balls["status"] == 200
+    assert balls["count"] == 6
+    assert balls["finalRuns"] == balls["awayScore"]
+    assert balls["commentaryTypes"] == ["string"]
+    assert balls["fullHasBallLog"]
+    assert balls["fullHasScorecards"]
+
+
+def test_changed_inputs_are_refused(results):
+    changed = results["changed"]
+    # A replay memoized before the change is still the match as played
+    assert changed["cachedStatus"] == 200
+    assert changed["status"] == 409
+    assert "changed" in changed["error"]
+    assert changed["ballsStatus"] == 409
+    assert changed["restoredStatus"] == 200
+    assert results["stats"]["changed"] == 2
+
+
+def test_season_snapshot_replays_scorecards(results):
+    season = results["season"]
+    assert season["matches"] == 6
+    assert season["compact"]
+    assert season["runScorers"] > 0
+    assert season["wicketTakers"] > 0
+
+
+def test_player_edits_and_deletes_pin_their_matches(results):
+    edits = results["edits"]
+    assert edits["statuses"] == [200, 200, 200]
+    # A price change leaves the inputs alone and writes nothing to the match
+    assert not edits["pinnedByPricing"]
+    assert edits["pinned"]
+    # Renamed and deleted players replay from the pinned record
+    assert edits["status"] == 200
+    assert edits["unchanged"]
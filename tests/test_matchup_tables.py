@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Distribution equivalence of the precompiled matchup outcome tables
+(lib/simulation/matchups.js) with the per-delivery derivation simulateInnings
+used before them, for every scenario, phase and chase pressure level, and the
+throughput of the table lookup on the same stream of deliveries.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS = os.path.join(REPO_ROOT, "scripts", "bench-simulation.mjs")
+SAMPLES_PER_CELL = 10000
+MAX_Z_SCORE = 5.5
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run the simulation engines")
+
+
+@pytest.fixture(scope="module")
+def results():
+    completed = subprocess.run(
+        ["node", "--no-warnings", HARNESS, "matchups", "--n", str(SAMPLES_PER_CELL), "--json"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def test_outcome_distributions_match(results):
+    distribution = results["distribution"]
+    assert distribution["cells"] == 4 * 11 * 3 * 3
+    assert distribution["maxZ"] < MAX_Z_SCORE, f"worst cell: {distribution['worst']}"
+
+
+def test_wicket_types_stay_uniform(results):
+    assert results["distribution"]["wicketTypeMaxZ"] < MAX_Z_SCORE
+
+
+def test_table_lookup_is_faster(results):
+    throughput = results["throughput"]
+    assert throughput["afterBallsPerSecond"] > throughput["beforeBallsPerSecond"]
+    print(f"\nper-ball derivation: {throughput['beforeBallsPerSecond']:,.0f} balls/s, "
+          f"matchup tables: {throughput['afterBallsPerSecond']:,.0f} balls/s ({throughput['speedup']:.1f}x)")
@@ -0,0 +1,200 @@
+// Route harness scenarios of test_migration.py (route_scenario in tests/conftest.py)
+
+import { heapUsed } from './harness/routes.mjs';
+
+export default {
+  // Streaming Mongo -> Supabase migration (lib/migration) from the local Mongo
+  // fixture into fresh stand-in databases: dry run, a run that fails halfway
+  // and its resume, a run stopped by a signal, and dry-run memory against
+  // loading whole collections
+  async migration(benchMatches = '15000') {
+    const { createLocalClient } = await import('@/lib/supabase/local');
+    const { migrate } = await import('@/lib/migration/migrator');
+    const { MIGRATION_TABLES } = await import('@/lib/migration/tables');
+    const { createMongoFixture, objectId } = await import('./harness/mongo-fixture.mjs');
+    const fs = await import('node:fs');
+    const os = await import('node:os');
+    const path = await import('node:path');
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'migration-'));
+    const BATCH_SIZE = 200;
+    const MAX_BATCH_BYTES = 256 * 1024;
+
+    const commentary = (i, balls) => Array.from({ length: balls }, (_, ball) =>
+      `Over ${Math.floor(ball / 6)}.${ball % 6 + 1}: match ${i} delivery ${ball}, pushed into the covers for a single`);
+    const collections = () => ({
+      users: { count: 1200, make: i => ({ id: `user-${i}`, team_name: `Team ${i}`, created_at: '2025-01-01T00:00:00.000Z' }) },
+      league_seasons: { count: 3, make: i => ({ league_id: 'default', season: String(i + 1), status: i < 2 ? 'completed' : 'active', teams: [] }) },
+      leagues: { count: 5, make: i => ({ name: `League ${i}`, season: '1' }) },
+      teams: { count: 40, make: i => ({ name: `Club ${i}`, league: objectId(i % 5), players: [] }) },
+      matches: {
+        count: 3000,
+        make: i => ({
+          id: `match-${i}`,
+          home_team_id: `user-${i % 1200}`,
+          away_team_id: `user-${(i + 1) % 1200}`,
+          league: 'default',
+          season: String(1 + (i % 3)),
+          scheduled_time: '2025-02-01T12:00:00.000Z',
+          status: 'completed',
+          home_score: i % 200,
+          commentary: commentary(i, 10 + (i % 40))
+        })
+      }
+    });
+    const counts = Object.fromEntries(Object.entries(collections()).map(([name, { count }]) => [name, count]));
+    const tableCounts = target => Object.fromEntries(MIGRATION_TABLES.map(({ table }) => [table, target.tables[table].rows.size]));
+    const options = { batchSize: BATCH_SIZE, maxBatchBytes: MAX_BATCH_BYTES, workers: 2 };
+    const summary = report => ({
+      error: report.error,
+      aborted: report.aborted,
+      rows: report.rows,
+      rowsPerSec: report.rowsPerSec,
+      statuses: Object.fromEntries(Object.entries(report.tables).map(([table, entry]) => [table, entry.status])),
+      checksums: Object.fromEntries(Object.entries(report.tables).map(([table, entry]) => [table, entry.checksum]))
+    });
+
+    // A target whose upserts into `table` fail from the `failOn`-th on, as a
+    // request over the size limit or a dropped connection would
+    const failingTarget = (client, table, failOn) => {
+      let upserts = 0;
+      return {
+        from(name) {
+          const query = client.from(name);
+          if (name !== table) return query;
+          return {
+            upsert: (rows, upsertOptions) => (++upserts >= failOn
+              ? Promise.resolve({ data: null, error: { message: 'Payload too large' } })
+              : query.upsert(rows, upsertOptions))
+          };
+        }
+      };
+    };
+
+    // Dry run: counts and checksums, nothing written
+    const dryTarget = createLocalClient();
+    const dry = await migrate(createMongoFixture(collections()), dryTarget, { ...options, dryRun: true, checkpointPath: path.join(dir, 'dry.json') });
+    const dryRun = {
+      ...summary(dry),
+      rowCounts: Object.fromEntries(Object.entries(dry.tables).map(([table, entry]) => [table, entry.rows])),
+      queries: dryTarget.stats.queries,
+      checkpointWritten: fs.existsSync(path.join(dir, 'dry.json'))
+    };
+
+    // Clean run: batches bounded by rows and bytes, dependencies respected
+    const cleanTarget = createLocalClient({ latencyMs: 1 });
+    const cleanSource = createMongoFixture(collections());
+    const timeline = [];
+    let previousBytes = {};
+    const clean = await migrate(cleanSource, cleanTarget, {
+      ...options,
+      checkpointPath: path.join(dir, 'clean.json'),
+      onBatch: (table, state) => {
+        timeline.push({ table, rows: state.rows, bytes: state.bytes - (previousBytes[table] ?? 0) });
+        previousBytes[table] = state.bytes;
+      }
+    });
+    const span = table => {
+      const indexes = timeline.flatMap((event, index) => (event.table === table ? [index] : []));
+      return [indexes[0], indexes[indexes.length - 1]];
+    };
+    let maxConcurrent = 0;
+    for (let i = 0; i < timeline.length; i++) {
+      maxConcurrent = Math.max(maxConcurrent, MIGRATION_TABLES.filter(({ table }) => span(table)[0] <= i && i <= span(table)[1]).length);
+    }
+    const matchBatches = timeline.filter(event => event.table === 'matches');
+    const sample = cleanTarget.tables.matches.rows.get('match-7');
+    const cleanRun = {
+      ...summary(clean),
+      counts: tableCounts(cleanTarget),
+      peakHeapBytes: clean.peakHeapBytes,
+      peakRssBytes: clean.peakRssBytes,
+      maxBatchBytes: Math.max(...timeline.map(event => event.bytes)),
+      maxBatchRows: Math.max(...timeline.map((event, i) => event.rows - (timeline.slice(0, i).findLast(e => e.table === event.table)?.rows ?? 0))),
+      matchBatches: matchBatches.length,
+      matchGetMores: cleanSource.stats.matches.getMores,
+      order: {
+        matchesAfterUsers: span('matches')[0] > span('users')[1],
+        matchesAfterSeasons: span('matches')[0] > span('league_seasons')[1],
+        teamsAfterLeagues: span('teams')[0] > span('leagues')[1]
+      },
+      maxConcurrent,
+      sampleCommentary: sample?.commentary?.length ?? null,
+      rerun: summary(await migrate(createMongoFixture(collections()), cleanTarget, { ...options, checkpointPath: path.join(dir, 'clean.json') }))
+    };
+
+    // Failure halfway through matches, then resume from the checkpoint
+    const resumeTarget = createLocalClient();
+    const checkpointPath = path.join(dir, 'resume.json');
+    const failed = await migrate(createMongoFixture(collections()), failingTarget(resumeTarget, 'matches', 6), { ...options, checkpointPath });
+    const afterFailure = JSON.parse(fs.readFileSync(checkpointPath, 'utf8'));
+    const failedCounts = tableCounts(resumeTarget);
+    const resumeSource = createMongoFixture(collections());
+    const resumed = await migrate(resumeSource, resumeTarget, { ...options, checkpointPath });
+    const resume = {
+      failed: summary(failed),
+      checkpointMatches: afterFailure.tables.matches.rows,
+      checkpointTeamsStarted: Boolean(afterFailure.tables.teams),
+      failedCounts,
+      resumed: summary(resumed),
+      resumedFrom: resumed.tables.matches.resumedFrom,
+      migratedOnResume: resumed.tables.matches.migrated,
+      documentsReadOnResume: resumeSource.stats.matches.documents,
+      counts: tableCounts(resumeTarget)
+    };
+
+    // A signal stops the run after the batches in flight; the rest follows later
+    const stopTarget = createLocalClient();
+    const stopPath = path.join(dir, 'stop.json');
+    const controller = new AbortController();
+    const stopped = await migrate(createMongoFixture(collections()), stopTarget, {
+      ...options,
+      checkpointPath: stopPath,
+      signal: controller.signal,
+      onBatch: (table, state) => { if (table === 'users' && state.batches === 2) controller.abort(); }
+    });
+    const stoppedUsers = stopTarget.tables.users.rows.size;
+    const finished = await migrate(createMongoFixture(collections()), stopTarget, { ...options, checkpointPath: stopPath });
+    const stop = {
+      stopped: summary(stopped),
+      stoppedUsers,
+      finished: summary(finished),
+      counts: tableCounts(stopTarget)
+    };
+
+    // Memory: a streamed dry run against holding the whole collection
+    const big = Number(benchMatches);
+    const bigCollections = { matches: { count: big, make: collections().matches.make } };
+    const startHeap = heapUsed();
+    const streamed = await migrate(createMongoFixture(bigCollections), createLocalClient(), { ...options, dryRun: true, only: ['matches'] });
+    const streamedGrowth = streamed.peakHeapBytes - startHeap;
+
+    const loadHeap = heapUsed();
+    const legacyStartedAt = performance.now();
+    const all = [];
+    for await (const doc of createMongoFixture(bigCollections).collection('matches').find({}).sort({ _id: 1 })) all.push(doc);
+    const rows = all.map(MIGRATION_TABLES.find(spec => spec.table === 'matches').toRow);
+    const legacyGrowth = process.memoryUsage().heapUsed - loadHeap;
+    const legacyMs = performance.now() - legacyStartedAt;
+    rows.length = 0;
+    all.length = 0;
+
+    fs.rmSync(dir, { recursive: true, force: true });
+    return {
+      counts,
+      dryRun,
+      cleanRun,
+      resume,
+      stop,
+      memory: {
+        matches: big,
+        dataBytes: streamed.tables.matches.bytes,
+        streamedGrowthBytes: streamedGrowth,
+        legacyGrowthBytes: legacyGrowth,
+        streamedRowsPerSec: streamed.rowsPerSec,
+        legacyLoadMs: legacyMs
+      },
+      batchSize: BATCH_SIZE,
+      maxBatchBytesLimit: MAX_BATCH_BYTES
+    };
+  }
+};
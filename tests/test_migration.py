@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Streaming Mongo-to-Supabase migration (lib/migration, scripts/migrate-to-supabase.mjs)
+from the local Mongo fixture (tests/harness/mongo-fixture.mjs) into the local
+Supabase stand-in: batches bounded by rows and bytes, tables in dependency
+order, dry-run counts and checksums, and resuming from the checkpoint after a
+failure or a stop.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("migration")
+
+
+def test_dry_run_counts_and_checksums_without_writing(results):
+    dry_run = results["dryRun"]
+    assert dry_run["rowCounts"] == results["counts"]
+    assert dry_run["queries"] == 0
+    assert not dry_run["checkpointWritten"]
+    assert dry_run["checksums"] == results["cleanRun"]["checksums"]
+
+
+def test_migrates_in_bounded_batches(results, record_property):
+    clean = results["cleanRun"]
+    record_property("rows_per_sec", clean["rowsPerSec"])
+    record_property("peak_heap_mb", round(clean["peakHeapBytes"] / 2 ** 20, 1))
+    assert clean["error"] is None
+    assert clean["counts"] == results["counts"]
+    assert set(clean["statuses"].values()) == {"done"}
+    assert clean["maxBatchRows"] <= results["batchSize"]
+    assert clean["maxBatchBytes"] <= results["maxBatchBytesLimit"]
+    # Large commentary arrays split batches on size before they reach the row limit
+    assert clean["matchBatches"] > results["counts"]["matches"] // results["batchSize"]
+    assert clean["matchGetMores"] == results["counts"]["matches"] // results["batchSize"]
+    assert clean["sampleCommentary"] == 17
+    assert clean["rowsPerSec"] > 0
+    assert clean["peakHeapBytes"] > 0 and clean["peakRssBytes"] > 0
+
+
+def test_tables_run_in_parallel_in_dependency_order(results):
+    clean = results["cleanRun"]
+    assert all(clean["order"].values()), clean["order"]
+    assert clean["maxConcurrent"] == 2
+
+
+def test_completed_migration_is_not_repeated(results):
+    rerun = results["cleanRun"]["rerun"]
+    assert rerun["rows"] == 0
+    assert set(rerun["statuses"].values()) == {"skipped"}
+
+
+def test_resumes_after_a_failure(results):
+    resume = results["resume"]
+    failed = resume["failed"]
+    assert failed["error"] == "matches: Payload too large"
+    assert failed["statuses"]["matches"] == "failed"
+    # Every committed batch is checkpointed, and nothing else was written
+    assert resume["failedCounts"]["matches"] == resume["checkpointMatches"] > 0
+
+    resumed = resume["resumed"]
+    assert resumed["error"] is None
+    assert resume["resumedFrom"] == resume["checkpointMatches"]
+    assert resume["migratedOnResume"] == results["counts"]["matches"] - resume["checkpointMatches"]
+    assert resume["documentsReadOnResume"] == resume["migratedOnResume"]
+    assert resume["counts"] == results["counts"]
+    assert resumed["checksums"] == results["dryRun"]["checksums"]
+
+
+def test_stop_keeps_committed_batches(results):
+    stop = results["stop"]
+    assert stop["stopped"]["aborted"]
+    assert stop["stopped"]["statuses"]["matches"] == "pending"
+    assert stop["stoppedUsers"] == 2 * results["batchSize"]
+    assert not stop["finished"]["aborted"]
+    assert stop["counts"] == results["counts"]
+    assert stop["finished"]["checksums"] == results["dryRun"]["checksums"]
+
+
+def test_streaming_holds_a_batch_not_the_collection(results, record_property):
+    memory = results["memory"]
+    record_property("streamed_growth_mb", round(memory["streamedGrowthBytes"] / 2 ** 20, 1))
+    record_property("legacy_growth_mb", round(memory["legacyGrowthBytes"] / 2 ** 20, 1))
+    record_property("streamed_rows_per_sec", memory["streamedRowsPerSec"])
+    assert memory["streamedGrowthBytes"] < memory["dataBytes"]
+    assert memory["streamedGrowthBytes"] * 3 < memory["legacyGrowthBytes"]
@@ -0,0 +1,169 @@
+// Route harness scenarios of test_name_allocation.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db, percentile } from './harness/routes.mjs';
+
+export default {
+  // Squad name allocation at registration against 1k to 100k stored players:
+  // the first registration (which loads the name index) and warm ones, their
+  // queries and picks, against the per-name lookup loop it replaced.
+  // Stored players use distinct pool names up to 75% of all of them, and
+  // generic names after that.
+  async registration(...sizes) {
+    const { POST } = await catchAll();
+    const { countryNames } = await import('@/lib/country-names');
+    const { resetNameIndex } = await import('@/lib/players/name-allocator');
+    const { GET: capacity } = await import('@/app/api/players/names/route');
+    const LATENCY_MS = 1;
+    const WARM_REGISTRATIONS = 20;
+    const results = [];
+
+    const poolNames = [...new Set(Object.values(countryNames).flatMap(({ firstNames, lastNames }) =>
+      firstNames.flatMap(first => lastNames.map(last => `${first} ${last}`))))];
+    // Deterministic shuffle, so every size takes the same names
+    let state = 42;
+    const random = () => (state = (state * 1103515245 + 12345) % 2147483648) / 2147483648;
+    for (let i = poolNames.length - 1; i > 0; i--) {
+      const j = Math.floor(random() * (i + 1));
+      [poolNames[i], poolNames[j]] = [poolNames[j], poolNames[i]];
+    }
+    const poolLimit = Math.floor(poolNames.length * 0.75);
+
+    const seed = (size) => {
+      db.reset();
+      resetNameIndex();
+      const players = Array.from({ length: size }, (_, i) => ({
+        id: `stored-${i}`,
+        user_id: 'stored-owner',
+        name: i < poolLimit ? poolNames[i] : `Generic Player ${i}`
+      }));
+      db.load({ users: [{ id: 'stored-owner', email: 'owner@cricket.com', username: 'owner', team_name: 'Owners' }], players });
+    };
+
+    let registered = 0;
+    const register = async (country) => {
+      const n = registered++;
+      const before = db.stats.queries;
+      const startedAt = performance.now();
+      const response = await call(POST, '/auth/register', {
+        method: 'POST',
+        params: { path: ['auth', 'register'] },
+        body: { email: `user${n}@cricket.com`, password: 'secret', username: `user${n}`, team_name: `Team ${n}`, country }
+      });
+      return { status: response.status, ms: performance.now() - startedAt, queries: db.stats.queries - before, userId: response.body?.id };
+    };
+
+    // The replaced loop: one lookup per candidate name, up to 1000 attempts
+    const legacySquad = async (country) => {
+      const { firstNames, lastNames } = countryNames[country];
+      const names = new Set();
+      const before = db.stats.queries;
+      const startedAt = performance.now();
+      let attempts = 0;
+      while (names.size < 20 && attempts < 1000) {
+        attempts++;
+        const name = `${firstNames[Math.floor(Math.random() * firstNames.length)]} ${lastNames[Math.floor(Math.random() * lastNames.length)]}`;
+        if (names.has(name)) continue;
+        const { error } = await db.from('players').select('id').eq('name', name).single();
+        if (error?.code === 'PGRST116') names.add(name);
+      }
+      return { ms: performance.now() - startedAt, queries: db.stats.queries - before, attempts, names: names.size };
+    };
+
+    for (const size of (sizes.length ? sizes : ['1000', '10000', '100000']).map(Number)) {
+      seed(size);
+      db.latencyMs = LATENCY_MS;
+      const cold = await register('England');
+      const warm = [];
+      for (let i = 0; i < WARM_REGISTRATIONS; i++) warm.push(await register(i % 2 ? 'India' : 'England'));
+      const legacy = await legacySquad('England');
+      db.latencyMs = 0;
+
+      const userIds = [cold, ...warm].map(result => result.userId);
+      const { data: squads } = await db.from('players').select('name, user_id').in('user_id', userIds);
+      const { data: stored } = await db.from('players').select('name');
+      const counts = new Map();
+      for (const { name } of stored) counts.set(name, (counts.get(name) || 0) + 1);
+      const capacityResponse = await call(capacity, '/players/names');
+
+      results.push({
+        size,
+        statuses: [...new Set([cold, ...warm].map(result => result.status))],
+        cold: { ms: cold.ms, queries: cold.queries },
+        warm: {
+          p50Ms: percentile(warm.map(result => result.ms), 0.5),
+          maxMs: percentile(warm.map(result => result.ms), 1),
+          queries: [...new Set(warm.map(result => result.queries))]
+        },
+        legacy,
+        squadPlayers: squads.length,
+        genericNames: squads.filter(player => player.name.startsWith('Player ')).length,
+        duplicateSquadNames: squads.filter(player => counts.get(player.name) > 1).length,
+        capacity: capacityResponse.body.countries.England,
+        loadedNames: capacityResponse.body.loadedNames
+      });
+    }
+
+    // A country whose names are all taken falls back to generic names
+    // without any lookups, and another process's names are caught by the
+    // batched check
+    seed(0);
+    const { firstNames, lastNames } = countryNames.Zimbabwe;
+    const zimbabwe = [...new Set(firstNames)].flatMap(first => [...new Set(lastNames)].map(last => `${first} ${last}`));
+    db.load({ players: zimbabwe.map((name, i) => ({ id: `zw-${i}`, user_id: 'stored-owner', name })) });
+    await register('England');
+    const exhausted = await register('Zimbabwe');
+    const { data: exhaustedSquad } = await db.from('players').select('name').eq('user_id', exhausted.userId);
+
+    // Leave 40 Indian names free in the index, 20 of which another process
+    // has since used: one check, and only the 20 unused names come back
+    const { allocateNames, markTaken } = await import('@/lib/players/name-allocator');
+    const india = countryNames.India;
+    const indianNames = [...new Set(india.firstNames)].flatMap(first => [...new Set(india.lastNames)].map(last => `${first} ${last}`));
+    const free = indianNames.filter(name => !zimbabwe.includes(name)).slice(0, 40);
+    markTaken(indianNames.filter(name => !free.includes(name)));
+    const elsewhere = free.slice(0, 20);
+    db.load({ players: elsewhere.map((name, i) => ({ id: `elsewhere-${i}`, user_id: 'stored-owner', name })) });
+    const before = db.stats.queries;
+    const { names: afterConflict, checked } = await allocateNames('India', 40);
+    const conflictQueries = db.stats.queries - before;
+
+    // Renamed and deleted players give their names back, unless another
+    // player still carries the name
+    const { nameCapacity } = await import('@/lib/players/name-allocator');
+    const { PUT: putPlayer } = await import('@/app/api/players/[id]/route');
+    const { PUT, DELETE } = await catchAll();
+    const remaining = async () => Object.values((await nameCapacity()).countries).reduce((sum, country) => sum + country.remaining, 0);
+    const owner = await register('England');
+    const { data: [renamed, removed, twin] } = await db.from('players').select('id, name').eq('user_id', owner.userId).order('id').limit(3);
+    db.load({ players: [{ id: 'twin-elsewhere', user_id: 'stored-owner', name: twin.name }] });
+    const freed = [await remaining()];
+    await call(putPlayer, `/players/${renamed.id}`, { method: 'PUT', body: { name: 'Unpooled Name One' }, params: { id: renamed.id } });
+    freed.push(await remaining());
+    await call(DELETE, `/players/${removed.id}`, { method: 'DELETE', params: { path: ['players', removed.id] } });
+    freed.push(await remaining());
+    await call(PUT, `/players/${twin.id}`, { method: 'PUT', body: { name: 'Unpooled Name Two' }, params: { path: ['players', twin.id] } });
+    freed.push(await remaining());
+    await call(PUT, `/players/${twin.id}`, { method: 'PUT', body: { name: renamed.name }, params: { path: ['players', twin.id] } });
+    freed.push(await remaining());
+
+    return {
+      sizes: results,
+      exhausted: {
+        status: exhausted.status,
+        queries: exhausted.queries,
+        generic: exhaustedSquad.filter(player => player.name.startsWith('Player ')).length
+      },
+      conflict: {
+        queries: conflictQueries,
+        names: afterConflict.length,
+        checked,
+        unique: new Set(afterConflict).size,
+        usedElsewhere: afterConflict.filter(name => elsewhere.includes(name)).length
+      },
+      renames: {
+        status: owner.status,
+        freed: freed.slice(1).map((count, index) => count - freed[index])
+      }
+    };
+  }
+};
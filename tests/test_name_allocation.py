@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Squad name allocation at registration (lib/players/name-allocator.js):
+unique names picked from an in-memory index of taken names with at most one
+batched check, against 1k to 100k stored players, with the per-country
+capacity reported by GET /api/players/names.
+"""
+
+import pytest
+
+SIZES = [1000, 10000, 100000]
+SQUAD_SIZE = 20
+# users lookup, user insert, current season, standings row, name check,
+# players insert, lineup insert
+WARM_QUERIES = 7
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("registration", *map(str, SIZES))
+
+
+@pytest.fixture(scope="module")
+def sizes(results):
+    return {size["size"]: size for size in results["sizes"]}
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_registration_query_count_is_constant(sizes, size, record_property):
+    result = sizes[size]
+    record_property("cold_ms", round(result["cold"]["ms"]))
+    record_property("warm_p50_ms", round(result["warm"]["p50Ms"], 1))
+    record_property("legacy_queries", result["legacy"]["queries"])
+    assert result["statuses"] == [201]
+    assert result["warm"]["queries"] == [WARM_QUERIES]
+    # The index is loaded once, a page of names per query
+    assert result["loadedNames"] == size
+    assert result["cold"]["queries"] == WARM_QUERIES + size // 1000 + 1
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_squad_names_are_unique(sizes, size):
+    result = sizes[size]
+    assert result["squadPlayers"] == 21 * SQUAD_SIZE
+    assert result["genericNames"] == 0
+    assert result["duplicateSquadNames"] == 0
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_capacity_reflects_stored_names(sizes, size):
+    capacity = sizes[size]["capacity"]
+    assert capacity["taken"] + capacity["remaining"] == capacity["capacity"]
+    assert capacity["taken"] >= 11 * SQUAD_SIZE
+
+
+def test_fewer_queries_than_lookup_loop(sizes):
+    for result in sizes.values():
+        assert result["legacy"]["queries"] > SQUAD_SIZE
+        assert result["warm"]["queries"][0] < result["legacy"]["queries"]
+    # The loop needs more lookups as the names fill up
+    assert sizes[10000]["legacy"]["queries"] > sizes[1000]["legacy"]["queries"]
+
+
+def test_exhausted_country_falls_back_without_lookups(results):
+    assert results["exhausted"] == {"status": 201, "queries": 6, "generic": SQUAD_SIZE}
+
+
+def test_names_used_by_another_process_are_replaced(results):
+    assert results["conflict"] == {"queries": 1, "names": 20, "checked": True, "unique": 20, "usedElsewhere": 0}
+
+
+def test_renamed_and_deleted_players_release_their_names(results):
+    renames = results["renames"]
+    assert renames["status"] == 201
+    # Free names gained after a rename, a delete, a rename of a name another
+    # player still carries, and a rename back to the first released name; a
+    # name counts once in every country space that can generate it
+    renamed, deleted, shared, retaken = renames["freed"]
+    assert renamed > 0 and deleted > 0
+    assert shared == 0
+    assert retaken == -renamed
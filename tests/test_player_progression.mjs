@@ -0,0 +1,174 @@
+// Route harness scenarios of test_player_progression.py (route_scenario in tests/conftest.py)
+
+import { awaitJob, call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Weekly player progression (lib/players/progression.js) after a league's
+  // fixtures are played through the simulation job: dry run, the workload
+  // read from the matches, what a run writes, replays afterwards, the next
+  // week, and a failed run resumed
+  async progression() {
+    process.env.SIMULATION_WORKERS = '0';
+    const { matchIds } = seedLeague(db, { teams: 6, rounds: 2 });
+    const { GET, POST } = await catchAll();
+    const { PROGRESSION_COLUMNS, FATIGUE_LEVELS, loadWorkload, runProgression } = await import('@/lib/players/progression');
+    const { clearReplays } = await import('@/lib/simulation/replay');
+    const matchPath = (id, ...rest) => ({ params: { path: ['matches', id, ...rest] } });
+    const scorecard = (id) => call(GET, `/matches/${id}/scorecard`, matchPath(id, 'scorecard'));
+    const playersById = async () => new Map((await db.from('players').select('*')).data.map(player => [player.id, player]));
+    const writesOf = (byTable) => Object.values(byTable).reduce((sum, ops) => sum + Object.entries(ops)
+      .filter(([op]) => op !== 'select').reduce((total, [, count]) => total + count, 0), 0);
+
+    for (const id of matchIds) {
+      const submitted = await call(POST, `/matches/${id}/simulate`, { method: 'POST', ...matchPath(id, 'simulate') });
+      await awaitJob(submitted.body.id);
+    }
+    // Weeks are named explicitly so birthdays (and every draw) are fixed
+    const now = new Date(Date.now() + 1000);
+    const week = (offset) => ({ week: `2030-W0${offset + 1}`, now: new Date(now.getTime() + offset * 7 * 86400000) });
+
+    // Bench players with nothing to progress: prime age, rested, average
+    // form, rating and value already where their skills put them
+    const stableIds = [11, 12, 13, 14].map(p => `team-0-player-${p}`);
+    const skills = Object.fromEntries(['batting', 'bowling', 'keeping', 'technique', 'fielding', 'endurance', 'power', 'captaincy'].map(skill => [skill, 60]));
+    await db.from('players').update({ ...skills, age: 29, form: 'Average', fatigue: 'Fresh', rating: 60, market_value: 60000 }).in('id', stableIds);
+
+    // Workload the scorecards add up to, by player name within a team
+    const before = await playersById();
+    const idsByName = new Map([...before.values()].map(player => [`${player.user_id}:${player.name}`, player.id]));
+    const expected = new Map();
+    const entryOf = (teamId, name) => {
+      const id = idsByName.get(`${teamId}:${name}`);
+      if (!expected.has(id)) expected.set(id, { ballsFaced: 0, ballsBowled: 0, runs: 0, wickets: 0, matches: 0 });
+      return expected.get(id);
+    };
+    const scorecards = {};
+    for (const id of matchIds) {
+      const card = (await scorecard(id)).body;
+      scorecards[id] = card;
+      for (const innings of [card.firstInnings, card.secondInnings]) {
+        for (const score of innings.batsmanScores) {
+          const entry = entryOf(innings.battingTeamId, score.name);
+          entry.ballsFaced += score.balls;
+          entry.runs += score.runs;
+          entry.matches++;
+        }
+        for (const figure of innings.bowlingFigures) {
+          const entry = entryOf(innings.bowlingTeamId, figure.name);
+          entry.ballsBowled += figure.overs * 6;
+          entry.wickets += figure.wickets;
+        }
+      }
+    }
+    const sorted = (map) => JSON.stringify([...map].sort(([a], [b]) => (a < b ? -1 : 1)));
+    const { workload } = await loadWorkload({ cutoff: now.toISOString(), dryRun: true });
+
+    // Dry run: the week's changes, nothing written
+    const dump = JSON.stringify(db.dump());
+    db.resetStats();
+    const dryRun = await runProgression({ ...week(0), dryRun: true, samples: 5 });
+    const dryRunWrites = writesOf(db.stats.byTable);
+    const dryRunUnchanged = JSON.stringify(db.dump()) === dump;
+
+    // The run
+    db.resetStats();
+    const run = await runProgression(week(0));
+    const runQueries = structuredClone(db.stats.byTable);
+    const after = await playersById();
+    const written = [...after.values()].filter(player => player.progressed_week === run.week);
+    const untouched = [...after.values()].filter(player => player.progressed_week !== run.week);
+    const level = (value) => FATIGUE_LEVELS.indexOf(value);
+    const experienceApplied = [...after.values()].every(player => {
+      const load = workload.get(player.id);
+      const gain = load ? 2 * load.matches + Math.floor((load.ballsFaced + load.ballsBowled) / 60) : 0;
+      return player.experience === Math.min(100, before.get(player.id).experience + gain);
+    });
+    const restedRecovered = [...after.values()].filter(player => !workload.has(player.id))
+      .every(player => level(player.fatigue) === Math.max(0, level(before.get(player.id).fatigue) - 2));
+    const diffsWritten = dryRun.diffs.every(diff => Object.entries(diff.after).every(([column, value]) => after.get(diff.id)[column] === value));
+
+    clearReplays();
+    const replays = await Promise.all(matchIds.map(id => scorecard(id)));
+    const { data: pinnedMatches } = await db.from('matches').select('match_data').in('id', matchIds);
+    const rerun = await runProgression(week(0));
+
+    // The week after: no new matches
+    db.resetStats();
+    const nextWeek = await runProgression(week(1));
+    const nextWeekQueries = structuredClone(db.stats.byTable);
+
+    // A run failing part-way and repeated ends where an uninterrupted one does
+    const state = db.dump();
+    const progressionOf = (players) => JSON.stringify([...players.values()].map(player => PROGRESSION_COLUMNS.map(column => player[column])));
+    const clean = await runProgression({ ...week(2), pageSize: 20, writeBatch: 10 });
+    const cleanPlayers = progressionOf(await playersById());
+    db.reset();
+    db.load(state);
+    let failure = null;
+    try {
+      await runProgression({
+        ...week(2),
+        pageSize: 20,
+        writeBatch: 10,
+        onPage: ({ page }) => { if (page === 2) throw new Error('interrupted'); }
+      });
+    } catch (error) {
+      failure = error.message;
+    }
+    const { data: failedRun } = await db.from('player_progression_runs').select('status').eq('id', clean.week).single();
+    const resumed = await runProgression({ ...week(2), pageSize: 20, writeBatch: 10 });
+
+    return {
+      players: before.size,
+      matches: matchIds.length,
+      workload: {
+        matches: sorted(workload) === sorted(expected),
+        players: workload.size,
+        ballsFaced: [...workload.values()].reduce((sum, load) => sum + load.ballsFaced, 0)
+      },
+      dryRun: {
+        writes: dryRunWrites,
+        unchanged: dryRunUnchanged,
+        changed: dryRun.playersChanged,
+        diffs: dryRun.diffs.length,
+        diffColumns: [...new Set(dryRun.diffs.flatMap(diff => Object.keys(diff.after)))].every(column => PROGRESSION_COLUMNS.includes(column)),
+        matches: dryRun.matches
+      },
+      run: {
+        week: run.week,
+        changed: run.playersChanged,
+        matches: run.matches,
+        writes: run.writes,
+        queries: runQueries,
+        written: written.length,
+        untouched: untouched.map(player => player.id).sort(),
+        stableIds,
+        untouchedUnchanged: untouched.every(player => JSON.stringify(player) === JSON.stringify(before.get(player.id))),
+        sameAsDryRun: run.playersChanged === dryRun.playersChanged && JSON.stringify(run.changes) === JSON.stringify(dryRun.changes),
+        diffsWritten,
+        experienceApplied,
+        restedRecovered
+      },
+      replays: {
+        statuses: [...new Set(replays.map(response => response.status))],
+        unchanged: replays.every((response, index) => JSON.stringify(response.body) === JSON.stringify(scorecards[matchIds[index]])),
+        pinned: pinnedMatches.every(match => match.match_data.replay.squads?.length === 2)
+      },
+      rerun: { skipped: rerun.skipped },
+      nextWeek: {
+        since: nextWeek.since,
+        cutoff: run.cutoff,
+        matches: nextWeek.matches,
+        changed: nextWeek.playersChanged,
+        queries: nextWeekQueries
+      },
+      resume: {
+        failure,
+        failedStatus: failedRun.status,
+        skippedOnResume: resumed.playersSkipped,
+        sameAsClean: progressionOf(await playersById()) === cleanPlayers
+      }
+    };
+  }
+};
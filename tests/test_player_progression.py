@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Weekly player progression (lib/players/progression.js, scripts/progression.mjs):
+workload read from the week's completed matches, typed-array batch updates of
+form, fatigue, experience, age, skills and value, only changed rows written
+back in bulk, a dry run that writes nothing, replays of the applied matches
+still served afterwards, and a failed run resumed to the same result. The
+benchmark runs one week over 100k players on the local Supabase stand-in.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(REPO_ROOT, "scripts", "progression.mjs")
+BENCH_PLAYERS = 100000
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("progression")
+
+
+@pytest.fixture(scope="module")
+def bench():
+    if shutil.which("node") is None:
+        pytest.skip("node is required to run the benchmark")
+    completed = subprocess.run(
+        ["node", "--no-warnings", SCRIPT, "bench", "--players", str(BENCH_PLAYERS), "--json"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=600, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def test_workload_matches_the_scorecards(results):
+    workload = results["workload"]
+    assert workload["matches"]
+    # The XIs of the six teams
+    assert workload["players"] == 6 * 11
+    assert workload["ballsFaced"] > 0
+
+
+def test_dry_run_writes_nothing(results):
+    dry_run = results["dryRun"]
+    assert dry_run["writes"] == 0
+    assert dry_run["unchanged"]
+    assert dry_run["diffs"] == 5 and dry_run["diffColumns"]
+    assert dry_run["matches"] == {"read": results["matches"], "applied": results["matches"], "pinned": results["matches"], "unreplayable": 0}
+
+
+def test_run_applies_workload_recovery_and_aging(results):
+    run = results["run"]
+    assert run["sameAsDryRun"] and run["diffsWritten"]
+    assert run["experienceApplied"]
+    assert run["restedRecovered"]
+
+
+def test_only_changed_rows_are_written_in_bulk(results):
+    run = results["run"]
+    assert run["written"] == run["changed"] < results["players"]
+    assert run["untouched"] and set(run["untouched"]) <= set(run["stableIds"])
+    assert run["untouchedUnchanged"]
+    # One page of players, one bulk write each for players and pinned matches
+    assert run["queries"]["players"] == {"select": 2, "upsert": 1}
+    assert run["queries"]["matches"] == {"select": 1, "upsert": 1}
+
+
+def test_applied_matches_still_replay(results):
+    replays = results["replays"]
+    assert replays["statuses"] == [200]
+    assert replays["unchanged"]
+    assert replays["pinned"]
+
+
+def test_a_week_runs_once_and_the_next_starts_at_its_cutoff(results):
+    assert results["rerun"]["skipped"]
+    next_week = results["nextWeek"]
+    assert next_week["since"] == next_week["cutoff"]
+    assert next_week["matches"]["read"] == 0
+    assert "upsert" not in next_week["queries"]["matches"]
+
+
+def test_failed_run_resumes_to_the_same_result(results):
+    resume = results["resume"]
+    assert resume["failure"] == "interrupted"
+    assert resume["failedStatus"] == "running"
+    # Rows written before the failure are not progressed twice
+    assert resume["skippedOnResume"] > 0
+    assert resume["sameAsClean"]
+
+
+def test_benchmark_100k_players(bench, record_property):
+    run = bench["run"]
+    record_property("run_ms", run["ms"])
+    record_property("compute_ms", run["computeMs"])
+    record_property("workload_ms", run["workloadMs"])
+    record_property("players_per_sec", run["playersPerSec"])
+    record_property("dry_run_ms", bench["dryRun"]["ms"])
+    record_property("next_week_changed", bench["nextWeek"]["changed"])
+    assert bench["dryRun"]["changed"] == run["changed"]
+    assert run["matches"]["applied"] == bench["matches"]
+    # Keyset pages read and bulk writes, never a query per player
+    assert run["pages"] == BENCH_PLAYERS // 5000
+    # Each page's changed rows go out in upserts of up to 1000
+    assert -(-run["changed"] // 1000) <= run["writes"] <= run["pages"] * 5
+    assert run["queries"]["players"]["upsert"] == run["writes"]
+    assert run["queries"]["matches"].get("update", 0) == 0
+    assert run["computeMs"] < 3000
+    assert run["ms"] < 30000
+    assert bench["rerun"]["skipped"]
@@ -0,0 +1,110 @@
+// Route harness scenarios of test_route_metrics.py (route_scenario in tests/conftest.py)
+
+import { BASE_URL, call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Route instrumentation: the Prometheus text served after a mix of
+  // requests, the slow-request log and the per-request cost of the wrapper
+  async metrics() {
+    process.env.SLOW_REQUEST_MS = '1';
+    process.env.SIMULATION_WORKERS = '0';
+    seedLeague(db, { teams: 8, rounds: 4 });
+    const { GET } = await catchAll();
+    const { GET: health } = await import('@/app/api/health/route');
+    const { GET: scrape } = await import('@/app/api/health/metrics/route');
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const { resetMetrics } = await import('@/lib/metrics/registry');
+    const { withMetrics } = await import('@/lib/metrics/route');
+    resetMetrics();
+
+    const warnings = [];
+    const warn = console.warn;
+    console.warn = (message) => warnings.push(String(message));
+
+    const observed = {};
+    const request = async (handler, path, options) => {
+      const response = await call(handler, path, options);
+      observed[path] = response;
+      return response;
+    };
+    const { body: { id: matchId } } = await call(GET, '/matches/default-1-match-1', { params: { path: ['matches', 'default-1-match-1'] } });
+    await request(GET, '/matches/default-1-match-2', { params: { path: ['matches', 'default-1-match-2'] } });
+    await request(GET, '/matches?limit=20', { params: { path: ['matches'] } });
+    await request(GET, '/matches/no-such-match-9', { params: { path: ['matches', 'no-such-match-9'] } });
+    await request(GET, '/marketplace?limit=5', { params: { path: ['marketplace'] } });
+    await request(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: 'team-0', limit: 4 } });
+    // Unknown paths share one label however many are probed
+    for (const probe of [['foo'], ['bar'], ['players', 'abc', 'def']]) {
+      await call(GET, `/${probe.join('/')}`, { params: { path: probe } });
+    }
+    const healthResponse = await call(health, '/health');
+    console.warn = warn;
+
+    const response = await scrape(new Request(`${BASE_URL}/health/metrics`));
+    const text = await response.text();
+    const samples = [];
+    for (const line of text.split('\n')) {
+      const match = line.match(/^(\w+)(?:\{(.*)\})? (\S+)$/);
+      if (!match) continue;
+      const labels = Object.fromEntries([...(match[2] || '').matchAll(/(\w+)="((?:[^"\\]|\\.)*)"/g)].map(([, name, value]) => [name, value]));
+      samples.push({ name: match[1], labels, value: Number(match[3]) });
+    }
+    const sample = (name, route, extra = {}) => samples.find(entry => entry.name === name && entry.labels.route === route
+      && Object.entries(extra).every(([label, value]) => entry.labels[label] === value))?.value;
+
+    const routes = [...new Set(samples.filter(entry => entry.labels.route).map(entry => entry.labels.route))].sort();
+    const histogramsConsistent = routes.every(route => ['cricket_http_request_duration_seconds', 'cricket_http_request_queries'].every(name => {
+      const buckets = samples.filter(entry => entry.name === `${name}_bucket` && entry.labels.route === route);
+      const monotonic = buckets.every((entry, i) => i === 0 || entry.value >= buckets[i - 1].value);
+      return monotonic && buckets[buckets.length - 1].labels.le === '+Inf' && buckets[buckets.length - 1].value === sample(`${name}_count`, route);
+    }));
+
+    const slow = warnings.filter(message => message.startsWith('Slow request: ')).map(message => JSON.parse(message.slice('Slow request: '.length)));
+    const slowQuickSim = slow.find(entry => entry.route === 'POST /api/matches/quick-sim');
+
+    // Cost of the wrapper around a handler that does nothing
+    const bare = async () => new Response('ok');
+    const wrapped = withMetrics(bare);
+    const timeCalls = async (handler) => {
+      const startedAt = performance.now();
+      for (let i = 0; i < 5000; i++) await handler(new Request(`${BASE_URL}/overhead/${i}`));
+      return (performance.now() - startedAt) / 5000;
+    };
+    await timeCalls(wrapped);
+    const bareMs = await timeCalls(bare);
+    const wrappedMs = await timeCalls(wrapped);
+
+    return {
+      matchId,
+      contentType: response.headers.get('Content-Type'),
+      routes,
+      histogramsConsistent,
+      matchRequests: sample('cricket_http_request_duration_seconds_count', 'GET /api/matches/:id'),
+      notFound: sample('cricket_http_requests_total', 'GET /api/matches/:id', { status: '404' }),
+      unmatchedRequests: sample('cricket_http_request_duration_seconds_count', 'unmatched'),
+      queriesMax: {
+        matchList: sample('cricket_http_request_queries_max', 'GET /api/matches'),
+        matchListHeader: observed['/matches?limit=20'].queries,
+        quickSim: sample('cricket_http_request_queries_max', 'POST /api/matches/quick-sim'),
+        quickSimHeader: observed['/matches/quick-sim'].queries
+      },
+      rows: sample('cricket_db_rows_total', 'GET /api/matches'),
+      dbSeconds: sample('cricket_db_seconds_total', 'POST /api/matches/quick-sim'),
+      simulationSeconds: {
+        quickSim: sample('cricket_simulation_seconds_total', 'POST /api/matches/quick-sim'),
+        matchList: sample('cricket_simulation_seconds_total', 'GET /api/matches')
+      },
+      slow: {
+        // The health request reports the slow requests before its own
+        count: slow.filter(entry => entry.route !== 'GET /api/health').length,
+        quickSimBreakdown: slowQuickSim?.breakdown.map(({ table, operation, count }) => ({ table, operation, count })),
+        quickSimBreakdownQueries: slowQuickSim?.breakdown.reduce((sum, group) => sum + group.count, 0),
+        quickSimQueries: slowQuickSim?.queries,
+        quickSimSimulationMs: slowQuickSim?.simulationMs
+      },
+      health: healthResponse.body.requests,
+      overhead: { bareMs, wrappedMs }
+    };
+  }
+};
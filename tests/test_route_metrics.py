@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Route instrumentation (lib/metrics, GET /api/health/metrics): per-route
+latency and query histograms, rows, database and simulation time in the
+Prometheus text format, the slow-request log with its query breakdown.
+Per-endpoint query budgets are checked by test_api_budgets.py, per-route
+budgets on the scraped metrics by conftest.py.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("metrics")
+
+
+def test_metrics_are_prometheus_text(results):
+    assert results["contentType"].startswith("text/plain; version=0.0.4")
+    assert results["histogramsConsistent"]
+
+
+def test_routes_are_labelled_by_template(results):
+    assert results["routes"] == [
+        "GET /api/health",
+        "GET /api/marketplace",
+        "GET /api/matches",
+        "GET /api/matches/:id",
+        "POST /api/matches/quick-sim",
+        "unmatched",
+    ]
+    assert results["matchRequests"] == 3
+    assert results["notFound"] == 1
+    assert results["unmatchedRequests"] == 3
+
+
+def test_query_counts_match_the_response_headers(results):
+    queries = results["queriesMax"]
+    assert queries["matchList"] == queries["matchListHeader"] > 0
+    assert queries["quickSim"] == queries["quickSimHeader"] > 0
+    assert results["rows"] > 0
+    assert results["dbSeconds"] > 0
+
+
+def test_simulation_time_is_attributed_to_its_route(results):
+    assert results["simulationSeconds"]["quickSim"] > 0
+    assert results["simulationSeconds"]["matchList"] == 0
+
+
+def test_slow_requests_are_logged_with_their_queries(results):
+    slow = results["slow"]
+    assert slow["count"] > 0
+    assert slow["quickSimBreakdownQueries"] == slow["quickSimQueries"]
+    assert {"table": "matches", "operation": "upsert", "count": 1} in slow["quickSimBreakdown"]
+    assert results["health"]["slow"] == slow["count"]
+    assert results["health"]["slowThresholdMs"] == 1
+
+
+def test_instrumentation_is_lightweight(results, record_property):
+    overhead = results["overhead"]
+    record_property("overhead_us", round((overhead["wrappedMs"] - overhead["bareMs"]) * 1000, 1))
+    assert overhead["wrappedMs"] - overhead["bareMs"] < 0.1
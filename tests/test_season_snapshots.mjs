@@ -0,0 +1,80 @@
+// Route harness scenarios of test_season_snapshots.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Completed seasons served from frozen snapshots as seasons accumulate
+  async 'season-snapshots'() {
+    seedLeague(db, { teams: 6, rounds: 10 });
+    const { GET, PUT } = await catchAll();
+    const { GET: leagues } = await import('@/app/api/leagues/route');
+    const { POST: schedule } = await import('@/app/api/matches/schedule/route');
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const { calculateLeagueStandings } = await import('@/lib/league/standings');
+
+    const users = (await db.from('users').select('id, team_name')).data;
+    const seasonMatches = async (season) => (await db.from('matches').select('*').eq('season', season).eq('status', 'completed')).data;
+    const results = { seasons: [] };
+    const liveTables = {};
+
+    for (let season = 1; season <= 8; season++) {
+      await call(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: 'team-0', limit: 500 } });
+      liveTables[season] = calculateLeagueStandings(users, await seasonMatches(String(season)));
+      const scheduled = await call(schedule, '/matches/schedule', { method: 'POST', body: { leagueId: 'default' } });
+
+      db.resetStats();
+      const history = await call(leagues, '/leagues?history=true');
+      const matchReads = db.stats.byTable.matches?.select || 0;
+      const revalidated = await call(leagues, '/leagues?history=true', { headers: { 'If-None-Match': history.etag } });
+      const catchAllHistory = await call(GET, '/leagues?history=true', { params: { path: ['leagues'] } });
+
+      results.seasons.push({
+        scheduleStatus: scheduled.status,
+        seasons: history.body.history.map(entry => entry.season),
+        queries: history.queries,
+        matchReads,
+        cacheControl: history.cacheControl,
+        revalidatedStatus: revalidated.status,
+        revalidatedBody: revalidated.body,
+        catchAllQueries: catchAllHistory.queries,
+        catchAllCurrentSeason: catchAllHistory.body.currentSeason
+      });
+    }
+
+    const { body: { history } } = await call(leagues, '/leagues?history=true');
+    results.matchesLiveTables = history.every(entry => JSON.stringify(entry.standings) === JSON.stringify(liveTables[entry.season]));
+    results.aggregates = history.map(entry => ({ season: entry.season, totalMatches: entry.totalMatches, ...entry.aggregates }));
+
+    const single = await call(leagues, '/leagues?history=true&season=3');
+    const singleRevalidated = await call(leagues, '/leagues?history=true&season=3', { headers: { 'If-None-Match': single.etag } });
+    const active = await call(leagues, '/leagues?history=true&season=9');
+    results.single = {
+      season: single.body.season,
+      cacheControl: single.cacheControl,
+      revalidatedStatus: singleRevalidated.status,
+      activeSeasonStatus: active.status
+    };
+
+    // A rename does not rewrite history; an edit to a past match re-freezes it
+    await call(PUT, '/users/team-2', { method: 'PUT', body: { team_name: 'Renamed XI' }, params: { path: ['users', 'team-2'] } });
+    const afterRename = await call(leagues, '/leagues?history=true&season=3', { headers: { 'If-None-Match': single.etag } });
+
+    const [pastMatch] = await seasonMatches('3');
+    await call(PUT, `/matches/${pastMatch.id}`, {
+      method: 'PUT',
+      body: { home_score: 400, away_score: 10 },
+      params: { path: ['matches', pastMatch.id] }
+    });
+    const afterEdit = await call(leagues, '/leagues?history=true&season=3', { headers: { 'If-None-Match': single.etag } });
+    results.changes = {
+      renameStatus: afterRename.status,
+      editStatus: afterEdit.status,
+      editHighestScore: afterEdit.body?.aggregates.highestTeamScore.score,
+      editMatchesRecompute: JSON.stringify(afterEdit.body?.standings.map(team => team.points)) ===
+        JSON.stringify(calculateLeagueStandings(users, await seasonMatches('3')).map(team => team.points))
+    };
+
+    return results;
+  }
+};
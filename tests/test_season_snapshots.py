@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Completed-season history served from frozen snapshots (lib/league/season-snapshots.js)
+with strong ETags, across eight seasons played through quick-sim and the schedule route.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("season-snapshots")
+
+
+def test_history_cost_does_not_grow_with_seasons(results):
+    seasons = results["seasons"]
+    assert [entry["scheduleStatus"] for entry in seasons] == [200] * 8
+    assert [len(entry["seasons"]) for entry in seasons] == list(range(1, 9))
+    assert seasons[-1]["seasons"] == [str(season) for season in range(8, 0, -1)]
+    assert {entry["queries"] for entry in seasons} == {2}
+    assert {entry["catchAllQueries"] for entry in seasons} == {3}
+    assert {entry["matchReads"] for entry in seasons} == {0}, "history must not read matches"
+
+
+def test_history_revalidates_with_etag(results):
+    for entry in results["seasons"]:
+        assert entry["cacheControl"] == "public, no-cache"
+        assert entry["revalidatedStatus"] == 304
+        assert entry["revalidatedBody"] is None
+
+
+def test_snapshots_match_live_standings_at_completion(results):
+    assert results["matchesLiveTables"]
+    for aggregates in results["aggregates"]:
+        assert aggregates["totalMatches"] == 30
+        assert aggregates["highestTeamScore"]["score"] >= aggregates["lowestTeamScore"]["score"]
+
+
+def test_single_season_snapshot_is_revalidated(results):
+    single = results["single"]
+    assert single["season"] == "3"
+    # Re-frozen on past-match edits, so never cached without revalidation
+    assert single["cacheControl"] == "public, no-cache"
+    assert single["revalidatedStatus"] == 304
+    assert single["activeSeasonStatus"] == 404
+
+
+def test_past_match_edit_refreezes_snapshot(results):
+    changes = results["changes"]
+    assert changes["renameStatus"] == 304, "a rename must not rewrite history"
+    assert changes["editStatus"] == 200
+    assert changes["editHighestScore"] == 400
+    assert changes["editMatchesRecompute"]
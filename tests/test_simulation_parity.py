@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Statistical parity between the per-ball innings engine (simulateInnings) and the
+batch Monte Carlo engine (simulateInningsBatch).
+
+Both engines are driven through scripts/bench-simulation.mjs on fixed squads and
+conditions; the mean runs, wickets and balls of each scenario must agree within
+a few standard errors, as must each batting position's average contribution.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARNESS = os.path.join(REPO_ROOT, "scripts", "bench-simulation.mjs")
+SAMPLES_PER_ENGINE = 4000
+MAX_Z_SCORE = 4.5
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run the simulation engines")
+
+
+def run_harness(*args):
+    """Run the node harness and return its parsed JSON output"""
+    completed = subprocess.run(
+        ["node", "--no-warnings", HARNESS, *args],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+@pytest.fixture(scope="module")
+def parity_results():
+    return run_harness("parity", "--n", str(SAMPLES_PER_ENGINE))
+
+
+def z_score(a, b):
+    standard_error = (a["sd"] ** 2 / a["n"] + b["sd"] ** 2 / b["n"]) ** 0.5
+    if standard_error == 0:
+        return 0.0 if a["mean"] == b["mean"] else float("inf")
+    return abs(a["mean"] - b["mean"]) / standard_error
+
+
+@pytest.mark.parametrize("metric", ["runs", "wickets", "balls"])
+def test_innings_totals_match(parity_results, metric):
+    for scenario in parity_results:
+        z = z_score(scenario["scalar"][metric], scenario["batch"][metric])
+        assert z < MAX_Z_SCORE, (
+            f"{scenario['scenario']}: {metric} mean per-ball={scenario['scalar'][metric]['mean']:.2f} "
+            f"batch={scenario['batch'][metric]['mean']:.2f} (z={z:.2f})"
+        )
+
+
+def test_batting_order_contributions_match(parity_results):
+    for scenario in parity_results:
+        scalar_runs = scenario["scalar"]["batsmanRunsMean"]
+        batch_runs = scenario["batch"]["batsmanRunsMean"]
+        assert len(scalar_runs) == len(batch_runs)
+        for position, (expected, actual) in enumerate(zip(scalar_runs, batch_runs), start=1):
+            # Absolute slack for the tail, relative slack for the top order
+            assert abs(expected - actual) <= max(1.0, 0.12 * expected), (
+                f"{scenario['scenario']}: batsman {position} averaged {expected:.2f} per-ball vs {actual:.2f} batch"
+            )
+
+
+def test_conditions_shift_scoring(parity_results):
+    by_name = {scenario["scenario"]: scenario for scenario in parity_results}
+    sunny = by_name["sunny-normal"]["batch"]["runs"]["mean"]
+    rainy = by_name["rainy-dusty"]["batch"]["runs"]["mean"]
+    assert rainy < sunny, "bowling-friendly conditions should lower the batch engine's scoring"
+
+
+def test_benchmark_reports_throughput():
+    results = run_harness("bench", "--n", "5000", "--json")
+    for engine in ("perBall", "batch", "batchPerPlayer"):
+        assert results[engine]["inningsPerSecond"] > 0
+    print(f"\nper-ball: {results['perBall']['inningsPerSecond']:.0f} innings/s, "
+          f"batch: {results['batch']['inningsPerSecond']:.0f} innings/s ({results['speedup']:.1f}x)")
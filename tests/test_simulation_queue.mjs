@@ -0,0 +1,160 @@
+// Route harness scenarios of test_simulation_queue.py (route_scenario in tests/conftest.py)
+
+import { awaitJob, call, catchAll, db, percentile, sleep } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Concurrent simulate requests (with duplicates and an overlapping quick-sim)
+  // while /api/health is polled: job dedupe, standings applied once per match
+  // and health latency against an idle baseline
+  async 'simulation-queue'(workers = '2') {
+    process.env.SIMULATION_WORKERS = workers;
+    const { matchIds } = seedLeague(db, { teams: 20, rounds: 10 });
+    const { POST } = await catchAll();
+    const { GET: health } = await import('@/app/api/health/route');
+    const { GET: jobMetrics } = await import('@/app/api/jobs/route');
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const { checkStandings } = await import('@/lib/league/standings-store');
+
+    // Latency of a health check due every 2 ms, counted from when it was due
+    // so that time spent waiting for a busy event loop is included
+    const probeHealth = async (until) => {
+      const latencies = [];
+      while (!until()) {
+        const dueAt = performance.now() + 2;
+        await sleep(2);
+        await call(health, '/health');
+        latencies.push(performance.now() - dueAt);
+      }
+      return { samples: latencies.length, p50: percentile(latencies, 0.5), p95: percentile(latencies, 0.95), max: percentile(latencies, 1) };
+    };
+
+    const baselineEnd = Date.now() + 300;
+    const baseline = await probeHealth(() => Date.now() > baselineEnd);
+
+    // Every match twice by id and once through the { matchId } body form, in
+    // one burst, with a quick-sim racing the queued jobs. Health is probed
+    // while the burst is accepted and then while the queued jobs run.
+    let accepted = false;
+    let finished = false;
+    const duringBurst = probeHealth(() => accepted);
+    const submissions = await Promise.all([
+      call(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: 'team-0', limit: 20 } }),
+      ...matchIds.flatMap(matchId => [
+        call(POST, `/matches/${matchId}/simulate`, { method: 'POST', params: { path: ['matches', matchId, 'simulate'] } }),
+        call(POST, `/matches/${matchId}/simulate`, { method: 'POST', params: { path: ['matches', matchId, 'simulate'] } }),
+        call(POST, '/matches/simulate', { method: 'POST', body: { matchId }, params: { path: ['matches', 'simulate'] } })
+      ])
+    ]);
+    accepted = true;
+    const burst = await duringBurst;
+    const underLoad = probeHealth(() => finished);
+    const quick = submissions.shift();
+    const queued = submissions.filter(submission => submission.status === 202);
+    const jobs = await Promise.all([...new Set(queued.map(submission => submission.body.id))].map(id => awaitJob(id, { intervalMs: 50 })));
+    finished = true;
+    const load = await underLoad;
+
+    const { data: matches } = await db.from('matches').select('id, status').in('id', matchIds);
+    const { data: standings } = await db.from('league_standings').select('played').eq('league', 'default').eq('season', '1');
+    const metrics = await call(jobMetrics, '/jobs');
+    const resubmitted = await call(POST, `/matches/${matchIds[0]}/simulate`, { method: 'POST', params: { path: ['matches', matchIds[0], 'simulate'] } });
+
+    const jobIdsByMatch = new Map();
+    for (const submission of queued) {
+      const ids = jobIdsByMatch.get(submission.body.matchId) || new Set();
+      ids.add(submission.body.id);
+      jobIdsByMatch.set(submission.body.matchId, ids);
+    }
+
+    return {
+      matches: matchIds.length,
+      submitStatuses: [...new Set(submissions.map(submission => submission.status))].sort(),
+      accepted: queued.length,
+      jobsPerMatch: [...new Set([...jobIdsByMatch.values()].map(ids => ids.size))],
+      jobStatuses: jobs.map(job => job.job.status).reduce((counts, status) => ({ ...counts, [status]: (counts[status] || 0) + 1 }), {}),
+      failedErrors: [...new Set(jobs.filter(job => job.job.status === 'failed').map(job => job.job.error))],
+      quickSim: { status: quick.status, simulated: quick.body.simulated ?? 0 },
+      completedMatches: matches.filter(match => match.status === 'completed').length,
+      standingsPlayed: standings.reduce((sum, row) => sum + row.played, 0),
+      standingsConsistent: (await checkStandings('default', '1')).consistent,
+      resubmitted: { status: resubmitted.status, jobStatus: resubmitted.body.status, hasResult: Boolean(resubmitted.body.result) },
+      metrics: metrics.body,
+      health: { baseline, burst, load }
+    };
+  },
+
+  // Every fixture of one team simulated at once on four workers, with a
+  // round-trip latency that keeps the jobs' standings writes overlapping
+  async 'shared-team-jobs'() {
+    process.env.SIMULATION_WORKERS = '4';
+    seedLeague(db, { teams: 8, rounds: 7 });
+    const { POST } = await catchAll();
+    const { checkStandings } = await import('@/lib/league/standings-store');
+
+    const { data: fixtures } = await db.from('matches')
+      .select('id')
+      .or('home_team_id.eq.team-0,away_team_id.eq.team-0');
+    const matchIds = fixtures.map(match => match.id).slice(0, 4);
+
+    db.latencyMs = 20;
+    const submissions = await Promise.all(matchIds.map(matchId =>
+      call(POST, `/matches/${matchId}/simulate`, { method: 'POST', params: { path: ['matches', matchId, 'simulate'] } })
+    ));
+    const jobs = await Promise.all(submissions.map(submission => awaitJob(submission.body.id, { intervalMs: 20 })));
+    db.latencyMs = 0;
+
+    const { data: standings } = await db.from('league_standings').select('team_id, played').eq('league', 'default').eq('season', '1');
+    const played = Object.fromEntries(standings.filter(row => row.played > 0).map(row => [row.team_id, row.played]));
+
+    return {
+      submitStatuses: submissions.map(submission => submission.status),
+      jobStatuses: jobs.map(job => job.job.status),
+      played,
+      standingsConsistent: (await checkStandings('default', '1')).consistent
+    };
+  },
+
+  // Simulate requests for a match that is live (started, then paused) or was
+  // started while its job was queued; each fixture is completed once
+  async 'simulate-live'() {
+    process.env.SIMULATION_WORKERS = '0';
+    process.env.LIVE_BALL_INTERVAL_MS = '1';
+    const { matchIds: [startedId, pausedId, racedId] } = seedLeague(db, { teams: 6, rounds: 1 });
+    const { GET, POST } = await catchAll();
+    const { jobForMatch, submitSimulation } = await import('@/lib/jobs/simulation-queue');
+    const { checkStandings } = await import('@/lib/league/standings-store');
+    const matchPath = (matchId, action) => ({ params: { path: ['matches', matchId, action] } });
+    const simulate = matchId => call(POST, `/matches/${matchId}/simulate`, { method: 'POST', ...matchPath(matchId, 'simulate') });
+
+    const started = await call(GET, `/matches/${startedId}/start`, matchPath(startedId, 'start'));
+    const whileLive = await simulate(startedId);
+
+    await db.from('matches').update({ status: 'paused' }).eq('id', pausedId);
+    const whilePaused = await simulate(pausedId);
+
+    // A job read the match as scheduled, then it went live before the write
+    const { job } = submitSimulation(racedId);
+    await db.from('matches').update({ status: 'in-progress' }).eq('id', racedId);
+    while (jobForMatch(racedId).status !== 'failed' && jobForMatch(racedId).status !== 'done') await sleep(5);
+
+    let status;
+    do {
+      await sleep(20);
+      ({ data: { status } } = await db.from('matches').select('status').eq('id', startedId).single());
+    } while (status !== 'completed');
+
+    const { data: matches } = await db.from('matches').select('id, status').in('id', [startedId, pausedId, racedId]);
+    const { data: standings } = await db.from('league_standings').select('played').eq('league', 'default').eq('season', '1');
+
+    return {
+      startStatus: started.status,
+      simulateStatuses: { live: whileLive.status, paused: whilePaused.status },
+      errors: [whileLive.body.error, whilePaused.body.error],
+      racedJob: { status: jobForMatch(racedId).status, error: jobForMatch(racedId).error, sameJob: jobForMatch(racedId).id === job.id },
+      matchStatuses: Object.fromEntries(matches.map(match => [match.id, match.status])),
+      standingsPlayed: standings.reduce((sum, row) => sum + row.played, 0),
+      standingsConsistent: (await checkStandings('default', '1')).consistent
+    };
+  }
+};
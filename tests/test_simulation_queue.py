@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Simulation job queue (POST /api/matches/:id/simulate, lib/jobs/simulation-queue.js):
+a burst of concurrent simulate requests with duplicates on the local stand-in,
+run on the worker pool and, for comparison, inline on the main thread, and the
+worker script traced into the production build.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import subprocess
+
+import pytest
+
+from tests.conftest import REPO_ROOT, require_node
+
+# Most a health request may slow down (p95) while jobs run, relative to the
+# idle server on the same machine
+HEALTH_SLOWDOWN = 50
+WORKER_SCRIPT = "lib/jobs/simulation-worker.js"
+RELATIVE_IMPORT = re.compile(r"""^(?:import|export)\b[^'"]*?from\s+['"](\.[^'"]+)['"]""", re.MULTILINE)
+
+
+@pytest.fixture(scope="module")
+def pooled(route_scenario):
+    return route_scenario("simulation-queue", "2")
+
+
+@pytest.fixture(scope="module")
+def inline(route_scenario):
+    return route_scenario("simulation-queue", "0")
+
+
+@pytest.fixture(scope="module")
+def shared_team(route_scenario):
+    return route_scenario("shared-team-jobs")
+
+
+@pytest.fixture(scope="module")
+def live(route_scenario):
+    return route_scenario("simulate-live")
+
+
+def test_duplicate_submissions_share_one_job(pooled):
+    # A racing quick-sim that claimed a match first answers its submissions
+    # with 409, both while it runs and once the match is completed
+    assert set(pooled["submitStatuses"]) <= {202, 409}
+    assert pooled["jobsPerMatch"] == [1]
+    metrics = pooled["metrics"]
+    assert metrics["submitted"] + pooled["quickSim"]["simulated"] == pooled["matches"]
+    assert metrics["submitted"] + metrics["deduplicated"] == pooled["accepted"]
+    assert metrics["depth"] == 0 and metrics["running"] == 0
+    assert metrics["waitMs"]["p95"] is not None
+
+
+def test_every_match_is_simulated_once(pooled):
+    assert pooled["failedErrors"] == []
+    assert pooled["jobStatuses"].get("done", 0) + pooled["quickSim"]["simulated"] == pooled["matches"]
+    assert pooled["completedMatches"] == pooled["matches"]
+    assert pooled["standingsPlayed"] == 2 * pooled["matches"]
+    assert pooled["standingsConsistent"]
+
+
+def test_jobs_sharing_a_team_all_reach_the_standings(shared_team):
+    assert shared_team["submitStatuses"] == [202] * 4
+    assert shared_team["jobStatuses"] == ["done"] * 4
+    # Four fixtures of team-0 against four different opponents
+    assert shared_team["played"]["team-0"] == 4
+    assert sorted(shared_team["played"].values()) == [1, 1, 1, 1, 4]
+    assert shared_team["standingsConsistent"]
+
+
+def test_live_matches_are_not_simulated(live):
+    assert live["startStatus"] == 200
+    assert live["simulateStatuses"] == {"live": 409, "paused": 409}
+    assert live["errors"] == ["Match already in-progress", "Match already paused"]
+    # A job whose match went live after it was read does not write a result
+    assert live["racedJob"] == {"status": "failed", "error": "Match is no longer scheduled", "sameJob": True}
+    assert sorted(live["matchStatuses"].values()) == ["completed", "in-progress", "paused"]
+    # Only the started match completed, once
+    assert live["standingsPlayed"] == 2
+    assert live["standingsConsistent"]
+
+
+def test_resubmitting_a_finished_match_returns_its_job(pooled):
+    assert pooled["resubmitted"] == {"status": 200, "jobStatus": "done", "hasResult": True}
+
+
+def test_health_latency_stays_flat(pooled, inline, record_property):
+    health = pooled["health"]
+    for phase in ("baseline", "burst", "load"):
+        record_property(f"health_{phase}_p50_ms", health[phase]["p50"])
+        record_property(f"health_{phase}_p95_ms", health[phase]["p95"])
+    record_property("inline_health_burst_max_ms", inline["health"]["burst"]["max"])
+    # Bounds relative to the same machine idle, so a slow runner moves both
+    idle = health["baseline"]["p95"]
+    assert health["load"]["p95"] <= HEALTH_SLOWDOWN * idle, (
+        f"health p95 {health['load']['p95']:.1f} ms while jobs run, idle {idle:.1f} ms"
+    )
+    # Simulating on the main thread stalls requests behind the whole burst
+    assert health["burst"]["max"] < inline["health"]["burst"]["max"]
+
+
+def glob_matches(path, pattern):
+    # "**/" also matches no directory at all
+    return fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(path, pattern.replace("**/", ""))
+
+
+def relative_imports(path):
+    """`path` and every module it imports by a relative specifier, recursively"""
+    seen = set()
+    pending = [os.path.normpath(path)]
+    while pending:
+        module = pending.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        with open(os.path.join(REPO_ROOT, module)) as source:
+            for specifier in RELATIVE_IMPORT.findall(source.read()):
+                pending.append(os.path.normpath(os.path.join(os.path.dirname(module), specifier)))
+    return seen
+
+
+def test_worker_script_ships_with_the_build():
+    # The pool starts the worker by path, which the bundler does not follow,
+    # so next.config.js must trace the script and its imports into the build
+    require_node()
+    includes = json.loads(subprocess.run(
+        ["node", "-e", "console.log(JSON.stringify(require('./next.config.js').experimental.outputFileTracingIncludes))"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout)
+    patterns = [pattern for route, patterns in includes.items() if glob_matches("/api/matches/simulate", route)
+                for pattern in patterns]
+    untraced = [module for module in sorted(relative_imports(WORKER_SCRIPT))
+                if not any(glob_matches(f"./{module}", pattern) for pattern in patterns)]
+    assert not untraced, f"not traced into the build: {untraced}"
@@ -0,0 +1,107 @@
+// Route harness scenarios of test_standings.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Incrementally maintained standings against full recomputation
+  async standings() {
+    const { teamIds } = seedLeague(db, { teams: 12, rounds: 22 });
+    const { GET, POST, PUT, DELETE } = await catchAll();
+    const { GET: leagues } = await import('@/app/api/leagues/route');
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const { checkStandings, rebuildStandings } = await import('@/lib/league/standings-store');
+    const { calculateLeagueStandings } = await import('@/lib/league/standings');
+
+    const completedMatches = async () => (await db.from('matches').select('*').eq('status', 'completed')).data;
+    const users = (await db.from('users').select('id, team_name')).data;
+    const results = { reads: [] };
+
+    const readTable = async () => {
+      await call(leagues, '/leagues');
+      const table = await call(leagues, '/leagues');
+      const catchAllTable = await call(GET, '/leagues', { params: { path: ['leagues'] } });
+      results.reads.push({
+        completed: (await completedMatches()).length,
+        queries: table.queries,
+        catchAllQueries: catchAllTable.queries,
+        totalMatches: table.body.totalMatches
+      });
+      return table.body.leagueTable;
+    };
+
+    await readTable();
+    for (const limit of [6, 30, 60]) {
+      await call(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: teamIds[0], limit } });
+      await readTable();
+    }
+
+    const { data: [scheduled] } = await db.from('matches').select('id').eq('status', 'scheduled').limit(1);
+    const completed = await call(PUT, `/matches/${scheduled.id}`, {
+      method: 'PUT',
+      body: { status: 'completed', home_score: 150, away_score: 150, home_overs: 20, away_overs: 20 },
+      params: { path: ['matches', scheduled.id] }
+    });
+    const afterComplete = await checkStandings('default', '1');
+
+    const edited = await call(PUT, `/matches/${scheduled.id}`, {
+      method: 'PUT',
+      body: { away_score: 151 },
+      params: { path: ['matches', scheduled.id] }
+    });
+    const afterEdit = await checkStandings('default', '1');
+
+    const [firstCompleted] = await completedMatches();
+    const deleted = await call(DELETE, `/matches/${firstCompleted.id}`, { method: 'DELETE', params: { path: ['matches', firstCompleted.id] } });
+    const afterDelete = await checkStandings('default', '1');
+
+    const leagueTable = await readTable();
+    const recomputed = calculateLeagueStandings(users, await completedMatches());
+    results.transitions = {
+      statuses: [completed.status, edited.status, deleted.status],
+      consistent: [afterComplete.consistent, afterEdit.consistent, afterDelete.consistent],
+      matchesFullRecompute: JSON.stringify(leagueTable) === JSON.stringify(recomputed),
+      totalPoints: leagueTable.reduce((sum, team) => sum + team.points, 0)
+    };
+
+    await db.from('league_standings').update({ points: 999, form: [] }).eq('team_id', teamIds[3]);
+    const corrupted = await checkStandings('default', '1');
+    const rebuilt = await rebuildStandings('default', '1');
+    const repaired = await checkStandings('default', '1');
+    results.repair = {
+      mismatchedFields: corrupted.mismatches.map(mismatch => mismatch.field).sort(),
+      rebuiltTeams: rebuilt.teams,
+      consistent: repaired.consistent
+    };
+
+    // A team registered mid-season gets its zero row at registration; one
+    // that has none (registered before rows were seeded) gets it on a rebuild
+    const registered = await call(POST, '/auth/register', {
+      method: 'POST',
+      body: { email: 'late@cricket.com', password: 'x', username: 'late', team_name: 'Late XI', country: 'England' },
+      params: { path: ['auth', 'register'] }
+    });
+    await db.from('users').insert({ id: 'legacy-team', team_name: 'Legacy XI' });
+    const tableEntries = async (ids) => {
+      const table = (await call(leagues, '/leagues')).body.leagueTable;
+      const catchAllTable = (await call(GET, '/leagues', { params: { path: ['leagues'] } })).body.leagueTable;
+      return {
+        teams: [table.length, catchAllTable.length],
+        entries: [table, catchAllTable].flatMap(entries => ids.map(id => entries.find(team => team.id === id) ?? null))
+      };
+    };
+    const afterRegistration = await tableEntries([registered.body.id, 'legacy-team']);
+    const registeredConsistent = (await checkStandings('default', '1')).mismatches.map(mismatch => mismatch.teamId);
+    await rebuildStandings('default', '1');
+    const afterRebuild = await tableEntries([registered.body.id, 'legacy-team']);
+    results.lateRegistration = {
+      status: registered.status,
+      afterRegistration,
+      mismatchedTeams: registeredConsistent,
+      afterRebuild,
+      consistent: (await checkStandings('default', '1')).consistent
+    };
+
+    return results;
+  }
+};
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+League standings maintained incrementally in league_standings
+(lib/league/standings-store.js): read cost, match transitions and the
+consistency check against a full recomputation, and registered teams listed at
+zero from registration (or, for teams without a row, from the next rebuild).
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("standings")
+
+
+def test_league_table_read_cost_is_independent_of_match_count(results):
+    reads = results["reads"]
+    assert [read["completed"] for read in reads] == [0, 6, 36, 96, 96]
+    assert {read["queries"] for read in reads} == {2}
+    assert {read["catchAllQueries"] for read in reads} == {2}
+    assert [read["totalMatches"] for read in reads] == [read["completed"] for read in reads]
+
+
+def test_match_transitions_keep_standings_consistent(results):
+    transitions = results["transitions"]
+    assert transitions["statuses"] == [200, 200, 200]
+    assert transitions["consistent"] == [True, True, True]
+    assert transitions["totalPoints"] == 96 * 4
+
+
+def test_stored_table_matches_full_recomputation(results):
+    assert results["transitions"]["matchesFullRecompute"]
+
+
+def test_check_detects_drift_and_rebuild_repairs_it(results):
+    repair = results["repair"]
+    assert repair["mismatchedFields"] == ["form", "points"]
+    assert repair["rebuiltTeams"] == 12
+    assert repair["consistent"]
+
+
+def test_registered_teams_are_listed_at_zero(results):
+    late = results["lateRegistration"]
+    assert late["status"] == 201
+    # Registration seeds a zero row; a team without one is only a check mismatch
+    registered, legacy = late["afterRegistration"]["entries"][:2]
+    assert (registered["name"], registered["played"], registered["points"]) == ("Late XI", 0, 0)
+    assert legacy is None
+    assert late["afterRegistration"]["teams"] == [13, 13]
+    assert late["mismatchedTeams"] == ["legacy-team"]
+
+
+def test_rebuild_backfills_teams_without_a_standings_row(results):
+    late = results["lateRegistration"]
+    assert late["afterRebuild"]["teams"] == [14, 14]
+    for entry in late["afterRebuild"]["entries"]:
+        assert (entry["played"], entry["points"]) == (0, 0)
+    assert late["consistent"]
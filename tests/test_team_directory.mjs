@@ -0,0 +1,51 @@
+// Route harness scenarios of test_team_directory.py (route_scenario in tests/conftest.py)
+
+import { call, catchAll, db, invalidateTeams } from './harness/routes.mjs';
+import { seedLeague } from './harness/fixtures.mjs';
+
+export default {
+  // Query counts of the match list, matches/next and quick-sim with the team directory
+  async 'team-directory'() {
+    seedLeague(db, { teams: 30, rounds: 10 });
+    const { GET, PUT } = await catchAll();
+    const { GET: nextMatch } = await import('@/app/api/matches/next/route');
+    const { POST: quickSim } = await import('@/app/api/matches/quick-sim/route');
+    const results = { matchList: [] };
+
+    for (const limit of [10, 50, 150]) {
+      invalidateTeams();
+      const cold = await call(GET, `/matches?limit=${limit}`, { params: { path: ['matches'] } });
+      const warm = await call(GET, `/matches?limit=${limit}`, { params: { path: ['matches'] } });
+      results.matchList.push({
+        limit,
+        returned: cold.body.length,
+        coldQueries: cold.queries,
+        warmQueries: warm.queries,
+        unknownNames: cold.body.filter(match => match.home_team_name === 'Unknown Team').length
+      });
+    }
+
+    invalidateTeams();
+    const nextCold = await call(nextMatch, '/matches/next?userId=team-0');
+    const nextWarm = await call(nextMatch, '/matches/next?userId=team-0');
+    results.next = {
+      status: nextCold.body.status,
+      homeTeamName: nextCold.body.match?.home_team_name,
+      coldQueries: nextCold.queries,
+      warmQueries: nextWarm.queries
+    };
+
+    const simulated = await call(quickSim, '/matches/quick-sim', { method: 'POST', body: { userId: 'team-0', limit: 20 } });
+    results.quickSim = { status: simulated.status, simulated: simulated.body.simulated, queries: simulated.queries };
+
+    const renamed = await call(PUT, '/users/team-1', { method: 'PUT', body: { team_name: 'Renamed XI', coins: 1 }, params: { path: ['users', 'team-1'] } });
+    const afterRename = await call(GET, '/matches?limit=150&userId=team-1', { params: { path: ['matches'] } });
+    results.rename = {
+      status: renamed.status,
+      coins: renamed.body.coins,
+      names: [...new Set(afterRename.body.map(match => match.home_team_id === 'team-1' ? match.home_team_name : match.away_team_name))]
+    };
+
+    return results;
+  }
+};
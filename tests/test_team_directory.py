@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Round trips of the team-name lookups in GET /api/matches, /api/matches/next and
+quick-sim once they go through the shared team directory (lib/league/team-directory.js).
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def results(route_scenario):
+    return route_scenario("team-directory")
+
+
+def test_match_list_query_count_is_constant(results):
+    match_list = results["matchList"]
+    assert [entry["returned"] for entry in match_list] == [10, 50, 150]
+    for entry in match_list:
+        assert entry["unknownNames"] == 0
+        assert entry["coldQueries"] == 2, f"limit={entry['limit']} made {entry['coldQueries']} queries"
+        assert entry["warmQueries"] == 1
+
+
+def test_next_match_uses_cached_names(results):
+    assert results["next"]["status"] == "next_match_available"
+    assert results["next"]["homeTeamName"] == "Team 0"
+    assert results["next"]["warmQueries"] == results["next"]["coldQueries"] - 1
+
+
+def test_quick_sim_query_count(results):
+    assert results["quickSim"]["simulated"] == 20
+    # matches, three prefetch queries, the results upsert, then a read and an
+    # upsert of the affected league_standings rows
+    assert results["quickSim"]["queries"] <= 7
+
+
+def test_team_update_invalidates_directory(results):
+    assert results["rename"]["status"] == 200
+    assert results["rename"]["coins"] == 50000, "PUT /users must not touch coins"
+    assert results["rename"]["names"] == ["Renamed XI"]